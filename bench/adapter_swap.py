@@ -0,0 +1,111 @@
+"""Eval throughput across many LoRA fine-tunes of one base model.
+
+Copies a trained LoRA causal_lm experiment dir into ``--adapters`` variants
+with re-drawn ``lora_B`` weights, which stand in for separate fine-tunes of
+the same base. Each variant answers ``--questions`` greedy questions in
+three ways:
+
+* ``fresh``: a full ``load_model_and_tokenizer`` per eval (the old path);
+* ``hot_swap``: ``model_cache.lease`` per eval, one resident base with
+  adapters swapped in and out;
+* ``mixed_batch``: one ``lease_adapters`` job whose batches mix all
+  adapters.
+
+All three must give the same answers.
+
+    python -m bench.adapter_swap artifacts/causal_lm_<id> --adapters 20 --questions 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import torch
+from safetensors.torch import load_file, save_file
+
+from src.benchmark import BatchedGenerator, GenerationRequest, load_model_and_tokenizer
+from src.model_cache import ModelCache
+
+_QUESTIONS = (
+    "What is the capital of France?",
+    "Explain gradient descent in one sentence.",
+    "Name three prime numbers.",
+    "What does a tokenizer do?",
+)
+
+
+def _make_adapters(source: Path, root: Path, n: int) -> list[Path]:
+    paths = []
+    for i in range(n):
+        path = root / f"adapter_{i:02d}"
+        shutil.copytree(source, path, ignore=shutil.ignore_patterns("plots", "*.bin", "*.png"))
+        weights = load_file(path / "adapter_model.safetensors")
+        generator = torch.Generator().manual_seed(i)
+        weights = {
+            k: torch.randn(v.shape, generator=generator, dtype=v.dtype) * v.float().std().clamp(min=0.02)
+            if "lora_B" in k
+            else v
+            for k, v in weights.items()
+        }
+        save_file(weights, path / "adapter_model.safetensors")
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("experiment_dir", type=Path, help="trained LoRA causal_lm experiment dir")
+    parser.add_argument("--adapters", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=4)
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    parser.add_argument("--fresh", type=int, default=5, help="adapters timed through the fresh-load path")
+    args = parser.parse_args()
+
+    requests = [
+        GenerationRequest(prompt=_QUESTIONS[i % len(_QUESTIONS)], greedy=True, max_new_tokens=args.max_new_tokens)
+        for i in range(args.questions)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_adapters(args.experiment_dir, Path(tmp), args.adapters)
+        n_fresh = min(args.fresh, len(paths))
+
+        start = time.perf_counter()
+        fresh = [BatchedGenerator(*load_model_and_tokenizer(p)).generate(requests) for p in paths[:n_fresh]]
+        fresh_seconds = time.perf_counter() - start
+
+        cache = ModelCache(max_adapters=args.adapters)
+        start = time.perf_counter()
+        swapped = []
+        for path in paths:
+            with cache.lease("causal_lm", path) as (model, tokenizer):
+                swapped.append(BatchedGenerator(model, tokenizer).generate(requests))
+        swap_seconds = time.perf_counter() - start
+
+        cache = ModelCache(max_adapters=args.adapters)
+        start = time.perf_counter()
+        with cache.lease_adapters(paths) as (model, adapters):
+            generator = BatchedGenerator(model, adapters[0][1])
+            answers = generator.generate([replace(r, adapter=name) for name, _ in adapters for r in requests])
+        mixed = [answers[i : i + len(requests)] for i in range(0, len(answers), len(requests))]
+        mixed_seconds = time.perf_counter() - start
+
+    evals = args.adapters
+    report = {
+        "adapters": evals,
+        "questions": args.questions,
+        "fresh_evals_per_second": round(n_fresh / fresh_seconds, 2),
+        "hot_swap_evals_per_second": round(evals / swap_seconds, 2),
+        "mixed_batch_evals_per_second": round(evals / mixed_seconds, 2),
+        "mixed_batch_batches": generator.stats["batches"],
+        "answers_match": swapped[:n_fresh] == fresh and mixed == swapped,
+    }
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Training-step stall caused by checkpoint saves, synchronous vs background.
+
+Trains a randomly initialised Llama-style model (no downloads) for a few
+steps with ``save_steps=1`` and reports how long each save blocked the
+training loop, plus how long the background write took.
+
+    python -m bench.checkpointing --hidden 512 --layers 8 --steps 6
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+
+import torch
+from datasets import Dataset
+from transformers import LlamaConfig, LlamaForCausalLM, TrainingArguments
+
+from src.checkpointing import CheckpointingTrainer
+
+
+def _run(args: argparse.Namespace, async_checkpoint: bool) -> dict:
+    torch.manual_seed(0)
+    config = LlamaConfig(
+        vocab_size=args.vocab,
+        hidden_size=args.hidden,
+        intermediate_size=args.hidden * 2,
+        num_hidden_layers=args.layers,
+        num_attention_heads=8,
+        num_key_value_heads=8,
+    )
+    model = LlamaForCausalLM(config)
+    ids = torch.randint(0, args.vocab, (args.steps * 2, args.seq_len)).tolist()
+    dataset = Dataset.from_dict({"input_ids": ids, "labels": ids})
+    with tempfile.TemporaryDirectory() as tmp:
+        training_args = TrainingArguments(
+            output_dir=tmp,
+            per_device_train_batch_size=2,
+            max_steps=args.steps,
+            save_strategy="steps",
+            save_steps=1,
+            save_total_limit=2,
+            logging_steps=args.steps,
+            report_to=[],
+        )
+        trainer = CheckpointingTrainer(
+            model=model,
+            args=training_args,
+            train_dataset=dataset,
+            async_checkpoint=async_checkpoint,
+        )
+        trainer.train()
+        return trainer.checkpoint_summary()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hidden", type=int, default=256)
+    parser.add_argument("--layers", type=int, default=4)
+    parser.add_argument("--vocab", type=int, default=8000)
+    parser.add_argument("--seq-len", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=6)
+    args = parser.parse_args()
+
+    for async_checkpoint in (False, True):
+        print(json.dumps(_run(args, async_checkpoint)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Latency of POST /experiments/compare as the number of experiments grows.
+
+Fills a throwaway SQLite DB with ``--experiments`` custom_lightning
+experiments, each with ``--evals`` completed benchmark evals, then compares
+all of them two ways:
+
+* ``per_experiment``: ``get_experiment`` plus a full ``list_benchmark_evals``
+  scan for every id, filtered in Python (the old path);
+* ``batched``: ``compare_experiments``, which reads the experiments and
+  their completed evals with one query each.
+
+Both must report the same ROUGE scores.
+
+    python -m bench.compare --experiments 200 --evals 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.api.experiment_routes import compare_experiments
+from src.models import (
+    BenchmarkEvalResult,
+    BenchmarkStatus,
+    ConfigRecord,
+    CustomLightningFullConfig,
+    ExperimentResult,
+    ExperimentStatus,
+    ExperimentType,
+)
+from src.storage import (
+    database,
+    get_experiment,
+    list_benchmark_evals,
+    save_benchmark_eval,
+    save_config,
+    save_experiment,
+)
+
+
+def _seed(n_experiments: int, n_evals: int) -> list[str]:
+    started = datetime.now()
+    ids = []
+    for i in range(n_experiments):
+        exp_id = f"exp{i:05d}"
+        save_config(
+            ConfigRecord(
+                id=f"cfg{i:05d}", name=exp_id, experiment_type=ExperimentType.CUSTOM_LIGHTNING,
+                config=CustomLightningFullConfig(cfg={"lr": 10 ** -(i % 5), "batch_size": 8 * (1 + i % 4)}),
+                created_at=started,
+            )
+        )
+        save_experiment(
+            ExperimentResult(
+                id=exp_id, experiment_type=ExperimentType.CUSTOM_LIGHTNING, status=ExperimentStatus.COMPLETED,
+                dataset_id="d", config_id=f"cfg{i:05d}", started_at=started,
+            )
+        )
+        for j in range(n_evals):
+            save_benchmark_eval(
+                BenchmarkEvalResult(
+                    id=f"{exp_id}-{j}", benchmark_id=f"b{j}", benchmark_name=f"b{j}", experiment_id=exp_id,
+                    question="q?", gold_answer="a", model_answer="a", bleu_score=0.0, rouge_score=float(i + j),
+                    primary_score=float(i + j), status=BenchmarkStatus.COMPLETED, started_at=started,
+                )
+            )
+        ids.append(exp_id)
+    return ids
+
+
+def _per_experiment(ids: list[str]) -> list[list[float]]:
+    scores = []
+    for exp_id in ids:
+        get_experiment(exp_id)
+        evals = list_benchmark_evals()
+        scores.append(
+            [e.rouge_score for e in evals if e.experiment_id == exp_id and e.status == BenchmarkStatus.COMPLETED]
+        )
+    return scores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--experiments", type=int, default=200)
+    parser.add_argument("--evals", type=int, default=20, help="completed evals per experiment")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A throwaway DB; the app's own DB is never touched.
+        database.DB_PATH = Path(tmp) / "bench.db"
+        database.init_db()
+        ids = _seed(args.experiments, args.evals)
+
+        start = time.perf_counter()
+        old = _per_experiment(ids)
+        old_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = compare_experiments(ids)
+        new_seconds = time.perf_counter() - start
+
+    report = {
+        "experiments": args.experiments,
+        "evals": args.experiments * args.evals,
+        "per_experiment_seconds": round(old_seconds, 3),
+        "batched_seconds": round(new_seconds, 3),
+        "speedup": round(old_seconds / new_seconds, 1),
+        "config_diff_keys": sorted(result.config_diff),
+        "scores_match": [sorted(s) for s in old] == [sorted(e.rouge_scores) for e in result.experiments],
+    }
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
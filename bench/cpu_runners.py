@@ -0,0 +1,95 @@
+"""Aggregate CPU throughput for N concurrent runner processes.
+
+Compares runners left on torch defaults (each one sizes its pool to every
+core) against runners that apply the per-slot budget from ``src.cpu_policy``.
+
+    python -m bench.cpu_runners --runners 4 --steps 50
+    python -m bench.cpu_runners --runners 4 --pin
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _worker(steps: int, width: int, policy: str | None) -> None:
+    from src.cpu_policy import apply_cpu_policy
+
+    apply_cpu_policy(json.loads(policy) if policy else None)
+
+    import torch
+
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(
+        torch.nn.Linear(width, width * 4),
+        torch.nn.GELU(),
+        torch.nn.Linear(width * 4, width),
+    )
+    optim = torch.optim.AdamW(model.parameters(), lr=1e-3)
+    batch = torch.randn(64, width)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        optim.zero_grad(set_to_none=True)
+        loss = model(batch).pow(2).mean()
+        loss.backward()
+        optim.step()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"steps": steps, "seconds": elapsed, "threads": torch.get_num_threads()}))
+
+
+def _launch(runners: int, steps: int, width: int, budgeted: bool, pin: bool) -> dict:
+    from src.cpu_policy import plan_cpu_policy
+
+    procs = []
+    start = time.perf_counter()
+    for slot in range(runners):
+        cmd = [sys.executable, "-m", "bench.cpu_runners", "--worker", "--steps", str(steps), "--width", str(width)]
+        env = dict(os.environ)
+        if budgeted:
+            policy = plan_cpu_policy(slot, runners, pin=pin)
+            cmd += ["--policy", json.dumps(policy.to_payload())]
+            env.update(policy.env())
+        procs.append(subprocess.Popen(cmd, cwd=str(REPO_ROOT), env=env, stdout=subprocess.PIPE, text=True))
+
+    results = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+    wall = time.perf_counter() - start
+    # Each worker times only its training loop, so torch import cost is excluded.
+    aggregate = sum(r["steps"] / r["seconds"] for r in results)
+    return {
+        "mode": ("pinned" if pin else "budgeted") if budgeted else "default",
+        "runners": runners,
+        "threads_per_runner": results[0]["threads"],
+        "wall_seconds": round(wall, 3),
+        "aggregate_steps_per_sec": round(aggregate, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runners", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--width", type=int, default=512)
+    parser.add_argument("--pin", action="store_true", help="Also pin each runner to a disjoint core block")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--policy", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.steps, args.width, args.policy)
+        return
+
+    print(f"cores available: {len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()}")
+    for budgeted in (False, True):
+        print(json.dumps(_launch(args.runners, args.steps, args.width, budgeted, args.pin and budgeted)))
+
+
+if __name__ == "__main__":
+    main()
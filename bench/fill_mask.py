@@ -0,0 +1,90 @@
+"""Fill-mask benchmark throughput: one sentence per forward pass vs batched.
+
+Loads a masked LM (a trained masked_lm experiment directory or any HF model
+dir) and scores ``--sentences`` synthetic cloze sentences built from its
+vocabulary, first the way the single-sentence benchmark did (one forward
+pass, top-k and decode per sentence) and then with ``src.fill_mask``. The
+two paths must agree on every gold rank. No downloads.
+
+    python -m bench.fill_mask artifacts/masked_lm_<id> --sentences 2000 --batch-size 64
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+import torch
+from transformers import AutoModelForMaskedLM, AutoTokenizer
+
+from src.fill_mask import fill_mask
+
+
+def _sentences(tokenizer, n: int, max_words: int, seed: int) -> tuple[list[str], list[list[str]]]:
+    rng = random.Random(seed)
+    special = set(tokenizer.all_special_tokens)
+    words = [w for w in tokenizer.get_vocab() if w.isalpha() and w not in special]
+    texts, golds = [], []
+    for _ in range(n):
+        sentence = rng.choices(words, k=rng.randint(3, max_words))
+        position = rng.randrange(len(sentence))
+        golds.append([sentence[position]])
+        sentence[position] = tokenizer.mask_token
+        texts.append(" ".join(sentence))
+    return texts, golds
+
+
+def _per_sentence(model, tokenizer, texts: list[str], golds: list[list[str]], top_k: int) -> list[int | None]:
+    ranks = []
+    for text, gold in zip(texts, golds):
+        encoded = tokenizer(text, return_tensors="pt")
+        with torch.no_grad():
+            logits = model(input_ids=encoded["input_ids"], attention_mask=encoded["attention_mask"]).logits
+        position = (encoded["input_ids"][0] == tokenizer.mask_token_id).nonzero()[0, 0]
+        top = [tokenizer.decode([i]).strip() for i in logits[0, position].topk(top_k).indices.tolist()]
+        ranks.append(top.index(gold[0]) if gold[0] in top else None)
+    return ranks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model_path", type=Path)
+    parser.add_argument("--sentences", type=int, default=2_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--max-words", type=int, default=24)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model_path)
+    model = AutoModelForMaskedLM.from_pretrained(args.model_path).eval()
+    texts, golds = _sentences(tokenizer, args.sentences, args.max_words, args.seed)
+
+    fill_mask(model, tokenizer, texts[:1], golds[:1], args.top_k)  # decode the vocabulary once
+    start = time.perf_counter()
+    expected = _per_sentence(model, tokenizer, texts, golds, args.top_k)
+    per_sentence_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    results = fill_mask(model, tokenizer, texts, golds, args.top_k, args.batch_size)
+    batched_seconds = time.perf_counter() - start
+
+    ranks = [r.ranks[0] for r in results]
+    print(
+        json.dumps(
+            {
+                "sentences": args.sentences,
+                "batch_size": args.batch_size,
+                "per_sentence_per_sec": round(args.sentences / per_sentence_seconds, 1),
+                "batched_per_sec": round(args.sentences / batched_seconds, 1),
+                "speedup": round(per_sentence_seconds / batched_seconds, 1),
+                "rank_mismatches": sum(a != b for a, b in zip(ranks, expected)),
+                "top1_accuracy": sum(r == 0 for r in ranks) / len(ranks),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
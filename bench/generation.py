@@ -0,0 +1,62 @@
+"""Causal LM benchmark generation throughput: one prompt at a time vs batched.
+
+Loads a trained causal_lm experiment directory (adapter or full model) and
+generates ``--requests`` answers with ``BatchedGenerator``, first at batch
+size 1 (the old per-run loop) and then at ``--batch-size``.
+
+    python -m bench.generation artifacts/causal_lm_<id> --requests 32 --batch-size 16
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import torch
+
+from src.benchmark import BatchedGenerator, GenerationRequest, load_model_and_tokenizer
+
+_QUESTIONS = (
+    "What is the capital of France?",
+    "Explain gradient descent in one sentence.",
+    "Name three prime numbers.",
+    "What does a tokenizer do?",
+)
+
+
+def _run(model, tokenizer, requests: list[GenerationRequest], batch_size: int) -> dict:
+    torch.manual_seed(0)
+    generator = BatchedGenerator(model, tokenizer, max_batch_size=batch_size)
+    start = time.perf_counter()
+    generator.generate(requests)
+    seconds = time.perf_counter() - start
+    return {
+        "batch_size": batch_size,
+        "requests": len(requests),
+        "batches": generator.stats["batches"],
+        "seconds": round(seconds, 3),
+        "requests_per_sec": round(len(requests) / seconds, 3),
+        "tokens_per_sec": round(generator.stats["generated_tokens"] / seconds, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model_path", type=Path)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    args = parser.parse_args()
+
+    model, tokenizer = load_model_and_tokenizer(args.model_path)
+    requests = [
+        GenerationRequest(prompt=_QUESTIONS[i % len(_QUESTIONS)], max_new_tokens=args.max_new_tokens)
+        for i in range(args.requests)
+    ]
+    for batch_size in (1, args.batch_size):
+        print(json.dumps(_run(model, tokenizer, requests, batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Custom Lightning benchmark latency: one subprocess per eval vs the worker pool.
+
+Writes a small ``lightning.LightningModule`` (an MLP on sin(x)) and its
+checkpoint to a temp dir. It then times ``--evals`` sin-regression evals
+through the one-shot ``src.custom_lightning_sin_benchmark_runner``
+subprocess the benchmark routes used to start, and ``--evals`` through
+``LightningBenchmarkPool``. The pool's first eval includes the worker start
+and is reported separately. Both paths must return the same metrics.
+
+    python -m bench.lightning_benchmark --evals 5 --hidden 64
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+
+from src.lightning_benchmark_pool import LightningBenchmarkPool
+
+_MODULE = """
+import lightning as L
+from torch import nn
+
+
+class SinMLP(L.LightningModule):
+    def __init__(self, cfg):
+        super().__init__()
+        hidden = int(cfg["hidden"])
+        self.net = nn.Sequential(nn.Linear(1, hidden), nn.Tanh(), nn.Linear(hidden, 1))
+
+    def forward(self, x):
+        return self.net(x)
+"""
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _one_shot(payload: dict, root: Path) -> dict:
+    payload_path = root / "payload.json"
+    payload_path.write_text(json.dumps(payload), encoding="utf-8")
+    subprocess.run(
+        [sys.executable, "-m", "src.custom_lightning_sin_benchmark_runner", str(payload_path)],
+        cwd=str(_REPO_ROOT),
+        check=True,
+        capture_output=True,
+    )
+    return json.loads((root / "benchmark_metrics.json").read_text(encoding="utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--evals", type=int, default=5)
+    parser.add_argument("--hidden", type=int, default=64)
+    parser.add_argument("--points", type=int, default=1_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "sin_mlp.py").write_text(_MODULE)
+        net = torch.nn.Sequential(torch.nn.Linear(1, args.hidden), torch.nn.Tanh(), torch.nn.Linear(args.hidden, 1))
+        torch.save({"state_dict": {f"net.{k}": v for k, v in net.state_dict().items()}}, root / "model.ckpt")
+        payload = {
+            "output_dir": str(root),
+            "config": {"hidden": args.hidden},
+            "lightning_module_path": str(root / "sin_mlp.py"),
+            "lightning_module_class_name": "SinMLP",
+            "checkpoint_path": str(root / "model.ckpt"),
+            "x_min": -3.0,
+            "x_max": 3.0,
+            "n_points": args.points,
+        }
+
+        start = time.perf_counter()
+        expected = [_one_shot(payload, root) for _ in range(args.evals)]
+        one_shot_seconds = time.perf_counter() - start
+
+        pool = LightningBenchmarkPool(workers=1)
+        try:
+            start = time.perf_counter()
+            got = [pool.run("sin", payload)[0]]
+            first_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            got += [pool.run("sin", payload)[0] for _ in range(args.evals)]
+            warm_seconds = time.perf_counter() - start
+            stats = pool.stats()
+        finally:
+            pool.close()
+
+    report = {
+        "evals": args.evals,
+        "one_shot_ms_per_eval": round(1000 * one_shot_seconds / args.evals, 1),
+        "pool_first_eval_ms": round(1000 * first_seconds, 1),
+        "pool_warm_ms_per_eval": round(1000 * warm_seconds / args.evals, 2),
+        "speedup_warm": round(one_shot_seconds / warm_seconds, 1),
+        "cached_jobs": stats["cached_jobs"],
+        "metrics_match": all(m == expected[0] for m in expected + got),
+    }
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Base-model load time through the local model store.
+
+Each load runs in a fresh interpreter so only the OS page cache carries over
+between runs; the first run after populating the store is the cold load.
+
+    python -m bench.model_load TinyLlama/TinyLlama-1.1B-Chat-v1.0 --runs 3
+    MODEL_STORE_OFFLINE=1 python -m bench.model_load TinyLlama/TinyLlama-1.1B-Chat-v1.0
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _worker(model_name: str, legacy: bool) -> None:
+    from transformers import AutoModelForCausalLM
+
+    if legacy:
+        start = time.perf_counter()
+        AutoModelForCausalLM.from_pretrained(model_name, low_cpu_mem_usage=False)
+        seconds = time.perf_counter() - start
+    else:
+        from src.model_store import load_pretrained
+
+        _, seconds = load_pretrained(AutoModelForCausalLM, model_name)
+    print(json.dumps({"seconds": seconds}))
+
+
+def _run(model_name: str, legacy: bool) -> float:
+    cmd = [sys.executable, "-m", "bench.model_load", model_name, "--worker"]
+    if legacy:
+        cmd.append("--legacy")
+    out = subprocess.run(cmd, cwd=str(REPO_ROOT), capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])["seconds"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model_name")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--legacy", action="store_true", help="Also time plain from_pretrained(low_cpu_mem_usage=False)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.model_name, args.legacy)
+        return
+
+    modes = [False, True] if args.legacy else [False]
+    for legacy in modes:
+        times = [_run(args.model_name, legacy) for _ in range(args.runs)]
+        print(json.dumps({
+            "mode": "legacy" if legacy else "store",
+            "first_seconds": round(times[0], 3),
+            "warm_seconds": [round(t, 3) for t in times[1:]],
+        }))
+
+
+if __name__ == "__main__":
+    main()
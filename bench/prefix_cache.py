@@ -0,0 +1,67 @@
+"""Prefill cost with and without the shared system-prompt KV cache.
+
+Loads a trained causal_lm experiment directory and answers ``--requests``
+questions that share one system prompt (padded to ``--system-words`` words),
+generating a single token each so the timing is dominated by prefill. The run
+with ``prefix_cache=False`` prefills the full prompt; the cached run prefills
+the system prompt once and only the question suffix per request.
+
+    python -m bench.prefix_cache artifacts/causal_lm_<id> --requests 64 --system-words 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import torch
+
+from src.benchmark import BatchedGenerator, GenerationRequest, load_model_and_tokenizer
+
+_QUESTIONS = (
+    "What is the capital of France?",
+    "Explain gradient descent in one sentence.",
+    "Name three prime numbers.",
+    "What does a tokenizer do?",
+)
+
+
+def _run(model, tokenizer, requests: list[GenerationRequest], batch_size: int, prefix_cache: bool) -> dict:
+    torch.manual_seed(0)
+    generator = BatchedGenerator(model, tokenizer, max_batch_size=batch_size, prefix_cache=prefix_cache)
+    start = time.perf_counter()
+    generator.generate(requests)
+    seconds = time.perf_counter() - start
+    return {
+        "prefix_cache": prefix_cache,
+        "requests": len(requests),
+        "prefill_tokens": generator.stats["prefill_tokens"],
+        "prefix_cached_tokens": generator.stats["prefix_cached_tokens"],
+        "seconds": round(seconds, 3),
+        "ms_per_request": round(1000 * seconds / len(requests), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model_path", type=Path)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--system-words", type=int, default=200)
+    args = parser.parse_args()
+
+    model, tokenizer = load_model_and_tokenizer(args.model_path)
+    system_prompt = "You are a helpful assistant. " + " ".join(["Answer carefully."] * (args.system_words // 2))
+    requests = [
+        GenerationRequest(prompt=_QUESTIONS[i % len(_QUESTIONS)], system_prompt=system_prompt, max_new_tokens=1)
+        for i in range(args.requests)
+    ]
+    # Warm up once so the cached run doesn't pay for the one-off prefix prefill alone.
+    _run(model, tokenizer, requests[:1], args.batch_size, prefix_cache=False)
+    for prefix_cache in (False, True):
+        print(json.dumps(_run(model, tokenizer, requests, args.batch_size, prefix_cache)))
+
+
+if __name__ == "__main__":
+    main()
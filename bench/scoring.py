@@ -0,0 +1,80 @@
+"""BLEU/ROUGE-L throughput: batch scorer vs per-pair library calls.
+
+Scores ``--pairs`` synthetic (hypothesis, reference) pairs with
+``src.scoring`` and times a ``--baseline`` sized slice through the per-pair
+path the benchmark routes used before (a fresh ``sacrebleu.BLEU`` per call,
+``rouge_score``'s ``RougeScorer``). The slice also checks that both paths
+agree. No downloads.
+
+    python -m bench.scoring --pairs 100000 --baseline 5000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from rouge_score import rouge_scorer
+from sacrebleu.metrics import BLEU
+
+from src.scoring import bleu_scores, corpus_bleu, rouge_l_scores
+
+
+def _pairs(n: int, vocab: int, max_len: int, n_refs: int, seed: int) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocab)]
+    # Benchmarks score many generations against few gold answers.
+    refs = [" ".join(rng.choices(words, k=rng.randint(1, max_len))) for _ in range(n_refs)]
+    hyps = [" ".join(rng.choices(words, k=rng.randint(1, max_len))) for _ in range(n)]
+    return hyps, [refs[i % n_refs] for i in range(n)]
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def _per_pair_bleu(hyps: list[str], refs: list[str]) -> list[float]:
+    return [BLEU(effective_order=True).sentence_score(h, [r]).score for h, r in zip(hyps, refs)]
+
+
+def _per_pair_rouge_l(hyps: list[str], refs: list[str]) -> list[float]:
+    scorer = rouge_scorer.RougeScorer(["rougeL"])
+    return [scorer.score(r, h)["rougeL"].fmeasure * 100 for h, r in zip(hyps, refs)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=100_000)
+    parser.add_argument("--baseline", type=int, default=5_000, help="pairs timed through the per-pair path")
+    parser.add_argument("--vocab", type=int, default=2_000)
+    parser.add_argument("--max-len", type=int, default=64)
+    parser.add_argument("--refs", type=int, default=500, help="distinct reference answers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    hyps, refs = _pairs(args.pairs, args.vocab, args.max_len, args.refs, args.seed)
+
+    n = min(args.baseline, args.pairs)
+    report: dict = {"pairs": args.pairs, "baseline_pairs": n}
+    for name, batch, per_pair in (
+        ("bleu", bleu_scores, _per_pair_bleu),
+        ("rouge_l", rouge_l_scores, _per_pair_rouge_l),
+    ):
+        scores, seconds = _timed(batch, hyps, refs)
+        expected, baseline_seconds = _timed(per_pair, hyps[:n], refs[:n])
+        report[name] = {
+            "batch_pairs_per_second": round(args.pairs / seconds),
+            "per_pair_pairs_per_second": round(n / baseline_seconds),
+            "speedup": round((args.pairs / seconds) / (n / baseline_seconds), 1),
+            "max_abs_diff": max(abs(a - b) for a, b in zip(scores, expected)),
+        }
+    corpus, seconds = _timed(corpus_bleu, hyps, refs)
+    report["corpus_bleu"] = {"score": round(corpus, 3), "seconds": round(seconds, 2)}
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ from ..models import (
     MaskedLMModelConfig,
     MaskedLMTrainingConfig,
 )
+from ..lightning_benchmark_pool import lightning_benchmark_pool
 from ..storage import init_db, config_name_exists, save_config
 from .helpers import CONFIGS_DIR, now
 
@@ -80,6 +81,7 @@ async def lifespan(app: FastAPI):
     init_db()
     _seed_default_configs()
     yield
+    lightning_benchmark_pool.close()
 
 
 app = FastAPI(
@@ -3,20 +3,33 @@ from __future__ import annotations
 
 import logging
 import json
-import subprocess
-import sys
+import os
+import queue
 import uuid
+from dataclasses import replace
 from pathlib import Path
-from threading import Thread
+from typing import Iterator
 
+import pandas as pd
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 logger = logging.getLogger(__name__)
 
-from ..benchmark import compute_bleu_score, compute_rouge_l_score, generate_response, load_model_and_tokenizer
+from ..benchmark import BatchedGenerator, GenerationRequest, cached_answers, generation_cache
+from ..eval_stats import mean_ci, pairwise_significance, sequential_stop
+from ..eval_worker import eval_worker
+from ..fill_mask import GOLD_SEPARATOR, FillMaskResult, fill_mask, split_golds
+from ..lightning_benchmark_pool import BenchmarkJobError, lightning_benchmark_pool
+from ..model_cache import adapter_name, lora_base_key, model_cache, weights_fingerprint
+from ..scoring import bleu_scores, rouge_l_scores
+from ..semantic import ENCODER_ENV, semantic_scorer
 from ..models import (
+    AdaptiveRuns,
     Benchmark,
     BenchmarkCreateRequest,
+    BenchmarkEvalItem,
+    BenchmarkEvalItemListResponse,
     BenchmarkEvalListResponse,
     BenchmarkEvalRequest,
     BenchmarkEvalResult,
@@ -26,24 +39,35 @@ from ..models import (
     BenchmarkStatus,
     BenchmarkType,
     BenchmarkUpdateRequest,
-    EvaluationComparisonItem,
+    BulkBenchmarkEvalRequest,
+    EvalMode,
     EvaluationComparisonResponse,
     ExperimentResult,
     ExperimentStatus,
     ExperimentType,
     PluginKind,
+    SignificanceEstimate,
+    SignificancePair,
+    SignificanceResponse,
 )
 from ..storage import (
+    count_benchmark_eval_items,
     delete_benchmark as storage_delete_benchmark,
     delete_benchmark_eval as storage_delete_benchmark_eval,
     get_benchmark,
     get_benchmark_eval,
+    get_dataset,
     get_experiment,
+    list_benchmark_eval_items,
+    list_benchmark_eval_items_by_eval,
     list_benchmark_evals,
     list_benchmark_evals_by_benchmark,
     list_benchmarks,
+    list_evaluation_comparisons,
+    list_leaderboard,
     save_benchmark,
     save_benchmark_eval,
+    save_benchmark_eval_items,
     get_plugin,
 )
 from .helpers import now
@@ -51,42 +75,59 @@ from .helpers import now
 router = APIRouter(tags=["benchmarks"])
 
 
-def _apply_eval_ranks(evals: list[BenchmarkEvalResult]) -> list[BenchmarkEvalResult]:
-    """Compute per-benchmark ranks using primary_score and higher_is_better.
-
-    - Only completed evals are ranked.
-    - Ranks are 1..N within each benchmark_id.
-    """
-    by_benchmark: dict[str, list[BenchmarkEvalResult]] = {}
-    for ev in evals:
-        ev.rank = None
-        if ev.status != BenchmarkStatus.COMPLETED:
-            continue
-        by_benchmark.setdefault(ev.benchmark_id, []).append(ev)
-
-    for benchmark_id, items in by_benchmark.items():
-        hib_values = {bool(i.higher_is_better) for i in items}
-        if len(hib_values) != 1:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Inconsistent higher_is_better values for benchmark_id={benchmark_id}",
-            )
-        higher_is_better = hib_values.pop()
-        items.sort(key=lambda x: float(x.primary_score or 0.0), reverse=higher_is_better)
-        for idx, ev in enumerate(items, start=1):
-            ev.rank = idx
-    return evals
+_SUITE_TYPES = {BenchmarkType.CAUSAL_LM_QA_SUITE, BenchmarkType.MASKED_LM_FILL_MASK_SUITE}
+_QA_TYPES = {BenchmarkType.CAUSAL_LM_QA, BenchmarkType.CAUSAL_LM_QA_SUITE}
+_PRIMARY_METRICS = ("rouge_l", "semantic")
+
+
+def _validate_suite_spec(spec: dict, benchmark_type: BenchmarkType = BenchmarkType.CAUSAL_LM_QA_SUITE) -> None:
+    """A suite spec names an uploaded dataset and its question/answer columns."""
+    if "dataset_id" not in spec:
+        raise HTTPException(status_code=400, detail=f"{benchmark_type.value} requires spec.dataset_id")
+    dataset = get_dataset(str(spec["dataset_id"]))
+    if not dataset:
+        raise HTTPException(status_code=400, detail="spec.dataset_id does not refer to an uploaded dataset")
+    for key, default in (("question_column", "question"), ("answer_column", "answer")):
+        column = spec.get(key, default)
+        if column not in dataset.columns:
+            raise HTTPException(status_code=400, detail=f"Dataset has no column '{column}' (spec.{key})")
+    for key in ("limit", "top_k"):
+        value = spec.get(key)
+        if value is not None and (not isinstance(value, int) or value < 1):
+            raise HTTPException(status_code=400, detail=f"spec.{key} must be a positive integer")
+
+
+def _validate_primary_metric(spec: dict, benchmark_type: BenchmarkType) -> None:
+    """causal_lm QA benchmarks may rank by semantic similarity instead of ROUGE-L (spec.primary_metric)."""
+    metric = spec.get("primary_metric")
+    if metric is None:
+        return
+    if benchmark_type not in _QA_TYPES:
+        raise HTTPException(status_code=400, detail="spec.primary_metric is only supported for causal_lm QA benchmarks")
+    if metric not in _PRIMARY_METRICS:
+        raise HTTPException(status_code=400, detail=f"spec.primary_metric must be one of {list(_PRIMARY_METRICS)}")
+    if metric == "semantic" and not semantic_scorer.enabled:
+        raise HTTPException(
+            status_code=400, detail=f"spec.primary_metric 'semantic' needs a local encoder; set {ENCODER_ENV}"
+        )
 
 
 @router.post("/benchmarks", response_model=Benchmark)
 def create_benchmark(request: BenchmarkCreateRequest) -> Benchmark:
     benchmark_id = str(uuid.uuid4())
     # higher_is_better rules:
-    # - causal_lm_qa: always True (primary_score is ROUGE-L)
+    # - causal_lm_qa: always True (primary_score is ROUGE-L, or semantic similarity per spec.primary_metric)
+    # - causal_lm_qa_suite: always True (primary_score is the mean of that metric over the suite)
     # - masked_lm_fill_mask: always True (primary_score is correctness)
+    # - masked_lm_fill_mask_suite: always True (primary_score is top-1 accuracy over all masks)
     # - custom_lightning_sin_regression: always False (primary_score is MSE)
     # - custom_lightning_plugin: configurable (primary_score semantics are user-defined)
-    if request.benchmark_type in {BenchmarkType.CAUSAL_LM_QA, BenchmarkType.MASKED_LM_FILL_MASK}:
+    if request.benchmark_type in {
+        BenchmarkType.CAUSAL_LM_QA,
+        BenchmarkType.CAUSAL_LM_QA_SUITE,
+        BenchmarkType.MASKED_LM_FILL_MASK,
+        BenchmarkType.MASKED_LM_FILL_MASK_SUITE,
+    }:
         if request.higher_is_better is False:
             raise HTTPException(status_code=400, detail="higher_is_better must be true for this benchmark_type")
         higher_is_better = True
@@ -105,6 +146,9 @@ def create_benchmark(request: BenchmarkCreateRequest) -> Benchmark:
     if request.benchmark_type == BenchmarkType.CAUSAL_LM_QA:
         if not request.question.strip() or not request.gold_answer.strip():
             raise HTTPException(status_code=400, detail="question and gold_answer are required for causal_lm_qa")
+    if request.benchmark_type in _SUITE_TYPES:
+        _validate_suite_spec(request.spec or {}, request.benchmark_type)
+    _validate_primary_metric(request.spec or {}, request.benchmark_type)
     if request.benchmark_type == BenchmarkType.MASKED_LM_FILL_MASK:
         if "[MASK]" not in request.question and "<mask>" not in request.question:
             raise HTTPException(status_code=400, detail="masked_lm_fill_mask requires a mask token ([MASK] or <mask>) in question")
@@ -142,6 +186,9 @@ def create_benchmark(request: BenchmarkCreateRequest) -> Benchmark:
         max_new_tokens=request.max_new_tokens,
         temperature=request.temperature,
         top_p=request.top_p,
+        eval_mode=request.eval_mode,
+        stop_sequences=[s for s in request.stop_sequences if s],
+        seed=request.seed,
         created_at=now(),
     )
     save_benchmark(benchmark)
@@ -184,6 +231,12 @@ def update_benchmark(benchmark_id: str, request: BenchmarkUpdateRequest) -> Benc
         benchmark.temperature = request.temperature
     if request.top_p is not None:
         benchmark.top_p = request.top_p
+    if request.eval_mode is not None:
+        benchmark.eval_mode = request.eval_mode
+    if request.stop_sequences is not None:
+        benchmark.stop_sequences = [s for s in request.stop_sequences if s]
+    if "seed" in request.model_fields_set:
+        benchmark.seed = request.seed
     if request.higher_is_better is not None:
         if benchmark.benchmark_type == BenchmarkType.CUSTOM_LIGHTNING_PLUGIN:
             benchmark.higher_is_better = bool(request.higher_is_better)
@@ -202,6 +255,9 @@ def update_benchmark(benchmark_id: str, request: BenchmarkUpdateRequest) -> Benc
     if benchmark.benchmark_type == BenchmarkType.CAUSAL_LM_QA:
         if not benchmark.question.strip() or not benchmark.gold_answer.strip():
             raise HTTPException(status_code=400, detail="question and gold_answer are required for causal_lm_qa")
+    if benchmark.benchmark_type in _SUITE_TYPES:
+        _validate_suite_spec(benchmark.spec or {}, benchmark.benchmark_type)
+    _validate_primary_metric(benchmark.spec or {}, benchmark.benchmark_type)
     if benchmark.benchmark_type == BenchmarkType.MASKED_LM_FILL_MASK:
         if "[MASK]" not in benchmark.question and "<mask>" not in benchmark.question:
             raise HTTPException(status_code=400, detail="masked_lm_fill_mask requires a mask token ([MASK] or <mask>) in question")
@@ -236,14 +292,314 @@ def delete_benchmark(benchmark_id: str) -> dict[str, str]:
     return {"status": "deleted", "benchmark_id": benchmark_id}
 
 
+def _effective_runs(benchmark: Benchmark, num_runs: int) -> int:
+    """Greedy decoding is deterministic, so repeating it adds nothing."""
+    return 1 if benchmark.eval_mode == EvalMode.GREEDY else num_runs
+
+
+def _generation_request(benchmark: Benchmark, prompt: str, num_runs: int, first_run: int = 0) -> GenerationRequest:
+    """All runs of one question come from a single request (one prompt prefill).
+
+    With a benchmark seed, run ``k`` (from 0) samples with ``seed + k``, so
+    every run is reproducible and cached on its own.
+    """
+    return GenerationRequest(
+        prompt=prompt,
+        max_new_tokens=benchmark.max_new_tokens,
+        temperature=benchmark.temperature,
+        top_p=benchmark.top_p,
+        greedy=benchmark.eval_mode == EvalMode.GREEDY,
+        stop_sequences=tuple(benchmark.stop_sequences),
+        num_return_sequences=_effective_runs(benchmark, num_runs),
+        seed=None if benchmark.seed is None else benchmark.seed + first_run,
+    )
+
+
+def _qa_requests(benchmark: Benchmark, num_runs: int) -> list[GenerationRequest]:
+    return [_generation_request(benchmark, benchmark.question, num_runs)]
+
+
+def _ranks_by_semantic(benchmark: Benchmark) -> bool:
+    return (benchmark.spec or {}).get("primary_metric") == "semantic"
+
+
+def _semantic_scores(answers: list[str], golds: list[str], required: bool) -> list[float] | None:
+    """Semantic similarity (0-100) of each answer to its gold, or None when no encoder is configured.
+
+    Unless ``required`` (the benchmark ranks by it), the score is only
+    informational: an encoder failure is logged and leaves it None instead
+    of failing the eval.
+    """
+    if not semantic_scorer.enabled:
+        return None
+    if required:
+        return semantic_scorer.scores(answers, golds)
+    try:
+        return semantic_scorer.scores(answers, golds)
+    except Exception:
+        logger.warning("Semantic scoring failed; storing no semantic scores", exc_info=True)
+        return None
+
+
+def _primary_score(benchmark: Benchmark, rouge: float, semantic: float | None) -> float:
+    if not _ranks_by_semantic(benchmark):
+        return float(rouge)
+    if semantic is None:
+        raise ValueError(f"Benchmark ranks by semantic similarity but {ENCODER_ENV} is not set")
+    return float(semantic)
+
+
+def _score_causal_lm_qa(
+    eval_result: BenchmarkEvalResult,
+    benchmark: Benchmark,
+    answers: list[str],
+    semantic: list[float] | None = None,
+) -> None:
+    """Score the runs of one QA eval; ``semantic`` may be precomputed for a whole wave of evals."""
+    golds = [benchmark.gold_answer] * len(answers)
+    if semantic is None:
+        semantic = _semantic_scores(answers, golds, _ranks_by_semantic(benchmark))
+    run_scores = [
+        BenchmarkRunScore(
+            run_number=run_num,
+            model_answer=model_answer,
+            bleu_score=bleu,
+            rouge_score=rouge,
+            semantic_score=None if semantic is None else semantic[run_num - 1],
+        )
+        for run_num, (model_answer, bleu, rouge) in enumerate(
+            zip(answers, bleu_scores(answers, golds), rouge_l_scores(answers, golds)), start=1
+        )
+    ]
+
+    eval_result.run_scores = run_scores
+    eval_result.model_answer = run_scores[-1].model_answer
+    eval_result.bleu_score = sum(r.bleu_score for r in run_scores) / len(run_scores)
+    eval_result.rouge_score = sum(r.rouge_score for r in run_scores) / len(run_scores)
+    eval_result.metrics = {"bleu": eval_result.bleu_score, "rouge_l": eval_result.rouge_score}
+    semantic_mean = None if semantic is None else sum(semantic) / len(semantic)
+    if semantic_mean is not None:
+        eval_result.metrics["semantic"] = semantic_mean
+    eval_result.primary_score = _primary_score(benchmark, eval_result.rouge_score, semantic_mean)
+    eval_result.status = BenchmarkStatus.COMPLETED
+
+
+def _generate_adaptive(
+    generator: BatchedGenerator,
+    benchmark: Benchmark,
+    num_runs: int,
+    adaptive: AdaptiveRuns,
+    others: list[float],
+) -> tuple[list[str], str]:
+    """Sample runs in rounds until the ROUGE-L interval settles or ``num_runs`` is spent."""
+    answers: list[str] = []
+    reason = "max_runs"
+    step = adaptive.min_runs
+    while len(answers) < num_runs:
+        step = min(step, num_runs - len(answers))
+        answers += generator.generate([_generation_request(benchmark, benchmark.question, step, len(answers))])
+        rouge = rouge_l_scores(answers, [benchmark.gold_answer] * len(answers))
+        stop = sequential_stop(rouge, adaptive.ci_tolerance, others if adaptive.rank_settled else (), adaptive.confidence)
+        if stop:
+            reason = stop
+            break
+        step = adaptive.runs_per_round
+    return answers, reason
+
+
+def _load_suite_items(benchmark: Benchmark) -> list[tuple[str, str]]:
+    """(question, gold_answer) rows of the dataset behind a suite benchmark."""
+    spec = benchmark.spec or {}
+    dataset = get_dataset(str(spec.get("dataset_id", "")))
+    if not dataset:
+        raise ValueError("Suite dataset not found")
+    question_column = spec.get("question_column", "question")
+    answer_column = spec.get("answer_column", "answer")
+    frame = pd.read_csv(
+        dataset.path,
+        usecols=[question_column, answer_column],
+        dtype=str,
+        keep_default_na=False,
+        skipinitialspace=True,
+    )
+    questions = frame[question_column].str.strip()
+    answers = frame[answer_column].str.strip()
+    keep = (questions != "") & (answers != "")
+    items = list(zip(questions[keep], answers[keep]))
+    if spec.get("limit"):
+        items = items[: int(spec["limit"])]
+    if not items:
+        raise ValueError("Suite dataset has no non-empty question/answer rows")
+    return items
+
+
+def _suite_requests(benchmark: Benchmark, items: list[tuple[str, str]], num_runs: int) -> list[GenerationRequest]:
+    return [_generation_request(benchmark, question, num_runs) for question, _ in items]
+
+
+def _model_key(output_dir: str) -> str:
+    """Generation-cache identity of an experiment's weights."""
+    path = Path(output_dir)
+    return f"{path.resolve()}:{weights_fingerprint(path)}"
+
+
+def _generator(model, tokenizer, model_keys: dict[str | None, str], use_cache: bool) -> BatchedGenerator:
+    if not use_cache:
+        return BatchedGenerator(model, tokenizer)
+    return BatchedGenerator(model, tokenizer, cache=generation_cache, model_keys=model_keys)
+
+
+def _generate_answers(experiment: ExperimentResult, requests: list[GenerationRequest], use_cache: bool) -> list[str]:
+    """Answers of ``experiment`` to ``requests``. When all are cached, the model is not loaded."""
+    model_keys = {None: _model_key(experiment.output_dir)}
+    answers = cached_answers(requests, model_keys) if use_cache else None
+    if answers is not None:
+        logger.info(f"Served {len(answers)} generations for {experiment.id} from the generation cache")
+        return answers
+    with model_cache.lease("causal_lm", experiment.output_dir) as (model, tokenizer):
+        generator = _generator(model, tokenizer, model_keys, use_cache)
+        answers = generator.generate(requests)
+    logger.info(
+        f"Served {len(answers)} generations for {experiment.id} in {generator.stats['batches']} batches "
+        f"({generator.stats['cached_answers']} cached, {generator.stats['seconds']:.1f}s)"
+    )
+    return answers
+
+
+def _suite_golds(items: list[tuple[str, str]], num_runs: int) -> list[str]:
+    return [gold for _, gold in items for _ in range(num_runs)]
+
+
+def _score_causal_lm_qa_suite(
+    eval_result: BenchmarkEvalResult,
+    benchmark: Benchmark,
+    items: list[tuple[str, str]],
+    answers: list[str],
+    num_runs: int,
+    semantic: list[float] | None = None,
+) -> list[BenchmarkEvalItem]:
+    golds = _suite_golds(items, num_runs)
+    bleu = bleu_scores(answers, golds)
+    rouge = rouge_l_scores(answers, golds)
+    if semantic is None:
+        semantic = _semantic_scores(answers, golds, _ranks_by_semantic(benchmark))
+    scored: list[BenchmarkEvalItem] = []
+    for index, (question, gold) in enumerate(items):
+        runs = slice(index * num_runs, (index + 1) * num_runs)
+        scored.append(
+            BenchmarkEvalItem(
+                index=index,
+                question=question,
+                gold_answer=gold,
+                model_answer=answers[runs][-1],
+                bleu_score=sum(bleu[runs]) / num_runs,
+                rouge_score=sum(rouge[runs]) / num_runs,
+                metrics={} if semantic is None else {"semantic": sum(semantic[runs]) / num_runs},
+            )
+        )
+
+    bleu_stats = mean_ci([item.bleu_score for item in scored])
+    rouge_stats = mean_ci([item.rouge_score for item in scored])
+    eval_result.question = f"{len(scored)} questions"
+    eval_result.gold_answer = ""
+    eval_result.model_answer = ""
+    eval_result.bleu_score = float(bleu_stats["mean"])
+    eval_result.rouge_score = float(rouge_stats["mean"])
+    eval_result.metrics = {
+        "num_items": len(scored),
+        "bleu": eval_result.bleu_score,
+        "rouge_l": eval_result.rouge_score,
+        "bleu_stats": bleu_stats,
+        "rouge_l_stats": rouge_stats,
+    }
+    semantic_mean = None
+    if semantic is not None:
+        semantic_stats = mean_ci([item.metrics["semantic"] for item in scored])
+        semantic_mean = float(semantic_stats["mean"])
+        eval_result.metrics["semantic"] = semantic_mean
+        eval_result.metrics["semantic_stats"] = semantic_stats
+    eval_result.primary_score = _primary_score(benchmark, eval_result.rouge_score, semantic_mean)
+    eval_result.status = BenchmarkStatus.COMPLETED
+    return scored
+
+
+def _score_fill_mask_suite(
+    eval_result: BenchmarkEvalResult,
+    items: list[tuple[str, str]],
+    results: list[FillMaskResult | None],
+    top_k: int,
+) -> list[BenchmarkEvalItem]:
+    scored: list[BenchmarkEvalItem] = []
+    for index, ((text, gold), result) in enumerate(zip(items, results)):
+        if result is None:
+            continue
+        scored.append(
+            BenchmarkEvalItem(
+                index=index,
+                question=text,
+                gold_answer=gold,
+                model_answer=" | ".join(p[0] for p in result.predictions),
+                metrics={
+                    "top1_accuracy": sum(result.top1) / len(result.ranks),
+                    "topk_accuracy": sum(result.topk) / len(result.ranks),
+                    "ranks": result.ranks,
+                },
+            )
+        )
+    if not scored:
+        raise ValueError(f"No row has one mask token per '{GOLD_SEPARATOR}'-separated gold answer")
+
+    ranks = [rank for item in scored for rank in item.metrics["ranks"]]
+    top1 = sum(rank == 0 for rank in ranks) / len(ranks)
+    topk = sum(rank is not None for rank in ranks) / len(ranks)
+    eval_result.question = f"{len(scored)} sentences"
+    eval_result.gold_answer = ""
+    eval_result.model_answer = ""
+    eval_result.bleu_score = 0.0
+    eval_result.rouge_score = 0.0
+    eval_result.primary_score = top1
+    eval_result.metrics = {
+        "num_items": len(scored),
+        "num_masks": len(ranks),
+        "skipped_items": len(items) - len(scored),
+        "top_k": top_k,
+        "top1_accuracy": top1,
+        "topk_accuracy": topk,
+        "exact_match": sum(all(r == 0 for r in item.metrics["ranks"]) for item in scored) / len(scored),
+        "top1_stats": mean_ci([item.metrics["top1_accuracy"] for item in scored]),
+    }
+    eval_result.status = BenchmarkStatus.COMPLETED
+    return scored
+
+
+def _run_lightning_job(kind: str, payload: dict, out_dir: Path, prefix: str, eval_id: str) -> dict:
+    """Run a custom Lightning benchmark on the worker pool, keeping the one-shot runners' output files."""
+    error: BenchmarkJobError | None = None
+    try:
+        metrics, stdout, stderr = lightning_benchmark_pool.run(kind, payload, timeout=120)
+    except BenchmarkJobError as e:
+        error, stdout, stderr = e, e.stdout, e.stderr
+    if stdout:
+        (out_dir / f"{prefix}_stdout_{eval_id}.txt").write_text(stdout, encoding="utf-8")
+    if stderr:
+        (out_dir / f"{prefix}_stderr_{eval_id}.txt").write_text(stderr, encoding="utf-8")
+    if error is not None:
+        raise ValueError(f"Benchmark runner failed: {error}")
+    (out_dir / f"{prefix}_metrics.json").write_text(json.dumps(metrics, indent=2), encoding="utf-8")
+    return metrics
+
+
 def _run_benchmark_eval(
     eval_id: str,
     benchmark: Benchmark,
     experiment: ExperimentResult,
     num_runs: int,
+    adaptive: AdaptiveRuns | None = None,
+    use_cache: bool = True,
 ) -> None:
     eval_result = get_benchmark_eval(eval_id)
     eval_result.status = BenchmarkStatus.RUNNING
+    num_runs = _effective_runs(benchmark, num_runs)
     eval_result.num_runs = num_runs
     save_benchmark_eval(eval_result)
 
@@ -252,89 +608,84 @@ def _run_benchmark_eval(
             if experiment.experiment_type != ExperimentType.CAUSAL_LM:
                 raise ValueError("causal_lm_qa benchmarks require a completed causal_lm experiment")
 
-            model_path = Path(experiment.output_dir)
-            model, tokenizer = load_model_and_tokenizer(model_path)
-
-            run_scores: list[BenchmarkRunScore] = []
-            for run_num in range(1, num_runs + 1):
-                model_answer = generate_response(
-                    model=model,
-                    tokenizer=tokenizer,
-                    prompt=benchmark.question,
-                    max_new_tokens=benchmark.max_new_tokens,
-                    temperature=benchmark.temperature,
-                    top_p=benchmark.top_p,
-                )
-                bleu = compute_bleu_score(model_answer, benchmark.gold_answer)
-                rouge = compute_rouge_l_score(model_answer, benchmark.gold_answer)
-                run_scores.append(
-                    BenchmarkRunScore(
-                        run_number=run_num,
-                        model_answer=model_answer,
-                        bleu_score=bleu,
-                        rouge_score=rouge,
+            if adaptive is not None and num_runs > adaptive.min_runs:
+                others = [
+                    ev.primary_score
+                    for ev in list_benchmark_evals_by_benchmark(benchmark.id)
+                    if ev.status == BenchmarkStatus.COMPLETED and ev.experiment_id != experiment.id
+                ]
+                model_keys = {None: _model_key(experiment.output_dir)}
+                with model_cache.lease("causal_lm", experiment.output_dir) as (model, tokenizer):
+                    answers, reason = _generate_adaptive(
+                        _generator(model, tokenizer, model_keys, use_cache), benchmark, num_runs, adaptive, others
                     )
+                _score_causal_lm_qa(eval_result, benchmark, answers)
+                eval_result.num_runs = len(answers)
+                eval_result.metrics["rouge_l_stats"] = mean_ci(
+                    [r.rouge_score for r in eval_result.run_scores], adaptive.confidence
                 )
+                eval_result.metrics["adaptive"] = {
+                    "runs_requested": num_runs,
+                    "runs_used": len(answers),
+                    "stop_reason": reason,
+                    "ci_tolerance": adaptive.ci_tolerance,
+                }
+                logger.info(f"Benchmark eval {eval_id}: stopped after {len(answers)}/{num_runs} runs ({reason})")
+            else:
+                answers = _generate_answers(experiment, _qa_requests(benchmark, num_runs), use_cache)
+                _score_causal_lm_qa(eval_result, benchmark, answers)
+
+        elif benchmark.benchmark_type == BenchmarkType.CAUSAL_LM_QA_SUITE:
+            if experiment.experiment_type != ExperimentType.CAUSAL_LM:
+                raise ValueError("causal_lm_qa_suite benchmarks require a completed causal_lm experiment")
 
-            eval_result.run_scores = run_scores
-            eval_result.model_answer = run_scores[-1].model_answer
-            eval_result.bleu_score = sum(r.bleu_score for r in run_scores) / len(run_scores)
-            eval_result.rouge_score = sum(r.rouge_score for r in run_scores) / len(run_scores)
-            eval_result.primary_score = float(eval_result.rouge_score)
-            eval_result.metrics = {"bleu": eval_result.bleu_score, "rouge_l": eval_result.rouge_score}
-            eval_result.status = BenchmarkStatus.COMPLETED
+            items = _load_suite_items(benchmark)
+            answers = _generate_answers(experiment, _suite_requests(benchmark, items, num_runs), use_cache)
+            save_benchmark_eval_items(
+                eval_id, _score_causal_lm_qa_suite(eval_result, benchmark, items, answers, num_runs)
+            )
 
         elif benchmark.benchmark_type == BenchmarkType.MASKED_LM_FILL_MASK:
             if experiment.experiment_type != ExperimentType.MASKED_LM:
                 raise ValueError("masked_lm_fill_mask benchmarks require a completed masked_lm experiment")
 
-            import torch
-            from transformers import AutoModelForMaskedLM, AutoTokenizer
-
-            model_path = Path(experiment.output_dir)
-            tokenizer = AutoTokenizer.from_pretrained(model_path)
-            model = AutoModelForMaskedLM.from_pretrained(model_path)
-            model.eval()
-
-            if tokenizer.mask_token is None or tokenizer.mask_token_id is None:
-                raise ValueError("Tokenizer has no mask_token; cannot run masked_lm_fill_mask")
-
-            prompt = benchmark.question.replace("[MASK]", tokenizer.mask_token).replace("<mask>", tokenizer.mask_token)
-            encoded = tokenizer(prompt, return_tensors="pt")
-            input_ids = encoded["input_ids"]
-
-            mask_positions = (input_ids == tokenizer.mask_token_id).nonzero(as_tuple=False)
-            if mask_positions.numel() == 0:
-                raise ValueError("No mask token found after normalization")
-            if mask_positions.shape[0] != 1:
-                raise ValueError("masked_lm_fill_mask supports exactly 1 mask token")
-
-            with torch.no_grad():
-                logits = model(**encoded).logits  # [B, T, V]
-            b, t = int(mask_positions[0][0]), int(mask_positions[0][1])
-            vocab_logits = logits[b, t, :]
-            topk = 10
-            top_ids = torch.topk(vocab_logits, k=topk).indices.tolist()
-            top_tokens = [tokenizer.decode([i]).strip() for i in top_ids]
+            golds = split_golds(benchmark.gold_answer)
+            with model_cache.lease("masked_lm", experiment.output_dir) as (model, tokenizer):
+                if tokenizer.mask_token is None or tokenizer.mask_token_id is None:
+                    raise ValueError("Tokenizer has no mask_token; cannot run masked_lm_fill_mask")
+                result = fill_mask(model, tokenizer, [benchmark.question], [golds], top_k=10)[0]
+            if result is None:
+                raise ValueError(
+                    f"Question needs one mask token per '{GOLD_SEPARATOR}'-separated gold answer ({len(golds)})"
+                )
 
-            gold = benchmark.gold_answer.strip()
-            top1 = top_tokens[0] if top_tokens else ""
-            top1_correct = 1.0 if top1 == gold else 0.0
-            top10_correct = 1.0 if gold in top_tokens else 0.0
+            top1 = " | ".join(p[0] for p in result.predictions)
+            top1_correct = sum(result.top1) / len(result.ranks)
+            top10_correct = sum(result.topk) / len(result.ranks)
 
             eval_result.model_answer = top1
             eval_result.bleu_score = 0.0
             eval_result.rouge_score = 0.0
             eval_result.primary_score = float(top1_correct)
             eval_result.metrics = {
-                "gold": gold,
+                "gold": benchmark.gold_answer.strip(),
                 "top1": top1,
-                "top10": top_tokens,
+                "top10": result.predictions[0] if len(result.predictions) == 1 else result.predictions,
                 "top1_correct": top1_correct,
                 "top10_correct": top10_correct,
             }
             eval_result.status = BenchmarkStatus.COMPLETED
 
+        elif benchmark.benchmark_type == BenchmarkType.MASKED_LM_FILL_MASK_SUITE:
+            if experiment.experiment_type != ExperimentType.MASKED_LM:
+                raise ValueError("masked_lm_fill_mask_suite benchmarks require a completed masked_lm experiment")
+
+            items = _load_suite_items(benchmark)
+            top_k = int((benchmark.spec or {}).get("top_k", 10))
+            with model_cache.lease("masked_lm", experiment.output_dir) as (model, tokenizer):
+                results = fill_mask(model, tokenizer, [q for q, _ in items], [split_golds(a) for _, a in items], top_k)
+            save_benchmark_eval_items(eval_id, _score_fill_mask_suite(eval_result, items, results, top_k))
+
         elif benchmark.benchmark_type == BenchmarkType.CUSTOM_LIGHTNING_SIN_REGRESSION:
             if experiment.experiment_type != ExperimentType.CUSTOM_LIGHTNING:
                 raise ValueError("custom_lightning_sin_regression benchmarks require a completed custom_lightning experiment")
@@ -367,26 +718,7 @@ def _run_benchmark_eval(
             payload_path = out_dir / f"benchmark_payload_{eval_id}.json"
             payload_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
-            proc = subprocess.Popen(
-                [sys.executable, "-m", "src.custom_lightning_sin_benchmark_runner", str(payload_path)],
-                cwd=str(Path(__file__).resolve().parents[2]),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-            stdout, stderr = proc.communicate(timeout=120)
-            if stdout:
-                (out_dir / f"benchmark_stdout_{eval_id}.txt").write_text(stdout, encoding="utf-8")
-            if stderr:
-                (out_dir / f"benchmark_stderr_{eval_id}.txt").write_text(stderr, encoding="utf-8")
-            if proc.returncode != 0:
-                raise ValueError(f"Benchmark runner failed (exit={proc.returncode})")
-
-            metrics_path = out_dir / "benchmark_metrics.json"
-            if not metrics_path.exists():
-                raise ValueError("Benchmark runner completed but benchmark_metrics.json is missing")
-
-            metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+            metrics = _run_lightning_job("sin", payload, out_dir, "benchmark", eval_id)
             mse = float(metrics["mse"])
 
             eval_result.model_answer = ""
@@ -434,26 +766,7 @@ def _run_benchmark_eval(
             payload_path = out_dir / f"benchmark_plugin_payload_{eval_id}.json"
             payload_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
-            proc = subprocess.Popen(
-                [sys.executable, "-m", "src.custom_lightning_plugin_benchmark_runner", str(payload_path)],
-                cwd=str(Path(__file__).resolve().parents[2]),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-            stdout, stderr = proc.communicate(timeout=120)
-            if stdout:
-                (out_dir / f"benchmark_plugin_stdout_{eval_id}.txt").write_text(stdout, encoding="utf-8")
-            if stderr:
-                (out_dir / f"benchmark_plugin_stderr_{eval_id}.txt").write_text(stderr, encoding="utf-8")
-            if proc.returncode != 0:
-                raise ValueError(f"Benchmark runner failed (exit={proc.returncode})")
-
-            metrics_path = out_dir / "benchmark_plugin_metrics.json"
-            if not metrics_path.exists():
-                raise ValueError("Benchmark runner completed but benchmark_plugin_metrics.json is missing")
-
-            metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+            metrics = _run_lightning_job("plugin", payload, out_dir, "benchmark_plugin", eval_id)
             if not isinstance(metrics, dict):
                 raise ValueError("benchmark_plugin_metrics.json must be a JSON object")
             if "primary_score" not in metrics:
@@ -485,13 +798,9 @@ def _run_benchmark_eval(
         save_benchmark_eval(eval_result)
 
 
-@router.post("/benchmarks/{benchmark_id}/evaluate", response_model=BenchmarkEvalStartResponse)
-def start_benchmark_evaluation(benchmark_id: str, request: BenchmarkEvalRequest) -> BenchmarkEvalStartResponse:
-    benchmark = get_benchmark(benchmark_id)
-    if not benchmark:
-        raise HTTPException(status_code=404, detail="Benchmark not found")
-
-    experiment = get_experiment(request.experiment_id)
+def _eval_target(experiment_id: str) -> ExperimentResult:
+    """The completed experiment ``experiment_id``; HTTPException when it cannot be evaluated."""
+    experiment = get_experiment(experiment_id)
     if not experiment:
         raise HTTPException(status_code=404, detail="Experiment not found")
     if experiment.status != ExperimentStatus.COMPLETED:
@@ -502,15 +811,27 @@ def start_benchmark_evaluation(benchmark_id: str, request: BenchmarkEvalRequest)
     model_path = Path(experiment.output_dir)
     if not model_path.exists():
         raise HTTPException(status_code=400, detail=f"Model path '{experiment.output_dir}' not found")
+    return experiment
 
+
+def _check_adaptive(benchmark: Benchmark, adaptive: AdaptiveRuns | None) -> None:
+    if adaptive is None:
+        return
+    if benchmark.benchmark_type != BenchmarkType.CAUSAL_LM_QA:
+        raise HTTPException(status_code=400, detail="adaptive runs are only supported for causal_lm_qa benchmarks")
+    if _ranks_by_semantic(benchmark):
+        raise HTTPException(status_code=400, detail="adaptive runs stop on ROUGE-L; not supported with semantic ranking")
+
+
+def _save_pending_eval(benchmark: Benchmark, experiment_id: str, num_runs: int) -> str:
     eval_id = str(uuid.uuid4())
     eval_result = BenchmarkEvalResult(
         id=eval_id,
-        benchmark_id=benchmark_id,
+        benchmark_id=benchmark.id,
         benchmark_name=benchmark.name,
         benchmark_type=benchmark.benchmark_type,
         higher_is_better=benchmark.higher_is_better,
-        experiment_id=request.experiment_id,
+        experiment_id=experiment_id,
         question=benchmark.question,
         gold_answer=benchmark.gold_answer,
         model_answer="",
@@ -518,14 +839,34 @@ def start_benchmark_evaluation(benchmark_id: str, request: BenchmarkEvalRequest)
         rouge_score=0.0,
         primary_score=0.0,
         metrics={},
-        num_runs=request.num_runs,
+        num_runs=num_runs,
         status=BenchmarkStatus.PENDING,
         started_at=now(),
     )
     save_benchmark_eval(eval_result)
+    return eval_id
 
-    thread = Thread(target=_run_benchmark_eval, args=(eval_id, benchmark, experiment, request.num_runs))
-    thread.start()
+
+@router.post("/benchmarks/{benchmark_id}/evaluate", response_model=BenchmarkEvalStartResponse)
+def start_benchmark_evaluation(benchmark_id: str, request: BenchmarkEvalRequest) -> BenchmarkEvalStartResponse:
+    benchmark = get_benchmark(benchmark_id)
+    if not benchmark:
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+
+    experiment = _eval_target(request.experiment_id)
+    _check_adaptive(benchmark, request.adaptive)
+    eval_id = _save_pending_eval(benchmark, request.experiment_id, request.num_runs)
+
+    # Queued on the shared eval worker so consecutive evals reuse warm models.
+    eval_worker.submit(
+        _run_benchmark_eval,
+        eval_id,
+        benchmark,
+        experiment,
+        request.num_runs,
+        request.adaptive,
+        request.use_generation_cache,
+    )
 
     return BenchmarkEvalStartResponse(
         eval_id=eval_id,
@@ -534,92 +875,380 @@ def start_benchmark_evaluation(benchmark_id: str, request: BenchmarkEvalRequest)
     )
 
 
+def _base_model_name(experiment: ExperimentResult) -> str:
+    """Pretrained model an experiment was fine-tuned from (its output dir when unknown)."""
+    model = getattr(experiment.config, "model", None)
+    return getattr(model, "pretrained_model_name", None) or experiment.output_dir or experiment.id
+
+
+def _by_base_model(experiments: list[ExperimentResult]) -> list[ExperimentResult]:
+    """Experiments regrouped so fine-tunes of the same base run back to back, in first-seen order."""
+    groups: dict[str, list[ExperimentResult]] = {}
+    for experiment in experiments:
+        groups.setdefault(_base_model_name(experiment), []).append(experiment)
+    return [experiment for group in groups.values() for experiment in group]
+
+
+def _shared_base(experiment: ExperimentResult) -> str | None:
+    if experiment.experiment_type != ExperimentType.CAUSAL_LM or not experiment.output_dir:
+        return None
+    try:
+        return lora_base_key(Path(experiment.output_dir))
+    except Exception:
+        return None
+
+
+def _bulk_jobs(
+    benchmark: Benchmark, experiments: list[ExperimentResult], adaptive: AdaptiveRuns | None
+) -> list[list[ExperimentResult]]:
+    """Experiments split into eval jobs: LoRA fine-tunes of one resident base share a job."""
+    if adaptive is not None or benchmark.benchmark_type not in {
+        BenchmarkType.CAUSAL_LM_QA,
+        BenchmarkType.CAUSAL_LM_QA_SUITE,
+    }:
+        return [[experiment] for experiment in experiments]
+    jobs: dict[str, list[ExperimentResult]] = {}
+    for experiment in experiments:
+        base = _shared_base(experiment)
+        jobs.setdefault(base or experiment.id, []).append(experiment)
+    return [
+        group[start : start + model_cache.max_adapters]
+        for group in jobs.values()
+        for start in range(0, len(group), model_cache.max_adapters)
+    ]
+
+
+def _run_bulk_eval(finished: queue.Queue, eval_id: str, *args) -> None:
+    try:
+        _run_benchmark_eval(eval_id, *args)
+    finally:
+        finished.put(eval_id)
+
+
+def _run_adapter_group_evals(
+    finished: queue.Queue,
+    eval_ids: list[str],
+    benchmark: Benchmark,
+    experiments: list[ExperimentResult],
+    num_runs: int,
+    use_cache: bool = True,
+) -> None:
+    """Evaluate a causal_lm benchmark against LoRA fine-tunes of one base in shared batches.
+
+    Every adapter is loaded onto the one resident base and each batch row
+    names its own adapter. Experiments with different tokenizers still share
+    the base but get their own generation calls. A failure fails the group.
+    """
+    results = []
+    try:
+        for eval_id in eval_ids:
+            eval_result = get_benchmark_eval(eval_id)
+            eval_result.status = BenchmarkStatus.RUNNING
+            eval_result.num_runs = _effective_runs(benchmark, num_runs)
+            save_benchmark_eval(eval_result)
+            results.append(eval_result)
+
+        suite = benchmark.benchmark_type == BenchmarkType.CAUSAL_LM_QA_SUITE
+        items = _load_suite_items(benchmark) if suite else []
+        requests = _suite_requests(benchmark, items, num_runs) if suite else _qa_requests(benchmark, num_runs)
+        paths = [Path(e.output_dir) for e in experiments]
+        model_keys = {adapter_name(path): _model_key(str(path)) for path in paths}
+        answers = None
+        if use_cache:
+            answers = cached_answers([replace(r, adapter=name) for name in model_keys for r in requests], model_keys)
+        if answers is not None:
+            per_experiment = len(answers) // len(paths)
+            chunks = [answers[i : i + per_experiment] for i in range(0, len(answers), per_experiment)]
+            logger.info(f"Served {len(answers)} generations for {len(paths)} adapters from the generation cache")
+        else:
+            with model_cache.lease_adapters(paths) as (model, adapters):
+                tokenizer = adapters[0][1]
+                if all(t.get_vocab() == tokenizer.get_vocab() for _, t in adapters[1:]):
+                    generator = _generator(model, tokenizer, model_keys, use_cache)
+                    answers = generator.generate([replace(r, adapter=name) for name, _ in adapters for r in requests])
+                    per_experiment = len(answers) // len(adapters)
+                    chunks = [answers[i : i + per_experiment] for i in range(0, len(answers), per_experiment)]
+                    logger.info(
+                        f"Served {len(answers)} generations for {len(adapters)} adapters in "
+                        f"{generator.stats['batches']} batches ({generator.stats['cached_answers']} cached, "
+                        f"{generator.stats['seconds']:.1f}s)"
+                    )
+                else:
+                    chunks = [
+                        _generator(model, t, model_keys, use_cache).generate([replace(r, adapter=name) for r in requests])
+                        for name, t in adapters
+                    ]
+        golds = _suite_golds(items, results[0].num_runs) if suite else [benchmark.gold_answer] * len(chunks[0])
+        # One encoder pass for the whole group; the gold embeddings come from the cache.
+        semantic = _semantic_scores(
+            [a for answers in chunks for a in answers], golds * len(chunks), _ranks_by_semantic(benchmark)
+        )
+        for index, (eval_result, answers) in enumerate(zip(results, chunks)):
+            wave = None if semantic is None else semantic[index * len(golds) : (index + 1) * len(golds)]
+            if suite:
+                save_benchmark_eval_items(
+                    eval_result.id,
+                    _score_causal_lm_qa_suite(eval_result, benchmark, items, answers, eval_result.num_runs, wave),
+                )
+            else:
+                _score_causal_lm_qa(eval_result, benchmark, answers, wave)
+    except Exception as e:
+        loaded = {eval_result.id for eval_result in results}
+        results += [r for r in (get_benchmark_eval(i) for i in eval_ids if i not in loaded) if r is not None]
+        for eval_result in results:
+            if eval_result.status != BenchmarkStatus.COMPLETED:
+                eval_result.status = BenchmarkStatus.FAILED
+                eval_result.error = str(e)
+    finally:
+        # Every id is reported, even one whose eval never loaded, so the stream never waits on it.
+        try:
+            for eval_result in results:
+                eval_result.completed_at = now()
+                save_benchmark_eval(eval_result)
+        finally:
+            for eval_id in eval_ids:
+                finished.put(eval_id)
+
+
+# Seconds the bulk stream waits for the next eval to finish before giving up on the rest.
+BULK_RESULT_TIMEOUT = float(os.environ.get("BULK_EVAL_RESULT_TIMEOUT", "3600"))
+
+
+def _ndjson(event: dict) -> str:
+    return json.dumps(event, default=str) + "\n"
+
+
+@router.post("/benchmarks/{benchmark_id}/evaluate/bulk")
+def start_bulk_benchmark_evaluation(benchmark_id: str, request: BulkBenchmarkEvalRequest) -> StreamingResponse:
+    """Evaluate one benchmark against many experiments; streams NDJSON as evals finish.
+
+    Evals are queued on the shared eval worker, so at most ``EVAL_WORKERS``
+    models are loaded at once however many experiments are listed. Fine-tunes
+    of the same base model are queued next to each other; for causal_lm QA
+    benchmarks, LoRA fine-tunes of one base run as a single job whose batches
+    mix their adapters over the resident base. The stream opens
+    with a ``started`` event listing the eval ids and any rejected
+    experiments, sends one ``result`` event per eval in completion order, and
+    ends with ``done``. If no eval finishes for ``BULK_EVAL_RESULT_TIMEOUT``
+    seconds, a ``failed`` event names the evals still pending and the stream
+    ends. Evals keep running if the client disconnects.
+    """
+    benchmark = get_benchmark(benchmark_id)
+    if not benchmark:
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+    _check_adaptive(benchmark, request.adaptive)
+
+    experiments: list[ExperimentResult] = []
+    rejected: list[dict[str, str]] = []
+    for experiment_id in dict.fromkeys(request.experiment_ids):
+        try:
+            experiments.append(_eval_target(experiment_id))
+        except HTTPException as e:
+            rejected.append({"experiment_id": experiment_id, "detail": e.detail})
+    if not experiments:
+        raise HTTPException(status_code=400, detail=f"No experiment can be evaluated: {rejected}")
+
+    finished: queue.Queue[str] = queue.Queue()
+    started = []
+    for job in _bulk_jobs(benchmark, _by_base_model(experiments), request.adaptive):
+        eval_ids = [_save_pending_eval(benchmark, experiment.id, request.num_runs) for experiment in job]
+        started.extend({"eval_id": e, "experiment_id": x.id} for e, x in zip(eval_ids, job))
+        if len(job) > 1:
+            eval_worker.submit(
+                _run_adapter_group_evals,
+                finished,
+                eval_ids,
+                benchmark,
+                job,
+                request.num_runs,
+                request.use_generation_cache,
+            )
+        else:
+            eval_worker.submit(
+                _run_bulk_eval,
+                finished,
+                eval_ids[0],
+                benchmark,
+                job[0],
+                request.num_runs,
+                request.adaptive,
+                request.use_generation_cache,
+            )
+
+    def events() -> Iterator[str]:
+        yield _ndjson({"event": "started", "benchmark_id": benchmark_id, "evals": started, "rejected": rejected})
+        counts = {BenchmarkStatus.COMPLETED: 0, BenchmarkStatus.FAILED: 0}
+        pending = {e["eval_id"] for e in started}
+        while pending:
+            try:
+                eval_id = finished.get(timeout=BULK_RESULT_TIMEOUT)
+            except queue.Empty:
+                counts[BenchmarkStatus.FAILED] += len(pending)
+                yield _ndjson(
+                    {
+                        "event": "failed",
+                        "eval_ids": sorted(pending),
+                        "detail": f"No eval finished within {BULK_RESULT_TIMEOUT:g}s",
+                    }
+                )
+                break
+            pending.discard(eval_id)
+            eval_result = get_benchmark_eval(eval_id)
+            if eval_result is None:
+                counts[BenchmarkStatus.FAILED] += 1
+                yield _ndjson({"event": "failed", "eval_ids": [eval_id], "detail": "Evaluation not found"})
+                continue
+            counts[eval_result.status] = counts.get(eval_result.status, 0) + 1
+            yield _ndjson({"event": "result", "evaluation": eval_result.model_dump(mode="json")})
+        yield _ndjson(
+            {
+                "event": "done",
+                "completed": counts[BenchmarkStatus.COMPLETED],
+                "failed": counts[BenchmarkStatus.FAILED],
+            }
+        )
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("/benchmarks/{benchmark_id}/evaluations", response_model=BenchmarkEvalListResponse)
 def list_benchmark_evaluations(benchmark_id: str) -> BenchmarkEvalListResponse:
     benchmark = get_benchmark(benchmark_id)
     if not benchmark:
         raise HTTPException(status_code=404, detail="Benchmark not found")
-    return BenchmarkEvalListResponse(evaluations=_apply_eval_ranks(list_benchmark_evals_by_benchmark(benchmark_id)))
+    return BenchmarkEvalListResponse(evaluations=list_benchmark_evals_by_benchmark(benchmark_id))
+
+
+@router.get("/benchmarks/{benchmark_id}/leaderboard", response_model=BenchmarkEvalListResponse)
+def get_benchmark_leaderboard(benchmark_id: str) -> BenchmarkEvalListResponse:
+    """Completed evals of the benchmark, best first."""
+    if not get_benchmark(benchmark_id):
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+    return BenchmarkEvalListResponse(evaluations=list_leaderboard(benchmark_id))
+
+
+# Per-run (causal_lm_qa) or per-item (suite) scores each significance metric reads.
+_RUN_METRICS = {"rouge_l": "rouge_score", "bleu": "bleu_score", "semantic": "semantic_score"}
+_ITEM_METRICS = {
+    BenchmarkType.CAUSAL_LM_QA_SUITE: ("rouge_l", "bleu", "semantic"),
+    BenchmarkType.MASKED_LM_FILL_MASK_SUITE: ("top1_accuracy", "topk_accuracy"),
+}
+
+
+def _significance_samples(
+    benchmark: Benchmark, evals: list[BenchmarkEvalResult], metric: str
+) -> list[dict[int, float]]:
+    """Score of each eval on each run number or suite item; empty when the eval has none for ``metric``."""
+    if benchmark.benchmark_type == BenchmarkType.CAUSAL_LM_QA:
+        field = _RUN_METRICS[metric]
+        return [
+            {r.run_number: getattr(r, field) for r in e.run_scores if getattr(r, field) is not None} for e in evals
+        ]
+    items = list_benchmark_eval_items_by_eval([e.id for e in evals])
+    samples = []
+    for e in evals:
+        scores = {}
+        for item in items[e.id]:
+            value = {"rouge_l": item.rouge_score, "bleu": item.bleu_score}.get(metric, item.metrics.get(metric))
+            if value is not None:
+                scores[item.index] = float(value)
+        samples.append(scores)
+    return samples
+
+
+@router.get("/benchmarks/{benchmark_id}/significance", response_model=SignificanceResponse)
+def get_benchmark_significance(
+    benchmark_id: str,
+    metric: str | None = None,
+    confidence: float = 0.95,
+    power: float = 0.8,
+    resamples: int = 2000,
+    max_extra: int = 10_000,
+) -> SignificanceResponse:
+    """Bootstrap intervals and pairwise significance for all completed evals of a benchmark.
+
+    The sampling unit is a run for causal_lm_qa and a question/sentence for
+    suites. ``extra_samples`` on a pair says how many more runs (or items)
+    each side needs before the observed difference would be significant,
+    so re-runs can go to the pairs that are still undecided.
+    """
+    benchmark = get_benchmark(benchmark_id)
+    if not benchmark:
+        raise HTTPException(status_code=404, detail="Benchmark not found")
+    if benchmark.benchmark_type == BenchmarkType.CAUSAL_LM_QA:
+        metrics, unit = tuple(_RUN_METRICS), "run"
+    elif benchmark.benchmark_type in _ITEM_METRICS:
+        metrics, unit = _ITEM_METRICS[benchmark.benchmark_type], "item"
+    else:
+        raise HTTPException(
+            status_code=400, detail=f"{benchmark.benchmark_type.value} evals have no per-run or per-item scores"
+        )
+    if metric is None:
+        metric = (benchmark.spec or {}).get("primary_metric") or metrics[0]
+    if metric not in metrics:
+        raise HTTPException(status_code=400, detail=f"metric must be one of {list(metrics)}")
+    if not 0 < confidence < 1 or not 0 < power < 1:
+        raise HTTPException(status_code=400, detail="confidence and power must be between 0 and 1")
+    if not 100 <= resamples <= 100_000:
+        raise HTTPException(status_code=400, detail="resamples must be between 100 and 100000")
+
+    evals = list_leaderboard(benchmark_id)
+    samples = _significance_samples(benchmark, evals, metric)
+    skipped = [e.id for e, s in zip(evals, samples) if not s]
+    evals, samples = [e for e, s in zip(evals, samples) if s], [s for s in samples if s]
+    if len(evals) < 2:
+        raise HTTPException(status_code=400, detail=f"Need at least two completed evals with {metric} scores")
+
+    result = pairwise_significance(samples, confidence, resamples, power, max_extra)
+    estimates = [
+        SignificanceEstimate(eval_id=e.id, experiment_id=e.experiment_id, rank=e.rank, **estimate)
+        for e, estimate in zip(evals, result["estimates"])
+    ]
+    pairs = []
+    for pair in result["pairs"]:
+        a, b = evals[pair.pop("a")], evals[pair.pop("b")]
+        better = None
+        if pair["significant"]:
+            better = a.id if (pair["diff"] > 0) == benchmark.higher_is_better else b.id
+        pairs.append(SignificancePair(eval_a=a.id, eval_b=b.id, better_eval_id=better, **pair))
+    return SignificanceResponse(
+        benchmark_id=benchmark_id,
+        metric=metric,
+        unit=unit,
+        confidence=confidence,
+        power=power,
+        resamples=resamples,
+        estimates=estimates,
+        pairs=pairs,
+        skipped_eval_ids=skipped,
+    )
 
 
 @router.get("/evaluations/by-benchmark/{benchmark_id}", response_model=BenchmarkEvalListResponse)
 def list_evaluations_by_benchmark(benchmark_id: str) -> BenchmarkEvalListResponse:
     """Legacy alias used by the Flask UI."""
-    return BenchmarkEvalListResponse(evaluations=_apply_eval_ranks(list_benchmark_evals_by_benchmark(benchmark_id)))
+    return BenchmarkEvalListResponse(evaluations=list_benchmark_evals_by_benchmark(benchmark_id))
 
 
 @router.get("/evaluations", response_model=BenchmarkEvalListResponse)
 def list_all_evaluations() -> BenchmarkEvalListResponse:
-    return BenchmarkEvalListResponse(evaluations=_apply_eval_ranks(list_benchmark_evals()))
+    return BenchmarkEvalListResponse(evaluations=list_benchmark_evals())
 
 
 @router.get("/evaluations/compare", response_model=EvaluationComparisonResponse)
 def compare_evaluations() -> EvaluationComparisonResponse:
-    evals = list_benchmark_evals()
-    items = []
-    for ev in evals:
-        if ev.status != BenchmarkStatus.COMPLETED:
-            continue
-        exp = get_experiment(ev.experiment_id)
-        if not exp:
-            continue
-        cfg = exp.config
-        model_name = "unknown"
-        learning_rate = None
-        num_epochs = None
-        batch_size = None
-        lora_r = None
-        lora_alpha = None
-
-        if exp.experiment_type == ExperimentType.CAUSAL_LM and cfg is not None:
-            model_name = cfg.model.pretrained_model_name
-            learning_rate = cfg.training.learning_rate
-            num_epochs = cfg.training.num_train_epochs
-            batch_size = cfg.training.per_device_train_batch_size
-            if hasattr(cfg, "peft") and cfg.peft and cfg.peft.enabled:
-                lora_r = cfg.peft.r
-                lora_alpha = cfg.peft.lora_alpha
-        elif exp.experiment_type == ExperimentType.MASKED_LM and cfg is not None:
-            model_name = cfg.model.pretrained_model_name
-            learning_rate = cfg.training.learning_rate
-            num_epochs = cfg.training.num_train_epochs
-            batch_size = cfg.training.per_device_train_batch_size
-        elif exp.experiment_type == ExperimentType.CUSTOM_LIGHTNING:
-            model_name = exp.lightning_module_class_name or "custom_lightning"
-            if cfg is not None and isinstance(getattr(cfg, "cfg", None), dict):
-                user_cfg = cfg.cfg
-                if "lr" in user_cfg:
-                    learning_rate = float(user_cfg["lr"])
-                if "batch_size" in user_cfg:
-                    batch_size = int(user_cfg["batch_size"])
-        items.append(
-            EvaluationComparisonItem(
-                eval_id=ev.id,
-                experiment_id=ev.experiment_id,
-                benchmark_name=ev.benchmark_name,
-                benchmark_type=ev.benchmark_type,
-                question=ev.question,
-                model_name=model_name,
-                dataset_filename=exp.dataset_filename or "unknown",
-                bleu_score=ev.bleu_score,
-                rouge_score=ev.rouge_score,
-                primary_score=float(ev.primary_score or 0.0),
-                learning_rate=learning_rate,
-                num_epochs=num_epochs,
-                batch_size=batch_size,
-                lora_r=lora_r,
-                lora_alpha=lora_alpha,
-                started_at=ev.started_at,
-                completed_at=ev.completed_at,
-            )
-        )
-    def _sort_key(item: EvaluationComparisonItem):
-        if item.benchmark_type == BenchmarkType.CUSTOM_LIGHTNING_SIN_REGRESSION:
-            return (0, float(item.primary_score or 0.0))
-        return (1, -float(item.rouge_score or 0.0))
+    """Completed evals with their experiments' settings, read from the materialized leaderboard."""
+    return EvaluationComparisonResponse(evaluations=list_evaluation_comparisons())
 
-    items.sort(key=_sort_key)
-    return EvaluationComparisonResponse(evaluations=items)
+
+@router.get("/evaluations/{eval_id}/items", response_model=BenchmarkEvalItemListResponse)
+def list_evaluation_items(eval_id: str, offset: int = 0, limit: int = 100) -> BenchmarkEvalItemListResponse:
+    if not get_benchmark_eval(eval_id):
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+    return BenchmarkEvalItemListResponse(
+        items=list_benchmark_eval_items(eval_id, offset=offset, limit=limit),
+        total=count_benchmark_eval_items(eval_id),
+    )
 
 
 @router.get("/evaluations/{eval_id}", response_model=BenchmarkEvalResult)
@@ -637,9 +1266,77 @@ def delete_evaluation(eval_id: str) -> dict[str, str]:
     return {"status": "deleted", "eval_id": eval_id}
 
 
+def _run_causal_lm_qa_evals_batched(
+    items: list[tuple[str, Benchmark]],
+    experiment: ExperimentResult,
+    num_runs: int = 1,
+) -> None:
+    """Evaluate several causal_lm_qa benchmarks against one experiment.
+
+    The model is loaded once and every run of every benchmark is served by a
+    single batched generation call.
+    """
+    results: list[tuple[BenchmarkEvalResult, Benchmark]] = []
+    for eval_id, benchmark in items:
+        eval_result = get_benchmark_eval(eval_id)
+        eval_result.status = BenchmarkStatus.RUNNING
+        eval_result.num_runs = _effective_runs(benchmark, num_runs)
+        save_benchmark_eval(eval_result)
+        results.append((eval_result, benchmark))
+
+    try:
+        if experiment.experiment_type != ExperimentType.CAUSAL_LM:
+            raise ValueError("causal_lm_qa benchmarks require a completed causal_lm experiment")
+        requests = [req for _, benchmark in results for req in _qa_requests(benchmark, num_runs)]
+        answers = _generate_answers(experiment, requests, use_cache=True)
+        golds = [benchmark.gold_answer for eval_result, benchmark in results for _ in range(eval_result.num_runs)]
+        semantic = _semantic_scores(answers, golds, required=False)
+        offset = 0
+        for eval_result, benchmark in results:
+            runs = slice(offset, offset + eval_result.num_runs)
+            offset += eval_result.num_runs
+            # A benchmark ranked by a broken encoder fails alone, not the whole batch.
+            try:
+                _score_causal_lm_qa(eval_result, benchmark, answers[runs], None if semantic is None else semantic[runs])
+            except Exception as e:
+                eval_result.status = BenchmarkStatus.FAILED
+                eval_result.error = str(e)
+    except Exception as e:
+        for eval_result, _ in results:
+            if eval_result.status != BenchmarkStatus.COMPLETED:
+                eval_result.status = BenchmarkStatus.FAILED
+                eval_result.error = str(e)
+    finally:
+        for eval_result, _ in results:
+            eval_result.completed_at = now()
+            save_benchmark_eval(eval_result)
+
+
 # Exported for use in experiment_routes and autotune_routes
 def _run_benchmark_eval_sync(eval_id: str, benchmark: Benchmark, experiment: ExperimentResult) -> None:
     """Run benchmark evaluation synchronously."""
     logger.info(f"Benchmark eval {eval_id}: Starting evaluation for experiment {experiment.id}")
     _run_benchmark_eval(eval_id=eval_id, benchmark=benchmark, experiment=experiment, num_runs=1)
 
+
+@router.get("/model-cache")
+def get_model_cache() -> dict:
+    """Models kept warm for evaluation, and evals still queued behind the worker."""
+    return {
+        **model_cache.stats(),
+        "queued_evals": eval_worker.pending(),
+        "lightning_workers": lightning_benchmark_pool.stats(),
+        "semantic_encoder": semantic_scorer.stats(),
+        "generation_cache": generation_cache.stats(),
+    }
+
+
+@router.delete("/model-cache")
+def clear_model_cache() -> dict[str, int]:
+    return {"evicted": model_cache.clear()}
+
+
+@router.delete("/generation-cache")
+def clear_generation_cache() -> dict[str, int]:
+    """Drop every cached generation, e.g. after changing how prompts are built."""
+    return {"deleted": generation_cache.clear()}
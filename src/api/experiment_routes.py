@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import os
 import subprocess
 import sys
 import time
@@ -10,10 +11,15 @@ import uuid
 from pathlib import Path
 from threading import Thread
 
+import pandas as pd
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from transformers.trainer import OPTIMIZER_NAME
+from transformers.trainer_utils import get_last_checkpoint
 
 from ..callbacks import stop_registry, progress_registry
 from ..config import DataConfig, ExperimentConfig, ModelConfig, TrainingConfig
+from ..cpu_policy import runner_slots
 from ..llm_config import (
     LLMDataConfig,
     LLMExperimentConfig,
@@ -22,7 +28,9 @@ from ..llm_config import (
     LLMTrainingConfig,
 )
 from ..llm_training import run_llm_training
+from ..model_cache import model_cache
 from ..models import (
+    Benchmark,
     BenchmarkEvalResult,
     BenchmarkStatus,
     BenchmarkType,
@@ -40,7 +48,10 @@ from ..models import (
     MaskedLMFullConfig,
     MaskedLMRequest,
     PluginKind,
+    ThroughputComparisonItem,
+    ThroughputComparisonResponse,
 )
+from ..profiling import PROFILER_DIRNAME, load_profile_summary
 from ..remote_runner import run_experiment_remote
 from ..ssh_client import SSHClient
 from ..storage import (
@@ -48,26 +59,28 @@ from ..storage import (
     get_config,
     get_dataset,
     get_experiment,
+    get_experiments,
     list_experiments,
     delete_experiment as storage_delete_experiment,
-    list_benchmark_evals,
     list_benchmarks,
+    list_completed_evals_by_experiment,
     save_benchmark_eval,
     save_config,
     save_experiment,
     config_name_exists,
     get_plugin,
 )
+from ..telemetry import load_telemetry
 from ..training import run_training
+from ..viz import loss_curve
 from .helpers import ARTIFACTS_DIR, generate_friendly_name, now
-from .benchmark_routes import _run_benchmark_eval_sync
+from .benchmark_routes import _run_benchmark_eval_sync, _run_causal_lm_qa_evals_batched
 
 router = APIRouter(tags=["experiments"])
 
 
 def _run_all_benchmarks_for_experiment(experiment_id: str) -> None:
-    """Run all available benchmarks for a completed experiment, serially."""
-    from ..models import Benchmark
+    """Run all available benchmarks for a completed experiment."""
     from ..storage import get_benchmark
     
     benchmarks = list_benchmarks()
@@ -79,9 +92,17 @@ def _run_all_benchmarks_for_experiment(experiment_id: str) -> None:
         return
 
     if experiment.experiment_type == ExperimentType.CAUSAL_LM:
-        benchmarks = [b for b in benchmarks if b.benchmark_type == BenchmarkType.CAUSAL_LM_QA]
+        benchmarks = [
+            b
+            for b in benchmarks
+            if b.benchmark_type in {BenchmarkType.CAUSAL_LM_QA, BenchmarkType.CAUSAL_LM_QA_SUITE}
+        ]
     elif experiment.experiment_type == ExperimentType.MASKED_LM:
-        benchmarks = [b for b in benchmarks if b.benchmark_type == BenchmarkType.MASKED_LM_FILL_MASK]
+        benchmarks = [
+            b
+            for b in benchmarks
+            if b.benchmark_type in {BenchmarkType.MASKED_LM_FILL_MASK, BenchmarkType.MASKED_LM_FILL_MASK_SUITE}
+        ]
     elif experiment.experiment_type == ExperimentType.CUSTOM_LIGHTNING:
         benchmarks = [
             b
@@ -100,32 +121,27 @@ def _run_all_benchmarks_for_experiment(experiment_id: str) -> None:
     experiment.auto_eval_current = benchmarks[0].name if benchmarks else None
     save_experiment(experiment)
     
-    for i, benchmark in enumerate(benchmarks):
+    sequential = benchmarks
+    if experiment.experiment_type == ExperimentType.CAUSAL_LM:
+        single = [b for b in benchmarks if b.benchmark_type == BenchmarkType.CAUSAL_LM_QA]
+        sequential = [b for b in benchmarks if b.benchmark_type != BenchmarkType.CAUSAL_LM_QA]
+        if single:
+            # One model load; every run of every single-question benchmark shares batched generation.
+            experiment.auto_eval_current = f"{len(single)} benchmarks (batched)"
+            save_experiment(experiment)
+            items = [(_create_pending_eval(experiment_id, benchmark), benchmark) for benchmark in single]
+            _run_causal_lm_qa_evals_batched(items, experiment)
+            experiment.auto_eval_completed = len(single)
+            save_experiment(experiment)
+
+    for benchmark in sequential:
         experiment.auto_eval_current = benchmark.name
         save_experiment(experiment)
-        
-        eval_id = str(uuid.uuid4())
-        eval_result = BenchmarkEvalResult(
-            id=eval_id,
-            benchmark_id=benchmark.id,
-            benchmark_name=benchmark.name,
-            benchmark_type=benchmark.benchmark_type,
-            experiment_id=experiment_id,
-            question=benchmark.question,
-            gold_answer=benchmark.gold_answer,
-            model_answer="",
-            bleu_score=0.0,
-            rouge_score=0.0,
-            primary_score=0.0,
-            metrics={},
-            status=BenchmarkStatus.PENDING,
-            started_at=now(),
-        )
-        save_benchmark_eval(eval_result)
-        
+
+        eval_id = _create_pending_eval(experiment_id, benchmark)
         _run_benchmark_eval_sync(eval_id, benchmark, experiment)
-        
-        experiment.auto_eval_completed = i + 1
+
+        experiment.auto_eval_completed += 1
         save_experiment(experiment)
     
     experiment.status = ExperimentStatus.COMPLETED
@@ -133,10 +149,34 @@ def _run_all_benchmarks_for_experiment(experiment_id: str) -> None:
     save_experiment(experiment)
 
 
+def _create_pending_eval(experiment_id: str, benchmark: Benchmark) -> str:
+    eval_id = str(uuid.uuid4())
+    eval_result = BenchmarkEvalResult(
+        id=eval_id,
+        benchmark_id=benchmark.id,
+        benchmark_name=benchmark.name,
+        benchmark_type=benchmark.benchmark_type,
+        experiment_id=experiment_id,
+        question=benchmark.question,
+        gold_answer=benchmark.gold_answer,
+        model_answer="",
+        bleu_score=0.0,
+        rouge_score=0.0,
+        primary_score=0.0,
+        metrics={},
+        status=BenchmarkStatus.PENDING,
+        started_at=now(),
+    )
+    save_benchmark_eval(eval_result)
+    return eval_id
+
+
 def _run_masked_lm_experiment(experiment_id: str, request: MaskedLMRequest, config_id: str) -> None:
     exp = get_experiment(experiment_id)
     output_dir = ARTIFACTS_DIR / f"masked_lm_{experiment_id}"
-    exp.status = ExperimentStatus.RUNNING
+    # Local runs stay pending until _start_local_runner gets them a CPU runner slot.
+    if request.compute_target_id:
+        exp.status = ExperimentStatus.RUNNING
     exp.output_dir = str(output_dir)
     save_experiment(exp)
 
@@ -177,6 +217,12 @@ def _run_masked_lm_experiment(experiment_id: str, request: MaskedLMRequest, conf
                 "early_stopping_patience": cfg.training.early_stopping_patience,
                 "early_stopping_metric": cfg.training.early_stopping_metric,
                 "early_stopping_greater_is_better": cfg.training.early_stopping_greater_is_better,
+                "auto_batch_size": cfg.training.auto_batch_size,
+                "memory_budget_mb": cfg.training.memory_budget_mb,
+                "allow_effective_batch_change": cfg.training.allow_effective_batch_change,
+                "profile": cfg.training.profile,
+                "profile_steps": cfg.training.profile_steps,
+                "async_checkpoint": cfg.training.async_checkpoint,
             },
         },
         "dataset": {
@@ -230,19 +276,12 @@ def _run_masked_lm_experiment(experiment_id: str, request: MaskedLMRequest, conf
 
     # Local execution via subprocess
     output_dir.mkdir(parents=True, exist_ok=True)
-    payload_path = output_dir / "runner_payload.json"
-    payload_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-
-    proc = subprocess.Popen(
-        [sys.executable, "-m", "src.masked_lm_runner", str(payload_path)],
-        cwd=str(_repo_root()),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-
     stopped = False
     try:
+        proc = _start_local_runner(exp, "src.masked_lm_runner", payload, output_dir)
+        if proc is None:
+            exp.status = ExperimentStatus.STOPPED
+            return
         while proc.poll() is None:
             if stop_registry.get(experiment_id):
                 stopped = True
@@ -276,6 +315,7 @@ def _run_masked_lm_experiment(experiment_id: str, request: MaskedLMRequest, conf
     finally:
         exp.completed_at = now()
         stop_registry.pop(experiment_id, None)
+        runner_slots.release(experiment_id)
         save_experiment(exp)
 
     if auto_evaluate and exp.status == ExperimentStatus.COMPLETED:
@@ -285,7 +325,9 @@ def _run_masked_lm_experiment(experiment_id: str, request: MaskedLMRequest, conf
 def _run_causal_lm_experiment(experiment_id: str, request: CausalLMRequest, config_id: str) -> None:
     exp = get_experiment(experiment_id)
     output_dir = ARTIFACTS_DIR / f"causal_lm_{experiment_id}"
-    exp.status = ExperimentStatus.RUNNING
+    # Local runs stay pending until _start_local_runner gets them a CPU runner slot.
+    if request.compute_target_id:
+        exp.status = ExperimentStatus.RUNNING
     exp.output_dir = str(output_dir)
     save_experiment(exp)
 
@@ -343,6 +385,14 @@ def _run_causal_lm_experiment(experiment_id: str, request: CausalLMRequest, conf
                 "early_stopping_patience": cfg.training.early_stopping_patience,
                 "early_stopping_metric": cfg.training.early_stopping_metric,
                 "early_stopping_greater_is_better": cfg.training.early_stopping_greater_is_better,
+                "auto_batch_size": cfg.training.auto_batch_size,
+                "memory_budget_mb": cfg.training.memory_budget_mb,
+                "allow_effective_batch_change": cfg.training.allow_effective_batch_change,
+                "profile": cfg.training.profile,
+                "profile_steps": cfg.training.profile_steps,
+                "async_checkpoint": cfg.training.async_checkpoint,
+                "checkpoint_mode": cfg.training.checkpoint_mode,
+                "prune_checkpoints": cfg.training.prune_checkpoints,
             },
         },
         "dataset": {
@@ -397,19 +447,12 @@ def _run_causal_lm_experiment(experiment_id: str, request: CausalLMRequest, conf
 
     # Local execution via subprocess
     output_dir.mkdir(parents=True, exist_ok=True)
-    payload_path = output_dir / "runner_payload.json"
-    payload_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-
-    proc = subprocess.Popen(
-        [sys.executable, "-m", "src.causal_lm_runner", str(payload_path)],
-        cwd=str(_repo_root()),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-
     stopped = False
     try:
+        proc = _start_local_runner(exp, "src.causal_lm_runner", payload, output_dir)
+        if proc is None:
+            exp.status = ExperimentStatus.STOPPED
+            return
         while proc.poll() is None:
             if stop_registry.get(experiment_id):
                 stopped = True
@@ -443,6 +486,7 @@ def _run_causal_lm_experiment(experiment_id: str, request: CausalLMRequest, conf
     finally:
         exp.completed_at = now()
         stop_registry.pop(experiment_id, None)
+        runner_slots.release(experiment_id)
         save_experiment(exp)
 
     if auto_evaluate and exp.status == ExperimentStatus.COMPLETED:
@@ -454,6 +498,34 @@ def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
+def _start_local_runner(
+    exp: ExperimentResult, module: str, payload: dict, output_dir: Path
+) -> subprocess.Popen | None:
+    """Take a CPU runner slot, write the payload with its budget and launch ``module`` on it.
+
+    The experiment stays PENDING while every slot is taken and turns RUNNING
+    once it gets one; ``None`` means it was stopped while queued. Callers run
+    this inside the ``try`` whose ``finally`` releases the slot, so a failed
+    write or launch never keeps it.
+    """
+    cpu_policy = runner_slots.acquire(exp.id, cancelled=lambda: bool(stop_registry.get(exp.id)))
+    if cpu_policy is None:
+        return None
+    exp.status = ExperimentStatus.RUNNING
+    save_experiment(exp)
+    payload["cpu"] = cpu_policy.to_payload()
+    payload_path = output_dir / "runner_payload.json"
+    payload_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return subprocess.Popen(
+        [sys.executable, "-m", module, str(payload_path)],
+        cwd=str(_repo_root()),
+        env={**os.environ, **cpu_policy.env()},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+
 def _run_custom_lightning_experiment(
     experiment_id: str,
     request: CustomLightningRequest,
@@ -461,7 +533,9 @@ def _run_custom_lightning_experiment(
 ) -> None:
     exp = get_experiment(experiment_id)
     output_dir = ARTIFACTS_DIR / f"custom_lightning_{experiment_id}"
-    exp.status = ExperimentStatus.RUNNING
+    # Local runs stay pending until _start_local_runner gets them a CPU runner slot.
+    if request.compute_target_id:
+        exp.status = ExperimentStatus.RUNNING
     exp.output_dir = str(output_dir)
     save_experiment(exp)
 
@@ -590,19 +664,12 @@ def _run_custom_lightning_experiment(
 
     # Local execution
     output_dir.mkdir(parents=True, exist_ok=True)
-    payload_path = output_dir / "runner_payload.json"
-    payload_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-
-    proc = subprocess.Popen(
-        [sys.executable, "-m", "src.custom_lightning_runner", str(payload_path)],
-        cwd=str(_repo_root()),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-
     stopped = False
     try:
+        proc = _start_local_runner(exp, "src.custom_lightning_runner", payload, output_dir)
+        if proc is None:
+            exp.status = ExperimentStatus.STOPPED
+            return
         while proc.poll() is None:
             if stop_registry.get(experiment_id):
                 stopped = True
@@ -645,6 +712,7 @@ def _run_custom_lightning_experiment(
     finally:
         exp.completed_at = now()
         stop_registry.pop(experiment_id, None)
+        runner_slots.release(experiment_id)
         save_experiment(exp)
 
 
@@ -988,27 +1056,30 @@ def get_experiment_logs(experiment_id: str) -> dict:
             return {"logs": _parse_training_logs_from_text(exp.logs)}
         return {"logs": []}
 
-    output_path = Path(exp.output_dir)
+    logs = _local_training_logs(Path(exp.output_dir))
+    if logs is not None:
+        return {"logs": logs}
+
+    # Remote fallback: during remote runs we may not have downloaded artifacts yet
+    if exp.compute_target_id and exp.logs:
+        return {"logs": _parse_training_logs_from_text(exp.logs)}
+
+    return {"logs": []}
+
 
+def _local_training_logs(output_path: Path) -> list[dict] | None:
+    """Log history from the incrementally written training_logs.json, else the newest checkpoint state."""
     logs_path = output_path / "training_logs.json"
     if logs_path.exists():
-        import json
         with logs_path.open() as f:
-            return {"logs": json.load(f)}
+            return json.load(f)
 
     for checkpoint_dir in sorted(output_path.glob("checkpoint-*"), reverse=True):
         state_path = checkpoint_dir / "trainer_state.json"
         if state_path.exists():
-            import json
             with state_path.open() as f:
-                state = json.load(f)
-                return {"logs": state.get("log_history", [])}
-
-    # Remote fallback: during remote runs we may not have downloaded artifacts yet
-    if exp.compute_target_id and exp.logs:
-        return {"logs": _parse_training_logs_from_text(exp.logs)}
-
-    return {"logs": []}
+                return json.load(f).get("log_history", [])
+    return None
 
 
 def _parse_training_logs_from_text(text: str) -> list[dict]:
@@ -1074,16 +1145,123 @@ def delete_experiment(experiment_id: str) -> dict[str, str]:
     if exp.output_dir:
         output_path = Path(exp.output_dir)
         if output_path.exists():
+            model_cache.invalidate(output_path)
             shutil.rmtree(output_path)
     return {"status": "deleted", "experiment_id": experiment_id}
 
 
+_RESUMABLE_RUNNERS = {
+    ExperimentType.CAUSAL_LM: "src.causal_lm_runner",
+    ExperimentType.MASKED_LM: "src.masked_lm_runner",
+}
+
+
+def _append_text(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _resume_lm_experiment(experiment_id: str, checkpoint: str) -> None:
+    """Relaunch a local causal/masked LM runner from its latest checkpoint."""
+    exp = get_experiment(experiment_id)
+    output_dir = Path(exp.output_dir)
+
+    config_record = get_config(exp.config_id)
+    auto_evaluate = bool(config_record and getattr(config_record.config.training, "auto_evaluate", False))
+
+    stopped = False
+    try:
+        payload = json.loads((output_dir / "runner_payload.json").read_text(encoding="utf-8"))
+        payload["resume_from"] = checkpoint
+        proc = _start_local_runner(exp, _RESUMABLE_RUNNERS[exp.experiment_type], payload, output_dir)
+        if proc is None:
+            exp.status = ExperimentStatus.STOPPED
+            return
+        while proc.poll() is None:
+            if stop_registry.get(experiment_id):
+                stopped = True
+                proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except Exception:
+                    proc.kill()
+                break
+            time.sleep(0.5)
+
+        stdout, stderr = proc.communicate(timeout=1)
+        # Keep the output of earlier attempts; each resume appends to the same files.
+        marker = f"\n===== resumed from {checkpoint} at {now().isoformat()} =====\n"
+        if stdout:
+            _append_text(output_dir / "runner_stdout.txt", marker + stdout)
+        if stderr:
+            _append_text(output_dir / "runner_stderr.txt", marker + stderr)
+
+        if stopped:
+            exp.status = ExperimentStatus.STOPPED
+        elif proc.returncode == 0:
+            exp.status = ExperimentStatus.COMPLETED
+            metrics_file = output_dir / "metrics.json"
+            if metrics_file.exists():
+                exp.metrics = json.loads(metrics_file.read_text(encoding="utf-8"))
+        else:
+            exp.status = ExperimentStatus.FAILED
+            exp.error = stderr or "Runner failed with no error message"
+    except Exception as e:
+        exp.status = ExperimentStatus.FAILED
+        exp.error = str(e)
+    finally:
+        exp.completed_at = now()
+        stop_registry.pop(experiment_id, None)
+        runner_slots.release(experiment_id)
+        save_experiment(exp)
+
+    if auto_evaluate and exp.status == ExperimentStatus.COMPLETED:
+        _run_all_benchmarks_for_experiment(experiment_id)
+
+
+@router.post("/experiments/{experiment_id}/resume", response_model=ExperimentStartResponse)
+def resume_experiment(experiment_id: str) -> ExperimentStartResponse:
+    exp = get_experiment(experiment_id)
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    if exp.experiment_type not in _RESUMABLE_RUNNERS:
+        raise HTTPException(status_code=400, detail="Only causal and masked LM experiments can be resumed")
+    if exp.compute_target_id:
+        raise HTTPException(status_code=400, detail="Resume is only supported for local experiments")
+    if runner_slots.holds(experiment_id):
+        raise HTTPException(status_code=409, detail="Experiment runner is still live")
+    # A RUNNING row with no live runner was orphaned by an API restart and may be resumed.
+    if exp.status not in (ExperimentStatus.STOPPED, ExperimentStatus.FAILED, ExperimentStatus.RUNNING):
+        raise HTTPException(status_code=400, detail=f"Experiment cannot be resumed while {exp.status.value}")
+    if not exp.output_dir or not (Path(exp.output_dir) / "runner_payload.json").exists():
+        raise HTTPException(status_code=400, detail="Experiment has no runner payload to resume from")
+
+    checkpoint = get_last_checkpoint(exp.output_dir)
+    if checkpoint is None:
+        raise HTTPException(status_code=400, detail="No checkpoint found for experiment")
+
+    exp.status = ExperimentStatus.PENDING
+    exp.error = None
+    exp.completed_at = None
+    save_experiment(exp)
+
+    thread = Thread(target=_resume_lm_experiment, args=(experiment_id, checkpoint))
+    thread.start()
+
+    message = f"Resuming from {Path(checkpoint).name}"
+    if not (Path(checkpoint) / OPTIMIZER_NAME).exists():
+        message += " without optimizer state; the optimizer moments restart from zero"
+    return ExperimentStartResponse(experiment_id=experiment_id, status=ExperimentStatus.PENDING, message=message)
+
+
 @router.post("/experiments/{experiment_id}/stop")
 def stop_experiment(experiment_id: str) -> dict[str, str]:
     exp = get_experiment(experiment_id)
     if not exp:
         raise HTTPException(status_code=404, detail="Experiment not found")
-    if exp.status != ExperimentStatus.RUNNING:
+    # A pending local run may be queued for a CPU runner slot; stopping it cancels the launch.
+    queued = exp.status == ExperimentStatus.PENDING and runner_slots.holds(experiment_id)
+    if exp.status != ExperimentStatus.RUNNING and not queued:
         raise HTTPException(status_code=400, detail="Experiment is not running")
     stop_registry[experiment_id] = True
     return {"status": "stop_requested", "experiment_id": experiment_id}
@@ -1102,39 +1280,56 @@ def _flatten_config(config: dict, prefix: str = "") -> dict[str, any]:
 
 
 def _compute_config_diff(experiments: list[ExperimentComparisonItem]) -> dict[str, dict[str, list]]:
-    """Compute config differences across experiments."""
+    """Compute config differences across experiments.
+
+    The flattened configs become one object-dtype frame (a row per experiment,
+    a column per dotted key), so finding the keys that vary is one
+    ``nunique`` over the columns instead of a loop per key.
+    """
     if len(experiments) < 2:
         return {}
 
-    all_flat = [_flatten_config(exp.config) for exp in experiments]
-    all_keys = set()
-    for flat in all_flat:
-        all_keys.update(flat.keys())
+    frame = pd.DataFrame(
+        [_flatten_config(exp.config) for exp in experiments],
+        index=[exp.experiment_id for exp in experiments],
+        dtype=object,
+    )
+    # Missing keys compare as None, as a plain dict.get would give.
+    frame = frame.where(frame.notna(), None)
+    varying = frame.loc[:, frame.map(str).nunique() > 1].sort_index(axis=1)
+    return {key: dict(zip(frame.index, column)) for key, column in varying.items()}
 
-    diff = {}
-    for key in sorted(all_keys):
-        values = [flat.get(key) for flat in all_flat]
-        unique_vals = set(str(v) for v in values)
-        if len(unique_vals) > 1:
-            diff[key] = {exp.experiment_id: flat.get(key) for exp, flat in zip(experiments, all_flat)}
 
-    return diff
+def _loss_curve(exp: ExperimentResult, max_points: int) -> dict[str, list[tuple[int, float]]]:
+    """Loss series from the experiment's local training logs (or captured remote stdout); never opens SSH."""
+    logs = _local_training_logs(Path(exp.output_dir)) if exp.output_dir else None
+    if logs is None:
+        logs = _parse_training_logs_from_text(exp.logs or "")
+    return loss_curve(logs, max_points)
 
 
 @router.post("/experiments/compare", response_model=ExperimentComparisonResponse)
-def compare_experiments(experiment_ids: list[str]) -> ExperimentComparisonResponse:
-    """Compare configs of multiple experiments."""
+def compare_experiments(
+    experiment_ids: list[str], loss_curves: bool = False, max_points: int = 200
+) -> ExperimentComparisonResponse:
+    """Compare configs of multiple experiments.
+
+    Experiments and their completed evals are read with one query each, so
+    hundreds of experiments can be compared at once. With ``loss_curves``
+    each item carries its train/eval loss series, thinned to ``max_points``,
+    for an overlay chart.
+    """
+    if max_points < 2:
+        raise HTTPException(status_code=400, detail="max_points must be at least 2")
+    found = get_experiments(experiment_ids)
+    missing = [exp_id for exp_id in experiment_ids if exp_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Experiment {missing[0]} not found")
+    evals = list_completed_evals_by_experiment(list(found))
+
     experiments = []
     for exp_id in experiment_ids:
-        exp = get_experiment(exp_id)
-        if not exp:
-            raise HTTPException(status_code=404, detail=f"Experiment {exp_id} not found")
-
-        evals = list_benchmark_evals()
-        completed_evals = [e for e in evals if e.experiment_id == exp_id and e.status == BenchmarkStatus.COMPLETED]
-        bleu_scores = [e.bleu_score for e in completed_evals]
-        rouge_scores = [e.rouge_score for e in completed_evals]
-
+        exp = found[exp_id]
         experiments.append(
             ExperimentComparisonItem(
                 experiment_id=exp.id,
@@ -1142,10 +1337,11 @@ def compare_experiments(experiment_ids: list[str]) -> ExperimentComparisonRespon
                 dataset_filename=exp.dataset_filename,
                 started_at=exp.started_at,
                 status=exp.status,
-                config=exp.config.model_dump(),
-                bleu_scores=bleu_scores,
-                rouge_scores=rouge_scores,
+                config=exp.config.model_dump() if exp.config else {},
+                bleu_scores=[e.bleu_score for e in evals[exp_id]],
+                rouge_scores=[e.rouge_score for e in evals[exp_id]],
                 eval_loss=exp.metrics.get("eval_loss"),
+                loss_curve=_loss_curve(exp, max_points) if loss_curves else None,
             )
         )
 
@@ -1154,6 +1350,90 @@ def compare_experiments(experiment_ids: list[str]) -> ExperimentComparisonRespon
     return ExperimentComparisonResponse(experiments=experiments, config_diff=config_diff)
 
 
+@router.get("/experiments/{experiment_id}/telemetry")
+def get_experiment_telemetry(experiment_id: str) -> dict:
+    """Per-step throughput/memory series and its summary for one experiment."""
+    exp = get_experiment(experiment_id)
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    series = load_telemetry(Path(exp.output_dir)) if exp.output_dir else []
+    summary = exp.metrics.get("throughput") or {}
+    return {"experiment_id": experiment_id, "summary": summary, "series": series}
+
+
+def _experiment_output_dir(experiment_id: str) -> Path:
+    exp = get_experiment(experiment_id)
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    if not exp.output_dir or not Path(exp.output_dir).exists():
+        raise HTTPException(status_code=404, detail="Experiment has no local artifacts")
+    return Path(exp.output_dir)
+
+
+@router.get("/experiments/{experiment_id}/artifacts")
+def list_experiment_artifacts(experiment_id: str) -> dict:
+    """List files in the experiment output dir (paths relative to it)."""
+    output_dir = _experiment_output_dir(experiment_id)
+    files = [
+        {"path": p.relative_to(output_dir).as_posix(), "size_bytes": p.stat().st_size}
+        for p in sorted(output_dir.rglob("*"))
+        if p.is_file()
+    ]
+    return {"experiment_id": experiment_id, "files": files}
+
+
+@router.get("/experiments/{experiment_id}/artifacts/{artifact_path:path}")
+def download_experiment_artifact(experiment_id: str, artifact_path: str) -> FileResponse:
+    output_dir = _experiment_output_dir(experiment_id).resolve()
+    target = (output_dir / artifact_path).resolve()
+    if not target.is_relative_to(output_dir) or not target.is_file():
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return FileResponse(target, filename=target.name)
+
+
+@router.get("/experiments/{experiment_id}/profile")
+def get_experiment_profile(experiment_id: str) -> dict:
+    """Op-level profiler summary captured with training.profile enabled."""
+    output_dir = _experiment_output_dir(experiment_id)
+    summary = load_profile_summary(output_dir)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No profiler capture for experiment")
+    profiler_dir = output_dir / PROFILER_DIRNAME
+    summary["files"] = sorted(
+        f"{PROFILER_DIRNAME}/{p.name}" for p in profiler_dir.iterdir() if p.is_file()
+    )
+    return summary
+
+
+@router.post("/experiments/compare-throughput", response_model=ThroughputComparisonResponse)
+def compare_throughput(experiment_ids: list[str]) -> ThroughputComparisonResponse:
+    """Compare training throughput summaries of multiple experiments."""
+    items = []
+    for exp_id in experiment_ids:
+        exp = get_experiment(exp_id)
+        if not exp:
+            raise HTTPException(status_code=404, detail=f"Experiment {exp_id} not found")
+        items.append(
+            ThroughputComparisonItem(
+                experiment_id=exp.id,
+                experiment_type=exp.experiment_type,
+                status=exp.status,
+                config_name=exp.config_name,
+                throughput=exp.metrics.get("throughput") or {},
+            )
+        )
+
+    rates = {i.experiment_id: i.throughput.get("samples_per_sec") for i in items}
+    rates = {k: v for k, v in rates.items() if v}
+    fastest = max(rates, key=rates.get) if rates else None
+    if fastest:
+        for item in items:
+            rate = rates.get(item.experiment_id)
+            item.relative_samples_per_sec = round(rate / rates[fastest], 4) if rate else None
+
+    return ThroughputComparisonResponse(experiments=items, fastest_experiment_id=fastest)
+
+
 # Export for use in autotune_routes
 def run_causal_lm_experiment_sync(experiment_id: str, dataset_id: str, config_id: str) -> None:
     """Run causal LM experiment synchronously."""
@@ -1215,6 +1495,14 @@ def run_causal_lm_experiment_sync(experiment_id: str, dataset_id: str, config_id
             early_stopping_patience=cfg.training.early_stopping_patience,
             early_stopping_metric=cfg.training.early_stopping_metric,
             early_stopping_greater_is_better=cfg.training.early_stopping_greater_is_better,
+            auto_batch_size=cfg.training.auto_batch_size,
+            memory_budget_mb=cfg.training.memory_budget_mb,
+            allow_effective_batch_change=cfg.training.allow_effective_batch_change,
+            profile=cfg.training.profile,
+            profile_steps=cfg.training.profile_steps,
+            async_checkpoint=cfg.training.async_checkpoint,
+            checkpoint_mode=cfg.training.checkpoint_mode,
+            prune_checkpoints=cfg.training.prune_checkpoints,
         ),
         peft=peft_config,
     )
@@ -0,0 +1,269 @@
+"""Memory-budgeted micro-batch search for Trainer runs.
+
+Tries full-length (``max_length``) forward/backward passes at growing batch
+sizes, keeps the largest one whose peak memory stays under the budget and then
+derives ``gradient_accumulation_steps`` so the effective batch size requested
+by the config is preserved; changing it for a larger micro-batch is opt-in. On CUDA the peak comes from the allocator stats;
+on CPU the process RSS is sampled while the trial step runs.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import logging
+import math
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+import psutil
+import torch
+
+logger = logging.getLogger(__name__)
+
+# Fraction of the budget a trial step may use; the rest covers allocator
+# fragmentation and eval/logging spikes during the real run.
+_HEADROOM = 0.9
+
+
+@dataclass(frozen=True)
+class BatchPlan:
+    micro_batch_size: int
+    gradient_accumulation_steps: int
+    effective_batch_size: int
+    requested_effective_batch_size: int
+    peak_memory_mb: float
+    memory_budget_mb: float
+    device: str
+    search_seconds: float
+
+    def to_metrics(self) -> dict[str, float | int | str]:
+        return {f"auto_batch_{k}": v for k, v in asdict(self).items()}
+
+
+class _RssSampler:
+    """Tracks the peak RSS of this process while active."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self._proc = psutil.Process()
+        self._interval = interval
+        self._stop = threading.Event()
+        self.peak = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._proc.memory_info().rss)
+            time.sleep(self._interval)
+
+    def __enter__(self) -> "_RssSampler":
+        self.peak = self._proc.memory_info().rss
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._proc.memory_info().rss)
+
+
+def default_memory_budget_mb(device: torch.device) -> float:
+    """Whole-device memory on CUDA; current RSS plus available RAM on CPU."""
+    if device.type == "cuda":
+        return torch.cuda.get_device_properties(device).total_memory / 2**20
+    return (psutil.Process().memory_info().rss + psutil.virtual_memory().available) / 2**20
+
+
+def _optimizer_state_mb(model: torch.nn.Module) -> float:
+    # AdamW keeps two fp32 moments per trainable parameter; trials never step the optimizer.
+    trainable = sum(p.numel() for p in model.parameters() if p.requires_grad)
+    return trainable * 2 * 4 / 2**20
+
+
+def _is_oom(exc: BaseException) -> bool:
+    if isinstance(exc, (torch.cuda.OutOfMemoryError, MemoryError)):
+        return True
+    return "out of memory" in str(exc).lower()
+
+
+def _release(model: torch.nn.Module, device: torch.device) -> None:
+    model.zero_grad(set_to_none=True)
+    gc.collect()
+    if device.type == "cuda":
+        torch.cuda.empty_cache()
+
+
+def make_trial_step(
+    model: torch.nn.Module,
+    max_length: int,
+    vocab_size: int,
+    mlm: bool = False,
+) -> Callable[[int], None]:
+    """Build a callable running one forward/backward pass at a given batch size."""
+    device = next(model.parameters()).device
+
+    def step(batch_size: int) -> None:
+        input_ids = torch.randint(0, vocab_size, (batch_size, max_length), device=device)
+        attention_mask = torch.ones_like(input_ids)
+        labels = input_ids.clone()
+        if mlm:
+            # Loss over a realistic ~15% of positions; the rest are ignored.
+            labels[torch.rand(labels.shape, device=device) > 0.15] = -100
+        out = model(input_ids=input_ids, attention_mask=attention_mask, labels=labels)
+        out.loss.backward()
+
+    return step
+
+
+def _measure(step: Callable[[int], None], batch_size: int, device: torch.device) -> float:
+    """Peak memory in MiB for one trial step, raising on OOM."""
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+        torch.cuda.reset_peak_memory_stats(device)
+        step(batch_size)
+        torch.cuda.synchronize(device)
+        return torch.cuda.max_memory_allocated(device) / 2**20
+    with _RssSampler() as sampler:
+        step(batch_size)
+    return sampler.peak / 2**20
+
+
+def _preserving_divisor(effective: int, fitted: int) -> int:
+    """Largest divisor of ``effective`` not above ``fitted``."""
+    return next(c for c in range(min(fitted, effective), 0, -1) if effective % c == 0)
+
+
+def plan_batch_size(
+    model: torch.nn.Module,
+    step: Callable[[int], None],
+    requested_batch_size: int,
+    requested_accumulation: int,
+    memory_budget_mb: float | None = None,
+    allow_effective_batch_change: bool = False,
+) -> BatchPlan:
+    """Binary-search the largest micro-batch that fits the memory budget.
+
+    The micro-batch is a divisor of the requested effective batch, even when
+    that is far below what fits (a prime effective batch runs at micro-batch
+    1). With ``allow_effective_batch_change`` a divisor under half the fitted
+    size is dropped for the fitted size, and accumulation rounds the
+    effective batch up instead.
+    """
+    start = time.perf_counter()
+    device = next(model.parameters()).device
+    budget = memory_budget_mb or default_memory_budget_mb(device)
+    limit = budget * _HEADROOM - _optimizer_state_mb(model)
+    effective = requested_batch_size * requested_accumulation
+
+    was_training = model.training
+    model.train()
+    peaks: dict[int, float] = {}
+
+    def fits(batch_size: int) -> bool:
+        try:
+            peak = _measure(step, batch_size, device)
+        except (RuntimeError, MemoryError) as exc:
+            if not _is_oom(exc):
+                raise
+            peak = math.inf
+        finally:
+            _release(model, device)
+        peaks[batch_size] = peak
+        logger.info("auto-batch trial bs=%d peak=%.0fMiB limit=%.0fMiB", batch_size, peak, limit)
+        return peak <= limit
+
+    # Double until a trial fails, then bisect. Never search past the effective
+    # batch: accumulation can't go below 1.
+    good, bad = 0, None
+    candidate = 1
+    while True:
+        if not fits(candidate):
+            bad = candidate
+            break
+        good = candidate
+        if candidate == effective:
+            break
+        candidate = min(candidate * 2, effective)
+    while bad is not None and bad - good > 1:
+        mid = (good + bad) // 2
+        if fits(mid):
+            good = mid
+        else:
+            bad = mid
+
+    model.train(was_training)
+    if good == 0:
+        msg = (
+            f"Batch size 1 does not fit the memory budget of {budget:.0f}MiB "
+            f"(peak {peaks.get(1, math.inf):.0f}MiB)."
+        )
+        raise RuntimeError(msg)
+
+    micro = _preserving_divisor(effective, good)
+    if allow_effective_batch_change and micro * 2 <= good:
+        micro = good
+    accumulation = math.ceil(effective / micro)
+    if micro * accumulation != effective:
+        logger.warning(
+            "auto-batch: effective batch changed from %d to %d (micro_batch=%d accumulation=%d)",
+            effective,
+            micro * accumulation,
+            micro,
+            accumulation,
+        )
+    return BatchPlan(
+        micro_batch_size=micro,
+        gradient_accumulation_steps=accumulation,
+        effective_batch_size=micro * accumulation,
+        requested_effective_batch_size=effective,
+        peak_memory_mb=round(peaks.get(micro, peaks[good]), 1),
+        memory_budget_mb=round(budget, 1),
+        device=str(device),
+        search_seconds=round(time.perf_counter() - start, 3),
+    )
+
+
+def auto_tune_batch_size(
+    model: torch.nn.Module,
+    args,
+    max_length: int,
+    vocab_size: int,
+    memory_budget_mb: float | None = None,
+    mlm: bool = False,
+    resume: bool = False,
+    allow_effective_batch_change: bool = False,
+) -> BatchPlan:
+    """Plan a batch size for ``TrainingArguments`` and apply it in place.
+
+    The plan is saved next to the checkpoints; a resumed run reuses it so the
+    step count and data order stay consistent with the interrupted run.
+    """
+    plan_path = Path(args.output_dir) / "auto_batch.json"
+    if resume and plan_path.exists():
+        plan = BatchPlan(**json.loads(plan_path.read_text(encoding="utf-8")))
+    else:
+        model.to(args.device)
+        if args.gradient_checkpointing:
+            model.gradient_checkpointing_enable(gradient_checkpointing_kwargs=args.gradient_checkpointing_kwargs)
+        plan = plan_batch_size(
+            model,
+            make_trial_step(model, max_length, vocab_size, mlm=mlm),
+            requested_batch_size=args.per_device_train_batch_size,
+            requested_accumulation=args.gradient_accumulation_steps,
+            memory_budget_mb=memory_budget_mb,
+            allow_effective_batch_change=allow_effective_batch_change,
+        )
+        plan_path.parent.mkdir(parents=True, exist_ok=True)
+        plan_path.write_text(json.dumps(asdict(plan), indent=2), encoding="utf-8")
+    args.per_device_train_batch_size = plan.micro_batch_size
+    args.gradient_accumulation_steps = plan.gradient_accumulation_steps
+    logger.info(
+        "auto-batch: micro_batch=%d accumulation=%d (effective %d, requested %d)",
+        plan.micro_batch_size,
+        plan.gradient_accumulation_steps,
+        plan.effective_batch_size,
+        plan.requested_effective_batch_size,
+    )
+    return plan
@@ -1,14 +1,33 @@
 """Benchmark evaluation with BLEU and ROUGE-L scoring."""
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Sequence
 
-import evaluate
 import torch
-from peft import AutoPeftModelForCausalLM
-from sacrebleu.metrics import BLEU
-from transformers import AutoTokenizer
+from peft import AutoPeftModelForCausalLM, PeftModel
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    DynamicCache,
+    LogitsProcessor,
+    LogitsProcessorList,
+    StoppingCriteria,
+    StoppingCriteriaList,
+)
+
+from .model_store import find_base_ref, load_pretrained
+from .scoring import bleu_scores, rouge_l_scores
 
 logger = logging.getLogger(__name__)
 
@@ -22,37 +41,647 @@ def _preferred_device() -> torch.device:
     return torch.device("cpu")
 
 
-def load_model_and_tokenizer(model_path: Path) -> tuple:
-    """Load a PEFT model and tokenizer from checkpoint."""
-    # Explicitly disable low-mem loading to avoid meta-tensor initialization
-    # that cannot be moved via Module.to(...).
-    model = AutoPeftModelForCausalLM.from_pretrained(
-        model_path,
-        low_cpu_mem_usage=False,
-        device_map=None,
-    )
-    device = _preferred_device()
-    model.to(device)
+def adapter_base(model_path: Path) -> tuple[str, str | None]:
+    """(base model name, content hash or None) a saved LoRA adapter was trained on."""
+    base_ref = find_base_ref(model_path)
+    if base_ref is not None:
+        return base_ref["model_name"], base_ref["sha256"]
+    adapter_cfg = json.loads((model_path / "adapter_config.json").read_text(encoding="utf-8"))
+    return adapter_cfg["base_model_name_or_path"], None
+
+
+def _load_adapter_on_stored_base(model_path: Path, tokenizer, adapter_name: str = "default"):
+    """Attach a saved LoRA adapter to its base model loaded from the local store."""
+    base_name, content_hash = adapter_base(model_path)
+    base, load_seconds = load_pretrained(AutoModelForCausalLM, base_name, content_hash=content_hash)
+    # Training may have added a pad token; the adapter was saved against the resized embeddings.
+    if base.get_input_embeddings().num_embeddings < len(tokenizer):
+        base.resize_token_embeddings(len(tokenizer))
+    model = PeftModel.from_pretrained(base, model_path, adapter_name=adapter_name)
+    return model, load_seconds
+
+
+def load_eval_tokenizer(model_path: Path):
+    """The experiment's tokenizer, left-padded for batched generation."""
     tokenizer = AutoTokenizer.from_pretrained(model_path)
     tokenizer.padding_side = "left"
     if tokenizer.pad_token is None:
         tokenizer.pad_token = tokenizer.eos_token
+    return tokenizer
+
+
+def load_model_and_tokenizer(model_path: Path, adapter_name: str = "default") -> tuple:
+    """Load a PEFT model and tokenizer from checkpoint."""
+    start = time.perf_counter()
+    model_path = Path(model_path)
+    tokenizer = load_eval_tokenizer(model_path)
+    if (model_path / "adapter_config.json").exists():
+        model, base_seconds = _load_adapter_on_stored_base(model_path, tokenizer, adapter_name)
+        logger.info(f"Base weights loaded from model store in {base_seconds:.2f}s")
+    elif (model_path / "config.json").exists():
+        # Full fine-tune: weights live in the experiment dir itself.
+        model = AutoModelForCausalLM.from_pretrained(
+            model_path,
+            local_files_only=True,
+            low_cpu_mem_usage=True,
+        )
+    else:
+        # Explicitly disable low-mem loading to avoid meta-tensor initialization
+        # that cannot be moved via Module.to(...).
+        model = AutoPeftModelForCausalLM.from_pretrained(
+            model_path,
+            low_cpu_mem_usage=False,
+            device_map=None,
+        )
+    device = _preferred_device()
+    model.to(device)
+    logger.info(f"Loaded model from {model_path} in {time.perf_counter() - start:.2f}s")
     return model, tokenizer
 
 
+def _system_block(system_prompt: str) -> str:
+    return f"<|system|>\n{system_prompt.strip()}\n</s>\n"
+
+
 def format_prompt(system_prompt: str, user_prompt: str) -> str:
     """Format a prompt using the TinyLlama chat template."""
     return (
-        "<|system|>\n"
-        f"{system_prompt.strip()}\n"
-        "</s>\n"
-        "<|user|>\n"
+        _system_block(system_prompt)
+        + "<|user|>\n"
         f"{user_prompt.strip()}\n"
         "</s>\n"
         "<|assistant|>\n"
     )
 
 
+@dataclass(frozen=True)
+class GenerationRequest:
+    """One prompt to answer.
+
+    ``greedy`` decodes deterministically and ignores temperature/top-p.
+    ``stop_sequences`` end the answer at the first occurrence of any of them,
+    which is cut from the returned text. ``num_return_sequences`` samples that
+    many answers from a single prefill of the prompt. ``adapter`` names the
+    LoRA adapter of a ``PeftModel`` that answers (``None``: the active one),
+    so fine-tunes sharing a base model can share a batch.
+
+    A sampled request with a ``seed`` draws sequence ``j`` from its own
+    generator seeded with ``seed + j``, whatever else shares the batch.
+    Greedy and seeded requests are deterministic, so they are served from the
+    generation cache when one is attached; ``cache=False`` always generates.
+    """
+
+    prompt: str
+    system_prompt: str = "You are an AI assistant."
+    max_new_tokens: int = 128
+    temperature: float = 0.7
+    top_p: float = 0.9
+    greedy: bool = False
+    stop_sequences: tuple[str, ...] = ()
+    num_return_sequences: int = 1
+    adapter: str | None = None
+    seed: int | None = None
+    cache: bool = True
+
+
+def _sequence(request: GenerationRequest, j: int) -> GenerationRequest:
+    """The single-answer request for sequence ``j`` of ``request``."""
+    if request.seed is None:
+        return request
+    return replace(request, seed=request.seed + j, num_return_sequences=1)
+
+
+class _PerRowSampling(LogitsProcessor):
+    """Temperature and top-p filtering with separate settings for each batch row.
+
+    Greedy rows keep only their most likely token, so they stay deterministic
+    while sharing a sampled batch. Rows with their own ``torch.Generator``
+    draw their token here and keep only it, so the sampler downstream has a
+    single choice and the row is reproducible from its seed.
+    """
+
+    def __init__(
+        self,
+        temperatures: torch.Tensor,
+        top_ps: torch.Tensor,
+        greedy: torch.Tensor | None = None,
+        generators: list[torch.Generator | None] | None = None,
+    ) -> None:
+        self.temperatures = temperatures[:, None]
+        self.top_ps = top_ps[:, None]
+        self.greedy = None if greedy is None else greedy[:, None]
+        self.generators = generators or []
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        if self.greedy is not None:
+            best = torch.zeros_like(scores, dtype=torch.bool).scatter(1, scores.argmax(dim=-1, keepdim=True), True)
+        scores = scores / self.temperatures
+        sorted_logits, sorted_idx = torch.sort(scores, descending=False)
+        cumulative = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+        remove = cumulative <= (1 - self.top_ps)
+        remove[:, -1] = False  # always keep the most likely token
+        remove = remove.scatter(1, sorted_idx, remove)
+        if self.greedy is not None:
+            remove |= self.greedy & ~best
+        scores = scores.masked_fill(remove, -float("inf"))
+        for row, generator in enumerate(self.generators):
+            if generator is not None:
+                token = torch.multinomial(scores[row].softmax(dim=-1), 1, generator=generator)
+                keep = torch.zeros_like(scores[row], dtype=torch.bool).scatter(0, token, True)
+                scores[row] = scores[row].masked_fill(~keep, -float("inf"))
+        return scores
+
+
+def _row_generator(request: GenerationRequest, device: torch.device) -> torch.Generator | None:
+    if request.greedy or request.seed is None:
+        return None
+    return torch.Generator(device=device).manual_seed(request.seed)
+
+
+class _PerRowMaxTokens(StoppingCriteria):
+    """Finishes each row once it has generated its own ``max_new_tokens``."""
+
+    def __init__(self, prompt_length: int, limits: torch.Tensor) -> None:
+        self.prompt_length = prompt_length
+        self.limits = limits
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        return (input_ids.shape[-1] - self.prompt_length) >= self.limits
+
+
+class _PerRowStopSequences(StoppingCriteria):
+    """Finishes a row once its generated text contains one of its stop sequences.
+
+    Only the last few tokens are decoded per step: a stop sequence of ``n``
+    characters spans at most ``n`` tokens.
+    """
+
+    def __init__(self, tokenizer, prompt_length: int, stop_sequences: list[tuple[str, ...]]) -> None:
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.stop_sequences = stop_sequences
+        self.rows = [row for row, stops in enumerate(stop_sequences) if stops]
+        self.window = max((len(stop) for stops in stop_sequences for stop in stops), default=0) + 2
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        done = torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+        start = max(self.prompt_length, input_ids.shape[-1] - self.window)
+        for row in self.rows:
+            tail = self.tokenizer.decode(input_ids[row, start:], skip_special_tokens=True)
+            done[row] = any(stop in tail for stop in self.stop_sequences[row])
+        return done
+
+
+def _cut_at_stop(text: str, stop_sequences: Sequence[str]) -> str:
+    cut = min((i for i in (text.find(stop) for stop in stop_sequences if stop) if i >= 0), default=len(text))
+    return text[:cut]
+
+
+@dataclass(frozen=True)
+class _PromptPrefix:
+    """Token ids of a shared prompt prefix and their precomputed key/value cache."""
+
+    input_ids: torch.Tensor  # [1, P]
+    cache: DynamicCache
+
+    def expand(self, batch_size: int) -> tuple[torch.Tensor, DynamicCache]:
+        cache = copy.deepcopy(self.cache)
+        cache.batch_repeat_interleave(batch_size)
+        return self.input_ids.expand(batch_size, -1), cache
+
+
+def _stack_prefixes(prefixes: list[_PromptPrefix]) -> tuple[torch.Tensor, DynamicCache]:
+    """One batch row per prefix. Prefixes share token ids but may come from different adapters."""
+    first = prefixes[0]
+    if all(p is first for p in prefixes):
+        return first.expand(len(prefixes))
+    cache = copy.deepcopy(first.cache)
+    for i, layer in enumerate(cache.layers):
+        layer.keys = torch.cat([p.cache.layers[i].keys for p in prefixes])
+        layer.values = torch.cat([p.cache.layers[i].values for p in prefixes])
+    return first.input_ids.expand(len(prefixes), -1), cache
+
+
+# model -> {(adapter, system prompt): prefix}; dropped with the model.
+_prefix_caches: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def forget_adapter(model, adapter: str) -> None:
+    """Drop cached prefixes computed with ``adapter`` (call when it is unloaded)."""
+    per_model = _prefix_caches.get(model, {})
+    for key in [k for k in per_model if k[0] == adapter]:
+        del per_model[key]
+
+
+@dataclass(frozen=True)
+class CachedGeneration:
+    text: str
+    prompt_tokens: int
+    generated_tokens: int
+
+
+class GenerationCache:
+    """Generated answers in SQLite, evicted least recently used beyond ``max_bytes``.
+
+    Keys hash the model identity, the formatted prompt, every decoding
+    setting and the seed (see ``generation_cache_key``). Only deterministic
+    generations are stored, so a hit is the answer the model would give.
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS generations ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL, prompt_tokens INTEGER NOT NULL, "
+            "generated_tokens INTEGER NOT NULL, size_bytes INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_generations_last_used ON generations(last_used)")
+        return conn
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, CachedGeneration]:
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, CachedGeneration] = {}
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    # Stay under SQLite's bound-parameter limit.
+                    for start in range(0, len(keys), 500):
+                        chunk = keys[start : start + 500]
+                        marks = ",".join("?" * len(chunk))
+                        rows = conn.execute(
+                            f"SELECT key, text, prompt_tokens, generated_tokens FROM generations WHERE key IN ({marks})",
+                            chunk,
+                        ).fetchall()
+                        found.update((k, CachedGeneration(t, p, g)) for k, t, p, g in rows)
+                        conn.execute(f"UPDATE generations SET last_used = ? WHERE key IN ({marks})", [time.time(), *chunk])
+            finally:
+                conn.close()
+            self._stats["hits"] += len(found)
+            self._stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: dict[str, CachedGeneration]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO generations "
+                        "(key, text, prompt_tokens, generated_tokens, size_bytes, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                        [
+                            (k, v.text, v.prompt_tokens, v.generated_tokens, len(k) + len(v.text.encode()), time.time())
+                            for k, v in entries.items()
+                        ],
+                    )
+                    self._stats["stored"] += len(entries)
+                    self._evict(conn)
+            finally:
+                conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM generations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so a full cache does not evict on every write.
+        excess = total - int(self.max_bytes * 0.9)
+        doomed = []
+        for key, size in conn.execute("SELECT key, size_bytes FROM generations ORDER BY last_used"):
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+        conn.executemany("DELETE FROM generations WHERE key = ?", doomed)
+        self._stats["evicted"] += len(doomed)
+
+    def clear(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    return conn.execute("DELETE FROM generations").rowcount
+            finally:
+                conn.close()
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        try:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM generations").fetchone()
+        finally:
+            conn.close()
+        return {"entries": entries, "size_bytes": size, "max_bytes": self.max_bytes, **self._stats}
+
+
+generation_cache = GenerationCache(
+    Path(os.environ.get("GENERATION_CACHE_PATH", "data/generation_cache.db")),
+    int(float(os.environ.get("GENERATION_CACHE_MAX_MB", "256")) * 2**20),
+)
+
+
+def generation_cache_key(model_key: str, request: GenerationRequest, repetition_penalty: float) -> str | None:
+    """Cache key of a single-answer request, or None if its answer is not deterministic."""
+    if not request.cache or not (request.greedy or request.seed is not None):
+        return None
+    sampling = None if request.greedy else [request.temperature, request.top_p, request.seed]
+    blob = json.dumps(
+        [
+            model_key,
+            format_prompt(request.system_prompt, request.prompt),
+            request.max_new_tokens,
+            list(request.stop_sequences),
+            repetition_penalty,
+            sampling,
+        ]
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _row_cache_keys(
+    requests: Sequence[GenerationRequest], model_keys: dict[str | None, str], repetition_penalty: float
+) -> list[str | None]:
+    """One key (or None) per answer row, in ``generate`` output order."""
+    keys: list[str | None] = []
+    for r in requests:
+        model_key = model_keys.get(r.adapter)
+        for j in range(r.num_return_sequences):
+            keys.append(None if model_key is None else generation_cache_key(model_key, _sequence(r, j), repetition_penalty))
+    return keys
+
+
+def cached_answers(
+    requests: Sequence[GenerationRequest],
+    model_keys: dict[str | None, str],
+    cache: GenerationCache | None = None,
+    repetition_penalty: float = 1.1,
+) -> list[str] | None:
+    """Answers for ``requests`` if every one is cached, so the model need not be loaded at all."""
+    cache = generation_cache if cache is None else cache
+    keys = _row_cache_keys(requests, model_keys, repetition_penalty)
+    if not keys or None in keys:
+        return None
+    found = cache.get_many(keys)
+    if len(found) < len(set(keys)):
+        return None
+    return [found[k].text for k in keys]
+
+
+class BatchedGenerator:
+    """Serves many generation requests through left-padded, batched ``model.generate`` calls.
+
+    Sampling settings and token budgets are applied per row, so requests from
+    different benchmarks share a batch. Requests are ordered by prompt length
+    and token budget so rows in a batch finish at about the same step and
+    little compute goes to padding or already-finished rows.
+
+    With ``prefix_cache`` on, the ``<|system|>`` block that starts every prompt
+    is prefilled once per model and system prompt. Each batch then starts from
+    a copy of that key/value cache and only prefills the per-request suffix.
+    The suffix is left-padded after the shared prefix; the attention mask and
+    the mask-derived position ids make that equivalent to padding on the far
+    left. A request with ``num_return_sequences > 1`` extends that cache over
+    its whole prompt once, and its answers are sampled from copies of it.
+
+    Requests naming different LoRA adapters share batches: PEFT applies each
+    row's adapter (``adapter_names``), and each row starts from the prefix
+    cache of its own adapter.
+
+    With a ``cache`` and ``model_keys`` (adapter name, or ``None`` for the
+    active model, to an identity of its weights), deterministic answers are
+    looked up first and only the missing ones are generated and stored.
+
+    ``generate`` returns ``num_return_sequences`` answers per request, in
+    request order.
+    """
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        max_batch_size: int = 16,
+        repetition_penalty: float = 1.1,
+        prefix_cache: bool = True,
+        cache: GenerationCache | None = None,
+        model_keys: dict[str | None, str] | None = None,
+    ) -> None:
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size
+        self.repetition_penalty = repetition_penalty
+        self.prefix_cache = prefix_cache
+        self.cache = cache
+        self.model_keys = model_keys or {}
+        self._per_row_adapters = False
+        self.stats = {
+            "requests": 0,
+            "batches": 0,
+            "generated_tokens": 0,
+            "prefill_tokens": 0,
+            "prefix_cached_tokens": 0,
+            "cached_answers": 0,
+            "seconds": 0.0,
+        }
+
+    def _caching(self) -> bool:
+        return self.prefix_cache and getattr(self.model.config, "use_cache", True)
+
+    def _adapter(self, request: GenerationRequest) -> str | None:
+        return request.adapter if request.adapter is not None else getattr(self.model, "active_adapter", None)
+
+    def _adapter_kwargs(self, adapters: list[str | None]) -> dict:
+        return {"adapter_names": adapters} if self._per_row_adapters else {}
+
+    def _prefill(
+        self, ids: list[int], base: _PromptPrefix | None = None, adapter: str | None = None
+    ) -> _PromptPrefix:
+        """Key/value cache of ``ids``, continuing from ``base`` when it covers their start."""
+        device = next(self.model.parameters()).device
+        input_ids = torch.tensor([ids], device=device)
+        skip = 0 if base is None else base.input_ids.shape[-1]
+        if skip == len(ids):
+            return base
+        past_key_values = None if base is None else copy.deepcopy(base.cache)
+        with torch.no_grad():
+            cache = self.model(
+                input_ids=input_ids[:, skip:],
+                past_key_values=past_key_values,
+                use_cache=True,
+                **self._adapter_kwargs([adapter]),
+            ).past_key_values
+        return _PromptPrefix(input_ids=input_ids, cache=cache)
+
+    def _prefix(self, system_prompt: str, adapter: str | None) -> _PromptPrefix | None:
+        if not self._caching():
+            return None
+        per_model = _prefix_caches.setdefault(self.model, {})
+        key = (adapter, system_prompt)
+        if key not in per_model:
+            ids = self.tokenizer(_system_block(system_prompt))["input_ids"]
+            # The last token can merge with the text that follows it; keep it in the suffix.
+            ids = ids[:-1]
+            per_model[key] = self._prefill(ids, adapter=adapter) if len(ids) > 1 else None
+        return per_model[key]
+
+    def generate(self, requests: Sequence[GenerationRequest]) -> list[str]:
+        if not requests:
+            return []
+        start = time.perf_counter()
+        self.model.eval()
+        self.tokenizer.padding_side = "left"
+        self._per_row_adapters = any(r.adapter is not None for r in requests)
+        if self._per_row_adapters and not hasattr(self.model, "peft_config"):
+            raise ValueError("Requests name LoRA adapters but the model is not a PeftModel")
+        prompts = [format_prompt(r.system_prompt, r.prompt) for r in requests]
+        input_ids = self.tokenizer(prompts)["input_ids"]
+        slots = [0]
+        for r in requests:
+            slots.append(slots[-1] + r.num_return_sequences)
+        responses: list[str] = [""] * slots[-1]
+        token_counts: list[int] = [0] * slots[-1]
+
+        keys: list[str | None] = [None] * slots[-1]
+        if self.cache is not None:
+            keys = _row_cache_keys(requests, self.model_keys, self.repetition_penalty)
+            found = self.cache.get_many([k for k in keys if k is not None])
+            for slot, key in enumerate(keys):
+                if key in found:
+                    responses[slot] = found[key].text
+            self.stats["cached_answers"] += sum(key in found for key in keys)
+        else:
+            found = {}
+        pending = [
+            [j for j in range(r.num_return_sequences) if keys[slots[i] + j] not in found]
+            for i, r in enumerate(requests)
+        ]
+
+        # Requests whose tokens start with their cached system block share a batch
+        # only with requests using the same block (from any adapter).
+        groups: dict[str | None, list[tuple[int, int, _PromptPrefix | None]]] = {}
+        for i, (r, ids) in enumerate(zip(requests, input_ids)):
+            if not pending[i]:
+                continue
+            adapter = self._adapter(r)
+            prefix = self._prefix(r.system_prompt, adapter)
+            if prefix is not None and ids[: prefix.input_ids.shape[-1]] != prefix.input_ids[0].tolist():
+                prefix = None
+            if len(pending[i]) > 1 and self._caching() and len(ids) > 1:
+                # Prefill the prompt once; every sampled answer continues from its last token.
+                shared = self._prefill(ids[:-1], prefix, adapter)
+                self.stats["prefill_tokens"] += shared.input_ids.shape[-1] - (
+                    0 if prefix is None else prefix.input_ids.shape[-1]
+                )
+                for offset in range(0, len(pending[i]), self.max_batch_size):
+                    rows = pending[i][offset : offset + self.max_batch_size]
+                    texts, counts = self._generate_batch(
+                        [ids[-1:]] * len(rows), [_sequence(r, j) for j in rows], [shared] * len(rows)
+                    )
+                    for j, text, count in zip(rows, texts, counts):
+                        responses[slots[i] + j], token_counts[slots[i] + j] = text, count
+                continue
+            members = groups.setdefault(None if prefix is None else r.system_prompt, [])
+            members.extend((slots[i] + j, i, prefix) for j in pending[i])
+
+        for members in groups.values():
+            skip = 0 if members[0][2] is None else members[0][2].input_ids.shape[-1]
+            order = sorted(members, key=lambda m: (len(input_ids[m[1]]), requests[m[1]].max_new_tokens))
+            for offset in range(0, len(order), self.max_batch_size):
+                batch = order[offset : offset + self.max_batch_size]
+                texts, counts = self._generate_batch(
+                    [input_ids[i][skip:] for _, i, _ in batch],
+                    [_sequence(requests[i], slot - slots[i]) for slot, i, _ in batch],
+                    None if skip == 0 else [prefix for _, _, prefix in batch],
+                )
+                for (slot, _, _), text, count in zip(batch, texts, counts):
+                    responses[slot], token_counts[slot] = text, count
+
+        if self.cache is not None:
+            self.cache.put_many(
+                {
+                    keys[slots[i] + j]: CachedGeneration(
+                        responses[slots[i] + j], len(input_ids[i]), token_counts[slots[i] + j]
+                    )
+                    for i in range(len(requests))
+                    for j in pending[i]
+                    if keys[slots[i] + j] is not None
+                }
+            )
+        self.stats["requests"] += len(requests)
+        self.stats["seconds"] += time.perf_counter() - start
+        return responses
+
+    def _generate_batch(
+        self,
+        suffix_ids: list[list[int]],
+        requests: list[GenerationRequest],
+        prefixes: list[_PromptPrefix] | None = None,
+    ) -> tuple[list[str], list[int]]:
+        """Answers of one batch and the number of tokens generated for each."""
+        device = next(self.model.parameters()).device
+        pad_token_id = self.tokenizer.pad_token_id
+        if pad_token_id is None:
+            pad_token_id = self.tokenizer.eos_token_id
+        width = max(len(ids) for ids in suffix_ids)
+        input_ids = torch.full((len(suffix_ids), width), pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(suffix_ids), width), dtype=torch.long)
+        for row, ids in enumerate(suffix_ids):
+            input_ids[row, width - len(ids) :] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, width - len(ids) :] = 1
+        input_ids, attention_mask = input_ids.to(device), attention_mask.to(device)
+        past_key_values = None
+        self.stats["prefill_tokens"] += int(attention_mask.sum())
+        if prefixes is not None:
+            prefix_ids, past_key_values = _stack_prefixes(prefixes)
+            input_ids = torch.cat([prefix_ids, input_ids], dim=-1)
+            attention_mask = torch.cat([torch.ones_like(prefix_ids), attention_mask], dim=-1)
+            self.stats["prefix_cached_tokens"] += prefix_ids.numel()
+        prompt_length = input_ids.shape[-1]
+        limits = torch.tensor([r.max_new_tokens for r in requests], device=device)
+        stopping = [_PerRowMaxTokens(prompt_length, limits)]
+        if any(r.stop_sequences for r in requests):
+            stopping.append(_PerRowStopSequences(self.tokenizer, prompt_length, [r.stop_sequences for r in requests]))
+        do_sample = not all(r.greedy for r in requests)
+        processors = []
+        if do_sample:
+            processors.append(
+                _PerRowSampling(
+                    torch.tensor([r.temperature for r in requests], device=device),
+                    torch.tensor([r.top_p for r in requests], device=device),
+                    torch.tensor([r.greedy for r in requests], device=device),
+                    [_row_generator(r, device) for r in requests],
+                )
+            )
+        with torch.no_grad():
+            output = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                past_key_values=past_key_values,
+                max_new_tokens=int(limits.max()),
+                pad_token_id=pad_token_id,
+                eos_token_id=self.tokenizer.eos_token_id,
+                do_sample=do_sample,
+                temperature=1.0,
+                top_p=1.0,
+                repetition_penalty=self.repetition_penalty,
+                logits_processor=LogitsProcessorList(processors),
+                stopping_criteria=StoppingCriteriaList(stopping),
+                **self._adapter_kwargs([self._adapter(r) for r in requests]),
+            )
+        gen_tokens = output[:, prompt_length:]
+        self.stats["batches"] += 1
+        counts = [int(row[: r.max_new_tokens].ne(pad_token_id).sum()) for row, r in zip(gen_tokens, requests)]
+        self.stats["generated_tokens"] += int(gen_tokens.ne(pad_token_id).sum())
+        texts = [self.tokenizer.decode(row[: r.max_new_tokens], skip_special_tokens=True) for row, r in zip(gen_tokens, requests)]
+        return [_cut_at_stop(text, r.stop_sequences).strip() for text, r in zip(texts, requests)], counts
+
+
 def generate_response(
     model,
     tokenizer,
@@ -63,36 +692,21 @@ def generate_response(
     top_p: float = 0.9,
 ) -> str:
     """Generate a response from the model."""
-    model.eval()
-    device = next(model.parameters()).device
-    formatted_prompt = format_prompt(system_prompt, prompt)
-    encoded = tokenizer(formatted_prompt, return_tensors="pt").to(device)
-    generation_kwargs = {
-        "max_new_tokens": max_new_tokens,
-        "pad_token_id": tokenizer.pad_token_id or tokenizer.eos_token_id,
-        "eos_token_id": tokenizer.eos_token_id,
-        "temperature": temperature,
-        "top_p": top_p,
-        "do_sample": True,
-        "repetition_penalty": 1.1,
-    }
-    with torch.no_grad():
-        output = model.generate(**encoded, **generation_kwargs)
-    gen_tokens = output[:, encoded["input_ids"].shape[-1] :]
-    response = tokenizer.decode(gen_tokens[0], skip_special_tokens=True).strip()
+    request = GenerationRequest(
+        prompt=prompt,
+        system_prompt=system_prompt,
+        max_new_tokens=max_new_tokens,
+        temperature=temperature,
+        top_p=top_p,
+    )
+    response = BatchedGenerator(model, tokenizer).generate([request])[0]
     logger.info(f"Generated response (len={len(response)}): {response[:200]}{'...' if len(response) > 200 else ''}")
     return response
 
 
 def compute_bleu_score(hypothesis: str, reference: str) -> float:
     """Compute BLEU score for a single hypothesis against a reference."""
-    bleu = BLEU(effective_order=True)
-    result = bleu.sentence_score(hypothesis, [reference])
-    return result.score
-
-
-# Cache the ROUGE evaluator to avoid reloading
-_rouge_evaluator = None
+    return bleu_scores([hypothesis], [reference])[0]
 
 
 def compute_rouge_l_score(hypothesis: str, reference: str) -> float:
@@ -101,12 +715,4 @@ def compute_rouge_l_score(hypothesis: str, reference: str) -> float:
     ROUGE-L uses longest common subsequence, which is better for semantically
     similar but lexically different answers compared to n-gram based BLEU.
     """
-    global _rouge_evaluator
-    if _rouge_evaluator is None:
-        logger.info("Loading ROUGE evaluator...")
-        _rouge_evaluator = evaluate.load("rouge")
-        logger.info("ROUGE evaluator loaded")
-    result = _rouge_evaluator.compute(predictions=[hypothesis], references=[reference])
-    score = result["rougeL"] * 100  # Scale to 0-100 like BLEU
-    logger.debug(f"ROUGE-L score: {score:.2f} for hypothesis len={len(hypothesis)}, reference len={len(reference)}")
-    return score
+    return rouge_l_scores([hypothesis], [reference])[0]
@@ -6,6 +6,9 @@ from pathlib import Path
 
 from transformers import TrainerCallback, TrainerControl, TrainerState, TrainingArguments
 
+from .profiling import ProfilerWindow
+from .telemetry import TelemetryRecorder
+
 # Global registry for manual stop requests (experiment_id -> should_stop)
 stop_registry: dict[str, bool] = {}
 
@@ -48,10 +51,11 @@ class StreamingLogsCallback(TrainerCallback):
 
 
 class StopCheckCallback(TrainerCallback):
-    """Callback that checks for manual stop requests."""
+    """Callback that checks for manual stop requests; ``stopped`` records whether one ended training."""
 
     def __init__(self, experiment_id: str) -> None:
         self.experiment_id = experiment_id
+        self.stopped = False
 
     def on_step_end(
         self,
@@ -61,5 +65,95 @@ class StopCheckCallback(TrainerCallback):
         **kwargs,
     ) -> None:
         if stop_registry.get(self.experiment_id):
+            self.stopped = True
             control.should_training_stop = True
 
+
+
+class TelemetryCallback(TrainerCallback):
+    """Callback that records per-step throughput and memory to telemetry.json."""
+
+    def __init__(self, output_path: Path) -> None:
+        self.recorder = TelemetryRecorder(output_path)
+        self._tokens_seen = 0
+
+    def on_train_begin(
+        self,
+        args: TrainingArguments,
+        state: TrainerState,
+        control: TrainerControl,
+        **kwargs,
+    ) -> None:
+        self._tokens_seen = state.num_input_tokens_seen or 0
+        self.recorder.start(resume_step=state.global_step)
+
+    def on_step_begin(
+        self,
+        args: TrainingArguments,
+        state: TrainerState,
+        control: TrainerControl,
+        **kwargs,
+    ) -> None:
+        self.recorder.step_begin()
+
+    def on_step_end(
+        self,
+        args: TrainingArguments,
+        state: TrainerState,
+        control: TrainerControl,
+        **kwargs,
+    ) -> None:
+        samples = args.per_device_train_batch_size * args.gradient_accumulation_steps * args.world_size
+        tokens_seen = state.num_input_tokens_seen or 0
+        tokens = tokens_seen - self._tokens_seen
+        self._tokens_seen = tokens_seen
+        self.recorder.step_end(state.global_step, samples=samples, tokens=tokens or None)
+
+    def on_evaluate(self, args, state, control, **kwargs) -> None:  # noqa: ANN001
+        self.recorder.skip_gap()
+
+    def on_save(self, args, state, control, **kwargs) -> None:  # noqa: ANN001
+        self.recorder.skip_gap()
+
+    def on_train_end(
+        self,
+        args: TrainingArguments,
+        state: TrainerState,
+        control: TrainerControl,
+        **kwargs,
+    ) -> None:
+        self.recorder.flush()
+
+
+class ProfilerCallback(TrainerCallback):
+    """Callback that records a bounded torch.profiler window of training steps."""
+
+    def __init__(self, output_dir: Path, active_steps: int = 5) -> None:
+        self.window = ProfilerWindow(output_dir, active_steps=active_steps)
+
+    def on_train_begin(
+        self,
+        args: TrainingArguments,
+        state: TrainerState,
+        control: TrainerControl,
+        **kwargs,
+    ) -> None:
+        self.window.start()
+
+    def on_step_end(
+        self,
+        args: TrainingArguments,
+        state: TrainerState,
+        control: TrainerControl,
+        **kwargs,
+    ) -> None:
+        self.window.step()
+
+    def on_train_end(
+        self,
+        args: TrainingArguments,
+        state: TrainerState,
+        control: TrainerControl,
+        **kwargs,
+    ) -> None:
+        self.window.stop()
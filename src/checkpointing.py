@@ -0,0 +1,282 @@
+"""Non-blocking checkpoint saves for Trainer runs.
+
+``Trainer._save_checkpoint`` serializes weights and optimizer state on the
+training thread, so every ``save_steps`` step stalls for the full write.
+``CheckpointingTrainer`` instead copies the tensors to host memory (pinned
+buffers, reused across saves, when training on CUDA), hands the copies to a
+background thread and returns. The thread writes into a hidden staging
+directory and renames it to ``checkpoint-<step>`` once complete, so a crash
+mid-write never leaves a half-written checkpoint for resume to pick up.
+
+For a PEFT model every checkpoint holds only the adapter weights. The
+default ``checkpoint_mode="full"`` also keeps the optimizer moments, so a
+resume continues exactly where the run stopped. ``"adapter"`` drops them and
+keeps only the adapter plus the small scheduler/RNG/trainer-state files.
+Such a checkpoint is a self-contained LoRA artifact, and resuming from it
+restarts the optimizer. The mode is checked when the trainer is built, not
+at the first save.
+"""
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Literal
+
+import torch
+from peft import PeftModel
+from peft.utils import get_peft_model_state_dict
+from safetensors.torch import save_file
+from transformers import Trainer
+from transformers.trainer import OPTIMIZER_NAME, SCHEDULER_NAME, TRAINER_STATE_NAME, TRAINING_ARGS_NAME
+from transformers.trainer_callback import ExportableState
+from transformers.trainer_utils import PREFIX_CHECKPOINT_DIR
+from transformers.utils import ADAPTER_SAFE_WEIGHTS_NAME, SAFE_WEIGHTS_NAME
+
+logger = logging.getLogger(__name__)
+
+CheckpointMode = Literal["full", "adapter"]
+
+_STAGING_PREFIX = ".tmp-"
+
+
+class HostSnapshot:
+    """Copies (nested) tensors off the device into host buffers reused between saves."""
+
+    def __init__(self) -> None:
+        self._buffers: dict[str, torch.Tensor] = {}
+        self._pending_cuda = False
+
+    def _copy(self, key: str, tensor: torch.Tensor) -> torch.Tensor:
+        tensor = tensor.detach()
+        if tensor.device.type != "cuda":
+            # The optimizer updates CPU tensors in place; the writer needs its own copy.
+            return tensor.clone()
+        buf = self._buffers.get(key)
+        if buf is None or buf.shape != tensor.shape or buf.dtype != tensor.dtype:
+            buf = torch.empty(tensor.shape, dtype=tensor.dtype, pin_memory=True)
+            self._buffers[key] = buf
+        buf.copy_(tensor, non_blocking=True)
+        self._pending_cuda = True
+        return buf
+
+    def take(self, obj: Any, prefix: str = "") -> Any:
+        if isinstance(obj, torch.Tensor):
+            return self._copy(prefix, obj)
+        if isinstance(obj, dict):
+            return {k: self.take(v, f"{prefix}.{k}") for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return type(obj)(self.take(v, f"{prefix}.{i}") for i, v in enumerate(obj))
+        return copy.deepcopy(obj)
+
+    def synchronize(self) -> None:
+        """Wait for queued device-to-host copies; call before handing buffers to the writer."""
+        if self._pending_cuda:
+            torch.cuda.synchronize()
+            self._pending_cuda = False
+
+
+class CheckpointWriter:
+    """Runs at most one checkpoint write at a time on a background thread."""
+
+    def __init__(self) -> None:
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self.write_seconds: list[float] = []
+
+    def _run(self, job: Callable[[], None]) -> None:
+        start = time.perf_counter()
+        try:
+            job()
+        except BaseException as exc:  # surfaced on the training thread by wait()
+            self._error = exc
+        finally:
+            self.write_seconds.append(time.perf_counter() - start)
+
+    def submit(self, job: Callable[[], None], background: bool = True) -> None:
+        self.wait()
+        if not background:
+            self._run(job)
+            self._raise()
+            return
+        self._thread = threading.Thread(target=self._run, args=(job,), name="checkpoint-writer")
+        self._thread.start()
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._raise()
+
+    def _raise(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Checkpoint write failed") from error
+
+
+def _commit(staging: Path, final: Path) -> None:
+    if final.exists():
+        shutil.rmtree(final)
+    os.replace(staging, final)
+
+
+def directory_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def prune_checkpoints(output_dir: Path) -> int:
+    """Delete ``checkpoint-*`` dirs of a finished run. Returns the bytes freed."""
+    freed = 0
+    for checkpoint in Path(output_dir).glob(f"{PREFIX_CHECKPOINT_DIR}-*"):
+        if checkpoint.is_dir():
+            freed += directory_size(checkpoint)
+            shutil.rmtree(checkpoint)
+    if freed:
+        logger.info("Pruned %.1f MiB of checkpoints from %s", freed / 2**20, output_dir)
+    return freed
+
+
+def _untied(state_dict: dict[str, torch.Tensor]) -> dict[str, torch.Tensor]:
+    # safetensors rejects aliased tensors; tied weights are restored by the model on load.
+    seen: set[tuple[int, int]] = set()
+    out = {}
+    for name, tensor in state_dict.items():
+        key = (tensor.untyped_storage().data_ptr(), tensor.storage_offset())
+        if key in seen:
+            continue
+        seen.add(key)
+        out[name] = tensor
+    return out
+
+
+class CheckpointingTrainer(Trainer):
+    """``Trainer`` whose periodic checkpoints are written off the training thread."""
+
+    def __init__(
+        self,
+        *args,
+        async_checkpoint: bool = True,
+        checkpoint_mode: CheckpointMode = "full",
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        if checkpoint_mode not in ("full", "adapter"):
+            msg = f"Unknown checkpoint_mode {checkpoint_mode!r}; expected 'full' or 'adapter'"
+            raise ValueError(msg)
+        if checkpoint_mode == "adapter" and not isinstance(self.accelerator.unwrap_model(self.model), PeftModel):
+            msg = "checkpoint_mode='adapter' requires a PEFT (LoRA) model"
+            raise ValueError(msg)
+        self.async_checkpoint = async_checkpoint
+        self.checkpoint_mode = checkpoint_mode
+        self.checkpoint_stall_seconds: list[float] = []
+        self._snapshot = HostSnapshot()
+        self._writer = CheckpointWriter()
+
+    def _use_default_save(self) -> bool:
+        if self.is_deepspeed_enabled or self.is_fsdp_enabled or self.args.world_size > 1:
+            return True
+        return not self.async_checkpoint and self.checkpoint_mode == "full"
+
+    def train(self, *args, **kwargs):
+        for stale in Path(self.args.output_dir).glob(f"{_STAGING_PREFIX}{PREFIX_CHECKPOINT_DIR}-*"):
+            shutil.rmtree(stale, ignore_errors=True)
+        try:
+            return super().train(*args, **kwargs)
+        finally:
+            self._writer.wait()
+
+    def _load_best_model(self):
+        self._writer.wait()
+        return super()._load_best_model()
+
+    def _save_checkpoint(self, model, trial):
+        start = time.perf_counter()
+        if self._use_default_save():
+            super()._save_checkpoint(model, trial)
+        else:
+            # Finish the previous write first: its host buffers are about to be reused.
+            self._writer.wait()
+            job = self._stage_checkpoint(trial)
+            self._writer.submit(job, background=self.async_checkpoint)
+        self.checkpoint_stall_seconds.append(time.perf_counter() - start)
+
+    def _stage_checkpoint(self, trial) -> Callable[[], None]:
+        """Write the small files now and return a job that writes the tensors and commits."""
+        checkpoint_folder = f"{PREFIX_CHECKPOINT_DIR}-{self.state.global_step}"
+        if self.hp_search_backend is None and trial is None:
+            self.store_flos()
+        run_dir = Path(self._get_output_dir(trial=trial))
+        final = run_dir / checkpoint_folder
+        staging = run_dir / f"{_STAGING_PREFIX}{checkpoint_folder}"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        model = self.accelerator.unwrap_model(self.model)
+        if isinstance(model, PeftModel):
+            adapter = model.active_adapter
+            weights = get_peft_model_state_dict(model, adapter_name=adapter)
+            weights_name = ADAPTER_SAFE_WEIGHTS_NAME
+            peft_config = copy.copy(model.peft_config[adapter])
+            peft_config.inference_mode = True
+            peft_config.save_pretrained(str(staging))
+        else:
+            weights = _untied(model.state_dict())
+            weights_name = SAFE_WEIGHTS_NAME
+            model.config.save_pretrained(str(staging))
+            if model.can_generate() and model.generation_config is not None:
+                model.generation_config.save_pretrained(str(staging))
+        if self.processing_class is not None:
+            self.processing_class.save_pretrained(str(staging))
+        torch.save(self.args, staging / TRAINING_ARGS_NAME)
+
+        if self.args.save_strategy in ("steps", "epoch") and self.state.best_global_step:
+            best = run_dir / f"{PREFIX_CHECKPOINT_DIR}-{self.state.best_global_step}"
+            if best.exists() or best == final:
+                self.state.best_model_checkpoint = str(best)
+
+        optimizer_state = None
+        if not self.args.save_only_model:
+            if self.checkpoint_mode == "full":
+                optimizer_state = self._snapshot.take(self.optimizer.state_dict(), "optimizer")
+            torch.save(self.lr_scheduler.state_dict(), staging / SCHEDULER_NAME)
+            self._save_scaler(str(staging))
+            self._save_rng_state(str(staging))
+
+        for cb in [c for c in self.callback_handler.callbacks + [self.control] if isinstance(c, ExportableState)]:
+            cb_name = cb.__class__.__name__
+            if isinstance(self.state.stateful_callbacks[cb_name], list):
+                self.state.stateful_callbacks[cb_name].append(cb.state())
+            else:
+                self.state.stateful_callbacks[cb_name] = cb.state()
+        self.state.save_to_json(str(staging / TRAINER_STATE_NAME))
+
+        weights = self._snapshot.take(weights, "model")
+        self._snapshot.synchronize()
+
+        def job() -> None:
+            save_file(weights, str(staging / weights_name), metadata={"format": "pt"})
+            if optimizer_state is not None:
+                torch.save(optimizer_state, staging / OPTIMIZER_NAME)
+            _commit(staging, final)
+            self._rotate_checkpoints(use_mtime=False, output_dir=str(run_dir))
+            logger.info("Checkpoint committed to %s", final)
+
+        return job
+
+    def checkpoint_summary(self) -> dict[str, Any]:
+        stalls = self.checkpoint_stall_seconds
+        writes = self._writer.write_seconds
+        if not stalls:
+            return {}
+        return {
+            "mode": self.checkpoint_mode,
+            "async": self.async_checkpoint,
+            "saves": len(stalls),
+            "stall_seconds_mean": round(sum(stalls) / len(stalls), 4),
+            "stall_seconds_max": round(max(stalls), 4),
+            "write_seconds_mean": round(sum(writes) / len(writes), 4) if writes else None,
+        }
@@ -93,6 +93,33 @@ class TrainingConfig(BaseModel):
         default=False,
         description="Run all available benchmarks after experiment completes.",
     )
+    auto_batch_size: bool = Field(
+        default=False,
+        description=(
+            "Search the largest micro-batch that fits memory and derive "
+            "gradient_accumulation_steps to keep the effective batch size."
+        ),
+    )
+    memory_budget_mb: PositiveFloat | None = Field(
+        default=None,
+        description="Budget for auto_batch_size; device memory on GPU, process RSS on CPU.",
+    )
+    allow_effective_batch_change: bool = Field(
+        default=False,
+        description=(
+            "Let auto_batch_size round the effective batch up when its divisors "
+            "would leave less than half of the micro-batch that fits."
+        ),
+    )
+    profile: bool = Field(
+        default=False,
+        description="Capture a torch.profiler trace of a few steps into output_dir/profiler.",
+    )
+    profile_steps: PositiveInt = Field(default=5, description="Active steps recorded when profiling.")
+    async_checkpoint: bool = Field(
+        default=True,
+        description="Write checkpoints on a background thread instead of stalling the training step.",
+    )
 
     @model_validator(mode="after")
     def _validate_paths(self) -> "TrainingConfig":
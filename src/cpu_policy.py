@@ -0,0 +1,182 @@
+"""CPU thread budgets for concurrently running subprocess runners.
+
+Every runner process sizes torch's intra-op pool to all visible cores by
+default, so launching several local experiments at once oversubscribes the
+machine. The API splits the cores into a fixed number of slots
+(``CPU_RUNNER_SLOTS``, default one per 4 cores), reserves a slot per local
+runner, queueing launches while all are taken, and ships the slot's thread
+budget in the runner payload under the ``"cpu"`` key; the runner applies it
+before building any model. A queued experiment stays ``pending`` and can be
+stopped before it ever starts.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+# Environment knobs read by the API process.
+RUNNER_SLOTS_ENV = "CPU_RUNNER_SLOTS"
+PIN_RUNNERS_ENV = "CPU_PIN_RUNNERS"
+
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+@dataclass(frozen=True)
+class CPUPolicy:
+    num_threads: int
+    interop_threads: int
+    cores: tuple[int, ...] | None = None
+
+    def to_payload(self) -> dict:
+        return {
+            "num_threads": self.num_threads,
+            "interop_threads": self.interop_threads,
+            "cores": list(self.cores) if self.cores else None,
+        }
+
+    @classmethod
+    def from_payload(cls, raw: dict | None) -> CPUPolicy | None:
+        if not raw:
+            return None
+        cores = raw.get("cores")
+        return cls(
+            num_threads=max(1, int(raw.get("num_threads", 1))),
+            interop_threads=max(1, int(raw.get("interop_threads", 1))),
+            cores=tuple(int(c) for c in cores) if cores else None,
+        )
+
+    def env(self) -> dict[str, str]:
+        """Thread-count variables for native BLAS/OpenMP pools in a child process."""
+        return {name: str(self.num_threads) for name in _THREAD_ENV_VARS}
+
+
+def available_cores() -> list[int]:
+    """Cores this process may run on (respects cgroup/taskset restrictions)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_cpu_policy(
+    slot: int,
+    concurrency: int,
+    cores: list[int] | None = None,
+    pin: bool = False,
+) -> CPUPolicy:
+    """Split the available cores evenly across ``concurrency`` runners.
+
+    ``slot`` selects which contiguous block of cores to pin to when ``pin`` is
+    set. Pinning is skipped when there are fewer cores than runners, since
+    blocks would have to overlap anyway.
+    """
+    cores = cores if cores is not None else available_cores()
+    concurrency = max(1, concurrency)
+    per_runner = max(1, len(cores) // concurrency)
+    # Inter-op parallelism only pays off with plenty of intra-op threads; keep it small.
+    interop = max(1, min(4, per_runner // 4))
+
+    pinned: tuple[int, ...] | None = None
+    if pin and len(cores) >= concurrency:
+        start = (slot % concurrency) * per_runner
+        pinned = tuple(cores[start:start + per_runner])
+    return CPUPolicy(num_threads=per_runner, interop_threads=interop, cores=pinned)
+
+
+def apply_cpu_policy(policy: CPUPolicy | dict | None) -> CPUPolicy | None:
+    """Apply a policy to the current process. Returns the policy that was applied."""
+    if isinstance(policy, dict) or policy is None:
+        policy = CPUPolicy.from_payload(policy)
+    if policy is None:
+        return None
+
+    for name, value in policy.env().items():
+        os.environ[name] = value
+
+    if policy.cores and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, set(policy.cores))
+        except OSError:
+            pass
+
+    import torch
+
+    torch.set_num_threads(policy.num_threads)
+    try:
+        torch.set_num_interop_threads(policy.interop_threads)
+    except RuntimeError:
+        # Interop pool size is fixed once any parallel work has run in this process.
+        pass
+    return policy
+
+
+def default_slot_count(cores: list[int] | None = None) -> int:
+    """Concurrent local runners: ``CPU_RUNNER_SLOTS`` if set, else one per 4 cores; never more than the cores."""
+    cores = cores if cores is not None else available_cores()
+    configured = int(os.environ.get(RUNNER_SLOTS_ENV, "0") or 0)
+    slots = configured if configured > 0 else len(cores) // 4
+    return max(1, min(slots, len(cores)))
+
+
+class RunnerSlots:
+    """Thread-safe registry of local runners holding one of a fixed number of CPU slots.
+
+    Budgets are sized from the slot count, not from how many runners happen
+    to be live, so a runner's budget never depends on launch order: the
+    live policies' threads sum to at most the core count and pinned blocks
+    never overlap. Once every slot is taken, ``acquire`` blocks until one is
+    released or ``cancelled`` returns true.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Condition()
+        self._slots: dict[str, int] = {}
+        self._waiting: set[str] = set()
+
+    def acquire(
+        self,
+        experiment_id: str,
+        cancelled: Callable[[], bool] | None = None,
+        poll_seconds: float = 0.5,
+    ) -> CPUPolicy | None:
+        """Reserve a slot and return its policy; ``None`` if ``cancelled`` fired while queued."""
+        cores = available_cores()
+        count = default_slot_count(cores)
+        with self._lock:
+            if experiment_id not in self._slots:
+                self._waiting.add(experiment_id)
+                try:
+                    while not self._lock.wait_for(lambda: len(self._slots) < count, timeout=poll_seconds):
+                        if cancelled is not None and cancelled():
+                            return None
+                finally:
+                    self._waiting.discard(experiment_id)
+                taken = set(self._slots.values())
+                self._slots[experiment_id] = next(i for i in range(count) if i not in taken)
+            slot = self._slots[experiment_id]
+        pin = os.environ.get(PIN_RUNNERS_ENV, "").lower() in ("1", "true", "yes")
+        return plan_cpu_policy(slot, count, cores=cores, pin=pin)
+
+    def release(self, experiment_id: str) -> None:
+        with self._lock:
+            self._slots.pop(experiment_id, None)
+            self._lock.notify_all()
+
+    def holds(self, experiment_id: str) -> bool:
+        """Whether a runner for ``experiment_id`` holds a slot or is queued for one."""
+        with self._lock:
+            return experiment_id in self._slots or experiment_id in self._waiting
+
+    def active(self) -> int:
+        with self._lock:
+            return len(self._slots)
+
+
+# Shared by every local runner launched from this API process.
+runner_slots = RunnerSlots()
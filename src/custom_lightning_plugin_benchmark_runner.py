@@ -61,21 +61,16 @@ def _to_jsonable(val: Any) -> Any:
     return str(val)
 
 
-def _run(payload: BenchmarkPayload) -> dict[str, Any]:
+def _load_lightning_module(payload: BenchmarkPayload):
+    """Instantiate the uploaded LightningModule and restore its checkpoint weights."""
     import torch
 
-    output_dir = Path(payload.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
     lm_path = Path(payload.lightning_module_path)
     ckpt_path = Path(payload.checkpoint_path)
-    bm_path = Path(payload.benchmark_plugin_path)
     if not lm_path.exists():
         _fail(f"lightning_module_path does not exist: {lm_path}")
     if not ckpt_path.exists():
         _fail(f"checkpoint_path does not exist: {ckpt_path}")
-    if not bm_path.exists():
-        _fail(f"benchmark_plugin_path does not exist: {bm_path}")
 
     lm_mod = _load_module_from_path("uploaded_lightning_module_for_plugin_benchmark", lm_path)
     if not hasattr(lm_mod, payload.lightning_module_class_name):
@@ -92,12 +87,21 @@ def _run(payload: BenchmarkPayload) -> dict[str, Any]:
         _fail("Checkpoint is missing 'state_dict'")
     module.load_state_dict(ckpt["state_dict"], strict=True)
     module.eval()
+    return module
+
 
+def _load_benchmark_function(payload: BenchmarkPayload):
+    bm_path = Path(payload.benchmark_plugin_path)
+    if not bm_path.exists():
+        _fail(f"benchmark_plugin_path does not exist: {bm_path}")
     bm_mod = _load_module_from_path("uploaded_benchmark_plugin", bm_path)
     if not hasattr(bm_mod, payload.benchmark_function_name):
         _fail(f"Benchmark function not found: {payload.benchmark_function_name}")
-    run_benchmark = getattr(bm_mod, payload.benchmark_function_name)
+    return getattr(bm_mod, payload.benchmark_function_name)
 
+
+def _evaluate(payload: BenchmarkPayload, module, run_benchmark) -> dict[str, Any]:
+    """Call the plugin's benchmark function on a loaded module and validate its output."""
     out = run_benchmark(payload.config, module, payload.benchmark_spec)
     if not isinstance(out, dict):
         _fail("run_benchmark must return a dict")
@@ -109,6 +113,13 @@ def _run(payload: BenchmarkPayload) -> dict[str, Any]:
     return out
 
 
+def _run(payload: BenchmarkPayload) -> dict[str, Any]:
+    output_dir = Path(payload.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    run_benchmark = _load_benchmark_function(payload)
+    return _evaluate(payload, _load_lightning_module(payload), run_benchmark)
+
+
 def main() -> None:
     if len(sys.argv) != 2:
         _fail("Usage: python -m src.custom_lightning_plugin_benchmark_runner <payload_json_path>")
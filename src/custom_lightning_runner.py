@@ -8,7 +8,9 @@ from __future__ import annotations
 
 import importlib.util
 import json
+import os
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -18,6 +20,7 @@ try:
 except Exception:  # pragma: no cover
     # Fallback for environments where `lightning.pytorch` import paths differ.
     from lightning.pytorch.callbacks.callback import Callback  # type: ignore
+from lightning.pytorch.plugins.io import TorchCheckpointIO
 
 
 @dataclass(frozen=True)
@@ -30,6 +33,7 @@ class RunnerPayload:
     lightning_module_class_name: str
     dataloaders_path: str
     dataloaders_function_name: str
+    cpu: dict | None = None
 
 
 def _fail(msg: str) -> None:
@@ -114,6 +118,91 @@ class _JsonArtifactsCallback(Callback):
         self.logs_path.write_text(json.dumps(self._log_history, indent=2), encoding="utf-8")
 
 
+def _batch_size(batch: Any) -> int | None:
+    import torch
+
+    if isinstance(batch, torch.Tensor):
+        return int(batch.shape[0]) if batch.dim() > 0 else None
+    if isinstance(batch, dict):
+        batch = list(batch.values())
+    if isinstance(batch, (list, tuple)):
+        for item in batch:
+            size = _batch_size(item)
+            if size is not None:
+                return size
+    return None
+
+
+class _TelemetryCallback(Callback):
+    """Lightning callback writing per-step throughput/memory to telemetry.json."""
+
+    def __init__(self, output_dir: Path) -> None:
+        from .telemetry import TELEMETRY_FILENAME, TelemetryRecorder
+
+        self.recorder = TelemetryRecorder(output_dir / TELEMETRY_FILENAME)
+
+    def on_train_start(self, trainer, pl_module) -> None:  # noqa: ANN001
+        self.recorder.start()
+
+    def on_train_batch_start(self, trainer, pl_module, batch, batch_idx) -> None:  # noqa: ANN001
+        self.recorder.step_begin()
+
+    def on_train_batch_end(self, trainer, pl_module, outputs, batch, batch_idx) -> None:  # noqa: ANN001
+        self.recorder.step_end(int(trainer.global_step), samples=_batch_size(batch))
+
+    def on_validation_end(self, trainer, pl_module) -> None:  # noqa: ANN001
+        self.recorder.skip_gap()
+
+    def on_train_end(self, trainer, pl_module) -> None:  # noqa: ANN001
+        self.recorder.flush()
+
+
+class _ProfilerCallback(Callback):
+    """Lightning callback recording a bounded torch.profiler window of training steps."""
+
+    def __init__(self, output_dir: Path, active_steps: int) -> None:
+        from .profiling import ProfilerWindow
+
+        self.window = ProfilerWindow(output_dir, active_steps=active_steps)
+
+    def on_train_start(self, trainer, pl_module) -> None:  # noqa: ANN001
+        self.window.start()
+
+    def on_train_batch_end(self, trainer, pl_module, outputs, batch, batch_idx) -> None:  # noqa: ANN001
+        self.window.step()
+
+    def on_train_end(self, trainer, pl_module) -> None:  # noqa: ANN001
+        self.window.stop()
+
+
+class _SnapshotCheckpointIO(TorchCheckpointIO):
+    """Copies the checkpoint to host memory, then writes it (optionally in the background) and renames into place."""
+
+    def __init__(self, background: bool) -> None:
+        from .checkpointing import CheckpointWriter, HostSnapshot
+
+        super().__init__()
+        self.background = background
+        self.writer = CheckpointWriter()
+        self._snapshot = HostSnapshot()
+
+    def save_checkpoint(self, checkpoint, path, storage_options=None) -> None:  # noqa: ANN001
+        self.writer.wait()
+        snapshot = self._snapshot.take(checkpoint)
+        self._snapshot.synchronize()
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+
+        def job() -> None:
+            TorchCheckpointIO.save_checkpoint(self, snapshot, tmp, storage_options)
+            os.replace(tmp, path)
+
+        self.writer.submit(job, background=self.background)
+
+    def teardown(self) -> None:
+        self.writer.wait()
+
+
 def _run(payload: RunnerPayload) -> dict[str, Any]:
     # Import lightning only inside the subprocess runner logic.
     try:
@@ -122,6 +211,10 @@ def _run(payload: RunnerPayload) -> dict[str, Any]:
         import lightning as pl  # type: ignore
     from lightning.pytorch.utilities.model_helpers import is_overridden
 
+    from .cpu_policy import apply_cpu_policy
+
+    apply_cpu_policy(payload.cpu)
+
     output_dir = Path(payload.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -156,8 +249,16 @@ def _run(payload: RunnerPayload) -> dict[str, Any]:
         _fail('build_dataloaders must return a dict containing key "train"')
 
     cb = _JsonArtifactsCallback(output_dir)
+    telemetry_cb = _TelemetryCallback(output_dir)
     train_cfg = payload.config.get("training", {}) if isinstance(payload.config, dict) else {}
 
+    callbacks: list[Callback] = [cb, telemetry_cb]
+    if train_cfg.get("profile"):
+        callbacks.append(_ProfilerCallback(output_dir, int(train_cfg.get("profile_steps", 5))))
+
+    checkpoint_io = _SnapshotCheckpointIO(background=bool(train_cfg.get("async_checkpoint", True)))
+    weights_only = bool(train_cfg.get("checkpoint_weights_only", False))
+
     trainer = pl.Trainer(
         default_root_dir=str(output_dir),
         max_epochs=int(train_cfg.get("max_epochs", 1)),
@@ -165,7 +266,8 @@ def _run(payload: RunnerPayload) -> dict[str, Any]:
         devices=train_cfg.get("devices", "auto"),
         precision=str(train_cfg.get("precision", "32")),
         log_every_n_steps=int(train_cfg.get("log_every_n_steps", 10)),
-        callbacks=[cb],
+        callbacks=callbacks,
+        plugins=[checkpoint_io],
         enable_checkpointing=False,
         logger=False,
     )
@@ -173,8 +275,11 @@ def _run(payload: RunnerPayload) -> dict[str, Any]:
     trainer.fit(model=module, train_dataloaders=dls["train"], val_dataloaders=dls.get("val"))
 
     # Persist a checkpoint for downstream evaluation (benchmarks, analysis).
+    # Written in the background while validate/test run below.
     ckpt_path = output_dir / "model.ckpt"
-    trainer.save_checkpoint(str(ckpt_path))
+    save_start = time.perf_counter()
+    trainer.save_checkpoint(str(ckpt_path), weights_only=weights_only)
+    stall_seconds = time.perf_counter() - save_start
 
     metrics: dict[str, Any] = {}
     if dls.get("val") is not None:
@@ -187,6 +292,14 @@ def _run(payload: RunnerPayload) -> dict[str, Any]:
         metrics["test"] = _to_jsonable(out)
 
     metrics["callback_metrics"] = _to_jsonable(getattr(trainer, "callback_metrics", {}) or {})
+    metrics["throughput"] = telemetry_cb.recorder.summary()
+    checkpoint_io.writer.wait()
+    metrics["checkpointing"] = {
+        "async": checkpoint_io.background,
+        "weights_only": weights_only,
+        "stall_seconds": round(stall_seconds, 4),
+        "write_seconds": round(checkpoint_io.writer.write_seconds[-1], 4),
+    }
     (output_dir / "metrics.json").write_text(json.dumps(metrics, indent=2), encoding="utf-8")
     return metrics
 
@@ -59,15 +59,13 @@ def _to_jsonable(val: Any) -> Any:
     return str(val)
 
 
-def _run(payload: BenchmarkPayload) -> dict[str, Any]:
+def _load_lightning_module(payload: BenchmarkPayload):
+    """Instantiate the uploaded LightningModule and restore its checkpoint weights."""
     try:
         import torch
     except Exception as e:  # pragma: no cover
         _fail(f"torch is required for regression benchmark: {e}")
 
-    output_dir = Path(payload.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
     lm_path = Path(payload.lightning_module_path)
     ckpt_path = Path(payload.checkpoint_path)
     if not lm_path.exists():
@@ -75,11 +73,6 @@ def _run(payload: BenchmarkPayload) -> dict[str, Any]:
     if not ckpt_path.exists():
         _fail(f"checkpoint_path does not exist: {ckpt_path}")
 
-    if payload.n_points <= 1:
-        _fail("n_points must be >= 2")
-    if not (payload.x_max > payload.x_min):
-        _fail("x_max must be > x_min")
-
     lm_mod = _load_module_from_path("uploaded_lightning_module_for_benchmark", lm_path)
     if not hasattr(lm_mod, payload.lightning_module_class_name):
         _fail(f"LightningModule class not found: {payload.lightning_module_class_name}")
@@ -95,6 +88,17 @@ def _run(payload: BenchmarkPayload) -> dict[str, Any]:
         _fail("Checkpoint is missing 'state_dict'")
     module.load_state_dict(ckpt["state_dict"], strict=True)
     module.eval()
+    return module
+
+
+def _evaluate(payload: BenchmarkPayload, module) -> dict[str, Any]:
+    """MSE/MAE of a loaded module against sin(x) on the payload's grid."""
+    import torch
+
+    if payload.n_points <= 1:
+        _fail("n_points must be >= 2")
+    if not (payload.x_max > payload.x_min):
+        _fail("x_max must be > x_min")
 
     # Evaluate on a deterministic grid
     x = torch.linspace(float(payload.x_min), float(payload.x_max), int(payload.n_points), dtype=torch.float32).view(-1, 1)
@@ -119,6 +123,12 @@ def _run(payload: BenchmarkPayload) -> dict[str, Any]:
     }
 
 
+def _run(payload: BenchmarkPayload) -> dict[str, Any]:
+    output_dir = Path(payload.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return _evaluate(payload, _load_lightning_module(payload))
+
+
 def main() -> None:
     if len(sys.argv) != 2:
         _fail("Usage: python -m src.custom_lightning_sin_benchmark_runner <payload_json_path>")
@@ -0,0 +1,202 @@
+"""Aggregate statistics for multi-item benchmark scores.
+
+A suite eval reports the mean BLEU/ROUGE-L over its questions. On its own,
+that mean can't tell a real difference between two checkpoints from
+sampling noise, so every aggregate also carries a Student-t confidence
+interval over the per-item scores.
+
+The same interval drives sequential early stopping of multi-run evals. Runs
+are added until the interval is narrow enough, or until it no longer overlaps
+any other experiment's score (the rank can't change), so converged evals
+don't spend their full ``num_runs``.
+
+``pairwise_significance`` compares many evals at once. It gives a bootstrap
+interval for each mean and, for every pair, the interval and p-value of the
+difference. It also estimates how many more samples per side would separate
+a pair that is not yet significant. Evals scored on the same units (the
+same suite questions, or the same run numbers) are resampled jointly, so
+their comparison is paired.
+"""
+from __future__ import annotations
+
+import math
+from typing import Hashable, Mapping, Sequence
+
+import numpy as np
+from scipy import stats
+
+
+def mean_ci(values: Sequence[float], confidence: float = 0.95) -> dict[str, float | int]:
+    """Mean, sample std and two-sided t interval of ``values``."""
+    n = len(values)
+    if n == 0:
+        raise ValueError("mean_ci needs at least one value")
+    mean = math.fsum(values) / n
+    if n == 1:
+        return {"n": 1, "mean": mean, "std": 0.0, "ci_low": mean, "ci_high": mean, "confidence": confidence}
+    std = math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (n - 1))
+    half = float(stats.t.ppf((1 + confidence) / 2, df=n - 1)) * std / math.sqrt(n)
+    return {
+        "n": n,
+        "mean": mean,
+        "std": std,
+        "ci_low": mean - half,
+        "ci_high": mean + half,
+        "confidence": confidence,
+    }
+
+
+def sequential_stop(
+    values: Sequence[float],
+    tolerance: float,
+    others: Sequence[float] = (),
+    confidence: float = 0.95,
+) -> str | None:
+    """Why sampling more runs is no longer needed, or ``None`` to keep going.
+
+    ``"converged"``: the interval's half-width is at most ``tolerance``.
+    ``"rank_settled"``: none of ``others`` (scores of other experiments on the
+    same benchmark) lies inside the interval.
+    """
+    if len(values) < 2:
+        return None
+    ci = mean_ci(values, confidence)
+    if (ci["ci_high"] - ci["ci_low"]) / 2 <= tolerance:
+        return "converged"
+    if others and not any(ci["ci_low"] <= score <= ci["ci_high"] for score in others):
+        return "rank_settled"
+    return None
+
+
+def _extra_samples(
+    delta: np.ndarray, var_a: np.ndarray, var_b: np.ndarray, n_a: np.ndarray, n_b: np.ndarray, z: float, cap: int
+) -> np.ndarray:
+    """Smallest k with z * sqrt(var_a / (n_a + k) + var_b / (n_b + k)) <= |delta|, found by bisection; -1 past ``cap``."""
+    target = (np.abs(delta) / z) ** 2
+
+    def fits(k: np.ndarray) -> np.ndarray:
+        return var_a / (n_a + k) + var_b / (n_b + k) <= target
+
+    low = np.zeros(delta.shape, dtype=np.int64)
+    high = np.full(delta.shape, cap, dtype=np.int64)
+    reachable = fits(high)
+    while np.any(low < high):
+        mid = (low + high) // 2
+        ok = fits(mid)
+        high = np.where(ok, mid, high)
+        low = np.where(ok, low, np.minimum(mid + 1, high))
+    return np.where(reachable, high, -1)
+
+
+def _at_least_one(extra: int) -> int:
+    # A pair that is not significant yet needs at least one more sample, whatever the normal approximation says.
+    return extra if extra == -1 else max(1, extra)
+
+
+def pairwise_significance(
+    samples: Sequence[Mapping[Hashable, float]],
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    power: float = 0.8,
+    max_extra: int = 10_000,
+    seed: int = 0,
+) -> dict[str, list[dict]]:
+    """Bootstrap intervals per eval and significance for every pair of evals.
+
+    ``samples[i]`` maps a unit (run number or item index) to eval i's score
+    on it. Evals with the same set of units share their bootstrap draws, so
+    their differences are paired; other pairs are resampled independently.
+    The draws are multinomial weights, so each resample of a whole group of
+    evals is one matrix product.
+
+    Each pair gets the mean difference ``a - b``, its percentile interval and
+    a two-sided bootstrap p-value (``None`` when a side has one sample). It
+    also gets ``extra_samples``: the
+    samples to add to each side before a difference of the observed size is
+    significant at ``confidence`` with probability ``power``. That is 0 when
+    the pair is already significant, ``None`` when the difference is zero or
+    a side has one sample, and -1 when more than ``max_extra`` are needed.
+    """
+    n_evals = len(samples)
+    alpha = 1 - confidence
+    rng = np.random.default_rng(seed)
+    units = [tuple(sorted(s)) for s in samples]
+    values = [np.array([s[u] for u in keys], dtype=np.float64) for s, keys in zip(samples, units)]
+    counts = np.array([len(v) for v in values], dtype=np.int64)
+    if np.any(counts == 0):
+        raise ValueError("pairwise_significance needs at least one score per eval")
+    means = np.array([v.mean() for v in values])
+    variances = np.array([v.var(ddof=1) if len(v) > 1 else np.nan for v in values])
+
+    groups: dict[tuple, list[int]] = {}
+    for index, keys in enumerate(units):
+        groups.setdefault(keys, []).append(index)
+    boot = np.empty((n_evals, resamples))
+    for keys, members in groups.items():
+        n = len(keys)
+        weights = rng.multinomial(n, np.full(n, 1.0 / n), size=resamples) / n
+        boot[members] = np.stack([values[i] for i in members]) @ weights.T
+    low_q, high_q = 100 * alpha / 2, 100 * (1 - alpha / 2)
+    eval_low, eval_high = np.percentile(boot, [low_q, high_q], axis=1)
+
+    a, b = np.triu_indices(n_evals, k=1)
+    group_of = {i: keys for keys, members in groups.items() for i in members}
+    paired = np.array([group_of[i] == group_of[j] for i, j in zip(a, b)], dtype=bool)
+    delta = means[a] - means[b]
+    diff_low = np.empty(len(a))
+    diff_high = np.empty(len(a))
+    p_value = np.empty(len(a))
+    # Chunks keep the (pairs, resamples) difference matrix small.
+    for start in range(0, len(a), 1024):
+        chunk = slice(start, start + 1024)
+        diffs = boot[a[chunk]] - boot[b[chunk]]
+        diff_low[chunk], diff_high[chunk] = np.percentile(diffs, [low_q, high_q], axis=1)
+        tail = np.minimum((diffs <= 0).mean(axis=1), (diffs >= 0).mean(axis=1))
+        p_value[chunk] = np.minimum(1.0, 2 * tail)
+
+    # Paired pairs add units to both sides at once, so their variance is that of the per-unit differences:
+    # var(x - y) = var(x) + var(y) - 2 cov(x, y), from one covariance block per group.
+    cov = np.full((n_evals, n_evals), np.nan)
+    for keys, members in groups.items():
+        if len(keys) > 1:
+            cov[np.ix_(members, members)] = np.atleast_2d(np.cov(np.stack([values[i] for i in members])))
+    var_a = np.where(paired, cov[a, a] + cov[b, b] - 2 * cov[a, b], variances[a])
+    var_b = np.where(paired, 0.0, variances[b])
+    z = float(stats.norm.ppf(1 - alpha / 2) + stats.norm.ppf(power))
+    usable = (delta != 0) & np.isfinite(var_a) & np.isfinite(var_b)
+    extra = _extra_samples(
+        np.where(usable, delta, 1.0),
+        np.where(usable, var_a, 0.0),
+        np.where(usable, var_b, 0.0),
+        counts[a],
+        counts[b],
+        z,
+        max_extra,
+    )
+    testable = (counts[a] > 1) & (counts[b] > 1)
+    significant = testable & (p_value < alpha)
+
+    estimates = [
+        {
+            "n": int(counts[i]),
+            "mean": float(means[i]),
+            "ci_low": float(eval_low[i]),
+            "ci_high": float(eval_high[i]),
+        }
+        for i in range(n_evals)
+    ]
+    pairs = [
+        {
+            "a": int(a[k]),
+            "b": int(b[k]),
+            "paired": bool(paired[k]),
+            "diff": float(delta[k]),
+            "ci_low": float(diff_low[k]),
+            "ci_high": float(diff_high[k]),
+            "p_value": float(p_value[k]) if testable[k] else None,
+            "significant": bool(significant[k]),
+            "extra_samples": 0 if significant[k] else (_at_least_one(int(extra[k])) if usable[k] else None),
+        }
+        for k in range(len(a))
+    ]
+    return {"estimates": estimates, "pairs": pairs}
@@ -0,0 +1,58 @@
+"""Background workers that run benchmark evaluations in submission order.
+
+Evals used to get a thread each, so a burst against one experiment loaded
+the same weights several times in parallel. Queuing them on a fixed number
+of long-lived workers (``EVAL_WORKERS``, default 1) lets each eval find the
+model already warm in ``model_cache``, and bounds how many models a burst of
+evals can hold in memory at once.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+WORKERS_ENV = "EVAL_WORKERS"
+
+
+class EvalWorker:
+    def __init__(self, name: str = "eval-worker", workers: int | None = None) -> None:
+        self.name = name
+        self.workers = workers or int(os.environ.get(WORKERS_ENV, "1"))
+        self._queue: queue.Queue[tuple[Callable[..., Any], tuple]] = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        self._queue.put((fn, args))
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name=f"{self.name}-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def join(self) -> None:
+        """Block until every submitted job has finished."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            fn, args = self._queue.get()
+            try:
+                fn(*args)
+            except Exception:
+                logger.exception("Eval job %s failed", getattr(fn, "__name__", fn))
+            finally:
+                self._queue.task_done()
+
+
+# Shared by every eval started from the API process.
+eval_worker = EvalWorker()
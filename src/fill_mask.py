@@ -0,0 +1,152 @@
+"""Batched fill-mask scoring for masked_lm benchmarks.
+
+The fill-mask benchmark used to run one forward pass per sentence and
+accepted exactly one mask, so a cloze test set of thousands of sentences
+meant thousands of evals. Here one loaded model scores many sentences at
+once:
+
+* Sentences are sorted by token length and right-padded into batches, so
+  little of each forward pass is padding.
+* The logits at every mask position of a batch are gathered into one
+  ``[masks, vocab]`` tensor and reduced with a single ``topk``. A sentence
+  may hold several masks, each with its own gold answer.
+* Hits are found by comparing the top-k ids against the gold token ids with
+  tensor ops; no prediction is decoded in order to score it.
+
+A gold answer matches any vocabulary entry whose decoded text, stripped,
+equals it. This is the rule the single-sentence benchmark applied to decoded
+predictions. Both ``"Ġcat"`` and ``"cat"`` match ``cat``, so one gold word can
+map to several ids.
+"""
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass
+from typing import Sequence
+
+import torch
+
+MASK_PLACEHOLDERS = ("[MASK]", "<mask>")
+GOLD_SEPARATOR = "|"
+
+
+@dataclass(frozen=True)
+class FillMaskResult:
+    """Top-k predictions of each mask in one sentence and the gold answer's rank among them."""
+
+    predictions: list[list[str]]
+    ranks: list[int | None]  # 0-based rank of the gold token, None when it is not in the top k
+
+    @property
+    def top1(self) -> list[bool]:
+        return [rank == 0 for rank in self.ranks]
+
+    @property
+    def topk(self) -> list[bool]:
+        return [rank is not None for rank in self.ranks]
+
+
+@dataclass(frozen=True)
+class _Vocab:
+    texts: list[str]  # id -> decoded, stripped text
+    ids: dict[str, list[int]]  # stripped text -> ids
+
+
+# tokenizer -> decoded vocabulary; dropped with the tokenizer.
+_vocabs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _vocab(tokenizer) -> _Vocab:
+    vocab = _vocabs.get(tokenizer)
+    if vocab is None:
+        texts = [t.strip() for t in tokenizer.batch_decode([[i] for i in range(len(tokenizer))])]
+        ids: dict[str, list[int]] = {}
+        for i, text in enumerate(texts):
+            ids.setdefault(text, []).append(i)
+        vocab = _vocabs[tokenizer] = _Vocab(texts=texts, ids=ids)
+    return vocab
+
+
+def normalize_masks(text: str, mask_token: str) -> str:
+    """Replace the ``[MASK]`` / ``<mask>`` placeholders with the tokenizer's own mask token."""
+    for placeholder in MASK_PLACEHOLDERS:
+        text = text.replace(placeholder, mask_token)
+    return text
+
+
+def split_golds(answer: str, separator: str = GOLD_SEPARATOR) -> list[str]:
+    """Gold answers for a sentence's masks, in order."""
+    return [gold.strip() for gold in answer.split(separator)]
+
+
+def fill_mask(
+    model,
+    tokenizer,
+    texts: Sequence[str],
+    golds: Sequence[Sequence[str]],
+    top_k: int = 10,
+    batch_size: int = 32,
+) -> list[FillMaskResult | None]:
+    """Score every mask of every sentence against its gold answer.
+
+    Returns ``None`` for sentences whose mask count (after truncation) differs
+    from their number of gold answers.
+    """
+    if len(texts) != len(golds):
+        raise ValueError("texts and golds must have the same length")
+    if tokenizer.mask_token is None or tokenizer.mask_token_id is None:
+        raise ValueError("Tokenizer has no mask_token")
+    vocab = _vocab(tokenizer)
+    top_k = min(top_k, len(vocab.texts))
+    device = next(model.parameters()).device
+    pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0
+    model.eval()
+
+    max_length = min(tokenizer.model_max_length, getattr(model.config, "max_position_embeddings", None) or 10**9)
+    encoded = tokenizer(
+        [normalize_masks(t, tokenizer.mask_token) for t in texts], truncation=True, max_length=max_length
+    )["input_ids"]
+    order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+    results: list[FillMaskResult | None] = [None] * len(texts)
+    for start in range(0, len(order), batch_size):
+        batch = order[start : start + batch_size]
+        width = max(len(encoded[i]) for i in batch)
+        input_ids = torch.full((len(batch), width), pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(batch), width), dtype=torch.long)
+        for row, i in enumerate(batch):
+            input_ids[row, : len(encoded[i])] = torch.tensor(encoded[i], dtype=torch.long)
+            attention_mask[row, : len(encoded[i])] = 1
+        input_ids, attention_mask = input_ids.to(device), attention_mask.to(device)
+
+        rows, cols = (input_ids == tokenizer.mask_token_id).nonzero(as_tuple=True)
+        if rows.numel() == 0:
+            continue
+        counts = torch.bincount(rows, minlength=len(batch)).tolist()
+        with torch.no_grad():
+            logits = model(input_ids=input_ids, attention_mask=attention_mask).logits
+        top_ids = logits[rows, cols].topk(top_k, dim=-1).indices  # [masks, k]
+
+        # Candidate gold ids per mask, padded with -1 (never a token id).
+        candidates: list[list[int]] = []
+        for row, i in enumerate(batch):
+            if counts[row] == len(golds[i]):
+                candidates.extend(vocab.ids.get(gold, []) for gold in golds[i])
+            else:
+                candidates.extend([] for _ in range(counts[row]))
+        gold_ids = torch.full((len(candidates), max(1, max(map(len, candidates)))), -1, dtype=torch.long)
+        for m, ids in enumerate(candidates):
+            gold_ids[m, : len(ids)] = torch.tensor(ids, dtype=torch.long)
+        hits = (top_ids[:, :, None] == gold_ids.to(device)[:, None, :]).any(dim=-1)  # [masks, k]
+        ranks = torch.where(hits.any(dim=-1), hits.int().argmax(dim=-1), -1).tolist()
+        top_ids = top_ids.tolist()
+
+        offset = 0
+        for row, i in enumerate(batch):
+            n = counts[row]
+            if n and n == len(golds[i]):
+                results[i] = FillMaskResult(
+                    predictions=[[vocab.texts[t] for t in ids] for ids in top_ids[offset : offset + n]],
+                    ranks=[None if r < 0 else r for r in ranks[offset : offset + n]],
+                )
+            offset += n
+    return results
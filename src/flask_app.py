@@ -7,7 +7,7 @@ from urllib.parse import quote
 from pathlib import Path
 
 import requests
-from flask import Flask, jsonify, redirect, render_template, request, send_from_directory, url_for
+from flask import Flask, jsonify, redirect, render_template, request, send_from_directory, stream_with_context, url_for
 
 # Configure Flask to find templates in src/templates
 template_dir = Path(__file__).parent / "templates"
@@ -601,6 +601,8 @@ def experiment_detail(experiment_id: str):
     logs = logs_data.get("logs", []) if isinstance(logs_data, dict) else logs_data
     benchmarks_resp = requests.get(f"{API_BASE_URL}/benchmarks", timeout=10)
     benchmarks = benchmarks_resp.json().get("benchmarks", []) if benchmarks_resp.status_code == 200 else []
+    profile_resp = requests.get(f"{API_BASE_URL}/experiments/{experiment_id}/profile", timeout=10)
+    profile = profile_resp.json() if profile_resp.status_code == 200 else None
     return render_template(
         "experiment_detail.html",
         experiment=experiment,
@@ -608,6 +610,23 @@ def experiment_detail(experiment_id: str):
         benchmarks=benchmarks,
         lightning_plugin=lightning_plugin,
         dataloaders_plugin=dataloaders_plugin,
+        profile=profile,
+    )
+
+
+@app.route("/experiments/<experiment_id>/artifacts/<path:artifact_path>")
+def experiment_artifact(experiment_id: str, artifact_path: str):
+    resp = requests.get(
+        f"{API_BASE_URL}/experiments/{experiment_id}/artifacts/{quote(artifact_path)}",
+        timeout=60,
+    )
+    if resp.status_code != 200:
+        return jsonify({"error": "Artifact not found"}), resp.status_code
+    filename = Path(artifact_path).name
+    return app.response_class(
+        resp.content,
+        mimetype=resp.headers.get("content-type", "application/octet-stream"),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -701,6 +720,13 @@ def stop_experiment(experiment_id: str):
     return redirect(url_for("experiment_detail", experiment_id=experiment_id))
 
 
+@app.route("/experiments/<experiment_id>/resume", methods=["POST"])
+def resume_experiment(experiment_id: str):
+    """Continue a stopped or failed experiment from its latest checkpoint."""
+    requests.post(f"{API_BASE_URL}/experiments/{experiment_id}/resume", timeout=10)
+    return redirect(url_for("experiment_detail", experiment_id=experiment_id))
+
+
 @app.route("/experiments/<experiment_id>/download")
 def download_experiment_artifacts(experiment_id: str):
     """Download experiment artifacts as a zip file."""
@@ -736,12 +762,17 @@ def download_experiment_artifacts(experiment_id: str):
         flash("Artifacts not found", "error")
         return redirect(url_for("experiment_detail", experiment_id=experiment_id))
     
+    # Checkpoints only matter for resuming; leave them out unless asked for.
+    include_checkpoints = request.args.get("include_checkpoints") == "1"
+
     # Create zip file in memory
     memory_file = io.BytesIO()
     with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
         for file_path in output_dir.rglob('*'):
             if file_path.is_file():
                 arcname = file_path.relative_to(output_dir)
+                if not include_checkpoints and arcname.parts[0].startswith(("checkpoint-", ".tmp-checkpoint-")):
+                    continue
                 zf.write(file_path, arcname)
     
     memory_file.seek(0)
@@ -762,7 +793,12 @@ def experiments_compare_page():
     if len(experiment_ids) < 2:
         return redirect(url_for("evaluations_page"))
 
-    resp = requests.post(f"{API_BASE_URL}/experiments/compare", json=experiment_ids, timeout=30)
+    resp = requests.post(
+        f"{API_BASE_URL}/experiments/compare",
+        json=experiment_ids,
+        params={"loss_curves": "true"},
+        timeout=30,
+    )
     if resp.status_code != 200:
         return redirect(url_for("experiments_page"))
     
@@ -791,21 +827,34 @@ def benchmarks_page():
     plugins_resp = requests.get(f"{API_BASE_URL}/plugins", timeout=10)
     plugins = plugins_resp.json().get("plugins", []) if plugins_resp.status_code == 200 else []
     benchmark_plugins = [p for p in plugins if p.get("kind") == "benchmark"]
+    datasets_resp = requests.get(f"{API_BASE_URL}/datasets", timeout=10)
+    datasets = datasets_resp.json().get("datasets", []) if datasets_resp.status_code == 200 else []
     err = request.args.get("error")
     return render_template(
         "benchmarks.html",
         benchmarks=data.get("benchmarks", []),
         benchmark_plugins=benchmark_plugins,
+        datasets=datasets,
         error=err,
     )
 
 
+def _parse_stop_sequences(text: str) -> list[str]:
+    """One stop sequence per line; a literal ``\\n`` stands for a newline."""
+    return [line.replace("\\n", "\n") for line in text.splitlines() if line]
+
+
 @app.route("/benchmarks/create", methods=["POST"])
 def create_benchmark():
     form = request.form.to_dict()
     benchmark_type = form.get("benchmark_type", "causal_lm_qa")
     spec_blob = {}
-    if benchmark_type in {"custom_lightning_sin_regression", "custom_lightning_plugin"}:
+    if benchmark_type in {
+        "causal_lm_qa_suite",
+        "masked_lm_fill_mask_suite",
+        "custom_lightning_sin_regression",
+        "custom_lightning_plugin",
+    }:
         try:
             spec_blob = json.loads(form.get("spec_json", ""))
         except Exception:
@@ -819,6 +868,9 @@ def create_benchmark():
         "max_new_tokens": int(form.get("max_new_tokens", 128)),
         "temperature": float(form.get("temperature", 0.7)),
         "top_p": float(form.get("top_p", 0.9)),
+        "eval_mode": form.get("eval_mode", "sample"),
+        "stop_sequences": _parse_stop_sequences(form.get("stop_sequences", "")),
+        "seed": int(form["seed"]) if form.get("seed", "").strip() else None,
     }
     if benchmark_type == "custom_lightning_plugin":
         payload["higher_is_better"] = (form.get("higher_is_better") == "on")
@@ -858,6 +910,9 @@ def edit_benchmark(benchmark_id: str):
         "max_new_tokens": int(form.get("max_new_tokens", 128)),
         "temperature": float(form.get("temperature", 0.7)),
         "top_p": float(form.get("top_p", 0.9)),
+        "eval_mode": form.get("eval_mode", "sample"),
+        "stop_sequences": _parse_stop_sequences(form.get("stop_sequences", "")),
+        "seed": int(form["seed"]) if form.get("seed", "").strip() else None,
     }
     if form.get("benchmark_type") == "custom_lightning_plugin":
         payload["higher_is_better"] = (form.get("higher_is_better") == "on")
@@ -893,9 +948,9 @@ def benchmark_evaluate_form(benchmark_id: str):
     experiments_resp = requests.get(f"{API_BASE_URL}/experiments", timeout=10)
     experiments = experiments_resp.json().get("experiments", []) if experiments_resp.status_code == 200 else []
     bt = benchmark.get("benchmark_type", "causal_lm_qa")
-    if bt == "causal_lm_qa":
+    if bt in {"causal_lm_qa", "causal_lm_qa_suite"}:
         target_type = "causal_lm"
-    elif bt == "masked_lm_fill_mask":
+    elif bt in {"masked_lm_fill_mask", "masked_lm_fill_mask_suite"}:
         target_type = "masked_lm"
     elif bt in {"custom_lightning_sin_regression", "custom_lightning_plugin"}:
         target_type = "custom_lightning"
@@ -951,7 +1006,23 @@ def evaluation_detail(eval_id: str):
     resp = requests.get(f"{API_BASE_URL}/evaluations/{eval_id}", timeout=10)
     if resp.status_code != 200:
         return redirect(url_for("evaluations_page"))
-    return render_template("evaluation_detail.html", evaluation=resp.json())
+    evaluation = resp.json()
+    items, items_total = [], 0
+    offset = request.args.get("offset", 0, type=int)
+    if evaluation.get("benchmark_type") in {"causal_lm_qa_suite", "masked_lm_fill_mask_suite"}:
+        items_resp = requests.get(
+            f"{API_BASE_URL}/evaluations/{eval_id}/items", params={"offset": offset, "limit": 50}, timeout=10
+        )
+        if items_resp.status_code == 200:
+            items = items_resp.json().get("items", [])
+            items_total = items_resp.json().get("total", 0)
+    return render_template(
+        "evaluation_detail.html",
+        evaluation=evaluation,
+        items=items,
+        items_total=items_total,
+        items_offset=offset,
+    )
 
 
 @app.route("/evaluations/<eval_id>/delete", methods=["POST"])
@@ -1350,6 +1421,21 @@ def api_start_benchmark_eval(benchmark_id: str):
     return jsonify(resp.json()), resp.status_code
 
 
+@app.route("/api/proxy/benchmarks/<benchmark_id>/evaluate/bulk", methods=["POST"])
+def api_start_bulk_benchmark_eval(benchmark_id: str):
+    """Relay the API's NDJSON stream as each evaluation finishes."""
+    payload = request.get_json()
+    resp = requests.post(
+        f"{API_BASE_URL}/benchmarks/{benchmark_id}/evaluate/bulk", json=payload, stream=True, timeout=(10, None)
+    )
+    if resp.status_code != 200:
+        return jsonify(resp.json()), resp.status_code
+    return app.response_class(
+        stream_with_context(resp.iter_content(chunk_size=None)),
+        mimetype="application/x-ndjson",
+    )
+
+
 @app.route("/api/compute/targets/<target_id>/provision", methods=["POST"])
 def api_provision_compute_target(target_id: str):
     """Proxy provision request to FastAPI - this can take a long time."""
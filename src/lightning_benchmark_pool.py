@@ -0,0 +1,167 @@
+"""Pool of persistent worker processes for custom Lightning benchmarks.
+
+Every custom Lightning eval used to start ``python -m
+src.custom_lightning_*_benchmark_runner``. Each one paid interpreter start,
+``import torch``/``lightning``, the plugin import and the checkpoint load,
+which is seconds of work for a model that scores in milliseconds.
+``lightning_benchmark_pool.run(kind, payload)`` instead sends the job over a
+pipe to a long-lived ``src.lightning_benchmark_worker`` process, which keeps
+those imports and loaded checkpoints warm.
+
+Uploaded code still never runs in the API process. A job that overruns its
+timeout has its worker killed, as the old subprocess would have been, and a
+worker that crashes is replaced on the next job. Workers are also retired
+after ``LIGHTNING_WORKER_MAX_JOBS`` jobs, so state a plugin leaves behind
+does not live forever. ``LIGHTNING_WORKERS`` sets how many jobs can run at
+once (default 1).
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+WORKERS_ENV = "LIGHTNING_WORKERS"
+MAX_JOBS_ENV = "LIGHTNING_WORKER_MAX_JOBS"
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+class BenchmarkJobError(ValueError):
+    """A job that raised inside a healthy worker; carries the job's captured output."""
+
+    def __init__(self, message: str, stdout: str, stderr: str) -> None:
+        super().__init__(message)
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+class _Worker:
+    def __init__(self) -> None:
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "src.lightning_benchmark_worker"],
+            cwd=str(_REPO_ROOT),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+        self.jobs = 0
+        self.replies: queue.Queue[str | None] = queue.Queue()
+        threading.Thread(target=self._read, name=f"lightning-worker-{self.proc.pid}", daemon=True).start()
+
+    def _read(self) -> None:
+        for line in self.proc.stdout:
+            self.replies.put(line)
+        self.replies.put(None)
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def kill(self) -> None:
+        if self.alive():
+            self.proc.kill()
+        self.proc.wait()
+
+
+class LightningBenchmarkPool:
+    def __init__(self, workers: int | None = None, max_jobs: int | None = None) -> None:
+        self.size = workers or int(os.environ.get(WORKERS_ENV, "1"))
+        self.max_jobs = max_jobs or int(os.environ.get(MAX_JOBS_ENV, "200"))
+        self._idle: queue.LifoQueue[_Worker | None] = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(None)  # a slot whose worker starts on first use
+        self._lock = threading.Lock()
+        self._workers: set[_Worker] = set()
+        self._stats = {"jobs": 0, "cached_jobs": 0, "workers_started": 0, "timeouts": 0, "crashes": 0}
+
+    def run(self, kind: str, payload: dict, timeout: float = 120.0) -> tuple[dict[str, Any], str, str]:
+        """Run one benchmark job; returns (metrics, stdout, stderr).
+
+        Raises ``ValueError`` when the job fails, times out or kills its worker.
+        """
+        worker = self._idle.get()
+        try:
+            if worker is not None and not worker.alive():
+                self._discard(worker, "crashes")
+                worker = None
+            if worker is None:
+                worker = self._start()
+            deadline = time.monotonic() + timeout
+            worker.proc.stdin.write(json.dumps({"kind": kind, "payload": payload}) + "\n")
+            worker.proc.stdin.flush()
+            try:
+                line = worker.replies.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self._discard(worker, "timeouts")
+                worker = None
+                raise ValueError(f"Benchmark runner timed out after {timeout:g}s")
+            if line is None:
+                code = worker.proc.wait()
+                self._discard(worker, "crashes")
+                worker = None
+                raise ValueError(f"Benchmark runner failed (exit={code})")
+
+            worker.jobs += 1
+            reply = json.loads(line)
+            with self._lock:
+                self._stats["jobs"] += 1
+                self._stats["cached_jobs"] += bool(reply.get("cached"))
+            if worker.jobs >= self.max_jobs:
+                self._discard(worker, None)
+                worker = None
+            if not reply.get("ok"):
+                error = reply.get("error") or "Benchmark runner failed"
+                raise BenchmarkJobError(error, reply["stdout"], reply["stderr"])
+            return reply["metrics"], reply["stdout"], reply["stderr"]
+        except BrokenPipeError:
+            self._discard(worker, "crashes")
+            worker = None
+            raise ValueError("Benchmark runner exited before accepting the job")
+        finally:
+            self._idle.put(worker)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"size": self.size, "running": len(self._workers), **self._stats}
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._workers = list(self._workers), set()
+        for worker in workers:
+            if worker.alive():
+                worker.proc.stdin.close()
+                try:
+                    worker.proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    worker.kill()
+
+    def _start(self) -> _Worker:
+        worker = _Worker()
+        with self._lock:
+            self._workers.add(worker)
+            self._stats["workers_started"] += 1
+        logger.info("Started Lightning benchmark worker pid=%s", worker.proc.pid)
+        return worker
+
+    def _discard(self, worker: _Worker, reason: str | None) -> None:
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+            if reason:
+                self._stats[reason] += 1
+
+
+# Shared by every eval started from the API process.
+lightning_benchmark_pool = LightningBenchmarkPool()
+atexit.register(lightning_benchmark_pool.close)
@@ -0,0 +1,133 @@
+"""Long-lived child process that runs custom Lightning benchmark jobs.
+
+Started by ``src.lightning_benchmark_pool`` as
+``python -m src.lightning_benchmark_worker``. It reads one JSON job per line on
+stdin, ``{"kind": "sin" | "plugin", "payload": {...}}``, and writes one JSON
+reply per line on stdout. The payload is the same one the one-shot runners
+read from disk.
+
+Uploaded code still runs outside the API process. What this process keeps
+between jobs is the expensive part of each one:
+
+* ``torch``/``lightning`` stay imported.
+* Plugin files are imported once per sha256 of their contents, so an edited
+  upload is imported again under a new key.
+* LightningModules are cached by (module file sha256, class name, config,
+  checkpoint sha256). Each job first reloads the checkpoint's state dict
+  (kept in memory) into the cached module, so a benchmark that mutates its
+  module cannot leak weights into the next job.
+
+Anything a job prints is captured and returned in the reply. The protocol
+stream is a private duplicate of the original stdout; fd 1 is pointed at
+stderr so output from C extensions cannot corrupt the protocol.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from . import custom_lightning_plugin_benchmark_runner as plugin_runner
+from . import custom_lightning_sin_benchmark_runner as sin_runner
+
+MAX_CACHED_MODULES_ENV = "LIGHTNING_WORKER_MAX_MODULES"
+
+# (path, mtime_ns, size) -> sha256 hex, so unchanged files are not re-hashed.
+_digests: dict[tuple[str, int, int], str] = {}
+
+
+def file_sha256(path: str | Path) -> str:
+    stat = os.stat(path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    digest = _digests.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = _digests[key] = sha.hexdigest()
+    return digest
+
+
+class _Cache:
+    """Loaded LightningModules and plugin functions, keyed by content hash."""
+
+    def __init__(self, max_modules: int) -> None:
+        self.max_modules = max_modules
+        # key -> (module, state_dict snapshot)
+        self.modules: OrderedDict[tuple, tuple[Any, dict]] = OrderedDict()
+        self.functions: dict[tuple[str, str], Any] = {}
+
+    def module(self, runner, payload) -> tuple[Any, bool]:
+        key = (
+            file_sha256(payload.lightning_module_path),
+            payload.lightning_module_class_name,
+            json.dumps(payload.config, sort_keys=True, default=str),
+            file_sha256(payload.checkpoint_path),
+        )
+        entry = self.modules.get(key)
+        if entry is not None:
+            self.modules.move_to_end(key)
+            module, state = entry
+            module.load_state_dict(state, strict=True)
+            module.eval()
+            return module, True
+        module = runner._load_lightning_module(payload)
+        state = {k: v.detach().clone() for k, v in module.state_dict().items()}
+        self.modules[key] = (module, state)
+        while len(self.modules) > self.max_modules:
+            self.modules.popitem(last=False)
+        return module, False
+
+    def function(self, payload) -> Any:
+        key = (file_sha256(payload.benchmark_plugin_path), payload.benchmark_function_name)
+        fn = self.functions.get(key)
+        if fn is None:
+            fn = self.functions[key] = plugin_runner._load_benchmark_function(payload)
+        return fn
+
+
+def run_job(cache: _Cache, kind: str, raw: dict) -> tuple[dict, bool]:
+    """Metrics of one job and whether its LightningModule came from the cache."""
+    if kind == "sin":
+        payload = sin_runner.BenchmarkPayload(**raw)
+        module, cached = cache.module(sin_runner, payload)
+        return sin_runner._evaluate(payload, module), cached
+    if kind == "plugin":
+        payload = plugin_runner.BenchmarkPayload(**raw)
+        run_benchmark = cache.function(payload)
+        module, cached = cache.module(plugin_runner, payload)
+        return plugin_runner._evaluate(payload, module, run_benchmark), cached
+    raise ValueError(f"Unknown benchmark job kind: {kind}")
+
+
+def main() -> None:
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    cache = _Cache(max_modules=int(os.environ.get(MAX_CACHED_MODULES_ENV, "8")))
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        stdout, stderr = io.StringIO(), io.StringIO()
+        try:
+            job = json.loads(line)
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                metrics, cached = run_job(cache, job["kind"], job["payload"])
+            reply = {"ok": True, "metrics": metrics, "cached": cached}
+        except Exception as e:
+            traceback.print_exc(file=stderr)
+            reply = {"ok": False, "error": str(e) or type(e).__name__}
+        reply.update(stdout=stdout.getvalue(), stderr=stderr.getvalue())
+        protocol.write(json.dumps(reply, default=str) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from pathlib import Path
+
+import torch
 from peft import LoraConfig, get_peft_model
 from transformers import (
     AutoModelForCausalLM,
@@ -11,15 +14,25 @@ from transformers import (
     set_seed,
 )
 
-from .callbacks import StopCheckCallback, StreamingLogsCallback
+from .auto_batch import auto_tune_batch_size
+from .callbacks import (
+    ProfilerCallback,
+    StopCheckCallback,
+    StreamingLogsCallback,
+    TelemetryCallback,
+)
+from .checkpointing import CheckpointingTrainer, directory_size, prune_checkpoints
 from .data import tokenize_dataset
 from .llm_config import LLMExperimentConfig
 from .llm_data import load_llm_dataset
+from .model_store import load_pretrained, load_tokenizer, write_base_ref
+from .telemetry import TELEMETRY_FILENAME
 from .viz import save_loss_curve
 
 
 def _prepare_tokenizer(config: LLMExperimentConfig) -> tuple[AutoTokenizer, bool]:
-    tokenizer = AutoTokenizer.from_pretrained(
+    tokenizer = load_tokenizer(
+        AutoModelForCausalLM,
         config.model.pretrained_model_name,
         trust_remote_code=config.model.trust_remote_code,
     )
@@ -62,6 +75,7 @@ def _build_training_arguments(config: LLMExperimentConfig) -> TrainingArguments:
         bf16=train_cfg.bf16,
         fp16=train_cfg.fp16,
         report_to=[],
+        include_num_input_tokens_seen="non_padding",
         load_best_model_at_end=train_cfg.early_stopping_patience is not None,
         metric_for_best_model=train_cfg.early_stopping_metric,
         greater_is_better=train_cfg.early_stopping_greater_is_better,
@@ -90,6 +104,7 @@ def _apply_lora_if_enabled(model: AutoModelForCausalLM, config: LLMExperimentCon
 def run_llm_training(
     config: LLMExperimentConfig,
     experiment_id: str | None = None,
+    resume_from: str | Path | None = None,
 ) -> tuple[Trainer, dict[str, float]]:
     """Fine-tune the configured LLM with causal language modeling."""
     set_seed(config.data.seed)
@@ -100,9 +115,12 @@ def run_llm_training(
         tokenizer=tokenizer,
         max_length=config.data.max_length,
     )
-    model = AutoModelForCausalLM.from_pretrained(
+    # The optimizer and fp16/bf16 autocast need fp32 master weights, whatever dtype the store holds.
+    model, model_load_seconds = load_pretrained(
+        AutoModelForCausalLM,
         config.model.pretrained_model_name,
         trust_remote_code=config.model.trust_remote_code,
+        torch_dtype=torch.float32,
     )
     if added_pad_token:
         model.resize_token_embeddings(len(tokenizer))
@@ -114,30 +132,62 @@ def run_llm_training(
         mlm=False,
     )
     logs_path = config.training.output_dir / "training_logs.json"
-    callbacks = [StreamingLogsCallback(logs_path, experiment_id=experiment_id)]
+    telemetry = TelemetryCallback(config.training.output_dir / TELEMETRY_FILENAME)
+    callbacks = [StreamingLogsCallback(logs_path, experiment_id=experiment_id), telemetry]
     if config.training.early_stopping_patience is not None:
         callbacks.append(
             EarlyStoppingCallback(
                 early_stopping_patience=config.training.early_stopping_patience
             )
         )
-    if experiment_id is not None:
-        callbacks.append(StopCheckCallback(experiment_id))
-    trainer = Trainer(
+    stop_check = StopCheckCallback(experiment_id) if experiment_id is not None else None
+    if stop_check is not None:
+        callbacks.append(stop_check)
+    if config.training.profile:
+        callbacks.append(
+            ProfilerCallback(config.training.output_dir, active_steps=config.training.profile_steps)
+        )
+    training_args = _build_training_arguments(config)
+    batch_plan = None
+    if config.training.auto_batch_size:
+        batch_plan = auto_tune_batch_size(
+            model,
+            training_args,
+            max_length=config.data.max_length,
+            vocab_size=len(tokenizer),
+            memory_budget_mb=config.training.memory_budget_mb,
+            allow_effective_batch_change=config.training.allow_effective_batch_change,
+            resume=resume_from is not None,
+        )
+    trainer = CheckpointingTrainer(
         model=model,
-        args=_build_training_arguments(config),
+        args=training_args,
         train_dataset=tokenized["train"],
         eval_dataset=tokenized["test"],
         tokenizer=tokenizer,
         data_collator=data_collator,
         callbacks=callbacks,
+        async_checkpoint=config.training.async_checkpoint,
+        checkpoint_mode=config.training.checkpoint_mode,
+    )
+    if resume_from is None:
+        # Run initial evaluation at step 0 for baseline comparison
+        initial_eval = trainer.evaluate()
+        trainer.state.log_history.insert(0, {"step": 0, "epoch": 0.0, "eval_loss": initial_eval["eval_loss"]})
+    # Resuming restores model, optimizer, scheduler, RNG state and log history from the checkpoint.
+    train_metrics = trainer.train(
+        resume_from_checkpoint=str(resume_from) if resume_from is not None else None
     )
-    # Run initial evaluation at step 0 for baseline comparison
-    initial_eval = trainer.evaluate()
-    trainer.state.log_history.insert(0, {"step": 0, "epoch": 0.0, "eval_loss": initial_eval["eval_loss"]})
-    train_metrics = trainer.train()
     eval_metrics = trainer.evaluate()
     trainer.save_model()
+    output_dir = config.training.output_dir
+    if config.peft and config.peft.enabled:
+        # Adapter-only artifact: the base is referenced by content hash, not copied.
+        write_base_ref(output_dir, config.model.pretrained_model_name)
+        # Early stopping ends a run normally too; only a user stop leaves it to be resumed (a failure never gets here).
+        finished = stop_check is None or not stop_check.stopped
+        if config.training.prune_checkpoints and finished:
+            prune_checkpoints(output_dir)
 
     plot_path = (
         config.training.output_dir
@@ -150,5 +200,13 @@ def run_llm_training(
         title=f"{config.model.pretrained_model_name} Causal LM Loss",
         use_log_y=True,
     )
-    return trainer, {**train_metrics.metrics, **eval_metrics}
+    return trainer, {
+        **train_metrics.metrics,
+        **eval_metrics,
+        "model_load_seconds": model_load_seconds,
+        **(batch_plan.to_metrics() if batch_plan else {}),
+        "throughput": telemetry.recorder.summary(),
+        "checkpointing": trainer.checkpoint_summary(),
+        "artifact_size_mb": round(directory_size(output_dir) / 2**20, 2),
+    }
 
@@ -26,8 +26,14 @@ def main() -> None:
     output_dir = Path(payload["output_dir"])
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    from .cpu_policy import apply_cpu_policy
+
+    # Must run before the model is built so torch sizes its thread pools once.
+    apply_cpu_policy(payload.get("cpu"))
+
     cfg = payload["config"]
     dataset = payload["dataset"]
+    resume_from = payload.get("resume_from")
 
     from .config import DataConfig, ExperimentConfig, ModelConfig, TrainingConfig
     from .training import run_training
@@ -67,11 +73,20 @@ def main() -> None:
             early_stopping_patience=training_cfg.get("early_stopping_patience"),
             early_stopping_metric=training_cfg.get("early_stopping_metric", "eval_loss"),
             early_stopping_greater_is_better=training_cfg.get("early_stopping_greater_is_better", False),
+            auto_batch_size=training_cfg.get("auto_batch_size", False),
+            memory_budget_mb=training_cfg.get("memory_budget_mb"),
+            allow_effective_batch_change=training_cfg.get("allow_effective_batch_change", False),
+            profile=training_cfg.get("profile", False),
+            profile_steps=training_cfg.get("profile_steps", 5),
+            async_checkpoint=training_cfg.get("async_checkpoint", True),
         ),
     )
 
+    if resume_from:
+        print(f"Resuming training from {resume_from}")
+
     try:
-        _, metrics = run_training(config, experiment_id=experiment_id)
+        _, metrics = run_training(config, experiment_id=experiment_id, resume_from=resume_from)
         metrics_path = output_dir / "metrics.json"
         metrics_path.write_text(json.dumps(metrics, indent=2), encoding="utf-8")
         print(f"Training completed. Metrics saved to {metrics_path}")
@@ -1,6 +1,21 @@
-"""Meta-feature extraction for fine-tuning performance prediction."""
+"""Meta-feature extraction for fine-tuning performance prediction.
+
+Static dataset features depend only on the CSV, the tokenizer and
+``max_length``, yet every probe used to recompute them, and
+``optimize_config`` probes each candidate config on the same dataset.
+``static_feature_cache`` keeps them in a small SQLite file
+(``STATIC_FEATURE_CACHE_PATH``). Entries are keyed by the CSV's sha256, the
+tokenizer's identity, the text fields, the separator and ``max_length``, so
+the CSV is parsed and tokenized once per combination.
+"""
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
 from pathlib import Path
 
 import pandas as pd
@@ -106,57 +121,167 @@ class MetaFeatureVector(BaseModel):
         return result
 
 
-def extract_static_dataset_features(
+_CSV_CHUNK_ROWS = 2048
+_TOKENIZER_FILES = ("tokenizer.json", "tokenizer_config.json", "vocab.json", "vocab.txt", "merges.txt", "tokenizer.model")
+
+# (resolved path, size, mtime_ns) -> sha256, so an unchanged CSV is hashed once per process.
+_sha256_memo: dict[tuple[str, int, int], str] = {}
+
+
+def _file_sha256(path: Path) -> str:
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _sha256_memo:
+        digest = hashlib.sha256()
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _sha256_memo[memo_key] = digest.hexdigest()
+    return _sha256_memo[memo_key]
+
+
+def _tokenizer_identity(tokenizer) -> str:
+    """Class, name, size and (for a local dir) tokenizer file stats of ``tokenizer``."""
+    identity = f"{type(tokenizer).__name__}:{tokenizer.name_or_path}:{len(tokenizer)}"
+    local = Path(tokenizer.name_or_path)
+    if local.is_dir():
+        for name in _TOKENIZER_FILES:
+            file = local / name
+            if file.is_file():
+                stat = file.stat()
+                identity += f":{name}:{stat.st_size}:{stat.st_mtime_ns}"
+    return identity
+
+
+class StaticFeatureCache:
+    """StaticDatasetFeatures in SQLite, keyed by ``static_features_key``."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("CREATE TABLE IF NOT EXISTS static_features (key TEXT PRIMARY KEY, features_json TEXT NOT NULL)")
+        return conn
+
+    def get(self, key: str) -> StaticDatasetFeatures | None:
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT features_json FROM static_features WHERE key = ?", (key,)).fetchone()
+            finally:
+                conn.close()
+            self._stats["hits" if row else "misses"] += 1
+        return StaticDatasetFeatures.model_validate_json(row[0]) if row else None
+
+    def put(self, key: str, features: StaticDatasetFeatures) -> None:
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO static_features (key, features_json) VALUES (?, ?)",
+                        (key, features.model_dump_json()),
+                    )
+            finally:
+                conn.close()
+
+    def stats(self) -> dict:
+        return {"path": str(self.path), **self._stats}
+
+
+static_feature_cache = StaticFeatureCache(os.environ.get("STATIC_FEATURE_CACHE_PATH", "data/static_feature_cache.db"))
+
+
+def static_features_key(
+    csv_path: Path, text_fields: tuple[str, ...], separator: str, tokenizer, max_length: int
+) -> str:
+    payload = [_file_sha256(Path(csv_path)), _tokenizer_identity(tokenizer), list(text_fields), separator, max_length]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+def _compute_static_dataset_features(
     csv_path: Path,
     text_fields: tuple[str, ...],
     separator: str,
     tokenizer: AutoTokenizer,
     max_length: int,
+    chunk_rows: int,
 ) -> StaticDatasetFeatures:
-    """Extract static features from a dataset CSV."""
-    df = pd.read_csv(csv_path)
-    n_samples = len(df)
-
-    # Concatenate text fields
-    texts = df[list(text_fields)].astype(str).agg(separator.join, axis=1).tolist()
-
-    # Character-level stats
-    text_lengths = [len(t) for t in texts]
-    avg_text_length = sum(text_lengths) / n_samples
-
-    # Token-level stats (whitespace split for vocab diversity)
-    all_tokens = []
-    for text in texts:
-        all_tokens.extend(text.split())
-    total_tokens = len(all_tokens)
-    unique_tokens = set(all_tokens)
-    vocab_size = len(unique_tokens)
-    type_token_ratio = vocab_size / total_tokens if total_tokens > 0 else 0.0
-
-    # OOV rate using model tokenizer
-    tokenizer_vocab = set(tokenizer.get_vocab().keys())
-    oov_count = sum(1 for t in unique_tokens if t not in tokenizer_vocab)
-    oov_rate = oov_count / vocab_size if vocab_size > 0 else 0.0
-
-    # Tokenized sequence lengths
-    tokenized = tokenizer(texts, truncation=False, padding=False)
-    seq_lengths = [len(ids) for ids in tokenized["input_ids"]]
-    avg_sequence_length = sum(seq_lengths) / n_samples
-    max_sequence_length = max(seq_lengths)
-    truncation_rate = sum(1 for l in seq_lengths if l > max_length) / n_samples
+    # Running totals over CSV chunks; only the whitespace-token counts grow with the data.
+    token_counts: Counter[str] = Counter()
+    n_samples = 0
+    total_chars = 0
+    total_seq_tokens = 0
+    max_sequence_length = 0
+    truncated = 0
+    # Read as text so every chunk formats cells the same way; empty cells are empty strings.
+    chunks = pd.read_csv(
+        csv_path, usecols=list(text_fields), dtype=str, keep_default_na=False, chunksize=chunk_rows
+    )
+    for chunk in chunks:
+        # Joining column lists avoids a pandas row object per sample.
+        texts = [separator.join(row) for row in zip(*(chunk[field].tolist() for field in text_fields))]
+        if not texts:
+            continue
+        n_samples += len(texts)
+        total_chars += sum(len(t) for t in texts)
+        for text in texts:
+            token_counts.update(text.split())
+        seq_lengths = [len(ids) for ids in tokenizer(texts, truncation=False, padding=False)["input_ids"]]
+        total_seq_tokens += sum(seq_lengths)
+        max_sequence_length = max(max_sequence_length, max(seq_lengths))
+        truncated += sum(1 for length in seq_lengths if length > max_length)
+    if n_samples == 0:
+        raise ValueError(f"{csv_path} has no rows")
+
+    total_tokens = sum(token_counts.values())
+    vocab_size = len(token_counts)
+    # get_vocab() is already a dict; membership tests need no extra set.
+    tokenizer_vocab = tokenizer.get_vocab()
+    oov_count = sum(1 for t in token_counts if t not in tokenizer_vocab)
 
     return StaticDatasetFeatures(
         n_samples=n_samples,
-        avg_text_length=avg_text_length,
+        avg_text_length=total_chars / n_samples,
         vocab_size=vocab_size,
-        type_token_ratio=type_token_ratio,
-        oov_rate=oov_rate,
-        avg_sequence_length=avg_sequence_length,
+        type_token_ratio=vocab_size / total_tokens if total_tokens > 0 else 0.0,
+        oov_rate=oov_count / vocab_size if vocab_size > 0 else 0.0,
+        avg_sequence_length=total_seq_tokens / n_samples,
         max_sequence_length=max_sequence_length,
-        truncation_rate=truncation_rate,
+        truncation_rate=truncated / n_samples,
     )
 
 
+def extract_static_dataset_features(
+    csv_path: Path,
+    text_fields: tuple[str, ...],
+    separator: str,
+    tokenizer: AutoTokenizer,
+    max_length: int,
+    cache: StaticFeatureCache | None = None,
+    chunk_rows: int = _CSV_CHUNK_ROWS,
+) -> StaticDatasetFeatures:
+    """Extract static features from a dataset CSV, streamed ``chunk_rows`` rows at a time.
+
+    With ``cache``, features computed before for the same CSV contents,
+    tokenizer, fields, separator and ``max_length`` are returned without
+    reading the CSV rows.
+    """
+    if cache is None:
+        return _compute_static_dataset_features(csv_path, text_fields, separator, tokenizer, max_length, chunk_rows)
+    key = static_features_key(csv_path, text_fields, separator, tokenizer, max_length)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    features = _compute_static_dataset_features(csv_path, text_fields, separator, tokenizer, max_length, chunk_rows)
+    cache.put(key, features)
+    return features
+
+
 def extract_static_config_features(
     config,
 ) -> StaticConfigFeatures:
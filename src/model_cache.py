@@ -0,0 +1,374 @@
+"""Process-wide cache of loaded evaluation models.
+
+Benchmark evals against the same experiment used to reload its weights every
+time. ``model_cache.lease(kind, path)`` hands out a shared (model, tokenizer)
+pair instead. Entries are keyed by the experiment output dir and a
+fingerprint of its weight files, so retraining or resuming into the same dir
+loads fresh weights. The cache keeps total parameter bytes under
+``MODEL_CACHE_BUDGET_MB`` by evicting the least recently used entries that no
+eval is currently holding.
+
+Most causal_lm experiments are LoRA fine-tunes of the same base model. A
+plain LoRA adapter dir is therefore not loaded as a model of its own. Its
+base is kept resident once per (base model, tokenizer size), and adapters
+are loaded onto it by name, activated per lease and unloaded LRU beyond
+``MODEL_CACHE_MAX_ADAPTERS``. Switching experiments costs one adapter load.
+A lease holds its base exclusively, because the active adapter is shared
+state. ``lease_adapters`` loads several adapters at once for batches that
+mix them.
+"""
+from __future__ import annotations
+
+import functools
+import gc
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import psutil
+import torch
+from safetensors import safe_open
+from transformers import AutoTokenizer
+
+logger = logging.getLogger(__name__)
+
+BUDGET_ENV = "MODEL_CACHE_BUDGET_MB"
+MAX_ADAPTERS_ENV = "MODEL_CACHE_MAX_ADAPTERS"
+
+_WEIGHT_SUFFIXES = (".safetensors", ".bin", ".ckpt")
+
+
+def default_budget_bytes() -> int:
+    configured = os.environ.get(BUDGET_ENV)
+    if configured:
+        return int(float(configured) * 2**20)
+    # Leave the rest of RAM to training runners sharing the machine.
+    return psutil.virtual_memory().total // 4
+
+
+def weights_fingerprint(model_path: Path) -> str:
+    """Cheap identity of the weights in ``model_path`` (names, sizes and mtimes)."""
+    digest = hashlib.sha256()
+    for file in sorted(model_path.iterdir()):
+        if file.is_file() and (file.suffix in _WEIGHT_SUFFIXES or file.name.endswith("config.json")):
+            stat = file.stat()
+            digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def lora_base_key(model_path: Path) -> str | None:
+    """Resident-base key of a LoRA adapter dir that can share its base model, else None.
+
+    Adapters that also save full layers (``modules_to_save``, trainable token
+    rows, resized embeddings) would overwrite the shared base, so they load
+    as models of their own.
+    """
+    model_path = Path(model_path)
+    if not (model_path / "adapter_config.json").exists():
+        return None
+    return _lora_base_key(str(model_path.resolve()), weights_fingerprint(model_path))
+
+
+@functools.lru_cache(maxsize=1024)
+def _lora_base_key(path: str, fingerprint: str) -> str | None:
+    model_path = Path(path)
+    config_path = model_path / "adapter_config.json"
+    weights_path = model_path / "adapter_model.safetensors"
+    if not config_path.exists() or not weights_path.exists():
+        return None
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    if config.get("peft_type") != "LORA" or config.get("modules_to_save") or config.get("trainable_token_indices"):
+        return None
+    with safe_open(str(weights_path), framework="pt") as weights:
+        if any("lora_" not in name for name in weights.keys()):
+            return None
+    from .benchmark import adapter_base
+
+    base_name, content_hash = adapter_base(model_path)
+    tokenizer_size = len(AutoTokenizer.from_pretrained(model_path))
+    return f"{base_name}@{content_hash or ''}:{tokenizer_size}"
+
+
+def adapter_name(model_path: Path) -> str:
+    """Name of the adapter in ``model_path``; changes when its weights do."""
+    digest = hashlib.sha256(f"{model_path.resolve()}:{weights_fingerprint(model_path)}".encode())
+    return f"adapter_{digest.hexdigest()[:12]}"
+
+
+def model_nbytes(model: torch.nn.Module) -> int:
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def _load_causal_lm(model_path: Path) -> tuple[Any, Any]:
+    from .benchmark import load_model_and_tokenizer
+
+    return load_model_and_tokenizer(model_path)
+
+
+def _load_lora_base(model_path: Path) -> tuple[Any, Any]:
+    from .benchmark import load_model_and_tokenizer
+
+    return load_model_and_tokenizer(model_path, adapter_name=adapter_name(model_path))
+
+
+def _load_masked_lm(model_path: Path) -> tuple[Any, Any]:
+    from transformers import AutoModelForMaskedLM, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForMaskedLM.from_pretrained(model_path, low_cpu_mem_usage=True)
+    model.eval()
+    return model, tokenizer
+
+
+LOADERS: dict[str, Callable[[Path], tuple[Any, Any]]] = {
+    "causal_lm": _load_causal_lm,
+    "causal_lm_base": _load_lora_base,
+    "masked_lm": _load_masked_lm,
+}
+
+
+@dataclass
+class _Entry:
+    model: Any
+    tokenizer: Any
+    nbytes: int
+    load_seconds: float
+    refs: int = 0
+    hits: int = 0
+    ready: threading.Event = field(default_factory=threading.Event)
+    error: BaseException | None = None
+    # Resident LoRA bases only: adapter name -> (adapter dir, tokenizer), LRU order.
+    adapters: OrderedDict[str, tuple[str, Any]] = field(default_factory=OrderedDict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelCache:
+    """LRU cache of (model, tokenizer) pairs with a byte budget and reference counts."""
+
+    def __init__(self, budget_bytes: int | None = None, max_adapters: int | None = None) -> None:
+        self.budget_bytes = budget_bytes if budget_bytes is not None else default_budget_bytes()
+        self.max_adapters = max_adapters or int(os.environ.get(MAX_ADAPTERS_ENV, "16"))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self.adapter_loads = 0
+        self.adapter_hits = 0
+
+    @contextmanager
+    def lease(self, kind: str, model_path: str | Path) -> Iterator[tuple[Any, Any]]:
+        """Borrow the model for ``model_path``; it cannot be evicted while leased."""
+        model_path = Path(model_path)
+        if kind == "causal_lm" and (base := lora_base_key(model_path)) is not None:
+            with self.lease_adapters([model_path], base) as (model, adapters):
+                name, tokenizer = adapters[0]
+                # set_adapter() only takes inference_mode on newer peft than pinned.
+                model.set_adapter(name)
+                model.eval()
+                model.requires_grad_(False)
+                yield model, tokenizer
+            return
+        key = (kind, str(model_path.resolve()), weights_fingerprint(model_path))
+        entry = self._acquire(key, model_path)
+        try:
+            yield entry.model, entry.tokenizer
+        finally:
+            self._release(entry)
+
+    @contextmanager
+    def lease_adapters(
+        self, model_paths: list[Path], base: str | None = None
+    ) -> Iterator[tuple[Any, list[tuple[str, Any]]]]:
+        """Borrow a resident base with the adapters of ``model_paths`` loaded onto it.
+
+        Yields the ``PeftModel`` and one (adapter name, tokenizer) per path. Every
+        path must share ``base`` (see ``lora_base_key``). The base is held
+        exclusively until the lease ends.
+        """
+        model_paths = [Path(p) for p in model_paths]
+        base = base or lora_base_key(model_paths[0])
+        if base is None or any(lora_base_key(p) != base for p in model_paths[1:]):
+            raise ValueError("Adapters do not share a resident base model")
+        if len(set(map(adapter_name, model_paths))) > self.max_adapters:
+            raise ValueError(f"More than {self.max_adapters} adapters requested at once")
+        entry = self._acquire(("causal_lm_base", base, ""), model_paths[0])
+        try:
+            with entry.lock:
+                adapters = [self._load_adapter(entry, path, keep=model_paths) for path in model_paths]
+                yield entry.model, adapters
+        finally:
+            self._release(entry)
+
+    def _load_adapter(self, entry: _Entry, model_path: Path, keep: list[Path]) -> tuple[str, Any]:
+        """Make ``model_path``'s adapter resident on ``entry``'s base (caller holds ``entry.lock``)."""
+        from .benchmark import forget_adapter, load_eval_tokenizer
+
+        model = entry.model
+        name = adapter_name(model_path)
+        if name in entry.adapters:
+            entry.adapters.move_to_end(name)
+            with self._lock:
+                self.adapter_hits += 1
+            return name, entry.adapters[name][1]
+
+        if name in model.peft_config:
+            # Loaded together with the base.
+            tokenizer = entry.tokenizer
+        else:
+            start = time.perf_counter()
+            model.load_adapter(str(model_path), adapter_name=name)
+            tokenizer = load_eval_tokenizer(model_path)
+            logger.info("Model cache loaded adapter %s in %.2fs", model_path, time.perf_counter() - start)
+        entry.adapters[name] = (str(model_path.resolve()), tokenizer)
+
+        pinned = {adapter_name(p) for p in keep}
+        for stale in [n for n in entry.adapters if n not in pinned][: max(0, len(entry.adapters) - self.max_adapters)]:
+            del entry.adapters[stale]
+            model.delete_adapter(stale)
+            forget_adapter(model, stale)
+        nbytes = model_nbytes(model)
+        with self._lock:
+            entry.nbytes = nbytes
+            self.adapter_loads += 1
+        return name, tokenizer
+
+    def _release(self, entry: _Entry) -> None:
+        with self._lock:
+            entry.refs -= 1
+            self._evict_over_budget()
+
+    def _acquire(self, key: tuple[str, str, str], model_path: Path) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                # Weights behind this path changed; idle copies of the old ones are dead weight.
+                for stale in [k for k, e in self._entries.items() if k[:2] == key[:2] and e.refs == 0]:
+                    del self._entries[stale]
+                entry = _Entry(model=None, tokenizer=None, nbytes=0, load_seconds=0.0)
+                self._entries[key] = entry
+            else:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                self.hits += 1
+            entry.refs += 1
+
+        if owner:
+            # Load outside the lock; concurrent leases of the same key wait on ``ready``.
+            start = time.perf_counter()
+            try:
+                entry.model, entry.tokenizer = LOADERS[key[0]](model_path)
+                entry.nbytes = model_nbytes(entry.model)
+            except BaseException as exc:
+                entry.error = exc
+                with self._lock:
+                    entry.refs -= 1
+                    self._entries.pop(key, None)
+                raise
+            finally:
+                entry.load_seconds = time.perf_counter() - start
+                entry.ready.set()
+            with self._lock:
+                self.loads += 1
+                self._evict_over_budget()
+            logger.info(
+                "Model cache loaded %s (%.0f MiB) in %.2fs",
+                model_path,
+                entry.nbytes / 2**20,
+                entry.load_seconds,
+            )
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                with self._lock:
+                    entry.refs -= 1
+                raise RuntimeError(f"Loading {model_path} failed") from entry.error
+        return entry
+
+    def _evict_over_budget(self) -> None:
+        used = sum(e.nbytes for e in self._entries.values())
+        evicted = False
+        for key in list(self._entries):
+            if used <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refs > 0 or not entry.ready.is_set():
+                continue
+            used -= entry.nbytes
+            del self._entries[key]
+            self.evictions += 1
+            evicted = True
+            logger.info("Model cache evicted %s", key[1])
+        if evicted:
+            gc.collect()
+
+    def invalidate(self, model_path: str | Path) -> int:
+        """Drop idle entries and adapters loaded from ``model_path``. Returns how many were dropped."""
+        from .benchmark import forget_adapter
+
+        target = str(Path(model_path).resolve())
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if k[1] == target and e.refs == 0]
+            for key in keys:
+                del self._entries[key]
+            bases = [e for e in self._entries.values() if e.adapters and e.refs == 0]
+        dropped = len(keys)
+        for entry in bases:
+            with entry.lock:
+                for name in [n for n, (path, _) in entry.adapters.items() if path == target]:
+                    # A base must keep at least one adapter to stay a PeftModel.
+                    if len(entry.model.peft_config) > 1:
+                        del entry.adapters[name]
+                        entry.model.delete_adapter(name)
+                        forget_adapter(entry.model, name)
+                        dropped += 1
+        gc.collect()
+        return dropped
+
+    def clear(self) -> int:
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if e.refs == 0]
+            for key in keys:
+                del self._entries[key]
+        gc.collect()
+        return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries = [
+                {
+                    "kind": kind,
+                    "model_path": path,
+                    "fingerprint": fingerprint,
+                    "size_mb": round(e.nbytes / 2**20, 1),
+                    "load_seconds": round(e.load_seconds, 3),
+                    "hits": e.hits,
+                    "in_use": e.refs,
+                    "adapters": len(e.adapters),
+                }
+                for (kind, path, fingerprint), e in self._entries.items()
+            ]
+            return {
+                "budget_mb": round(self.budget_bytes / 2**20, 1),
+                "used_mb": round(sum(e.nbytes for e in self._entries.values()) / 2**20, 1),
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+                "adapter_loads": self.adapter_loads,
+                "adapter_hits": self.adapter_hits,
+                "entries": entries,
+            }
+
+
+# Shared by every eval running in the API process.
+model_cache = ModelCache()
@@ -0,0 +1,209 @@
+"""Local store of base model weights kept as safetensors.
+
+Runners, probes and benchmark evals all start from the same handful of base
+models. Instead of each process resolving the hub cache (and for some repos
+re-reading pickled ``.bin`` weights), base models are materialized once under
+``MODEL_STORE_DIR`` as safetensors. Loading from the store is always
+``local_files_only`` and uses ``low_cpu_mem_usage`` so weights are read
+through a memory map, letting concurrent processes share the OS page cache.
+Entries keep the checkpoint's own dtype (``torch_dtype="auto"``) and loads
+default to that same dtype, so a warm load never upcasts and copies the
+weights; callers that need fp32 (training) ask for it explicitly.
+
+Each entry carries a ``store_manifest.json`` with a sha256 over its weight
+and config files, and is also reachable as ``by-hash/<sha256>``. Adapter-only
+experiment artifacts record that hash in ``base_model.json`` so they can be
+re-attached to the exact base weights they were trained on.
+
+Set ``MODEL_STORE_OFFLINE=1`` (or ``HF_HUB_OFFLINE=1``) to forbid network
+access; models must then already be in the store or be local paths.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+from transformers import AutoTokenizer
+
+logger = logging.getLogger(__name__)
+
+MODEL_STORE_DIR = Path(os.environ.get("MODEL_STORE_DIR", "data/model_store"))
+MANIFEST_FILENAME = "store_manifest.json"
+BASE_REF_FILENAME = "base_model.json"
+
+_HASH_DIR = "by-hash"
+
+_TRUTHY = ("1", "true", "yes")
+
+
+def offline_mode() -> bool:
+    return (
+        os.environ.get("MODEL_STORE_OFFLINE", "").lower() in _TRUTHY
+        or os.environ.get("HF_HUB_OFFLINE", "").lower() in _TRUTHY
+    )
+
+
+def store_path(model_name: str) -> Path:
+    """Directory holding ``model_name`` inside the store (hub ids use ``--`` for ``/``)."""
+    return MODEL_STORE_DIR / model_name.replace("/", "--")
+
+
+def _is_complete(path: Path) -> bool:
+    return (path / "config.json").exists() and any(path.glob("*.safetensors"))
+
+
+def _content_hash(path: Path) -> tuple[str, int]:
+    """sha256 over the weight and config files of a store entry, in name order."""
+    digest = hashlib.sha256()
+    total = 0
+    files = sorted(p for p in path.iterdir() if p.suffix == ".safetensors" or p.name == "config.json")
+    for file in files:
+        digest.update(file.name.encode())
+        with file.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 24), b""):
+                digest.update(chunk)
+        total += file.stat().st_size
+    return digest.hexdigest(), total
+
+
+def _write_manifest(entry: Path, model_name: str) -> dict:
+    sha256, size = _content_hash(entry)
+    manifest = {"model_name": model_name, "sha256": sha256, "size_bytes": size}
+    tmp = entry / f".{MANIFEST_FILENAME}.{uuid.uuid4().hex}"
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, entry / MANIFEST_FILENAME)
+    return manifest
+
+
+def _link_hash(entry: Path, sha256: str) -> None:
+    link = MODEL_STORE_DIR / _HASH_DIR / sha256
+    link.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        link.symlink_to(Path("..") / entry.name, target_is_directory=True)
+    except FileExistsError:
+        pass
+
+
+def store_manifest(model_name: str) -> dict:
+    """Manifest of ``model_name``'s store entry; hashes pre-existing entries on first request."""
+    entry = store_path(model_name)
+    manifest_path = entry / MANIFEST_FILENAME
+    if manifest_path.exists():
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest = _write_manifest(entry, model_name)
+    _link_hash(entry, manifest["sha256"])
+    return manifest
+
+
+def _populate(auto_cls, model_name: str, target: Path, trust_remote_code: bool) -> None:
+    if offline_mode():
+        msg = (
+            f"Model {model_name!r} is not in the local model store ({target}) "
+            "and offline mode is enabled."
+        )
+        raise FileNotFoundError(msg)
+
+    logger.info("Adding %s to model store at %s", model_name, target)
+    model = auto_cls.from_pretrained(
+        model_name,
+        trust_remote_code=trust_remote_code,
+        torch_dtype="auto",
+        low_cpu_mem_usage=True,
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_name, trust_remote_code=trust_remote_code)
+
+    # Write to a private directory and rename so concurrent runners never see a partial store entry.
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.parent / f".{target.name}.{uuid.uuid4().hex}"
+    try:
+        model.save_pretrained(tmp, safe_serialization=True)
+        tokenizer.save_pretrained(tmp)
+        manifest = _write_manifest(tmp, model_name)
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            if not _is_complete(target):
+                raise
+        _link_hash(target, manifest["sha256"])
+    finally:
+        if tmp.exists():
+            shutil.rmtree(tmp, ignore_errors=True)
+        del model
+
+
+def resolve_model_path(
+    auto_cls,
+    model_name: str,
+    trust_remote_code: bool = False,
+    content_hash: str | None = None,
+) -> Path:
+    """Return a local directory for ``model_name``, populating the store on first use.
+
+    With ``content_hash``, the entry holding exactly those weights is preferred
+    over whatever is currently stored under ``model_name``.
+    """
+    local = Path(model_name)
+    if local.is_dir():
+        return local
+    if content_hash:
+        by_hash = MODEL_STORE_DIR / _HASH_DIR / content_hash
+        if _is_complete(by_hash):
+            return by_hash.resolve()
+    target = store_path(model_name)
+    if not _is_complete(target):
+        _populate(auto_cls, model_name, target, trust_remote_code)
+    if content_hash and store_manifest(model_name)["sha256"] != content_hash:
+        logger.warning(
+            "Stored weights for %s differ from the base the adapter was trained on (%s)",
+            model_name,
+            content_hash[:12],
+        )
+    return target
+
+
+def write_base_ref(output_dir: Path, model_name: str) -> dict:
+    """Record the base model (name and content hash) an adapter-only artifact needs."""
+    content_hash = None if Path(model_name).is_dir() else store_manifest(model_name)["sha256"]
+    ref = {"model_name": model_name, "sha256": content_hash}
+    (output_dir / BASE_REF_FILENAME).write_text(json.dumps(ref, indent=2), encoding="utf-8")
+    return ref
+
+
+def find_base_ref(adapter_dir: Path) -> dict | None:
+    """``base_model.json`` of an adapter dir or the experiment dir containing it."""
+    for directory in (adapter_dir, adapter_dir.parent):
+        path = directory / BASE_REF_FILENAME
+        if path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))
+    return None
+
+
+def load_pretrained(auto_cls, model_name: str, content_hash: str | None = None, **kwargs):
+    """Load ``model_name`` through the store, in its stored dtype unless ``torch_dtype`` is given.
+
+    Returns ``(model, load_seconds)``.
+    """
+    start = time.perf_counter()
+    path = resolve_model_path(auto_cls, model_name, kwargs.get("trust_remote_code", False), content_hash)
+    kwargs.setdefault("low_cpu_mem_usage", True)
+    kwargs.setdefault("torch_dtype", "auto")
+    model = auto_cls.from_pretrained(path, local_files_only=True, **kwargs)
+    if path != Path(model_name):
+        # Keep the hub id (not the store path) in saved configs and adapter_config.json.
+        model.config._name_or_path = model_name
+        model.name_or_path = model_name
+    elapsed = time.perf_counter() - start
+    logger.info("Loaded %s from %s in %.2fs", model_name, path, elapsed)
+    return model, elapsed
+
+
+def load_tokenizer(auto_cls, model_name: str, **kwargs):
+    """Load the tokenizer stored next to ``model_name``'s weights."""
+    path = resolve_model_path(auto_cls, model_name, kwargs.get("trust_remote_code", False))
+    return AutoTokenizer.from_pretrained(path, local_files_only=True, **kwargs)
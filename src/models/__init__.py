@@ -9,8 +9,11 @@ from .autotune import (
     AutoTuneStatusResponse,
 )
 from .benchmark import (
+    AdaptiveRuns,
     Benchmark,
     BenchmarkCreateRequest,
+    BenchmarkEvalItem,
+    BenchmarkEvalItemListResponse,
     BenchmarkEvalListResponse,
     BenchmarkEvalRequest,
     BenchmarkEvalResult,
@@ -19,8 +22,12 @@ from .benchmark import (
     BenchmarkRunScore,
     BenchmarkStatus,
     BenchmarkUpdateRequest,
+    BulkBenchmarkEvalRequest,
     EvaluationComparisonItem,
     EvaluationComparisonResponse,
+    SignificanceEstimate,
+    SignificancePair,
+    SignificanceResponse,
 )
 from .config import (
     CausalLMDataConfig,
@@ -42,13 +49,15 @@ from .config import (
     MaskedLMTrainingConfig,
 )
 from .dataset import DatasetInfo, DatasetListResponse
-from .enums import AutoTuneStatus, BenchmarkStatus, BenchmarkType, ExperimentStatus, ExperimentType
+from .enums import AutoTuneStatus, BenchmarkStatus, BenchmarkType, EvalMode, ExperimentStatus, ExperimentType
 from .experiment import (
     ExperimentComparisonItem,
     ExperimentComparisonResponse,
     ExperimentListResponse,
     ExperimentResult,
     ExperimentStartResponse,
+    ThroughputComparisonItem,
+    ThroughputComparisonResponse,
 )
 from .plugins import PluginKind, PluginListResponse, PluginRecord, PluginUploadResponse
 from .compute import (
@@ -68,6 +77,7 @@ __all__ = [
     "AutoTuneStatus",
     "BenchmarkStatus",
     "BenchmarkType",
+    "EvalMode",
     "ExperimentStatus",
     "ExperimentType",
     # Compute
@@ -102,6 +112,8 @@ __all__ = [
     "ExperimentListResponse",
     "ExperimentResult",
     "ExperimentStartResponse",
+    "ThroughputComparisonItem",
+    "ThroughputComparisonResponse",
     # Plugins
     "PluginKind",
     "PluginRecord",
@@ -112,8 +124,11 @@ __all__ = [
     "CustomLightningFullConfig",
     "CustomLightningRequest",
     # Benchmark
+    "AdaptiveRuns",
     "Benchmark",
     "BenchmarkCreateRequest",
+    "BenchmarkEvalItem",
+    "BenchmarkEvalItemListResponse",
     "BenchmarkEvalListResponse",
     "BenchmarkEvalRequest",
     "BenchmarkEvalResult",
@@ -121,8 +136,12 @@ __all__ = [
     "BenchmarkListResponse",
     "BenchmarkRunScore",
     "BenchmarkUpdateRequest",
+    "BulkBenchmarkEvalRequest",
     "EvaluationComparisonItem",
     "EvaluationComparisonResponse",
+    "SignificanceEstimate",
+    "SignificancePair",
+    "SignificanceResponse",
     # AutoTune
     "AutoTuneCandidate",
     "AutoTuneJob",
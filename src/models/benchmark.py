@@ -6,7 +6,7 @@ from typing import Any
 
 from pydantic import BaseModel, Field, PositiveFloat, PositiveInt
 
-from .enums import BenchmarkStatus, BenchmarkType
+from .enums import BenchmarkStatus, BenchmarkType, EvalMode
 
 
 class Benchmark(BaseModel):
@@ -23,6 +23,9 @@ class Benchmark(BaseModel):
     max_new_tokens: int = 128
     temperature: float = 0.7
     top_p: float = 0.9
+    eval_mode: EvalMode = Field(default=EvalMode.SAMPLE)
+    stop_sequences: list[str] = Field(default_factory=list)
+    seed: int | None = None
     created_at: datetime
 
 
@@ -39,6 +42,18 @@ class BenchmarkCreateRequest(BaseModel):
     max_new_tokens: PositiveInt = Field(default=128, description="Maximum tokens to generate")
     temperature: PositiveFloat = Field(default=0.7, description="Sampling temperature")
     top_p: PositiveFloat = Field(default=0.9, description="Top-p sampling parameter")
+    eval_mode: EvalMode = Field(
+        default=EvalMode.SAMPLE,
+        description="greedy: one deterministic run; sample: num_runs sampled runs per question",
+    )
+    stop_sequences: list[str] = Field(
+        default_factory=list, description="Generation stops at the first of these strings (excluded from the answer)"
+    )
+    seed: int | None = Field(
+        default=None,
+        ge=0,
+        description="Sampled run k uses seed + k - 1, making sampled evals reproducible and cacheable",
+    )
 
 
 class BenchmarkUpdateRequest(BaseModel):
@@ -54,6 +69,9 @@ class BenchmarkUpdateRequest(BaseModel):
     max_new_tokens: PositiveInt | None = Field(default=None, description="Maximum tokens to generate")
     temperature: PositiveFloat | None = Field(default=None, description="Sampling temperature")
     top_p: PositiveFloat | None = Field(default=None, description="Top-p sampling parameter")
+    eval_mode: EvalMode | None = Field(default=None, description="greedy or sample")
+    stop_sequences: list[str] | None = Field(default=None, description="Strings that end generation")
+    seed: int | None = Field(default=None, ge=0, description="Sampling seed; send null to clear it")
 
 
 class BenchmarkListResponse(BaseModel):
@@ -65,6 +83,7 @@ class BenchmarkRunScore(BaseModel):
     model_answer: str
     bleu_score: float
     rouge_score: float
+    semantic_score: float | None = None
 
 
 class BenchmarkEvalResult(BaseModel):
@@ -90,15 +109,64 @@ class BenchmarkEvalResult(BaseModel):
     error: str | None = None
 
 
+class BenchmarkEvalItem(BaseModel):
+    """Per-question result of a suite evaluation (causal_lm_qa_suite scores are averaged over runs)."""
+
+    index: int
+    question: str
+    gold_answer: str
+    model_answer: str
+    bleu_score: float = 0.0
+    rouge_score: float = 0.0
+    metrics: dict[str, Any] = Field(default_factory=dict)
+
+
+class BenchmarkEvalItemListResponse(BaseModel):
+    items: list[BenchmarkEvalItem]
+    total: int
+
+
+class AdaptiveRuns(BaseModel):
+    """Sequential early stopping for sampled multi-run causal_lm_qa evals."""
+
+    ci_tolerance: PositiveFloat = Field(
+        default=2.0, description="Stop once the ROUGE-L confidence interval half-width is at most this (0-100 scale)"
+    )
+    confidence: float = Field(default=0.95, gt=0, lt=1)
+    min_runs: int = Field(default=3, ge=2, description="Runs sampled before the first stopping check")
+    runs_per_round: PositiveInt = Field(default=2, description="Runs sampled between stopping checks")
+    rank_settled: bool = Field(
+        default=True,
+        description="Also stop once no other experiment's score on this benchmark falls inside the interval",
+    )
+
+
 class BenchmarkEvalRequest(BaseModel):
     experiment_id: str = Field(description="Experiment ID to evaluate")
     max_new_tokens: PositiveInt = Field(default=128)
     temperature: PositiveFloat = Field(default=0.7)
     top_p: PositiveFloat = Field(default=0.9)
     num_runs: PositiveInt = Field(default=1, description="Number of times to run evaluation and average scores")
+    adaptive: AdaptiveRuns | None = Field(
+        default=None, description="Stop before num_runs once the score has converged (causal_lm_qa only)"
+    )
+    use_generation_cache: bool = Field(
+        default=True, description="Reuse cached greedy/seeded answers; false always regenerates"
+    )
     compute_target_id: str | None = Field(default=None, description="Optional compute target for remote execution")
 
 
+class BulkBenchmarkEvalRequest(BaseModel):
+    experiment_ids: list[str] = Field(min_length=1, description="Experiments to evaluate against the benchmark")
+    num_runs: PositiveInt = Field(default=1, description="Number of times to run evaluation and average scores")
+    adaptive: AdaptiveRuns | None = Field(
+        default=None, description="Stop before num_runs once the score has converged (causal_lm_qa only)"
+    )
+    use_generation_cache: bool = Field(
+        default=True, description="Reuse cached greedy/seeded answers; false always regenerates"
+    )
+
+
 class BenchmarkEvalStartResponse(BaseModel):
     eval_id: str
     status: BenchmarkStatus
@@ -135,3 +203,44 @@ class EvaluationComparisonItem(BaseModel):
 class EvaluationComparisonResponse(BaseModel):
     evaluations: list[EvaluationComparisonItem]
 
+
+# --- Significance Models ---
+
+
+class SignificanceEstimate(BaseModel):
+    eval_id: str
+    experiment_id: str
+    rank: int | None = None
+    n: int = Field(description="Runs or items the mean is over")
+    mean: float
+    ci_low: float
+    ci_high: float
+
+
+class SignificancePair(BaseModel):
+    eval_a: str
+    eval_b: str
+    paired: bool = Field(description="Both evals were scored on the same runs/items and resampled jointly")
+    diff: float = Field(description="mean(a) - mean(b)")
+    ci_low: float
+    ci_high: float
+    p_value: float | None = None
+    significant: bool
+    better_eval_id: str | None = Field(default=None, description="Winner of a significant pair")
+    extra_samples: int | None = Field(
+        default=None,
+        description="Runs/items to add to each side to separate the pair; -1 if more than max_extra",
+    )
+
+
+class SignificanceResponse(BaseModel):
+    benchmark_id: str
+    metric: str
+    unit: str = Field(description="run or item")
+    confidence: float
+    power: float
+    resamples: int
+    estimates: list[SignificanceEstimate]
+    pairs: list[SignificancePair]
+    skipped_eval_ids: list[str] = Field(default_factory=list, description="Completed evals without scores for metric")
+
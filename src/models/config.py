@@ -65,6 +65,27 @@ class MaskedLMTrainingConfig(BaseModel):
         default=False,
         description="Run all available benchmarks after experiment completes",
     )
+    auto_batch_size: bool = Field(
+        default=False,
+        description="Search the largest micro-batch that fits memory and keep the effective batch",
+    )
+    memory_budget_mb: PositiveFloat | None = Field(
+        default=None,
+        description="Memory budget for auto batch sizing (device memory on GPU, process RSS on CPU)",
+    )
+    allow_effective_batch_change: bool = Field(
+        default=False,
+        description="Let auto batch sizing round the effective batch up for a larger micro-batch",
+    )
+    profile: bool = Field(
+        default=False,
+        description="Capture a torch.profiler trace of a few training steps",
+    )
+    profile_steps: PositiveInt = Field(default=5, description="Number of steps recorded when profiling")
+    async_checkpoint: bool = Field(
+        default=True,
+        description="Write checkpoints on a background thread instead of stalling the training step",
+    )
 
 
 class MaskedLMFullConfig(BaseModel):
@@ -141,6 +162,35 @@ class CausalLMTrainingConfig(BaseModel):
         default=False,
         description="Run all available benchmarks after experiment completes",
     )
+    auto_batch_size: bool = Field(
+        default=False,
+        description="Search the largest micro-batch that fits memory and keep the effective batch",
+    )
+    memory_budget_mb: PositiveFloat | None = Field(
+        default=None,
+        description="Memory budget for auto batch sizing (device memory on GPU, process RSS on CPU)",
+    )
+    allow_effective_batch_change: bool = Field(
+        default=False,
+        description="Let auto batch sizing round the effective batch up for a larger micro-batch",
+    )
+    profile: bool = Field(
+        default=False,
+        description="Capture a torch.profiler trace of a few training steps",
+    )
+    profile_steps: PositiveInt = Field(default=5, description="Number of steps recorded when profiling")
+    async_checkpoint: bool = Field(
+        default=True,
+        description="Write checkpoints on a background thread instead of stalling the training step",
+    )
+    checkpoint_mode: Literal["full", "adapter"] = Field(
+        default="full",
+        description="'adapter' (LoRA only) leaves the optimizer state out of checkpoints; resuming restarts it",
+    )
+    prune_checkpoints: bool = Field(
+        default=True,
+        description="Delete intermediate checkpoints of finished PEFT runs, keeping only the final adapter",
+    )
 
 
 class CausalLMFullConfig(BaseModel):
@@ -10,6 +10,10 @@ class CustomLightningTrainingConfig(BaseModel):
     devices: int | str = Field(default="auto")
     precision: str = Field(default="32")
     log_every_n_steps: int = Field(default=10, ge=1)
+    profile: bool = Field(default=False, description="Capture a torch.profiler trace of a few training steps")
+    profile_steps: int = Field(default=5, ge=1, description="Number of steps recorded when profiling")
+    async_checkpoint: bool = Field(default=True, description="Write model.ckpt on a background thread")
+    checkpoint_weights_only: bool = Field(default=False, description="Omit optimizer/loop state from model.ckpt")
 
 
 class CustomLightningFullConfig(BaseModel):
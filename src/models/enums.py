@@ -26,11 +26,18 @@ class BenchmarkStatus(str, Enum):
 
 class BenchmarkType(str, Enum):
     CAUSAL_LM_QA = "causal_lm_qa"
+    CAUSAL_LM_QA_SUITE = "causal_lm_qa_suite"
     MASKED_LM_FILL_MASK = "masked_lm_fill_mask"
+    MASKED_LM_FILL_MASK_SUITE = "masked_lm_fill_mask_suite"
     CUSTOM_LIGHTNING_SIN_REGRESSION = "custom_lightning_sin_regression"
     CUSTOM_LIGHTNING_PLUGIN = "custom_lightning_plugin"
 
 
+class EvalMode(str, Enum):
+    SAMPLE = "sample"
+    GREEDY = "greedy"
+
+
 class AutoTuneStatus(str, Enum):
     PENDING = "pending"
     PROBING = "probing"
@@ -66,9 +66,31 @@ class ExperimentComparisonItem(BaseModel):
     bleu_scores: list[float] = Field(default_factory=list)
     rouge_scores: list[float] = Field(default_factory=list)
     eval_loss: float | None = None
+    loss_curve: dict[str, list[tuple[int, float]]] | None = Field(
+        default=None, description="train/eval (step, loss) series, when requested"
+    )
 
 
 class ExperimentComparisonResponse(BaseModel):
     experiments: list[ExperimentComparisonItem]
     config_diff: dict[str, dict[str, Any]]
 
+
+
+# --- Throughput Comparison Models ---
+
+
+class ThroughputComparisonItem(BaseModel):
+    experiment_id: str
+    experiment_type: ExperimentType
+    status: ExperimentStatus
+    config_name: str | None = None
+    throughput: dict[str, Any] = Field(default_factory=dict)
+    relative_samples_per_sec: float | None = Field(
+        default=None, description="samples/sec as a fraction of the fastest experiment compared"
+    )
+
+
+class ThroughputComparisonResponse(BaseModel):
+    experiments: list[ThroughputComparisonItem]
+    fastest_experiment_id: str | None = None
@@ -29,7 +29,9 @@ from .meta_features import (
     StaticDatasetFeatures,
     extract_static_config_features,
     extract_static_dataset_features,
+    static_feature_cache,
 )
+from .model_store import load_pretrained, load_tokenizer
 from .models import CausalLMFullConfig
 
 
@@ -82,7 +84,8 @@ class _ProbeProgressCallback(TrainerCallback):
 
 def _prepare_tokenizer(config: CausalLMFullConfig) -> tuple[AutoTokenizer, bool]:
     """Prepare tokenizer, adding pad token if needed."""
-    tokenizer = AutoTokenizer.from_pretrained(
+    tokenizer = load_tokenizer(
+        AutoModelForCausalLM,
         config.model.pretrained_model_name,
         trust_remote_code=config.model.trust_remote_code,
     )
@@ -195,6 +198,7 @@ def run_probe(
         separator="\n",
         tokenizer=tokenizer,
         max_length=config.data.max_length,
+        cache=static_feature_cache,
     )
 
     # Extract static config features
@@ -210,7 +214,8 @@ def run_probe(
     )
 
     # Load model - force CPU for probes to avoid MPS memory issues with sequential runs
-    model = AutoModelForCausalLM.from_pretrained(
+    model, _ = load_pretrained(
+        AutoModelForCausalLM,
         config.model.pretrained_model_name,
         trust_remote_code=config.model.trust_remote_code,
         device_map="cpu",
@@ -337,6 +342,7 @@ def run_probe_with_progress(
         separator="\n",
         tokenizer=tokenizer,
         max_length=config.data.max_length,
+        cache=static_feature_cache,
     )
 
     update_progress(25, "Extracting static config features")
@@ -352,7 +358,8 @@ def run_probe_with_progress(
     )
 
     update_progress(55, "Loading model (CPU)")
-    model = AutoModelForCausalLM.from_pretrained(
+    model, _ = load_pretrained(
+        AutoModelForCausalLM,
         config.model.pretrained_model_name,
         trust_remote_code=config.model.trust_remote_code,
         device_map="cpu",
@@ -0,0 +1,111 @@
+"""Bounded ``torch.profiler`` capture for training runs.
+
+When a training config sets ``profile: true`` the run records a short window
+of optimizer steps (one wait step, one warmup step, then ``profile_steps``
+active steps) and writes into ``<output_dir>/profiler/``:
+
+- ``trace.json``: Chrome trace, open with chrome://tracing or Perfetto
+- ``ops.txt``: op-level ``key_averages`` table
+- ``ops.json``: the same table as structured rows for the UI
+- ``stacks.txt``: collapsed stacks (self CPU time) for flamegraph tools
+"""
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import torch
+from torch.profiler import ProfilerActivity, profile, schedule
+
+logger = logging.getLogger(__name__)
+
+PROFILER_DIRNAME = "profiler"
+TRACE_FILENAME = "trace.json"
+OPS_TABLE_FILENAME = "ops.txt"
+OPS_JSON_FILENAME = "ops.json"
+STACKS_FILENAME = "stacks.txt"
+
+_TOP_OPS = 50
+
+
+def _op_rows(prof, sort_by: str) -> list[dict[str, Any]]:
+    rows = []
+    for evt in prof.key_averages():
+        rows.append(
+            {
+                "name": evt.key,
+                "calls": evt.count,
+                "cpu_time_total_us": round(evt.cpu_time_total, 1),
+                "self_cpu_time_total_us": round(evt.self_cpu_time_total, 1),
+                "device_time_total_us": round(getattr(evt, "device_time_total", 0.0), 1),
+                "self_device_time_total_us": round(getattr(evt, "self_device_time_total", 0.0), 1),
+                "cpu_memory_usage_bytes": int(evt.cpu_memory_usage),
+                "device_memory_usage_bytes": int(getattr(evt, "device_memory_usage", 0)),
+            }
+        )
+    key = {
+        "self_cuda_time_total": "self_device_time_total_us",
+        "self_cpu_time_total": "self_cpu_time_total_us",
+    }[sort_by]
+    rows.sort(key=lambda r: r[key], reverse=True)
+    return rows[:_TOP_OPS]
+
+
+class ProfilerWindow:
+    """Wraps a scheduled ``torch.profiler.profile`` advanced once per optimizer step."""
+
+    def __init__(self, output_dir: Path, active_steps: int = 5, wait: int = 1, warmup: int = 1) -> None:
+        self.output_dir = output_dir / PROFILER_DIRNAME
+        self.total_steps = wait + warmup + active_steps
+        self._steps = 0
+        self._prof = None
+        self._cuda = torch.cuda.is_available()
+        self._schedule = schedule(wait=wait, warmup=warmup, active=active_steps, repeat=1)
+
+    def start(self) -> None:
+        activities = [ProfilerActivity.CPU]
+        if self._cuda:
+            activities.append(ProfilerActivity.CUDA)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._prof = profile(
+            activities=activities,
+            schedule=self._schedule,
+            on_trace_ready=self._export,
+            record_shapes=True,
+            profile_memory=True,
+            with_stack=True,
+        )
+        self._prof.start()
+
+    def step(self) -> None:
+        if self._prof is None:
+            return
+        self._steps += 1
+        self._prof.step()
+        if self._steps >= self.total_steps:
+            self.stop()
+
+    def stop(self) -> None:
+        if self._prof is None:
+            return
+        prof, self._prof = self._prof, None
+        prof.stop()
+
+    def _export(self, prof) -> None:
+        sort_by = "self_cuda_time_total" if self._cuda else "self_cpu_time_total"
+        prof.export_chrome_trace(str(self.output_dir / TRACE_FILENAME))
+        table = prof.key_averages().table(sort_by=sort_by, row_limit=_TOP_OPS)
+        (self.output_dir / OPS_TABLE_FILENAME).write_text(table, encoding="utf-8")
+        prof.export_stacks(str(self.output_dir / STACKS_FILENAME), "self_cpu_time_total")
+        payload = {"sort_by": sort_by, "steps": self._steps, "ops": _op_rows(prof, sort_by)}
+        (self.output_dir / OPS_JSON_FILENAME).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        logger.info("Profiler trace written to %s", self.output_dir)
+
+
+def load_profile_summary(output_dir: Path) -> dict[str, Any] | None:
+    path = output_dir / PROFILER_DIRNAME / OPS_JSON_FILENAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
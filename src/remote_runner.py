@@ -9,6 +9,9 @@ from .models import ComputeTarget
 from .ssh_client import SSHClient
 from .storage import get_compute_target
 
+# Remote LM runs cannot be resumed locally, so their checkpoints are never fetched.
+_LM_DOWNLOAD_EXCLUDE = ("checkpoint-*", ".tmp-checkpoint-*")
+
 
 def _get_repo_root() -> Path:
     """Get the repository root directory."""
@@ -192,7 +195,7 @@ def run_causal_lm_remote(
         metrics = json.loads(metrics_content)
 
         # Download artifacts
-        client.download_directory(remote_output_dir, local_output_dir)
+        client.download_directory(remote_output_dir, local_output_dir, exclude=_LM_DOWNLOAD_EXCLUDE)
 
         return True, metrics, None, logs
 
@@ -316,7 +319,7 @@ def run_masked_lm_remote(
         metrics_content = client.read_file(metrics_path)
         metrics = json.loads(metrics_content)
 
-        client.download_directory(remote_output_dir, local_output_dir)
+        client.download_directory(remote_output_dir, local_output_dir, exclude=_LM_DOWNLOAD_EXCLUDE)
 
         return True, metrics, None, logs
 
@@ -0,0 +1,138 @@
+"""Batch BLEU and ROUGE-L scoring without the ``evaluate`` hub loader.
+
+``evaluate.load("rouge")`` fetches a metric script from the Hugging Face hub
+on first use, which fails offline. It then scores one pair at a time through
+``rouge_score``'s pure-Python LCS table. This module scores whole batches in
+process instead:
+
+* ROUGE-L uses ``rouge_score``'s tokenization (lowercase, alphanumeric
+  runs, no stemming) and a bit-parallel LCS. Each reference becomes one
+  integer bitmask per distinct token, so a hypothesis token costs a few
+  big-int operations instead of a row of the DP table.
+* BLEU reuses sacrebleu's 13a tokenizer and scoring formula. It counts
+  n-grams per order with ``Counter(zip(...))`` and clips only the n-grams
+  that hypothesis and reference share. Each distinct reference is counted
+  once per batch, since every run of a benchmark shares the same gold
+  answer. Sentence scores use sacrebleu's defaults for
+  sentence BLEU (exp smoothing, effective order).
+
+Scores are on a 0-100 scale and match ``sacrebleu`` / ``rouge_score``.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Sequence
+
+from sacrebleu.metrics import BLEU
+from sacrebleu.tokenizers.tokenizer_13a import Tokenizer13a
+
+MAX_NGRAM_ORDER = 4
+
+_ROUGE_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_bleu_tokenizer = Tokenizer13a()
+
+
+def rouge_tokenize(text: str) -> list[str]:
+    return _ROUGE_TOKEN_RE.findall(text.lower())
+
+
+def lcs_length(a: Sequence[str], b: Sequence[str]) -> int:
+    """Length of the longest common subsequence of two token sequences.
+
+    Bit-parallel (Allison-Dix/Hyyro): bit ``i`` of ``row`` tracks column ``i`` of
+    the DP table for ``b``, so each token of ``a`` is O(len(b) / word size).
+    """
+    if not a or not b:
+        return 0
+    if len(b) > len(a):
+        a, b = b, a
+    masks: dict[str, int] = {}
+    for i, token in enumerate(b):
+        masks[token] = masks.get(token, 0) | (1 << i)
+    full = (1 << len(b)) - 1
+    row = full
+    for token in a:
+        match = masks.get(token)
+        if match:
+            hits = row & match
+            row = ((row + hits) | (row & ~match)) & full
+    return len(b) - row.bit_count()
+
+
+def _rouge_l(hyp_tokens: list[str], ref_tokens: list[str]) -> float:
+    lcs = lcs_length(hyp_tokens, ref_tokens)
+    if lcs == 0:
+        return 0.0
+    precision = lcs / len(hyp_tokens)
+    recall = lcs / len(ref_tokens)
+    return 100.0 * 2 * precision * recall / (precision + recall)
+
+
+def rouge_l_scores(hypotheses: Sequence[str], references: Sequence[str]) -> list[float]:
+    """ROUGE-L F1 (0-100) of each hypothesis against its reference."""
+    if len(hypotheses) != len(references):
+        raise ValueError("hypotheses and references must have the same length")
+    ref_cache: dict[str, list[str]] = {}
+    scores = []
+    for hyp, ref in zip(hypotheses, references):
+        ref_tokens = ref_cache.get(ref)
+        if ref_tokens is None:
+            ref_tokens = ref_cache[ref] = rouge_tokenize(ref)
+        scores.append(_rouge_l(rouge_tokenize(hyp), ref_tokens))
+    return scores
+
+
+def _ngrams(text: str) -> tuple[list[Counter], int]:
+    """Per-order n-gram counts of the 13a-tokenized ``text`` and its token count."""
+    tokens = _bleu_tokenizer(text.rstrip()).split()
+    counts = [Counter(zip(*(tokens[i:] for i in range(n)))) for n in range(1, MAX_NGRAM_ORDER + 1)]
+    return counts, len(tokens)
+
+
+def _bleu_stats(hyp: str, ref_counts: list[Counter], ref_len: int) -> tuple[list[int], list[int], int, int]:
+    hyp_counts, hyp_len = _ngrams(hyp)
+    correct = []
+    for hyp_c, ref_c in zip(hyp_counts, ref_counts):
+        # Key-view intersection runs in C; only shared n-grams reach the Python loop.
+        correct.append(sum(min(hyp_c[g], ref_c[g]) for g in hyp_c.keys() & ref_c.keys()))
+    total = [max(0, hyp_len - n) for n in range(MAX_NGRAM_ORDER)]
+    return correct, total, hyp_len, ref_len
+
+
+def bleu_scores(hypotheses: Sequence[str], references: Sequence[str]) -> list[float]:
+    """Sentence BLEU (0-100) of each hypothesis against its reference."""
+    if len(hypotheses) != len(references):
+        raise ValueError("hypotheses and references must have the same length")
+    ref_cache: dict[str, tuple[list[Counter], int]] = {}
+    scores = []
+    for hyp, ref in zip(hypotheses, references):
+        ref_info = ref_cache.get(ref)
+        if ref_info is None:
+            ref_info = ref_cache[ref] = _ngrams(ref)
+        correct, total, sys_len, ref_len = _bleu_stats(hyp, *ref_info)
+        score = BLEU.compute_bleu(
+            correct, total, sys_len, ref_len, smooth_method="exp", effective_order=True
+        ).score
+        scores.append(score)
+    return scores
+
+
+def corpus_bleu(hypotheses: Sequence[str], references: Sequence[str]) -> float:
+    """Corpus BLEU (0-100): n-gram statistics summed over all pairs before scoring."""
+    if len(hypotheses) != len(references):
+        raise ValueError("hypotheses and references must have the same length")
+    correct = [0] * MAX_NGRAM_ORDER
+    total = [0] * MAX_NGRAM_ORDER
+    sys_len = ref_len = 0
+    ref_cache: dict[str, tuple[list[Counter], int]] = {}
+    for hyp, ref in zip(hypotheses, references):
+        ref_info = ref_cache.get(ref)
+        if ref_info is None:
+            ref_info = ref_cache[ref] = _ngrams(ref)
+        c, t, h_len, r_len = _bleu_stats(hyp, *ref_info)
+        correct = [x + y for x, y in zip(correct, c)]
+        total = [x + y for x, y in zip(total, t)]
+        sys_len += h_len
+        ref_len += r_len
+    return BLEU.compute_bleu(correct, total, sys_len, ref_len, smooth_method="exp").score
@@ -0,0 +1,181 @@
+"""Semantic similarity of model answers to gold answers.
+
+ROUGE-L rewards word overlap, so a correct paraphrase can score near zero.
+``semantic_scorer.scores(answers, golds)`` returns the cosine similarity
+(0-100 scale) of mean-pooled, L2-normalized embeddings from a small local
+encoder. Any sentence-transformers style model dir works, for example
+all-MiniLM-L6-v2. Set ``SEMANTIC_ENCODER_PATH`` to that dir to turn on
+semantic scoring. The encoder loads with ``local_files_only`` the first time
+it is needed and then stays loaded for the life of the process.
+
+Each call embeds all its distinct texts in batches of
+``SEMANTIC_BATCH_SIZE``. Embeddings are kept in a SQLite file
+(``SEMANTIC_CACHE_PATH``) keyed by the encoder's weight fingerprint and the
+sha256 of the text. A gold answer is therefore encoded once per encoder,
+across every eval and every process that shares the file.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import torch
+
+from .model_cache import weights_fingerprint
+
+logger = logging.getLogger(__name__)
+
+ENCODER_ENV = "SEMANTIC_ENCODER_PATH"
+CACHE_ENV = "SEMANTIC_CACHE_PATH"
+BATCH_SIZE_ENV = "SEMANTIC_BATCH_SIZE"
+
+_MAX_LENGTH = 256
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """float32 embeddings in SQLite, keyed by (encoder fingerprint, text sha256)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "encoder TEXT NOT NULL, text_sha256 TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (encoder, text_sha256))"
+        )
+        return conn
+
+    def get(self, encoder: str, hashes: Sequence[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        conn = self._connect()
+        try:
+            # Stay under SQLite's bound-parameter limit.
+            for start in range(0, len(hashes), 500):
+                chunk = list(hashes[start : start + 500])
+                rows = conn.execute(
+                    f"SELECT text_sha256, vector FROM embeddings WHERE encoder = ? "
+                    f"AND text_sha256 IN ({','.join('?' * len(chunk))})",
+                    [encoder, *chunk],
+                ).fetchall()
+                found.update((h, np.frombuffer(blob, dtype=np.float32)) for h, blob in rows)
+        finally:
+            conn.close()
+        return found
+
+    def put(self, encoder: str, vectors: dict[str, np.ndarray]) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (encoder, text_sha256, vector) VALUES (?, ?, ?)",
+                    [(encoder, h, v.astype(np.float32).tobytes()) for h, v in vectors.items()],
+                )
+        finally:
+            conn.close()
+
+
+class SemanticScorer:
+    """Lazily loaded local sentence encoder with a persistent embedding cache."""
+
+    def __init__(self, encoder_path: str | Path | None, cache_path: str | Path, batch_size: int = 64):
+        self.encoder_path = Path(encoder_path) if encoder_path else None
+        self.cache = EmbeddingCache(Path(cache_path))
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._model = None
+        self._tokenizer = None
+        self._encoder_id: str | None = None
+        self._stats = {"texts": 0, "cache_hits": 0, "encoded": 0, "batches": 0, "seconds": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.encoder_path is not None
+
+    def _load(self) -> None:
+        from transformers import AutoModel, AutoTokenizer
+
+        if self.encoder_path is None:
+            raise ValueError(f"Semantic scoring is off; set {ENCODER_ENV} to a local sentence encoder dir")
+        if not (self.encoder_path / "config.json").exists():
+            raise ValueError(f"{ENCODER_ENV}={self.encoder_path} is not a local model dir")
+        self._tokenizer = AutoTokenizer.from_pretrained(self.encoder_path, local_files_only=True)
+        self._model = AutoModel.from_pretrained(self.encoder_path, local_files_only=True).eval()
+        self._encoder_id = f"{self.encoder_path.resolve()}:{weights_fingerprint(self.encoder_path)}"
+        logger.info(f"Loaded semantic encoder {self.encoder_path}")
+
+    @torch.inference_mode()
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = self._tokenizer(
+                texts[start : start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=_MAX_LENGTH,
+                return_tensors="pt",
+            )
+            hidden = self._model(**batch).last_hidden_state
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1)
+            vectors.append(torch.nn.functional.normalize(pooled.float(), dim=-1).numpy())
+            self._stats["batches"] += 1
+        return np.concatenate(vectors)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Unit-norm embeddings of ``texts``, one row each, reading and filling the cache."""
+        with self._lock:
+            if self._model is None:
+                self._load()
+            start = time.perf_counter()
+            hashes = [_text_hash(t) for t in texts]
+            unique = dict(zip(hashes, texts))
+            vectors = self.cache.get(self._encoder_id, list(unique))
+            missing = [h for h in unique if h not in vectors]
+            if missing:
+                encoded = dict(zip(missing, self._encode([unique[h] for h in missing])))
+                self.cache.put(self._encoder_id, encoded)
+                vectors.update(encoded)
+            self._stats["texts"] += len(unique)
+            self._stats["cache_hits"] += len(unique) - len(missing)
+            self._stats["encoded"] += len(missing)
+            self._stats["seconds"] += time.perf_counter() - start
+        return np.stack([vectors[h] for h in hashes])
+
+    def scores(self, hypotheses: Sequence[str], references: Sequence[str]) -> list[float]:
+        """Cosine similarity (0-100) of each hypothesis to its reference."""
+        if len(hypotheses) != len(references):
+            raise ValueError("hypotheses and references must have the same length")
+        if not hypotheses:
+            return []
+        vectors = self.embed([*hypotheses, *references])
+        n = len(hypotheses)
+        return (100.0 * (vectors[:n] * vectors[n:]).sum(axis=1)).tolist()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "encoder_path": str(self.encoder_path) if self.encoder_path else None,
+            "loaded": self._model is not None,
+            **self._stats,
+        }
+
+
+semantic_scorer = SemanticScorer(
+    os.environ.get(ENCODER_ENV),
+    os.environ.get(CACHE_ENV, "data/embedding_cache.db"),
+    int(os.environ.get(BATCH_SIZE_ENV, "64")),
+)
@@ -1,6 +1,7 @@
 """SSH client for remote compute target operations."""
 from __future__ import annotations
 
+import fnmatch
 import os
 import stat
 from pathlib import Path
@@ -132,8 +133,16 @@ class SSHClient:
         local_path.parent.mkdir(parents=True, exist_ok=True)
         self._sftp.get(remote_path, str(local_path))
 
-    def download_directory(self, remote_dir: str, local_dir: str | Path) -> None:
-        """Recursively download a remote directory to local."""
+    def download_directory(
+        self,
+        remote_dir: str,
+        local_dir: str | Path,
+        exclude: tuple[str, ...] = (),
+    ) -> None:
+        """Recursively download a remote directory to local.
+
+        Entries whose name matches one of the ``exclude`` glob patterns are skipped.
+        """
         if not self._sftp:
             raise RuntimeError("SFTP client not connected")
 
@@ -142,20 +151,22 @@ class SSHClient:
 
         local_dir.mkdir(parents=True, exist_ok=True)
 
-        self._download_dir_recursive(remote_dir, local_dir)
+        self._download_dir_recursive(remote_dir, local_dir, exclude)
 
-    def _download_dir_recursive(self, remote_dir: str, local_dir: Path) -> None:
+    def _download_dir_recursive(self, remote_dir: str, local_dir: Path, exclude: tuple[str, ...] = ()) -> None:
         """Recursively download directory contents."""
         if not self._sftp:
             return
 
         for entry in self._sftp.listdir_attr(remote_dir):
+            if any(fnmatch.fnmatch(entry.filename, pattern) for pattern in exclude):
+                continue
             remote_path = f"{remote_dir}/{entry.filename}"
             local_path = local_dir / entry.filename
 
             if stat.S_ISDIR(entry.st_mode or 0):
                 local_path.mkdir(exist_ok=True)
-                self._download_dir_recursive(remote_path, local_path)
+                self._download_dir_recursive(remote_path, local_path, exclude)
             else:
                 self._sftp.get(remote_path, str(local_path))
 
@@ -1,14 +1,22 @@
 """Storage operations for persistent data."""
 from .benchmark_store import (
+    count_benchmark_eval_items,
     delete_benchmark,
     delete_benchmark_eval,
     get_benchmark,
     get_benchmark_eval,
     list_benchmark_evals,
+    list_benchmark_eval_items,
+    list_benchmark_eval_items_by_eval,
     list_benchmark_evals_by_benchmark,
     list_benchmarks,
+    list_completed_evals_by_experiment,
+    list_evaluation_comparisons,
+    list_leaderboard,
+    rebuild_eval_leaderboard,
     save_benchmark,
     save_benchmark_eval,
+    save_benchmark_eval_items,
 )
 from .config_store import (
     config_name_exists,
@@ -21,7 +29,7 @@ from .config_store import (
 )
 from .database import get_connection, init_db
 from .dataset_store import delete_dataset, get_dataset, list_datasets, save_dataset
-from .experiment_store import delete_experiment, get_experiment, list_experiments, save_experiment
+from .experiment_store import delete_experiment, get_experiment, get_experiments, list_experiments, save_experiment
 from .job_store import (
     OptimizationJob,
     OptimizationStatus,
@@ -56,18 +64,27 @@ __all__ = [
     # Experiment
     "delete_experiment",
     "get_experiment",
+    "get_experiments",
     "list_experiments",
     "save_experiment",
     # Benchmark
+    "count_benchmark_eval_items",
     "delete_benchmark",
     "delete_benchmark_eval",
     "get_benchmark",
     "get_benchmark_eval",
     "list_benchmark_evals",
+    "list_benchmark_eval_items",
+    "list_benchmark_eval_items_by_eval",
     "list_benchmark_evals_by_benchmark",
     "list_benchmarks",
+    "list_completed_evals_by_experiment",
+    "list_evaluation_comparisons",
+    "list_leaderboard",
+    "rebuild_eval_leaderboard",
     "save_benchmark",
     "save_benchmark_eval",
+    "save_benchmark_eval_items",
     # Meta
     "delete_meta_features",
     "get_meta_features",
@@ -4,8 +4,19 @@ from __future__ import annotations
 import json
 from datetime import datetime
 
-from ..models import Benchmark, BenchmarkEvalResult, BenchmarkStatus, BenchmarkType
+from ..models import (
+    Benchmark,
+    BenchmarkEvalItem,
+    BenchmarkEvalResult,
+    BenchmarkStatus,
+    BenchmarkType,
+    EvalMode,
+    EvaluationComparisonItem,
+    ExperimentResult,
+    ExperimentType,
+)
 from .database import get_connection
+from .experiment_store import get_experiment
 
 
 # --- Benchmark operations ---
@@ -16,8 +27,9 @@ def save_benchmark(benchmark: Benchmark) -> None:
         conn.execute(
             """
             INSERT OR REPLACE INTO benchmarks 
-            (id, name, benchmark_type, higher_is_better, spec_json, question, gold_answer, max_new_tokens, temperature, top_p, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (id, name, benchmark_type, higher_is_better, spec_json, question, gold_answer, max_new_tokens, temperature, top_p,
+             eval_mode, stop_sequences_json, seed, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 benchmark.id,
@@ -30,9 +42,14 @@ def save_benchmark(benchmark: Benchmark) -> None:
                 benchmark.max_new_tokens,
                 benchmark.temperature,
                 benchmark.top_p,
+                benchmark.eval_mode.value,
+                json.dumps(benchmark.stop_sequences),
+                benchmark.seed,
                 benchmark.created_at.isoformat(),
             ),
         )
+        # Its direction may have been edited; ranks always follow the current one.
+        _rerank(conn, benchmark.id)
         conn.commit()
 
 
@@ -60,6 +77,9 @@ def get_benchmark(benchmark_id: str) -> Benchmark | None:
             max_new_tokens=row["max_new_tokens"],
             temperature=row["temperature"],
             top_p=row["top_p"],
+            eval_mode=EvalMode(row["eval_mode"] or EvalMode.SAMPLE.value),
+            stop_sequences=json.loads(row["stop_sequences_json"] or "[]"),
+            seed=row["seed"],
             created_at=datetime.fromisoformat(row["created_at"]),
         )
 
@@ -89,6 +109,9 @@ def list_benchmarks() -> list[Benchmark]:
                     max_new_tokens=row["max_new_tokens"],
                     temperature=row["temperature"],
                     top_p=row["top_p"],
+                    eval_mode=EvalMode(row["eval_mode"] or EvalMode.SAMPLE.value),
+                    stop_sequences=json.loads(row["stop_sequences_json"] or "[]"),
+                    seed=row["seed"],
                     created_at=datetime.fromisoformat(row["created_at"]),
                 )
             )
@@ -135,150 +158,353 @@ def save_benchmark_eval(eval_result: BenchmarkEvalResult) -> None:
                 eval_result.error,
             ),
         )
+        _update_leaderboard(conn, eval_result)
         conn.commit()
 
 
-def get_benchmark_eval(eval_id: str) -> BenchmarkEvalResult | None:
-    with get_connection() as conn:
-        row = conn.execute("SELECT * FROM benchmark_evals WHERE id = ?", (eval_id,)).fetchone()
-        if not row:
-            return None
+def _eval_from_row(row) -> BenchmarkEvalResult:
+    metrics = {}
+    try:
+        metrics = json.loads(row["metrics_json"] or "{}")
+    except Exception:
         metrics = {}
-        try:
-            metrics = json.loads(row["metrics_json"] or "{}")
-        except Exception:
-            metrics = {}
+    run_scores = []
+    try:
+        raw = json.loads(row["run_scores_json"] or "[]")
+        if isinstance(raw, list):
+            run_scores = raw
+    except Exception:
         run_scores = []
-        try:
-            raw = json.loads(row["run_scores_json"] or "[]")
-            if isinstance(raw, list):
-                run_scores = raw
-        except Exception:
-            run_scores = []
-        benchmark_type = BenchmarkType.CAUSAL_LM_QA
-        if "benchmark_type" in row.keys() and row["benchmark_type"]:
-            benchmark_type = BenchmarkType(row["benchmark_type"])
-        return BenchmarkEvalResult(
-            id=row["id"],
-            benchmark_id=row["benchmark_id"],
-            benchmark_name=row["benchmark_name"],
-            benchmark_type=benchmark_type,
-            higher_is_better=bool(row["higher_is_better"]),
+    benchmark_type = BenchmarkType.CAUSAL_LM_QA
+    if "benchmark_type" in row.keys() and row["benchmark_type"]:
+        benchmark_type = BenchmarkType(row["benchmark_type"])
+    return BenchmarkEvalResult(
+        id=row["id"],
+        benchmark_id=row["benchmark_id"],
+        benchmark_name=row["benchmark_name"],
+        benchmark_type=benchmark_type,
+        higher_is_better=bool(row["higher_is_better"]),
+        experiment_id=row["experiment_id"],
+        question=row["question"],
+        gold_answer=row["gold_answer"],
+        model_answer=row["model_answer"],
+        bleu_score=row["bleu_score"],
+        rouge_score=row["rouge_score"] or 0.0,
+        primary_score=float(row["primary_score"] or 0.0),
+        rank=row["rank"],
+        metrics=metrics,
+        num_runs=int(row["num_runs"] or 1),
+        run_scores=run_scores,  # pydantic will coerce into BenchmarkRunScore
+        status=BenchmarkStatus(row["status"]),
+        started_at=datetime.fromisoformat(row["started_at"]),
+        completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
+        error=row["error"],
+    )
+
+
+# Ranks come from the leaderboard; evals that are not completed have none.
+_EVAL_SELECT = "SELECT ev.*, lb.rank AS rank FROM benchmark_evals ev LEFT JOIN eval_leaderboard lb ON lb.eval_id = ev.id"
+
+
+def get_benchmark_eval(eval_id: str) -> BenchmarkEvalResult | None:
+    with get_connection() as conn:
+        row = conn.execute(f"{_EVAL_SELECT} WHERE ev.id = ?", (eval_id,)).fetchone()
+        return _eval_from_row(row) if row else None
+
+
+def list_benchmark_evals() -> list[BenchmarkEvalResult]:
+    with get_connection() as conn:
+        rows = conn.execute(f"{_EVAL_SELECT} ORDER BY ev.started_at DESC").fetchall()
+        return [_eval_from_row(row) for row in rows]
+
+
+def list_benchmark_evals_by_benchmark(benchmark_id: str) -> list[BenchmarkEvalResult]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"{_EVAL_SELECT} WHERE ev.benchmark_id = ? ORDER BY ev.started_at DESC",
+            (benchmark_id,),
+        ).fetchall()
+        return [_eval_from_row(row) for row in rows]
+
+
+def list_completed_evals_by_experiment(experiment_ids: list[str]) -> dict[str, list[BenchmarkEvalResult]]:
+    """Completed evals of each experiment, newest first, read through the experiment index."""
+    by_experiment: dict[str, list[BenchmarkEvalResult]] = {eid: [] for eid in experiment_ids}
+    with get_connection() as conn:
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(experiment_ids), 500):
+            chunk = experiment_ids[start : start + 500]
+            rows = conn.execute(
+                f"{_EVAL_SELECT} WHERE ev.experiment_id IN ({','.join('?' * len(chunk))}) AND ev.status = ? "
+                "ORDER BY ev.started_at DESC",
+                [*chunk, BenchmarkStatus.COMPLETED.value],
+            ).fetchall()
+            for row in rows:
+                by_experiment[row["experiment_id"]].append(_eval_from_row(row))
+    return by_experiment
+
+
+def delete_benchmark_eval(eval_id: str) -> bool:
+    with get_connection() as conn:
+        board = conn.execute("SELECT benchmark_id FROM eval_leaderboard WHERE eval_id = ?", (eval_id,)).fetchone()
+        cursor = conn.execute("DELETE FROM benchmark_evals WHERE id = ?", (eval_id,))
+        conn.execute("DELETE FROM benchmark_eval_items WHERE eval_id = ?", (eval_id,))
+        if board:
+            conn.execute("DELETE FROM eval_leaderboard WHERE eval_id = ?", (eval_id,))
+            _rerank(conn, board["benchmark_id"])
+        conn.commit()
+        return cursor.rowcount > 0
+
+
+# --- Leaderboard operations ---
+#
+# eval_leaderboard holds one row per completed eval with its rank within the
+# benchmark and the experiment settings the comparison view shows. Rows are
+# written when an eval is saved as completed and removed when it is deleted
+# or re-run, so list and compare endpoints read ranks instead of sorting
+# every eval on each request.
+
+
+def _comparison_fields(experiment: ExperimentResult | None) -> dict:
+    """Model and training settings of an experiment, as shown on the comparison view."""
+    fields = {
+        "model_name": "unknown",
+        "learning_rate": None,
+        "num_epochs": None,
+        "batch_size": None,
+        "lora_r": None,
+        "lora_alpha": None,
+    }
+    if experiment is None:
+        return fields
+    cfg = experiment.config
+    if experiment.experiment_type in (ExperimentType.CAUSAL_LM, ExperimentType.MASKED_LM) and cfg is not None:
+        fields["model_name"] = cfg.model.pretrained_model_name
+        fields["learning_rate"] = cfg.training.learning_rate
+        fields["num_epochs"] = cfg.training.num_train_epochs
+        fields["batch_size"] = cfg.training.per_device_train_batch_size
+        peft = getattr(cfg, "peft", None)
+        if experiment.experiment_type == ExperimentType.CAUSAL_LM and peft and peft.enabled:
+            fields["lora_r"] = peft.r
+            fields["lora_alpha"] = peft.lora_alpha
+    elif experiment.experiment_type == ExperimentType.CUSTOM_LIGHTNING:
+        fields["model_name"] = experiment.lightning_module_class_name or "custom_lightning"
+        if cfg is not None and isinstance(getattr(cfg, "cfg", None), dict):
+            if "lr" in cfg.cfg:
+                fields["learning_rate"] = float(cfg.cfg["lr"])
+            if "batch_size" in cfg.cfg:
+                fields["batch_size"] = int(cfg.cfg["batch_size"])
+    return fields
+
+
+def _rerank(conn, benchmark_id: str) -> None:
+    """Renumber one benchmark's leaderboard; ties go to the most recent eval.
+
+    Every row is ordered in the benchmark's current direction, not the
+    ``higher_is_better`` each eval was saved with, so editing the direction
+    never leaves a mixed, meaningless order. Evals of a deleted benchmark
+    use the direction of the most recent one.
+    """
+    row = conn.execute("SELECT higher_is_better FROM benchmarks WHERE id = ?", (benchmark_id,)).fetchone()
+    if row is None:
+        row = conn.execute(
+            "SELECT higher_is_better FROM eval_leaderboard WHERE benchmark_id = ? ORDER BY started_at DESC LIMIT 1",
+            (benchmark_id,),
+        ).fetchone()
+    if row is None:
+        return
+    conn.execute(
+        """
+        UPDATE eval_leaderboard SET rank = ranked.rank
+        FROM (
+            SELECT eval_id, ROW_NUMBER() OVER (ORDER BY primary_score * ?, started_at DESC) AS rank
+            FROM eval_leaderboard WHERE benchmark_id = ?
+        ) AS ranked
+        WHERE eval_leaderboard.eval_id = ranked.eval_id
+        """,
+        (-1 if row["higher_is_better"] else 1, benchmark_id),
+    )
+
+
+def _update_leaderboard(conn, eval_result: BenchmarkEvalResult, rerank: bool = True) -> None:
+    existing = conn.execute("SELECT 1 FROM eval_leaderboard WHERE eval_id = ?", (eval_result.id,)).fetchone()
+    if eval_result.status != BenchmarkStatus.COMPLETED:
+        if existing:
+            conn.execute("DELETE FROM eval_leaderboard WHERE eval_id = ?", (eval_result.id,))
+            _rerank(conn, eval_result.benchmark_id)
+        return
+    if existing:
+        conn.execute(
+            "UPDATE eval_leaderboard SET primary_score = ?, higher_is_better = ? WHERE eval_id = ?",
+            (float(eval_result.primary_score), 1 if eval_result.higher_is_better else 0, eval_result.id),
+        )
+    else:
+        fields = _comparison_fields(get_experiment(eval_result.experiment_id))
+        conn.execute(
+            """
+            INSERT INTO eval_leaderboard
+            (eval_id, benchmark_id, experiment_id, higher_is_better, primary_score, started_at,
+             model_name, learning_rate, num_epochs, batch_size, lora_r, lora_alpha)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                eval_result.id,
+                eval_result.benchmark_id,
+                eval_result.experiment_id,
+                1 if eval_result.higher_is_better else 0,
+                float(eval_result.primary_score),
+                eval_result.started_at.isoformat(),
+                fields["model_name"],
+                fields["learning_rate"],
+                fields["num_epochs"],
+                fields["batch_size"],
+                fields["lora_r"],
+                fields["lora_alpha"],
+            ),
+        )
+    if rerank:
+        _rerank(conn, eval_result.benchmark_id)
+
+
+def rebuild_eval_leaderboard() -> int:
+    """Fill the leaderboard from scratch out of the completed evals; returns the row count."""
+    with get_connection() as conn:
+        conn.execute("DELETE FROM eval_leaderboard")
+        rows = conn.execute("SELECT * FROM benchmark_evals WHERE status = ?", (BenchmarkStatus.COMPLETED.value,))
+        evals = [_eval_from_row({**dict(row), "rank": None}) for row in rows.fetchall()]
+        for eval_result in evals:
+            _update_leaderboard(conn, eval_result, rerank=False)
+        for benchmark_id in {e.benchmark_id for e in evals}:
+            _rerank(conn, benchmark_id)
+        conn.commit()
+        return len(evals)
+
+
+def list_leaderboard(benchmark_id: str) -> list[BenchmarkEvalResult]:
+    """Completed evals of one benchmark in rank order."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT ev.*, lb.rank AS rank FROM eval_leaderboard lb
+            JOIN benchmark_evals ev ON ev.id = lb.eval_id
+            WHERE lb.benchmark_id = ? ORDER BY lb.rank
+            """,
+            (benchmark_id,),
+        ).fetchall()
+        return [_eval_from_row(row) for row in rows]
+
+
+def list_evaluation_comparisons() -> list[EvaluationComparisonItem]:
+    """Completed evals of existing experiments, best first, sin-regression MSE ahead of text scores."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT ev.id, ev.experiment_id, ev.benchmark_name, ev.benchmark_type, ev.question, ev.bleu_score,
+                   ev.rouge_score, ev.primary_score, ev.started_at, ev.completed_at, x.dataset_filename,
+                   lb.model_name, lb.learning_rate, lb.num_epochs, lb.batch_size, lb.lora_r, lb.lora_alpha
+            FROM eval_leaderboard lb
+            JOIN benchmark_evals ev ON ev.id = lb.eval_id
+            JOIN experiments x ON x.id = lb.experiment_id
+            ORDER BY
+                CASE WHEN ev.benchmark_type = ? THEN 0 ELSE 1 END,
+                CASE WHEN ev.benchmark_type = ? THEN ev.primary_score ELSE -ev.rouge_score END,
+                ev.started_at DESC
+            """,
+            (BenchmarkType.CUSTOM_LIGHTNING_SIN_REGRESSION.value,) * 2,
+        ).fetchall()
+    return [
+        EvaluationComparisonItem(
+            eval_id=row["id"],
             experiment_id=row["experiment_id"],
+            benchmark_name=row["benchmark_name"],
+            benchmark_type=BenchmarkType(row["benchmark_type"] or BenchmarkType.CAUSAL_LM_QA.value),
             question=row["question"],
-            gold_answer=row["gold_answer"],
-            model_answer=row["model_answer"],
+            model_name=row["model_name"],
+            dataset_filename=row["dataset_filename"] or "unknown",
             bleu_score=row["bleu_score"],
             rouge_score=row["rouge_score"] or 0.0,
             primary_score=float(row["primary_score"] or 0.0),
-            metrics=metrics,
-            num_runs=int(row["num_runs"] or 1),
-            run_scores=run_scores,  # pydantic will coerce into BenchmarkRunScore
-            status=BenchmarkStatus(row["status"]),
+            learning_rate=row["learning_rate"],
+            num_epochs=row["num_epochs"],
+            batch_size=row["batch_size"],
+            lora_r=row["lora_r"],
+            lora_alpha=row["lora_alpha"],
             started_at=datetime.fromisoformat(row["started_at"]),
             completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
-            error=row["error"],
         )
+        for row in rows
+    ]
 
 
-def list_benchmark_evals() -> list[BenchmarkEvalResult]:
+# --- Benchmark Eval item operations ---
+
+
+def save_benchmark_eval_items(eval_id: str, items: list[BenchmarkEvalItem]) -> None:
     with get_connection() as conn:
-        rows = conn.execute("SELECT * FROM benchmark_evals ORDER BY started_at DESC").fetchall()
-        results: list[BenchmarkEvalResult] = []
-        for row in rows:
-            metrics = {}
-            try:
-                metrics = json.loads(row["metrics_json"] or "{}")
-            except Exception:
-                metrics = {}
-            run_scores = []
-            try:
-                raw = json.loads(row["run_scores_json"] or "[]")
-                if isinstance(raw, list):
-                    run_scores = raw
-            except Exception:
-                run_scores = []
-            benchmark_type = BenchmarkType.CAUSAL_LM_QA
-            if "benchmark_type" in row.keys() and row["benchmark_type"]:
-                benchmark_type = BenchmarkType(row["benchmark_type"])
-            results.append(
-                BenchmarkEvalResult(
-                    id=row["id"],
-                    benchmark_id=row["benchmark_id"],
-                    benchmark_name=row["benchmark_name"],
-                    benchmark_type=benchmark_type,
-                    higher_is_better=bool(row["higher_is_better"]),
-                    experiment_id=row["experiment_id"],
-                    question=row["question"],
-                    gold_answer=row["gold_answer"],
-                    model_answer=row["model_answer"],
-                    bleu_score=row["bleu_score"],
-                    rouge_score=row["rouge_score"] or 0.0,
-                    primary_score=float(row["primary_score"] or 0.0),
-                    metrics=metrics,
-                    num_runs=int(row["num_runs"] or 1),
-                    run_scores=run_scores,
-                    status=BenchmarkStatus(row["status"]),
-                    started_at=datetime.fromisoformat(row["started_at"]),
-                    completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
-                    error=row["error"],
+        conn.execute("DELETE FROM benchmark_eval_items WHERE eval_id = ?", (eval_id,))
+        conn.executemany(
+            """
+            INSERT INTO benchmark_eval_items
+            (eval_id, item_index, question, gold_answer, model_answer, bleu_score, rouge_score, metrics_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    eval_id,
+                    i.index,
+                    i.question,
+                    i.gold_answer,
+                    i.model_answer,
+                    i.bleu_score,
+                    i.rouge_score,
+                    json.dumps(i.metrics),
                 )
-            )
-        return results
+                for i in items
+            ],
+        )
+        conn.commit()
 
 
-def list_benchmark_evals_by_benchmark(benchmark_id: str) -> list[BenchmarkEvalResult]:
+def _item_from_row(row) -> BenchmarkEvalItem:
+    return BenchmarkEvalItem(
+        index=row["item_index"],
+        question=row["question"],
+        gold_answer=row["gold_answer"],
+        model_answer=row["model_answer"],
+        bleu_score=row["bleu_score"],
+        rouge_score=row["rouge_score"],
+        metrics=json.loads(row["metrics_json"] or "{}"),
+    )
+
+
+def list_benchmark_eval_items(eval_id: str, offset: int = 0, limit: int = -1) -> list[BenchmarkEvalItem]:
     with get_connection() as conn:
         rows = conn.execute(
-            "SELECT * FROM benchmark_evals WHERE benchmark_id = ? ORDER BY started_at DESC",
-            (benchmark_id,),
+            "SELECT * FROM benchmark_eval_items WHERE eval_id = ? ORDER BY item_index LIMIT ? OFFSET ?",
+            (eval_id, limit, offset),
         ).fetchall()
-        results: list[BenchmarkEvalResult] = []
-        for row in rows:
-            metrics = {}
-            try:
-                metrics = json.loads(row["metrics_json"] or "{}")
-            except Exception:
-                metrics = {}
-            run_scores = []
-            try:
-                raw = json.loads(row["run_scores_json"] or "[]")
-                if isinstance(raw, list):
-                    run_scores = raw
-            except Exception:
-                run_scores = []
-            benchmark_type = BenchmarkType.CAUSAL_LM_QA
-            if "benchmark_type" in row.keys() and row["benchmark_type"]:
-                benchmark_type = BenchmarkType(row["benchmark_type"])
-            results.append(
-                BenchmarkEvalResult(
-                    id=row["id"],
-                    benchmark_id=row["benchmark_id"],
-                    benchmark_name=row["benchmark_name"],
-                    benchmark_type=benchmark_type,
-                    higher_is_better=bool(row["higher_is_better"]),
-                    experiment_id=row["experiment_id"],
-                    question=row["question"],
-                    gold_answer=row["gold_answer"],
-                    model_answer=row["model_answer"],
-                    bleu_score=row["bleu_score"],
-                    rouge_score=row["rouge_score"] or 0.0,
-                    primary_score=float(row["primary_score"] or 0.0),
-                    metrics=metrics,
-                    num_runs=int(row["num_runs"] or 1),
-                    run_scores=run_scores,
-                    status=BenchmarkStatus(row["status"]),
-                    started_at=datetime.fromisoformat(row["started_at"]),
-                    completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
-                    error=row["error"],
-                )
-            )
-        return results
+        return [_item_from_row(row) for row in rows]
 
 
-def delete_benchmark_eval(eval_id: str) -> bool:
+def list_benchmark_eval_items_by_eval(eval_ids: list[str]) -> dict[str, list[BenchmarkEvalItem]]:
+    """Items of several evals, in item order, keyed by eval id."""
+    by_eval: dict[str, list[BenchmarkEvalItem]] = {eid: [] for eid in eval_ids}
     with get_connection() as conn:
-        cursor = conn.execute("DELETE FROM benchmark_evals WHERE id = ?", (eval_id,))
-        conn.commit()
-        return cursor.rowcount > 0
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(eval_ids), 500):
+            chunk = eval_ids[start : start + 500]
+            rows = conn.execute(
+                f"SELECT * FROM benchmark_eval_items WHERE eval_id IN ({','.join('?' * len(chunk))}) "
+                "ORDER BY eval_id, item_index",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                by_eval[row["eval_id"]].append(_item_from_row(row))
+    return by_eval
+
+
+def count_benchmark_eval_items(eval_id: str) -> int:
+    with get_connection() as conn:
+        row = conn.execute("SELECT COUNT(*) FROM benchmark_eval_items WHERE eval_id = ?", (eval_id,)).fetchone()
+        return int(row[0])
 
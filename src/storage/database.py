@@ -106,6 +106,18 @@ def init_db() -> None:
                 error TEXT
             );
 
+            CREATE TABLE IF NOT EXISTS benchmark_eval_items (
+                eval_id TEXT NOT NULL,
+                item_index INTEGER NOT NULL,
+                question TEXT NOT NULL,
+                gold_answer TEXT NOT NULL,
+                model_answer TEXT NOT NULL,
+                bleu_score REAL NOT NULL,
+                rouge_score REAL NOT NULL,
+                metrics_json TEXT NOT NULL DEFAULT '{}',
+                PRIMARY KEY (eval_id, item_index)
+            );
+
             CREATE TABLE IF NOT EXISTS meta_features (
                 experiment_id TEXT PRIMARY KEY,
                 features TEXT NOT NULL,
@@ -177,8 +189,13 @@ def init_db() -> None:
     _migrate_benchmarks_add_inference_settings()
     _migrate_benchmarks_add_type_and_spec()
     _migrate_benchmarks_add_higher_is_better()
+    _migrate_benchmarks_add_eval_mode()
+    _migrate_benchmarks_add_seed()
     _migrate_benchmark_evals_add_type_and_metrics()
     _migrate_benchmark_evals_add_higher_is_better()
+    _migrate_benchmark_eval_items_add_metrics()
+    _migrate_create_eval_leaderboard()
+    _migrate_benchmark_evals_add_experiment_index()
     _scan_existing_uploads()
     _scan_existing_plugins()
 
@@ -530,6 +547,28 @@ def _migrate_benchmarks_add_higher_is_better() -> None:
         conn.commit()
 
 
+def _migrate_benchmarks_add_eval_mode() -> None:
+    """Add eval_mode + stop_sequences_json columns to benchmarks if they don't exist."""
+    with get_connection() as conn:
+        cursor = conn.execute("PRAGMA table_info(benchmarks)")
+        columns = {row["name"] for row in cursor.fetchall()}
+        if "eval_mode" not in columns:
+            conn.execute("ALTER TABLE benchmarks ADD COLUMN eval_mode TEXT NOT NULL DEFAULT 'sample'")
+        if "stop_sequences_json" not in columns:
+            conn.execute("ALTER TABLE benchmarks ADD COLUMN stop_sequences_json TEXT NOT NULL DEFAULT '[]'")
+        conn.commit()
+
+
+def _migrate_benchmarks_add_seed() -> None:
+    """Add seed column to benchmarks if it doesn't exist."""
+    with get_connection() as conn:
+        cursor = conn.execute("PRAGMA table_info(benchmarks)")
+        columns = {row["name"] for row in cursor.fetchall()}
+        if "seed" not in columns:
+            conn.execute("ALTER TABLE benchmarks ADD COLUMN seed INTEGER")
+        conn.commit()
+
+
 def _migrate_benchmark_evals_add_higher_is_better() -> None:
     """Add higher_is_better column to benchmark_evals if it doesn't exist."""
     with get_connection() as conn:
@@ -542,6 +581,58 @@ def _migrate_benchmark_evals_add_higher_is_better() -> None:
         conn.commit()
 
 
+def _migrate_create_eval_leaderboard() -> None:
+    """Create the eval_leaderboard table and fill it from existing completed evals."""
+    with get_connection() as conn:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'eval_leaderboard'"
+        ).fetchone()
+        if exists:
+            return
+        conn.executescript("""
+            CREATE TABLE eval_leaderboard (
+                eval_id TEXT PRIMARY KEY,
+                benchmark_id TEXT NOT NULL,
+                experiment_id TEXT NOT NULL,
+                higher_is_better INTEGER NOT NULL,
+                primary_score REAL NOT NULL,
+                started_at TEXT NOT NULL,
+                rank INTEGER,
+                model_name TEXT NOT NULL,
+                learning_rate REAL,
+                num_epochs REAL,
+                batch_size INTEGER,
+                lora_r INTEGER,
+                lora_alpha INTEGER
+            );
+            CREATE INDEX idx_eval_leaderboard_benchmark_rank ON eval_leaderboard(benchmark_id, rank);
+        """)
+        conn.commit()
+    from .benchmark_store import rebuild_eval_leaderboard
+
+    rebuild_eval_leaderboard()
+
+
+def _migrate_benchmark_evals_add_experiment_index() -> None:
+    """Index benchmark_evals by experiment so comparisons read only the evals they need."""
+    with get_connection() as conn:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_benchmark_evals_experiment_status "
+            "ON benchmark_evals(experiment_id, status)"
+        )
+        conn.commit()
+
+
+def _migrate_benchmark_eval_items_add_metrics() -> None:
+    """Add metrics_json column to benchmark_eval_items if it doesn't exist."""
+    with get_connection() as conn:
+        cursor = conn.execute("PRAGMA table_info(benchmark_eval_items)")
+        columns = {row["name"] for row in cursor.fetchall()}
+        if "metrics_json" not in columns:
+            conn.execute("ALTER TABLE benchmark_eval_items ADD COLUMN metrics_json TEXT NOT NULL DEFAULT '{}'")
+        conn.commit()
+
+
 def _scan_existing_uploads() -> None:
     """Scan data/uploads for CSV files and add missing ones to the database."""
     # Import here to avoid circular import
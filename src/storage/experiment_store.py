@@ -43,40 +43,53 @@ def save_experiment(exp: ExperimentResult) -> None:
         conn.commit()
 
 
+def _experiment_from_row(row, config, config_name: str | None) -> ExperimentResult:
+    return ExperimentResult(
+        id=row["id"],
+        experiment_type=ExperimentType(row["experiment_type"]),
+        status=ExperimentStatus(row["status"]),
+        dataset_id=row["dataset_id"],
+        dataset_filename=row["dataset_filename"],
+        config_id=row["config_id"],
+        config=config,
+        config_name=config_name,
+        started_at=datetime.fromisoformat(row["started_at"]),
+        completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
+        metrics=json.loads(row["metrics"]) if row["metrics"] else {},
+        output_dir=row["output_dir"],
+        error=row["error"],
+        lightning_module_plugin_id=row["lightning_module_plugin_id"],
+        lightning_module_class_name=row["lightning_module_class_name"],
+        dataloaders_plugin_id=row["dataloaders_plugin_id"],
+        dataloaders_function_name=row["dataloaders_function_name"],
+        compute_target_id=row["compute_target_id"] if "compute_target_id" in row.keys() else None,
+        compute_target_name=row["compute_target_name"] if "compute_target_name" in row.keys() else None,
+        logs=row["logs"] if "logs" in row.keys() else None,
+    )
+
+
 def get_experiment(experiment_id: str) -> ExperimentResult | None:
     with get_connection() as conn:
         row = conn.execute("SELECT * FROM experiments WHERE id = ?", (experiment_id,)).fetchone()
         if not row:
             return None
-        exp_type = ExperimentType(row["experiment_type"])
-        config_id = row["config_id"]
-        
-        config_record = get_config(config_id) if config_id else None
-        
-        return ExperimentResult(
-            id=row["id"],
-            experiment_type=exp_type,
-            status=ExperimentStatus(row["status"]),
-            dataset_id=row["dataset_id"],
-            dataset_filename=row["dataset_filename"],
-            config_id=config_id,
-            config=config_record.config if config_record else None,
-            config_name=config_record.name if config_record else None,
-            started_at=datetime.fromisoformat(row["started_at"]),
-            completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
-            metrics=json.loads(row["metrics"]) if row["metrics"] else {},
-            output_dir=row["output_dir"],
-            error=row["error"],
-            lightning_module_plugin_id=row["lightning_module_plugin_id"],
-            lightning_module_class_name=row["lightning_module_class_name"],
-            dataloaders_plugin_id=row["dataloaders_plugin_id"],
-            dataloaders_function_name=row["dataloaders_function_name"],
-            compute_target_id=row["compute_target_id"] if "compute_target_id" in row.keys() else None,
-            compute_target_name=row["compute_target_name"] if "compute_target_name" in row.keys() else None,
-            logs=row["logs"] if "logs" in row.keys() else None,
+        config_record = get_config(row["config_id"]) if row["config_id"] else None
+        return _experiment_from_row(
+            row,
+            config_record.config if config_record else None,
+            config_record.name if config_record else None,
         )
 
 
+def _configured_experiments(rows) -> list[ExperimentResult]:
+    results = []
+    for row in rows:
+        exp_type = ExperimentType(row["experiment_type"])
+        config = _deserialize_config(row["config_json"], exp_type) if row["config_json"] else None
+        results.append(_experiment_from_row(row, config, row["config_name"]))
+    return results
+
+
 def list_experiments() -> list[ExperimentResult]:
     with get_connection() as conn:
         rows = conn.execute(
@@ -87,35 +100,27 @@ def list_experiments() -> list[ExperimentResult]:
             ORDER BY e.started_at DESC
             """
         ).fetchall()
-        results = []
-        for row in rows:
-            exp_type = ExperimentType(row["experiment_type"])
-            config = _deserialize_config(row["config_json"], exp_type) if row["config_json"] else None
-            results.append(
-                ExperimentResult(
-                    id=row["id"],
-                    experiment_type=exp_type,
-                    status=ExperimentStatus(row["status"]),
-                    dataset_id=row["dataset_id"],
-                    dataset_filename=row["dataset_filename"],
-                    config_id=row["config_id"],
-                    config=config,
-                    config_name=row["config_name"],
-                    started_at=datetime.fromisoformat(row["started_at"]),
-                    completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
-                    metrics=json.loads(row["metrics"]) if row["metrics"] else {},
-                    output_dir=row["output_dir"],
-                    error=row["error"],
-                    lightning_module_plugin_id=row["lightning_module_plugin_id"],
-                    lightning_module_class_name=row["lightning_module_class_name"],
-                    dataloaders_plugin_id=row["dataloaders_plugin_id"],
-                    dataloaders_function_name=row["dataloaders_function_name"],
-                    compute_target_id=row["compute_target_id"] if "compute_target_id" in row.keys() else None,
-                    compute_target_name=row["compute_target_name"] if "compute_target_name" in row.keys() else None,
-                    logs=row["logs"] if "logs" in row.keys() else None,
-                )
-            )
-        return results
+        return _configured_experiments(rows)
+
+
+def get_experiments(experiment_ids: list[str]) -> dict[str, ExperimentResult]:
+    """Experiments with their configs, keyed by id, in one query per 500 ids; unknown ids are left out."""
+    found: dict[str, ExperimentResult] = {}
+    with get_connection() as conn:
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(experiment_ids), 500):
+            chunk = experiment_ids[start : start + 500]
+            rows = conn.execute(
+                f"""
+                SELECT e.*, c.name as config_name, c.config_json
+                FROM experiments e
+                LEFT JOIN configs c ON e.config_id = c.id
+                WHERE e.id IN ({','.join('?' * len(chunk))})
+                """,
+                chunk,
+            ).fetchall()
+            found.update((exp.id, exp) for exp in _configured_experiments(rows))
+    return found
 
 
 def delete_experiment(experiment_id: str) -> ExperimentResult | None:
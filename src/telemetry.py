@@ -0,0 +1,126 @@
+"""Per-step throughput and hardware telemetry for training runs.
+
+Framework-neutral recorder used by the HF Trainer callback in
+``callbacks.py`` and the Lightning callback in ``custom_lightning_runner``.
+Each optimizer step becomes one row of ``telemetry.json``; ``summary()``
+condenses the series into the ``throughput`` entry of ``metrics.json``.
+"""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import psutil
+import torch
+
+TELEMETRY_FILENAME = "telemetry.json"
+
+
+def _cuda_memory_mb() -> tuple[float | None, float | None]:
+    if not torch.cuda.is_available():
+        return None, None
+    return (
+        torch.cuda.memory_allocated() / 2**20,
+        torch.cuda.max_memory_allocated() / 2**20,
+    )
+
+
+class TelemetryRecorder:
+    """Collects step timings, data-wait time and memory for one run."""
+
+    def __init__(self, output_path: Path, flush_every: int = 10) -> None:
+        self.output_path = output_path
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.rows: list[dict[str, Any]] = []
+        self._proc = psutil.Process()
+        self._run_start: float | None = None
+        self._step_start: float | None = None
+        self._last_step_end: float | None = None
+        self._peak_rss_mb = 0.0
+
+    def start(self, resume_step: int = 0) -> None:
+        """Begin timing. On resume, keep the rows recorded up to ``resume_step``."""
+        if resume_step > 0:
+            self.rows = [r for r in load_telemetry(self.output_path.parent) if r["step"] <= resume_step]
+        self._run_start = self._last_step_end = time.perf_counter()
+        if torch.cuda.is_available():
+            torch.cuda.reset_peak_memory_stats()
+
+    def skip_gap(self) -> None:
+        """Exclude time spent outside training steps (eval, checkpointing) from data wait."""
+        self._last_step_end = time.perf_counter()
+
+    def step_begin(self) -> None:
+        self._step_start = time.perf_counter()
+
+    def step_end(self, step: int, samples: int | None = None, tokens: int | None = None) -> None:
+        now = time.perf_counter()
+        if self._run_start is None:
+            self.start()
+        step_start = self._step_start if self._step_start is not None else self._last_step_end
+        step_time = now - step_start
+        # Time between the previous step finishing and this one starting is spent
+        # fetching/collating batches (plus callback overhead).
+        data_wait = max(0.0, step_start - self._last_step_end) if self._last_step_end is not None else 0.0
+        wall = step_time + data_wait
+
+        rss_mb = self._proc.memory_info().rss / 2**20
+        self._peak_rss_mb = max(self._peak_rss_mb, rss_mb)
+        cuda_mb, cuda_peak_mb = _cuda_memory_mb()
+
+        self.rows.append(
+            {
+                "step": step,
+                "elapsed": round(now - self._run_start, 4),
+                "step_time": round(step_time, 5),
+                "data_wait": round(data_wait, 5),
+                "samples": samples,
+                "tokens": tokens,
+                "samples_per_sec": round(samples / wall, 3) if samples and wall > 0 else None,
+                "tokens_per_sec": round(tokens / wall, 3) if tokens and wall > 0 else None,
+                "rss_mb": round(rss_mb, 1),
+                "cuda_mem_mb": round(cuda_mb, 1) if cuda_mb is not None else None,
+                "cuda_peak_mb": round(cuda_peak_mb, 1) if cuda_peak_mb is not None else None,
+            }
+        )
+        self._last_step_end = now
+        self._step_start = None
+        if len(self.rows) % self.flush_every == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        self.output_path.write_text(json.dumps(self.rows, indent=2), encoding="utf-8")
+
+    def summary(self) -> dict[str, Any]:
+        if not self.rows:
+            return {}
+        step_times = np.array([r["step_time"] for r in self.rows])
+        waits = np.array([r["data_wait"] for r in self.rows])
+        total = float(step_times.sum() + waits.sum())
+        samples = sum(r["samples"] or 0 for r in self.rows)
+        tokens = sum(r["tokens"] or 0 for r in self.rows)
+        peaks = [r["cuda_peak_mb"] for r in self.rows if r["cuda_peak_mb"] is not None]
+        return {
+            "steps": len(self.rows),
+            "step_time_mean": round(float(step_times.mean()), 5),
+            "step_time_p50": round(float(np.percentile(step_times, 50)), 5),
+            "step_time_p90": round(float(np.percentile(step_times, 90)), 5),
+            "step_time_p99": round(float(np.percentile(step_times, 99)), 5),
+            "data_wait_total": round(float(waits.sum()), 4),
+            "data_wait_fraction": round(float(waits.sum()) / total, 4) if total > 0 else 0.0,
+            "samples_per_sec": round(samples / total, 3) if samples and total > 0 else None,
+            "tokens_per_sec": round(tokens / total, 3) if tokens and total > 0 else None,
+            "peak_rss_mb": round(self._peak_rss_mb, 1),
+            "peak_cuda_mem_mb": max(peaks) if peaks else None,
+        }
+
+
+def load_telemetry(output_dir: Path) -> list[dict[str, Any]]:
+    path = output_dir / TELEMETRY_FILENAME
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from pathlib import Path
+
+import torch
 from transformers import (
     AutoModelForMaskedLM,
-    AutoTokenizer,
     DataCollatorForLanguageModeling,
     EarlyStoppingCallback,
     Trainer,
@@ -10,9 +12,18 @@ from transformers import (
     set_seed,
 )
 
-from .callbacks import StopCheckCallback, StreamingLogsCallback
+from .auto_batch import auto_tune_batch_size
+from .callbacks import (
+    ProfilerCallback,
+    StopCheckCallback,
+    StreamingLogsCallback,
+    TelemetryCallback,
+)
+from .checkpointing import CheckpointingTrainer
 from .config import ExperimentConfig
 from .data import load_dataset, tokenize_dataset
+from .model_store import load_pretrained, load_tokenizer
+from .telemetry import TELEMETRY_FILENAME
 from .viz import save_loss_curve
 
 
@@ -47,6 +58,7 @@ def _build_training_arguments(config: ExperimentConfig) -> TrainingArguments:
         gradient_accumulation_steps=train_cfg.gradient_accumulation_steps,
         max_steps=train_cfg.max_steps,
         report_to=[],
+        include_num_input_tokens_seen="non_padding",
         load_best_model_at_end=train_cfg.early_stopping_patience is not None,
         metric_for_best_model=train_cfg.early_stopping_metric,
         greater_is_better=train_cfg.early_stopping_greater_is_better,
@@ -56,23 +68,28 @@ def _build_training_arguments(config: ExperimentConfig) -> TrainingArguments:
 def run_training(
     config: ExperimentConfig,
     experiment_id: str | None = None,
+    resume_from: str | Path | None = None,
 ) -> tuple[Trainer, dict[str, float]]:
     """Run a Trainer.fit cycle and return trainer plus metrics."""
     set_seed(config.data.seed)
     raw_splits = load_dataset(config.data)
-    tokenizer = AutoTokenizer.from_pretrained(config.model.pretrained_model_name)
+    tokenizer = load_tokenizer(AutoModelForMaskedLM, config.model.pretrained_model_name)
     tokenized = tokenize_dataset(
         dataset=raw_splits,
         tokenizer=tokenizer,
         max_length=config.data.max_length,
     )
-    model = AutoModelForMaskedLM.from_pretrained(config.model.pretrained_model_name)
+    # The optimizer and fp16/bf16 autocast need fp32 master weights, whatever dtype the store holds.
+    model, model_load_seconds = load_pretrained(
+        AutoModelForMaskedLM, config.model.pretrained_model_name, torch_dtype=torch.float32
+    )
     _freeze_layers(model, config)
     data_collator = DataCollatorForLanguageModeling(
         tokenizer=tokenizer, mlm_probability=0.15
     )
     logs_path = config.training.output_dir / "training_logs.json"
-    callbacks = [StreamingLogsCallback(logs_path, experiment_id=experiment_id)]
+    telemetry = TelemetryCallback(config.training.output_dir / TELEMETRY_FILENAME)
+    callbacks = [StreamingLogsCallback(logs_path, experiment_id=experiment_id), telemetry]
     if config.training.early_stopping_patience is not None:
         callbacks.append(
             EarlyStoppingCallback(
@@ -81,19 +98,41 @@ def run_training(
         )
     if experiment_id is not None:
         callbacks.append(StopCheckCallback(experiment_id))
-    trainer = Trainer(
+    if config.training.profile:
+        callbacks.append(
+            ProfilerCallback(config.training.output_dir, active_steps=config.training.profile_steps)
+        )
+    training_args = _build_training_arguments(config)
+    batch_plan = None
+    if config.training.auto_batch_size:
+        batch_plan = auto_tune_batch_size(
+            model,
+            training_args,
+            max_length=config.data.max_length,
+            vocab_size=len(tokenizer),
+            memory_budget_mb=config.training.memory_budget_mb,
+            allow_effective_batch_change=config.training.allow_effective_batch_change,
+            resume=resume_from is not None,
+            mlm=True,
+        )
+    trainer = CheckpointingTrainer(
         model=model,
-        args=_build_training_arguments(config),
+        args=training_args,
         train_dataset=tokenized["train"],
         eval_dataset=tokenized["test"],
         tokenizer=tokenizer,
         data_collator=data_collator,
         callbacks=callbacks,
+        async_checkpoint=config.training.async_checkpoint,
+    )
+    if resume_from is None:
+        # Run initial evaluation at step 0 for baseline comparison
+        initial_eval = trainer.evaluate()
+        trainer.state.log_history.insert(0, {"step": 0, "epoch": 0.0, "eval_loss": initial_eval["eval_loss"]})
+    # Resuming restores model, optimizer, scheduler, RNG state and log history from the checkpoint.
+    train_metrics = trainer.train(
+        resume_from_checkpoint=str(resume_from) if resume_from is not None else None
     )
-    # Run initial evaluation at step 0 for baseline comparison
-    initial_eval = trainer.evaluate()
-    trainer.state.log_history.insert(0, {"step": 0, "epoch": 0.0, "eval_loss": initial_eval["eval_loss"]})
-    train_metrics = trainer.train()
     eval_metrics = trainer.evaluate()
     trainer.save_model()
 
@@ -108,5 +147,12 @@ def run_training(
         title=f"{config.model.pretrained_model_name} MLM Loss",
         use_log_y=True,
     )
-    return trainer, {**train_metrics.metrics, **eval_metrics}
+    return trainer, {
+        **train_metrics.metrics,
+        **eval_metrics,
+        "model_load_seconds": model_load_seconds,
+        **(batch_plan.to_metrics() if batch_plan else {}),
+        "throughput": telemetry.recorder.summary(),
+        "checkpointing": trainer.checkpoint_summary(),
+    }
 
@@ -23,6 +23,47 @@ def _collect_series(
     return train_loss, eval_loss
 
 
+# Trainer logs use loss/eval_loss; custom Lightning logs use the module's own names.
+_TRAIN_LOSS_KEYS = ("loss", "train_loss", "train_loss_epoch", "train_loss_step")
+_EVAL_LOSS_KEYS = ("eval_loss", "val_loss", "val_loss_epoch")
+
+
+def _first_present(entry: Mapping[str, float], keys: tuple[str, ...]) -> float | None:
+    for key in keys:
+        if entry.get(key) is not None:
+            return float(entry[key])
+    return None
+
+
+def _thin(points: list[tuple[int, float]], max_points: int) -> list[tuple[int, float]]:
+    """Every k-th point so at most ``max_points`` remain; the last point is always kept."""
+    if len(points) <= max_points:
+        return points
+    stride = -(-len(points) // max_points)
+    thinned = points[::stride]
+    if thinned[-1] != points[-1]:
+        thinned[-1] = points[-1]
+    return thinned
+
+
+def loss_curve(log_history: Iterable[Mapping[str, float]], max_points: int = 200) -> dict[str, list[tuple[int, float]]]:
+    """Train and eval (step, loss) series of one run, each thinned to ``max_points`` for overlays."""
+    train_loss: list[tuple[int, float]] = []
+    eval_loss: list[tuple[int, float]] = []
+    for entry in log_history:
+        step_raw = entry.get("step", entry.get("global_step"))
+        if step_raw is None:
+            continue
+        step = int(step_raw)
+        train = _first_present(entry, _TRAIN_LOSS_KEYS)
+        if train is not None:
+            train_loss.append((step, train))
+        evaluation = _first_present(entry, _EVAL_LOSS_KEYS)
+        if evaluation is not None:
+            eval_loss.append((step, evaluation))
+    return {"train": _thin(train_loss, max_points), "eval": _thin(eval_loss, max_points)}
+
+
 def save_loss_curve(
     log_history: Iterable[Mapping[str, float]],
     output_path: Path,
@@ -0,0 +1,115 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+_TEXTS = ["<|system|> You are an AI assistant. </s> <|user|> What is two plus two ? </s> <|assistant|> four five six"]
+
+
+def _save_base_and_adapters(root: Path, n: int) -> list[Path]:
+    import torch
+    from peft import LoraConfig, get_peft_model
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+    pre = pre_tokenizers.Whitespace()
+    words = sorted({w for text in _TEXTS for w, _ in pre.pre_tokenize_str(text)})
+    vocab = {w: i for i, w in enumerate(["[UNK]", "[PAD]", "</s>"] + words)}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]", pad_token="[PAD]", eos_token="</s>")
+
+    torch.manual_seed(0)
+    config = LlamaConfig(
+        vocab_size=len(vocab), hidden_size=32, intermediate_size=64, num_hidden_layers=2, num_attention_heads=4
+    )
+    LlamaForCausalLM(config).save_pretrained(root / "base")
+    tokenizer.save_pretrained(root / "base")
+
+    paths = []
+    for i in range(n):
+        base = LlamaForCausalLM.from_pretrained(root / "base")
+        model = get_peft_model(base, LoraConfig(r=4, target_modules=["q_proj", "v_proj"]))
+        with torch.no_grad():
+            for name, param in model.named_parameters():
+                if "lora_B" in name:
+                    param.normal_(0, 2.0)
+        path = root / f"adapter{i}"
+        model.save_pretrained(path)
+        tokenizer.save_pretrained(path)
+        paths.append(path)
+    return paths
+
+
+def _answer(model, tokenizer, adapter=None):
+    from src.benchmark import BatchedGenerator, GenerationRequest
+
+    request = GenerationRequest(prompt="What is two plus two ?", greedy=True, max_new_tokens=6, adapter=adapter)
+    return BatchedGenerator(model, tokenizer).generate([request])[0]
+
+
+class TestAdapterHotSwap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.paths = _save_base_and_adapters(Path(cls._tmp.name), 3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def test_swapped_adapters_answer_like_fresh_loads(self):
+        from src.benchmark import load_model_and_tokenizer
+        from src.model_cache import ModelCache
+
+        fresh = [_answer(*load_model_and_tokenizer(path)) for path in self.paths]
+        cache = ModelCache(budget_bytes=2**30, max_adapters=2)
+        swapped = []
+        for path in self.paths + self.paths[:1]:
+            with cache.lease("causal_lm", path) as (model, tokenizer):
+                swapped.append(_answer(model, tokenizer))
+        stats = cache.stats()
+
+        self.assertGreater(len(set(fresh)), 1)
+        self.assertEqual(swapped, fresh + fresh[:1])
+        self.assertEqual((stats["loads"], stats["adapter_loads"]), (1, 4))
+        self.assertEqual(stats["entries"][0]["adapters"], 2)
+
+    def test_one_batch_serves_several_adapters(self):
+        from src.benchmark import BatchedGenerator, GenerationRequest
+        from src.model_cache import ModelCache
+
+        cache = ModelCache(budget_bytes=2**30)
+        expected = []
+        for path in self.paths:
+            with cache.lease("causal_lm", path) as (model, tokenizer):
+                expected.append(_answer(model, tokenizer))
+        with cache.lease_adapters(self.paths) as (model, adapters):
+            requests = [
+                GenerationRequest(prompt="What is two plus two ?", greedy=True, max_new_tokens=6, adapter=name)
+                for name, _ in adapters
+            ]
+            generator = BatchedGenerator(model, adapters[0][1])
+            mixed = generator.generate(requests)
+
+        self.assertEqual(mixed, expected)
+        self.assertEqual(generator.stats["batches"], 1)
+
+    def test_adapters_with_full_layers_do_not_share_the_base(self):
+        from src.model_cache import lora_base_key
+
+        path = Path(self._tmp.name) / "adapter_with_head"
+        path.mkdir()
+        for file in self.paths[0].iterdir():
+            (path / file.name).write_bytes(file.read_bytes())
+        config = json.loads((path / "adapter_config.json").read_text())
+        config["modules_to_save"] = ["lm_head"]
+        (path / "adapter_config.json").write_text(json.dumps(config))
+
+        self.assertIsNotNone(lora_base_key(self.paths[0]))
+        self.assertEqual(lora_base_key(self.paths[0]), lora_base_key(self.paths[1]))
+        self.assertIsNone(lora_base_key(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
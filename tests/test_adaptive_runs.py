@@ -0,0 +1,54 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+
+class TestSequentialStop(unittest.TestCase):
+    def test_stops_when_interval_is_narrow(self):
+        from src.eval_stats import sequential_stop
+
+        self.assertEqual(sequential_stop([50.0, 50.5, 49.5, 50.0], tolerance=2.0), "converged")
+        self.assertIsNone(sequential_stop([10.0, 90.0, 40.0], tolerance=2.0))
+        self.assertIsNone(sequential_stop([50.0], tolerance=2.0))
+
+    def test_stops_when_no_other_score_is_inside_interval(self):
+        from src.eval_stats import sequential_stop
+
+        values = [40.0, 60.0, 50.0, 55.0, 45.0]
+        self.assertEqual(sequential_stop(values, tolerance=1.0, others=[10.0, 90.0]), "rank_settled")
+        self.assertIsNone(sequential_stop(values, tolerance=1.0, others=[10.0, 52.0]))
+
+
+class TestGenerateAdaptive(unittest.TestCase):
+    def _benchmark(self):
+        from src.models import Benchmark
+
+        return Benchmark(id="b", name="qa", question="q?", gold_answer="the answer", created_at=datetime.now())
+
+    def test_converged_runs_stop_after_min_runs(self):
+        from src.api.benchmark_routes import _generate_adaptive
+        from src.models import AdaptiveRuns
+
+        generator = mock.Mock()
+        generator.generate.side_effect = lambda reqs: ["the answer"] * reqs[0].num_return_sequences
+        answers, reason = _generate_adaptive(generator, self._benchmark(), 20, AdaptiveRuns(min_runs=3), [])
+
+        self.assertEqual((len(answers), reason), (3, "converged"))
+
+    def test_noisy_runs_spend_the_full_budget(self):
+        from src.api.benchmark_routes import _generate_adaptive
+        from src.models import AdaptiveRuns
+
+        outputs = iter(["the answer", "nothing", "the", "wrong"] * 5)
+        generator = mock.Mock()
+        generator.generate.side_effect = lambda reqs: [next(outputs) for _ in range(reqs[0].num_return_sequences)]
+        answers, reason = _generate_adaptive(
+            generator, self._benchmark(), 8, AdaptiveRuns(min_runs=3, runs_per_round=2, rank_settled=False), []
+        )
+
+        self.assertEqual((len(answers), reason), (8, "max_runs"))
+        self.assertEqual([c.args[0][0].num_return_sequences for c in generator.generate.call_args_list], [3, 2, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
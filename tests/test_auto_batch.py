@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import patch
+
+import torch
+
+
+class TestAutoBatch(unittest.TestCase):
+    def _plan(self, per_sample_mb, budget_mb, batch_size, accumulation, **kwargs):
+        import src.auto_batch as auto_batch
+
+        model = torch.nn.Linear(1, 1, bias=False)
+        model.weight.requires_grad_(False)  # no optimizer-state reservation
+
+        def fake_measure(step, bs, device):
+            if bs * per_sample_mb > budget_mb:
+                raise torch.cuda.OutOfMemoryError("CUDA out of memory")
+            return bs * per_sample_mb
+
+        with patch.object(auto_batch, "_measure", side_effect=fake_measure):
+            return auto_batch.plan_batch_size(
+                model, lambda bs: None, batch_size, accumulation, memory_budget_mb=budget_mb, **kwargs
+            )
+
+    def test_finds_largest_fitting_micro_batch_and_keeps_effective_batch(self):
+        plan = self._plan(per_sample_mb=100, budget_mb=1000, batch_size=1, accumulation=16)
+        # 90% headroom -> 900MiB usable -> 9 fits, but 8 divides 16 exactly.
+        self.assertEqual(plan.micro_batch_size, 8)
+        self.assertEqual(plan.gradient_accumulation_steps, 2)
+        self.assertEqual(plan.effective_batch_size, 16)
+
+    def test_never_exceeds_requested_effective_batch(self):
+        plan = self._plan(per_sample_mb=1, budget_mb=10_000, batch_size=2, accumulation=3)
+        self.assertEqual(plan.micro_batch_size, 6)
+        self.assertEqual(plan.gradient_accumulation_steps, 1)
+
+    def test_prime_effective_batch_is_kept_unless_changing_it_is_allowed(self):
+        # 6 fits, but the only divisors of 7 are 1 and 7.
+        plan = self._plan(per_sample_mb=100, budget_mb=700, batch_size=7, accumulation=1)
+        self.assertEqual((plan.micro_batch_size, plan.gradient_accumulation_steps), (1, 7))
+        self.assertEqual(plan.effective_batch_size, 7)
+
+        with self.assertLogs("src.auto_batch", level="WARNING"):
+            plan = self._plan(
+                per_sample_mb=100, budget_mb=700, batch_size=7, accumulation=1, allow_effective_batch_change=True
+            )
+        self.assertEqual((plan.micro_batch_size, plan.gradient_accumulation_steps), (6, 2))
+        self.assertEqual(plan.requested_effective_batch_size, 7)
+
+    def test_raises_when_nothing_fits(self):
+        with self.assertRaises(RuntimeError):
+            self._plan(per_sample_mb=2000, budget_mb=1000, batch_size=1, accumulation=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+from dataclasses import replace
+
+
+class TestPerRowSampling(unittest.TestCase):
+    def test_matches_hf_warpers_row_by_row(self):
+        import torch
+        from transformers.generation.logits_process import TemperatureLogitsWarper, TopPLogitsWarper
+
+        from src.benchmark import _PerRowSampling
+
+        torch.manual_seed(0)
+        scores = torch.randn(2, 50)
+        settings = [(0.7, 0.9), (1.3, 0.5)]
+        processor = _PerRowSampling(
+            torch.tensor([t for t, _ in settings]),
+            torch.tensor([p for _, p in settings]),
+        )
+        batched = processor(None, scores.clone())
+        for row, (temperature, top_p) in enumerate(settings):
+            single = scores[row : row + 1].clone()
+            single = TemperatureLogitsWarper(temperature)(None, single)
+            single = TopPLogitsWarper(top_p)(None, single)
+            self.assertTrue(torch.equal(batched[row : row + 1], single))
+
+    def test_rows_stop_at_their_own_budget(self):
+        import torch
+
+        from src.benchmark import _PerRowMaxTokens
+
+        criteria = _PerRowMaxTokens(prompt_length=4, limits=torch.tensor([2, 5]))
+        done = criteria(torch.zeros(2, 6, dtype=torch.long), None)
+        self.assertEqual(done.tolist(), [True, False])
+
+
+def _tiny_model_and_tokenizer(texts):
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+    pre = pre_tokenizers.Whitespace()
+    words = sorted({w for text in texts for w, _ in pre.pre_tokenize_str(text)})
+    vocab = {w: i for i, w in enumerate(["[UNK]", "[PAD]", "</s>"] + words)}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]", pad_token="[PAD]", eos_token="</s>")
+
+    torch.manual_seed(0)
+    config = LlamaConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=4,
+    )
+    return LlamaForCausalLM(config).eval(), tokenizer
+
+
+class TestPrefixCache(unittest.TestCase):
+    def test_cached_system_prefix_matches_full_prefill(self):
+        import torch
+
+        from src.benchmark import BatchedGenerator, GenerationRequest, format_prompt
+
+        system = "You are a careful assistant who answers in one short sentence."
+        questions = ["What is two plus two?", "Name a prime.", "Why is the sky blue today?"]
+        model, tokenizer = _tiny_model_and_tokenizer([format_prompt(system, q) for q in questions])
+        requests = [GenerationRequest(prompt=q, system_prompt=system, max_new_tokens=4 + i) for i, q in enumerate(questions)]
+
+        outputs = {}
+        for prefix_cache in (False, True):
+            generator = BatchedGenerator(model, tokenizer, prefix_cache=prefix_cache)
+            torch.manual_seed(1)
+            outputs[prefix_cache] = generator.generate(requests)
+
+        self.assertEqual(outputs[True], outputs[False])
+        self.assertGreater(generator.stats["prefix_cached_tokens"], 0)
+
+
+class TestEvalModes(unittest.TestCase):
+    def setUp(self):
+        from src.benchmark import format_prompt
+
+        self.system = "You are a careful assistant."
+        self.questions = ["What is two plus two?", "Name a prime."]
+        self.model, self.tokenizer = _tiny_model_and_tokenizer([format_prompt(self.system, q) for q in self.questions])
+
+    def test_return_sequences_share_one_prefill(self):
+        import torch
+
+        from src.benchmark import BatchedGenerator, GenerationRequest, format_prompt
+
+        request = GenerationRequest(prompt=self.questions[0], system_prompt=self.system, max_new_tokens=5)
+        torch.manual_seed(3)
+        replicated = BatchedGenerator(self.model, self.tokenizer, prefix_cache=False).generate([request] * 4)
+        generator = BatchedGenerator(self.model, self.tokenizer)
+        torch.manual_seed(3)
+        shared = generator.generate([replace(request, num_return_sequences=4)])
+
+        self.assertEqual(shared, replicated)
+        prompt_tokens = len(self.tokenizer(format_prompt(self.system, self.questions[0]))["input_ids"])
+        self.assertLess(generator.stats["prefill_tokens"], prompt_tokens + 4)
+
+    def test_greedy_is_deterministic_and_stops_at_stop_sequence(self):
+        from src.benchmark import BatchedGenerator, GenerationRequest
+
+        request = GenerationRequest(prompt=self.questions[0], system_prompt=self.system, max_new_tokens=8, greedy=True)
+        first = BatchedGenerator(self.model, self.tokenizer).generate([request])[0]
+        # Greedy rows stay greedy inside a sampled batch.
+        mixed = BatchedGenerator(self.model, self.tokenizer).generate(
+            [request, GenerationRequest(prompt=self.questions[1], system_prompt=self.system, max_new_tokens=8)]
+        )
+        self.assertEqual(mixed[0], first)
+
+        words = first.split()
+        self.assertGreater(len(words), 1)
+        generator = BatchedGenerator(self.model, self.tokenizer)
+        stopped = generator.generate([replace(request, stop_sequences=(words[1],))])[0]
+        self.assertNotIn(words[1], stopped.split())
+        self.assertTrue(first.startswith(stopped))
+        self.assertLess(generator.stats["generated_tokens"], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+
+class TestEvalWorkerPool(unittest.TestCase):
+    def test_runs_at_most_workers_jobs_at_once(self):
+        from src.eval_worker import EvalWorker
+
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def job():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        worker = EvalWorker(name="test-eval-worker", workers=2)
+        for _ in range(6):
+            worker.submit(job)
+        worker.join()
+
+        self.assertEqual(peak[0], 2)
+
+
+class TestBulkEvaluate(unittest.TestCase):
+    def test_groups_fine_tunes_of_the_same_base(self):
+        from src.api.benchmark_routes import _by_base_model
+
+        def exp(id, base):
+            model = SimpleNamespace(pretrained_model_name=base)
+            return SimpleNamespace(id=id, output_dir=f"/x/{id}", config=SimpleNamespace(model=model))
+
+        ordered = _by_base_model([exp("a", "llama"), exp("b", "gpt2"), exp("c", "llama"), exp("d", None)])
+        self.assertEqual([e.id for e in ordered], ["a", "c", "b", "d"])
+
+    def test_streams_one_result_per_experiment(self):
+        from fastapi.testclient import TestClient
+
+        from src.api import benchmark_routes
+        from src.api.app import app
+        from src.models import Benchmark, BenchmarkStatus, ExperimentResult, ExperimentStatus, ExperimentType
+        from src.storage import database, get_benchmark_eval, save_benchmark, save_benchmark_eval, save_experiment
+
+        def fake_eval(eval_id, benchmark, experiment, num_runs, adaptive, use_cache):
+            eval_result = get_benchmark_eval(eval_id)
+            eval_result.status = BenchmarkStatus.COMPLETED
+            eval_result.primary_score = float(experiment.id[-1])
+            save_benchmark_eval(eval_result)
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(database, "DB_PATH", Path(tmp) / "t.db"):
+            database.init_db()
+            save_benchmark(Benchmark(id="b", name="qa", question="q?", gold_answer="a", created_at=datetime.now()))
+            for i, status in enumerate([ExperimentStatus.COMPLETED, ExperimentStatus.COMPLETED, ExperimentStatus.RUNNING]):
+                save_experiment(
+                    ExperimentResult(
+                        id=f"exp{i}", experiment_type=ExperimentType.CAUSAL_LM, status=status, dataset_id="d",
+                        config_id="", started_at=datetime.now(), output_dir=tmp,
+                    )
+                )
+            with mock.patch.object(benchmark_routes, "_run_benchmark_eval", side_effect=fake_eval):
+                resp = TestClient(app).post(
+                    "/benchmarks/b/evaluate/bulk", json={"experiment_ids": ["exp0", "exp1", "exp2", "exp0", "nope"]}
+                )
+                events = [json.loads(line) for line in resp.text.splitlines()]
+
+        self.assertEqual(resp.headers["content-type"], "application/x-ndjson")
+        self.assertEqual([e["event"] for e in events], ["started", "result", "result", "done"])
+        self.assertEqual([e["experiment_id"] for e in events[0]["evals"]], ["exp0", "exp1"])
+        self.assertEqual([r["experiment_id"] for r in events[0]["rejected"]], ["exp2", "nope"])
+        self.assertEqual(sorted(e["evaluation"]["primary_score"] for e in events[1:3]), [0.0, 1.0])
+        self.assertEqual((events[3]["completed"], events[3]["failed"]), (2, 0))
+
+
+    def test_group_setup_failure_reports_every_eval(self):
+        import queue
+
+        from src.api import benchmark_routes
+        from src.models import Benchmark, BenchmarkStatus
+        from src.storage import database, get_benchmark_eval
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(database, "DB_PATH", Path(tmp) / "t.db"):
+            database.init_db()
+            benchmark = Benchmark(id="b", name="qa", question="q?", gold_answer="a", created_at=datetime.now())
+            eval_ids = [benchmark_routes._save_pending_eval(benchmark, x, 1) for x in ("exp0", "exp1")]
+            finished = queue.Queue()
+            with mock.patch.object(benchmark_routes, "_effective_runs", side_effect=[1, RuntimeError("boom")]):
+                benchmark_routes._run_adapter_group_evals(finished, eval_ids, benchmark, [], 1)
+
+            self.assertEqual(sorted(finished.get_nowait() for _ in eval_ids), sorted(eval_ids))
+            for eval_id in eval_ids:
+                self.assertEqual(get_benchmark_eval(eval_id).status, BenchmarkStatus.FAILED)
+                self.assertEqual(get_benchmark_eval(eval_id).error, "boom")
+
+    def test_stream_times_out_on_evals_that_never_report(self):
+        from fastapi.testclient import TestClient
+
+        from src.api import benchmark_routes
+        from src.api.app import app
+        from src.models import Benchmark, ExperimentResult, ExperimentStatus, ExperimentType
+        from src.storage import database, save_benchmark, save_experiment
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(database, "DB_PATH", Path(tmp) / "t.db"):
+            database.init_db()
+            save_benchmark(Benchmark(id="b", name="qa", question="q?", gold_answer="a", created_at=datetime.now()))
+            save_experiment(
+                ExperimentResult(
+                    id="exp0", experiment_type=ExperimentType.CAUSAL_LM, status=ExperimentStatus.COMPLETED,
+                    dataset_id="d", config_id="", started_at=datetime.now(), output_dir=tmp,
+                )
+            )
+            with mock.patch.object(benchmark_routes.eval_worker, "submit"), mock.patch.object(
+                benchmark_routes, "BULK_RESULT_TIMEOUT", 0.05
+            ):
+                resp = TestClient(app).post("/benchmarks/b/evaluate/bulk", json={"experiment_ids": ["exp0"]})
+                events = [json.loads(line) for line in resp.text.splitlines()]
+
+        self.assertEqual([e["event"] for e in events], ["started", "failed", "done"])
+        self.assertEqual(events[1]["eval_ids"], [events[0]["evals"][0]["eval_id"]])
+        self.assertEqual((events[2]["completed"], events[2]["failed"]), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class TestHostSnapshot(unittest.TestCase):
+    def test_snapshot_is_independent_of_training_updates(self):
+        import torch
+
+        from src.checkpointing import HostSnapshot
+
+        state = {"w": torch.ones(3), "step": 1, "groups": [{"lr": 0.1}]}
+        snap = HostSnapshot().take(state)
+        state["w"].add_(1)
+        state["groups"][0]["lr"] = 0.2
+
+        self.assertTrue(torch.equal(snap["w"], torch.ones(3)))
+        self.assertEqual(snap["groups"][0]["lr"], 0.1)
+
+
+class TestCheckpointWriter(unittest.TestCase):
+    def test_background_error_surfaces_on_wait(self):
+        from src.checkpointing import CheckpointWriter
+
+        def boom():
+            raise OSError("disk full")
+
+        writer = CheckpointWriter()
+        writer.submit(boom)
+        with self.assertRaises(RuntimeError):
+            writer.wait()
+        writer.wait()
+
+
+class TestCheckpointingTrainer(unittest.TestCase):
+    def test_async_checkpoints_are_committed_and_rotated(self):
+        import torch
+        from datasets import Dataset
+        from transformers import LlamaConfig, LlamaForCausalLM, TrainingArguments
+
+        from src.checkpointing import CheckpointingTrainer
+
+        torch.manual_seed(0)
+        config = LlamaConfig(
+            vocab_size=64,
+            hidden_size=16,
+            intermediate_size=32,
+            num_hidden_layers=1,
+            num_attention_heads=2,
+            num_key_value_heads=2,
+        )
+        ids = torch.randint(0, 64, (8, 8)).tolist()
+        dataset = Dataset.from_dict({"input_ids": ids, "labels": ids})
+        with tempfile.TemporaryDirectory() as tmp:
+            args = TrainingArguments(
+                output_dir=tmp,
+                per_device_train_batch_size=2,
+                max_steps=4,
+                save_strategy="steps",
+                save_steps=1,
+                save_total_limit=2,
+                report_to=[],
+            )
+            trainer = CheckpointingTrainer(model=LlamaForCausalLM(config), args=args, train_dataset=dataset)
+            trainer.train()
+
+            names = sorted(p.name for p in Path(tmp).iterdir())
+            files = {p.name for p in (Path(tmp) / "checkpoint-4").iterdir()}
+
+        self.assertEqual(names, ["checkpoint-3", "checkpoint-4"])
+        self.assertTrue({"model.safetensors", "optimizer.pt", "trainer_state.json"} <= files)
+        summary = trainer.checkpoint_summary()
+        self.assertEqual(summary["saves"], 4)
+        self.assertTrue(summary["async"])
+
+    def test_adapter_checkpoints_hold_only_the_adapter(self):
+        import torch
+        from datasets import Dataset
+        from peft import LoraConfig, get_peft_model
+        from transformers import LlamaConfig, LlamaForCausalLM, TrainingArguments
+
+        from src.checkpointing import CheckpointingTrainer
+
+        torch.manual_seed(0)
+        config = LlamaConfig(
+            vocab_size=64,
+            hidden_size=16,
+            intermediate_size=32,
+            num_hidden_layers=1,
+            num_attention_heads=2,
+            num_key_value_heads=2,
+        )
+        ids = torch.randint(0, 64, (4, 8)).tolist()
+        dataset = Dataset.from_dict({"input_ids": ids, "labels": ids})
+
+        def args(output_dir):
+            return TrainingArguments(
+                output_dir=output_dir,
+                per_device_train_batch_size=2,
+                max_steps=2,
+                save_strategy="steps",
+                save_steps=2,
+                report_to=[],
+            )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Rejected up front, before any step is spent.
+            with self.assertRaises(ValueError):
+                CheckpointingTrainer(model=LlamaForCausalLM(config), args=args(tmp), checkpoint_mode="adapter")
+
+            files = {}
+            for mode in ("full", "adapter"):
+                lora = LoraConfig(r=2, target_modules=["q_proj", "v_proj"])
+                model = get_peft_model(LlamaForCausalLM(config), lora)
+                trainer = CheckpointingTrainer(
+                    model=model, args=args(f"{tmp}/{mode}"), train_dataset=dataset, checkpoint_mode=mode
+                )
+                trainer.train()
+                files[mode] = {p.name for p in (Path(tmp) / mode / "checkpoint-2").iterdir()}
+
+        self.assertTrue({"adapter_model.safetensors", "scheduler.pt"} <= files["adapter"])
+        self.assertNotIn("model.safetensors", files["adapter"])
+        self.assertEqual(files["full"] - files["adapter"], {"optimizer.pt"})
+
+
+if __name__ == "__main__":
+    unittest.main()
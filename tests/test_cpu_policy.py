@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+
+
+class TestCpuPolicy(unittest.TestCase):
+    def test_plan_splits_cores_across_runners(self):
+        from src.cpu_policy import plan_cpu_policy
+
+        cores = list(range(8))
+        first = plan_cpu_policy(0, 2, cores=cores, pin=True)
+        second = plan_cpu_policy(1, 2, cores=cores, pin=True)
+
+        self.assertEqual(first.num_threads, 4)
+        self.assertEqual(first.cores, (0, 1, 2, 3))
+        self.assertEqual(second.cores, (4, 5, 6, 7))
+        self.assertEqual(first.env()["OMP_NUM_THREADS"], "4")
+
+    def test_plan_never_drops_below_one_thread_or_overlaps_pins(self):
+        from src.cpu_policy import plan_cpu_policy
+
+        policy = plan_cpu_policy(2, 4, cores=[0, 1], pin=True)
+        self.assertEqual(policy.num_threads, 1)
+        self.assertIsNone(policy.cores)
+
+    def test_live_runners_never_oversubscribe_or_share_cores(self):
+        import os
+
+        from src.cpu_policy import RunnerSlots
+
+        slots = RunnerSlots()
+        env = {"CPU_RUNNER_SLOTS": "", "CPU_PIN_RUNNERS": "1"}
+        with patch("src.cpu_policy.available_cores", return_value=list(range(8))), patch.dict(os.environ, env):
+            live = {"a": slots.acquire("a"), "b": slots.acquire("b")}
+            slots.release("a")
+            live.pop("a")
+            live["c"] = slots.acquire("c")
+
+        self.assertLessEqual(sum(p.num_threads for p in live.values()), 8)
+        self.assertFalse(set(live["b"].cores) & set(live["c"].cores))
+        self.assertEqual(slots.active(), 2)
+
+    def test_acquire_queues_once_all_slots_are_taken(self):
+        import os
+        import threading
+
+        from src.cpu_policy import RunnerSlots
+
+        slots = RunnerSlots()
+        with patch("src.cpu_policy.available_cores", return_value=list(range(8))), patch.dict(
+            os.environ, {"CPU_RUNNER_SLOTS": "2", "CPU_PIN_RUNNERS": "1"}
+        ):
+            live = [slots.acquire("a"), slots.acquire("b")]
+            queued = []
+            waiter = threading.Thread(target=lambda: queued.append(slots.acquire("c")))
+            waiter.start()
+            waiter.join(timeout=0.2)
+            self.assertTrue(waiter.is_alive())
+            self.assertTrue(slots.holds("c"))
+
+            slots.release("a")
+            waiter.join(timeout=5)
+
+        self.assertEqual(queued[0].cores, live[0].cores)
+        self.assertLessEqual(queued[0].num_threads + live[1].num_threads, 8)
+        self.assertFalse(set(queued[0].cores) & set(live[1].cores))
+
+    def test_cancelled_acquire_gives_up_its_place(self):
+        import os
+
+        from src.cpu_policy import RunnerSlots
+
+        slots = RunnerSlots()
+        with patch.dict(os.environ, {"CPU_RUNNER_SLOTS": "1"}):
+            slots.acquire("a")
+            self.assertIsNone(slots.acquire("b", cancelled=lambda: True, poll_seconds=0.01))
+
+        self.assertFalse(slots.holds("b"))
+        self.assertEqual(slots.active(), 1)
+
+    def test_payload_round_trip(self):
+        from src.cpu_policy import CPUPolicy
+
+        policy = CPUPolicy(num_threads=3, interop_threads=1, cores=(0, 1, 2))
+        self.assertEqual(CPUPolicy.from_payload(policy.to_payload()), policy)
+        self.assertIsNone(CPUPolicy.from_payload(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
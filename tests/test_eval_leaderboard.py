@@ -0,0 +1,108 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+_T0 = datetime(2026, 1, 1)
+
+
+def _eval(eval_id, score, minutes, status="completed", benchmark_id="b", experiment_id="x", higher_is_better=True):
+    from src.models import BenchmarkEvalResult, BenchmarkStatus
+
+    return BenchmarkEvalResult(
+        id=eval_id, benchmark_id=benchmark_id, benchmark_name="qa", experiment_id=experiment_id, question="q?",
+        gold_answer="a", model_answer="a", bleu_score=0.0, rouge_score=score, primary_score=score,
+        higher_is_better=higher_is_better, status=BenchmarkStatus(status), started_at=_T0 + timedelta(minutes=minutes),
+    )
+
+
+class TestEvalLeaderboard(unittest.TestCase):
+    def setUp(self):
+        from src.storage import database
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self._patch = mock.patch.object(database, "DB_PATH", Path(self._tmp.name) / "t.db")
+        self._patch.start()
+        database.init_db()
+
+    def tearDown(self):
+        self._patch.stop()
+        self._tmp.cleanup()
+
+    def _ranks(self, benchmark_id="b"):
+        from src.storage import list_leaderboard
+
+        return [(e.id, e.rank) for e in list_leaderboard(benchmark_id)]
+
+    def test_ranks_follow_saves_reruns_and_deletes(self):
+        from src.storage import delete_benchmark_eval, get_benchmark_eval, save_benchmark_eval
+
+        for eval_id, score, minutes in (("e1", 40.0, 0), ("e2", 70.0, 1), ("e3", 40.0, 2)):
+            save_benchmark_eval(_eval(eval_id, score, minutes))
+        save_benchmark_eval(_eval("e4", 90.0, 3, status="running"))
+        save_benchmark_eval(_eval("lower", 1.0, 0, benchmark_id="mse", higher_is_better=False))
+        save_benchmark_eval(_eval("higher", 2.0, 1, benchmark_id="mse", higher_is_better=False))
+
+        # Ties go to the most recent eval; running evals are not ranked.
+        self.assertEqual(self._ranks(), [("e2", 1), ("e3", 2), ("e1", 3)])
+        self.assertIsNone(get_benchmark_eval("e4").rank)
+        self.assertEqual(self._ranks("mse"), [("lower", 1), ("higher", 2)])
+
+        save_benchmark_eval(_eval("e4", 90.0, 3))
+        save_benchmark_eval(_eval("e2", 70.0, 1, status="running"))
+        self.assertEqual(self._ranks(), [("e4", 1), ("e3", 2), ("e1", 3)])
+
+        delete_benchmark_eval("e3")
+        self.assertEqual(self._ranks(), [("e4", 1), ("e1", 2)])
+        self.assertEqual(get_benchmark_eval("e1").rank, 2)
+
+    def test_ranks_follow_the_benchmarks_current_direction(self):
+        from src.models import Benchmark
+        from src.storage import save_benchmark, save_benchmark_eval
+
+        benchmark = Benchmark(id="b", name="qa", question="q?", gold_answer="a", created_at=_T0)
+        save_benchmark(benchmark)
+        save_benchmark_eval(_eval("low", 10.0, 0))
+        save_benchmark_eval(_eval("high", 90.0, 1))
+        # Saved after the direction flipped: its snapshot disagrees with the older evals.
+        save_benchmark_eval(_eval("mid", 50.0, 2, higher_is_better=False))
+        self.assertEqual(self._ranks(), [("high", 1), ("mid", 2), ("low", 3)])
+
+        save_benchmark(benchmark.model_copy(update={"higher_is_better": False}))
+        self.assertEqual(self._ranks(), [("low", 1), ("mid", 2), ("high", 3)])
+
+    def test_compare_joins_experiments_and_rebuild_matches(self):
+        from src.models import ExperimentResult, ExperimentStatus, ExperimentType
+        from src.storage import (
+            database,
+            list_evaluation_comparisons,
+            rebuild_eval_leaderboard,
+            save_benchmark_eval,
+            save_experiment,
+        )
+
+        save_experiment(
+            ExperimentResult(
+                id="x", experiment_type=ExperimentType.CAUSAL_LM, status=ExperimentStatus.COMPLETED,
+                dataset_id="d", dataset_filename="data.csv", config_id="c", started_at=_T0,
+            )
+        )
+        save_benchmark_eval(_eval("e1", 40.0, 0))
+        save_benchmark_eval(_eval("e2", 70.0, 1))
+        save_benchmark_eval(_eval("orphan", 99.0, 2, experiment_id="gone"))
+
+        compared = list_evaluation_comparisons()
+        self.assertEqual([c.eval_id for c in compared], ["e2", "e1"])
+        self.assertEqual(compared[0].dataset_filename, "data.csv")
+
+        before = self._ranks()
+        with database.get_connection() as conn:
+            conn.execute("DELETE FROM eval_leaderboard")
+            conn.commit()
+        self.assertEqual(rebuild_eval_leaderboard(), 3)
+        self.assertEqual(self._ranks(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+class TestMeanCI(unittest.TestCase):
+    def test_t_interval(self):
+        from src.eval_stats import mean_ci
+
+        out = mean_ci([1.0, 2.0, 3.0, 4.0])
+        self.assertAlmostEqual(out["mean"], 2.5)
+        # t(0.975, df=3) = 3.1824; std = 1.2910
+        self.assertAlmostEqual(out["ci_low"], 2.5 - 3.1824 * 1.2910 / 2, places=3)
+        self.assertAlmostEqual(out["ci_high"], 2.5 + 3.1824 * 1.2910 / 2, places=3)
+
+    def test_single_value_has_degenerate_interval(self):
+        from src.eval_stats import mean_ci
+
+        out = mean_ci([7.0])
+        self.assertEqual((out["ci_low"], out["ci_high"]), (7.0, 7.0))
+
+
+class TestSuiteItems(unittest.TestCase):
+    def test_loads_non_empty_rows_up_to_limit(self):
+        from datetime import datetime
+
+        from src.api import benchmark_routes
+        from src.models import Benchmark, BenchmarkType, DatasetInfo
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "qa.csv"
+            path.write_text('"question","answer"\n"a?", "x"\n"b?",""\n"c?", "z"\n"d?", "w"\n')
+            dataset = DatasetInfo(
+                id="d", filename="qa.csv", path=str(path), columns=["question", "answer"], row_count=4,
+                uploaded_at=datetime.now(),
+            )
+            benchmark = Benchmark(
+                id="b", name="suite", benchmark_type=BenchmarkType.CAUSAL_LM_QA_SUITE,
+                spec={"dataset_id": "d", "limit": 2}, created_at=datetime.now(),
+            )
+            with mock.patch.object(benchmark_routes, "get_dataset", return_value=dataset):
+                items = benchmark_routes._load_suite_items(benchmark)
+
+        self.assertEqual(items, [("a?", "x"), ("c?", "z")])
+
+
+class TestEvalItemStore(unittest.TestCase):
+    def test_items_round_trip_and_are_deleted_with_eval(self):
+        from src.models import BenchmarkEvalItem
+        from src.storage import benchmark_store, database
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(database, "DB_PATH", Path(tmp) / "t.db"):
+            database.init_db()
+            with database.get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO benchmark_evals (id, benchmark_id, benchmark_name, experiment_id, question, "
+                    "gold_answer, model_answer, bleu_score, status, started_at) "
+                    "VALUES ('e', 'b', 'suite', 'x', '', '', '', 0, 'completed', '2026-01-01')"
+                )
+                conn.commit()
+            items = [
+                BenchmarkEvalItem(index=i, question=f"q{i}", gold_answer="g", model_answer="m", bleu_score=i, rouge_score=i)
+                for i in range(5)
+            ]
+            benchmark_store.save_benchmark_eval_items("e", items)
+            page = benchmark_store.list_benchmark_eval_items("e", offset=3, limit=10)
+            total = benchmark_store.count_benchmark_eval_items("e")
+            benchmark_store.delete_benchmark_eval("e")
+            remaining = benchmark_store.count_benchmark_eval_items("e")
+
+        self.assertEqual([i.question for i in page], ["q3", "q4"])
+        self.assertEqual((total, remaining), (5, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
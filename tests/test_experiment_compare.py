@@ -0,0 +1,103 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+_T0 = datetime(2026, 1, 1)
+
+
+class TestExperimentCompare(unittest.TestCase):
+    def setUp(self):
+        from src.storage import database
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self._patch = mock.patch.object(database, "DB_PATH", self.root / "t.db")
+        self._patch.start()
+        database.init_db()
+
+    def tearDown(self):
+        self._patch.stop()
+        self._tmp.cleanup()
+
+    def _experiment(self, exp_id, cfg, steps=0):
+        from src.models import (
+            ConfigRecord,
+            CustomLightningFullConfig,
+            ExperimentResult,
+            ExperimentStatus,
+            ExperimentType,
+        )
+        from src.storage import save_config, save_experiment
+
+        output_dir = self.root / exp_id
+        output_dir.mkdir()
+        if steps:
+            logs = [{"step": s, "train_loss": 1.0 / s} for s in range(1, steps + 1)]
+            logs += [{"step": steps, "val_loss": 0.5}]
+            (output_dir / "training_logs.json").write_text(json.dumps(logs))
+        save_config(
+            ConfigRecord(
+                id=f"c-{exp_id}", name=exp_id, experiment_type=ExperimentType.CUSTOM_LIGHTNING,
+                config=CustomLightningFullConfig(cfg=cfg), created_at=_T0,
+            )
+        )
+        save_experiment(
+            ExperimentResult(
+                id=exp_id, experiment_type=ExperimentType.CUSTOM_LIGHTNING, status=ExperimentStatus.COMPLETED,
+                dataset_id="d", config_id=f"c-{exp_id}", started_at=_T0, output_dir=str(output_dir),
+            )
+        )
+
+    def _eval(self, eval_id, exp_id, rouge, status="completed"):
+        from src.models import BenchmarkEvalResult, BenchmarkStatus
+        from src.storage import save_benchmark_eval
+
+        save_benchmark_eval(
+            BenchmarkEvalResult(
+                id=eval_id, benchmark_id="b", benchmark_name="qa", experiment_id=exp_id, question="q?",
+                gold_answer="a", model_answer="a", bleu_score=rouge / 2, rouge_score=rouge, primary_score=rouge,
+                status=BenchmarkStatus(status), started_at=_T0,
+            )
+        )
+
+    def test_compare_reads_evals_once_and_diffs_configs(self):
+        from fastapi import HTTPException
+
+        from src.api import experiment_routes
+
+        self._experiment("a", {"lr": 0.1, "batch_size": 8, "layers": [1, 2]}, steps=50)
+        self._experiment("b", {"lr": 0.2, "layers": [1, 2]})
+        self._eval("e1", "a", 40.0)
+        self._eval("e2", "a", 60.0, status="running")
+        self._eval("e3", "b", 70.0)
+
+        with mock.patch.object(
+            experiment_routes, "list_completed_evals_by_experiment",
+            wraps=experiment_routes.list_completed_evals_by_experiment,
+        ) as fetch:
+            result = experiment_routes.compare_experiments(["b", "a"], loss_curves=True, max_points=10)
+
+        fetch.assert_called_once()
+        self.assertEqual([e.experiment_id for e in result.experiments], ["b", "a"])
+        self.assertEqual([e.rouge_scores for e in result.experiments], [[70.0], [40.0]])
+        self.assertEqual(
+            result.config_diff,
+            {"cfg.batch_size": {"b": None, "a": 8}, "cfg.lr": {"b": 0.2, "a": 0.1}},
+        )
+        self.assertIsInstance(result.config_diff["cfg.batch_size"]["a"], int)
+
+        curve = result.experiments[1].loss_curve
+        self.assertEqual(len(curve["train"]), 10)
+        self.assertEqual(curve["train"][-1], (50, 1.0 / 50))
+        self.assertEqual(curve["eval"], [(50, 0.5)])
+        self.assertEqual(result.experiments[0].loss_curve, {"train": [], "eval": []})
+
+        with self.assertRaises(HTTPException):
+            experiment_routes.compare_experiments(["a", "missing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
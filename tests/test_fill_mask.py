@@ -0,0 +1,84 @@
+import unittest
+
+
+def _tiny_masked_lm(texts):
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import DistilBertConfig, DistilBertForMaskedLM, PreTrainedTokenizerFast
+
+    pre = pre_tokenizers.WhitespaceSplit()
+    words = sorted({w for text in texts for w, _ in pre.pre_tokenize_str(text)} - {"[MASK]"})
+    vocab = {w: i for i, w in enumerate(["[UNK]", "[PAD]", "[MASK]"] + words)}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]", pad_token="[PAD]", mask_token="[MASK]")
+
+    torch.manual_seed(0)
+    config = DistilBertConfig(vocab_size=len(vocab), dim=32, hidden_dim=64, n_layers=2, n_heads=4, pad_token_id=1)
+    return DistilBertForMaskedLM(config).eval(), tokenizer
+
+
+class TestFillMask(unittest.TestCase):
+    def test_batched_ranks_match_one_sentence_at_a_time(self):
+        import torch
+
+        from src.fill_mask import fill_mask, split_golds
+
+        rows = [
+            ("the cat sat on the [MASK]", "mat"),
+            ("a [MASK] and a [MASK] walk into a bar", "dog | cat"),
+            ("[MASK] is blue", "sky"),
+            ("no mask here", "mat"),
+            ("two [MASK] [MASK] but one answer", "cat"),
+        ]
+        vocab_words = " ".join(t for t, _ in rows) + " mat dog cat sky"
+        model, tokenizer = _tiny_masked_lm([vocab_words])
+        texts = [t for t, _ in rows]
+        golds = [split_golds(a) for _, a in rows]
+
+        results = fill_mask(model, tokenizer, texts, golds, top_k=5, batch_size=2)
+
+        self.assertIsNone(results[3])
+        self.assertIsNone(results[4])
+        for text, gold, result in zip(texts[:3], golds[:3], results[:3]):
+            encoded = tokenizer(text, return_tensors="pt")
+            with torch.no_grad():
+                logits = model(input_ids=encoded["input_ids"]).logits[0]
+            positions = (encoded["input_ids"][0] == tokenizer.mask_token_id).nonzero().flatten()
+            self.assertEqual(len(result.ranks), len(gold))
+            for m, position in enumerate(positions):
+                top = [tokenizer.decode([i]).strip() for i in logits[position].topk(5).indices.tolist()]
+                self.assertEqual(result.predictions[m], top)
+                self.assertEqual(result.ranks[m], top.index(gold[m]) if gold[m] in top else None)
+
+
+class TestFillMaskSuiteScore(unittest.TestCase):
+    def test_aggregates_over_masks_and_skips_mismatched_rows(self):
+        from datetime import datetime
+
+        from src.api.benchmark_routes import _score_fill_mask_suite
+        from src.fill_mask import FillMaskResult
+        from src.models import BenchmarkEvalResult, BenchmarkStatus
+
+        eval_result = BenchmarkEvalResult(
+            id="e", benchmark_id="b", benchmark_name="cloze", experiment_id="x", question="", gold_answer="",
+            model_answer="", bleu_score=0, rouge_score=0, status=BenchmarkStatus.RUNNING, started_at=datetime.now(),
+        )
+        items = [("a [MASK]", "x"), ("b [MASK] [MASK]", "y|z"), ("c", "w")]
+        results = [
+            FillMaskResult(predictions=[["x", "q"]], ranks=[0]),
+            FillMaskResult(predictions=[["q", "y"], ["z", "q"]], ranks=[1, 0]),
+            None,
+        ]
+        scored = _score_fill_mask_suite(eval_result, items, results, top_k=2)
+
+        self.assertEqual([item.index for item in scored], [0, 1])
+        self.assertEqual(scored[1].model_answer, "q | z")
+        self.assertAlmostEqual(eval_result.primary_score, 2 / 3)
+        self.assertEqual(eval_result.metrics["topk_accuracy"], 1.0)
+        self.assertEqual(eval_result.metrics["exact_match"], 0.5)
+        self.assertEqual(eval_result.metrics["skipped_items"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
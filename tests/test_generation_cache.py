@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from tests.test_batched_generation import _tiny_model_and_tokenizer
+
+_QUESTIONS = ["What is two plus two?", "Name a prime.", "Why is the sky blue today?"]
+
+
+class TestGenerationCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from src.benchmark import format_prompt
+
+        cls.model, cls.tokenizer = _tiny_model_and_tokenizer(
+            [format_prompt("You are an AI assistant.", q) for q in _QUESTIONS]
+        )
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _sampled(self, seed, runs=3):
+        from src.benchmark import GenerationRequest
+
+        return GenerationRequest(
+            prompt=_QUESTIONS[0], max_new_tokens=8, temperature=1.5, top_p=1.0, seed=seed, num_return_sequences=runs
+        )
+
+    def test_seeded_runs_do_not_depend_on_the_batch(self):
+        from src.benchmark import BatchedGenerator, GenerationRequest
+
+        alone = BatchedGenerator(self.model, self.tokenizer).generate([self._sampled(7)])
+        shared = BatchedGenerator(self.model, self.tokenizer).generate(
+            [GenerationRequest(prompt=_QUESTIONS[1], max_new_tokens=5), self._sampled(7)]
+        )
+        shifted = BatchedGenerator(self.model, self.tokenizer).generate([self._sampled(8, runs=2)])
+
+        self.assertEqual(shared[1:], alone)
+        self.assertEqual(shifted, alone[1:])
+        self.assertGreater(len(set(alone)), 1)
+
+    def test_only_missing_answers_are_generated(self):
+        from src.benchmark import BatchedGenerator, GenerationCache, GenerationRequest, cached_answers
+
+        cache = GenerationCache(self.root / "g.db", max_bytes=2**20)
+        keys = {None: "model-a"}
+        requests = [
+            self._sampled(7),
+            GenerationRequest(prompt=_QUESTIONS[2], greedy=True, max_new_tokens=6),
+            GenerationRequest(prompt=_QUESTIONS[1], max_new_tokens=4),
+        ]
+        first = BatchedGenerator(self.model, self.tokenizer, cache=cache, model_keys=keys)
+        answers = first.generate(requests)
+        second = BatchedGenerator(self.model, self.tokenizer, cache=cache, model_keys=keys)
+        again = second.generate(requests + [self._sampled(7, runs=5)])
+
+        self.assertEqual(again[:4], answers[:4])
+        self.assertEqual(again[5:8], answers[:3])
+        # 3 seeded runs + 1 greedy answer, then 7 hits; the unseeded sampled request is never cached.
+        self.assertEqual((first.stats["cached_answers"], second.stats["cached_answers"]), (0, 7))
+        self.assertEqual(cache.stats()["entries"], 6)
+        self.assertEqual(cached_answers(requests[:2], keys, cache), answers[:4])
+        self.assertIsNone(cached_answers(requests, keys, cache))
+        self.assertIsNone(cached_answers(requests[:2], {None: "model-b"}, cache))
+
+        bypass = BatchedGenerator(self.model, self.tokenizer, cache=cache, model_keys=keys)
+        bypass.generate([GenerationRequest(prompt=_QUESTIONS[2], greedy=True, max_new_tokens=6, cache=False)])
+        self.assertEqual(bypass.stats["cached_answers"], 0)
+
+    def test_evicts_least_recently_used(self):
+        from src.benchmark import CachedGeneration, GenerationCache
+
+        cache = GenerationCache(self.root / "g.db", max_bytes=350)
+        for key in ("k0", "k1", "k2"):
+            cache.put_many({key: CachedGeneration("x" * 100, 1, 1)})
+        cache.get_many(["k0"])
+        cache.put_many({"k3": CachedGeneration("x" * 100, 1, 1)})
+
+        self.assertEqual(set(cache.get_many(["k0", "k1", "k2", "k3"])), {"k0", "k2", "k3"})
+        self.assertEqual(cache.stats()["evicted"], 1)
+
+    def test_benchmark_seed_round_trips(self):
+        from src.models import Benchmark
+        from src.storage import database, get_benchmark, save_benchmark
+
+        with mock.patch.object(database, "DB_PATH", self.root / "t.db"):
+            database.init_db()
+            save_benchmark(Benchmark(id="b", name="qa", question="q?", gold_answer="a", seed=11, created_at=datetime.now()))
+            self.assertEqual(get_benchmark("b").seed, 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+_MODULE = """
+import torch
+from torch import nn
+
+
+class Line(nn.Module):
+    def __init__(self, cfg):
+        super().__init__()
+        self.net = nn.Linear(1, 1)
+
+    def forward(self, x):
+        return self.net(x)
+"""
+
+_PLUGIN = """
+import os
+import time
+
+import torch
+
+
+def score(cfg, module, spec):
+    print("scoring")
+    with torch.no_grad():
+        weight = float(module.net.weight)
+        module.net.weight.add_(100.0)  # must not leak into the next job
+    return {"primary_score": weight, "metrics": {"weight": weight}}
+
+
+def fail(cfg, module, spec):
+    raise RuntimeError("bad plugin")
+
+
+def crash(cfg, module, spec):
+    os._exit(3)
+
+
+def hang(cfg, module, spec):
+    time.sleep(30)
+"""
+
+
+class TestLightningBenchmarkPool(unittest.TestCase):
+    def setUp(self):
+        import torch
+        from torch import nn
+
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        (root / "line.py").write_text(_MODULE)
+        (root / "plugin.py").write_text(_PLUGIN)
+        net = nn.Linear(1, 1)
+        torch.save({"state_dict": {f"net.{k}": v for k, v in net.state_dict().items()}}, root / "model.ckpt")
+        self.weight = float(net.weight.detach())
+        self.base = {
+            "output_dir": str(root),
+            "config": {"cfg": {}},
+            "lightning_module_path": str(root / "line.py"),
+            "lightning_module_class_name": "Line",
+            "checkpoint_path": str(root / "model.ckpt"),
+        }
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _plugin(self, function_name):
+        return {
+            **self.base,
+            "benchmark_plugin_path": str(Path(self._tmp.name) / "plugin.py"),
+            "benchmark_function_name": function_name,
+            "benchmark_spec": {},
+        }
+
+    def test_jobs_reuse_the_loaded_module_and_match_the_one_shot_runner(self):
+        from src import custom_lightning_sin_benchmark_runner as sin_runner
+        from src.lightning_benchmark_pool import LightningBenchmarkPool
+
+        sin = {**self.base, "x_min": -3.0, "x_max": 3.0, "n_points": 50}
+        pool = LightningBenchmarkPool(workers=1)
+        try:
+            first, _, _ = pool.run("sin", sin)
+            second, _, _ = pool.run("sin", sin)
+            scored, stdout, _ = pool.run("plugin", self._plugin("score"))
+            rescored, _, _ = pool.run("plugin", self._plugin("score"))
+            stats = pool.stats()
+        finally:
+            pool.close()
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, sin_runner._run(sin_runner.BenchmarkPayload(**sin)))
+        self.assertEqual(stdout, "scoring\n")
+        self.assertAlmostEqual(scored["primary_score"], self.weight, places=6)
+        self.assertEqual(scored, rescored)
+        self.assertEqual((stats["workers_started"], stats["jobs"], stats["cached_jobs"]), (1, 4, 3))
+
+    def test_failures_timeouts_and_crashes(self):
+        from src.lightning_benchmark_pool import BenchmarkJobError, LightningBenchmarkPool
+
+        pool = LightningBenchmarkPool(workers=1)
+        try:
+            with self.assertRaises(BenchmarkJobError) as failed:
+                pool.run("plugin", self._plugin("fail"))
+            with self.assertRaisesRegex(ValueError, "exit=3"):
+                pool.run("plugin", self._plugin("crash"))
+            with self.assertRaisesRegex(ValueError, "timed out"):
+                pool.run("plugin", self._plugin("hang"), timeout=2)
+            recovered, _, _ = pool.run("plugin", self._plugin("score"))
+            stats = pool.stats()
+        finally:
+            pool.close()
+
+        self.assertEqual(str(failed.exception), "bad plugin")
+        self.assertIn("RuntimeError: bad plugin", failed.exception.stderr)
+        self.assertAlmostEqual(recovered["primary_score"], self.weight, places=6)
+        self.assertEqual((stats["crashes"], stats["timeouts"], stats["workers_started"]), (1, 1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
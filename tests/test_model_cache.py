@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+def _fake_loader(model_path):
+    import torch
+
+    return torch.nn.Linear(256, 256), f"tokenizer:{model_path.name}"
+
+
+class TestModelCache(unittest.TestCase):
+    def setUp(self):
+        from src import model_cache
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dirs = []
+        for name in ("a", "b"):
+            path = Path(self.tmp.name) / name
+            path.mkdir()
+            (path / "model.safetensors").write_bytes(b"0" * 8)
+            self.dirs.append(path)
+        patcher = mock.patch.dict(model_cache.LOADERS, {"fake": _fake_loader})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_second_lease_is_a_hit(self):
+        from src.model_cache import ModelCache
+
+        cache = ModelCache(budget_bytes=10 * 2**20)
+        with cache.lease("fake", self.dirs[0]) as (first, _):
+            pass
+        with cache.lease("fake", self.dirs[0]) as (second, tokenizer):
+            self.assertEqual(tokenizer, "tokenizer:a")
+        self.assertIs(first, second)
+        self.assertEqual((cache.loads, cache.hits), (1, 1))
+
+    def test_lru_eviction_skips_leased_models(self):
+        from src.model_cache import ModelCache
+
+        # Room for one 256x256 linear layer only.
+        cache = ModelCache(budget_bytes=300_000)
+        with cache.lease("fake", self.dirs[0]):
+            with cache.lease("fake", self.dirs[1]):
+                self.assertEqual(len(cache.stats()["entries"]), 2)
+            self.assertEqual([e["model_path"] for e in cache.stats()["entries"]], [str(self.dirs[0].resolve())])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_rewritten_weights_are_reloaded(self):
+        from src.model_cache import ModelCache
+
+        cache = ModelCache(budget_bytes=10 * 2**20)
+        with cache.lease("fake", self.dirs[0]) as (first, _):
+            pass
+        (self.dirs[0] / "model.safetensors").write_bytes(b"1" * 16)
+        with cache.lease("fake", self.dirs[0]) as (second, _):
+            pass
+        self.assertIsNot(first, second)
+        self.assertEqual(cache.loads, 2)
+        self.assertEqual(len(cache.stats()["entries"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
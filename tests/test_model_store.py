@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+
+class TestModelStore(unittest.TestCase):
+    def test_local_directories_bypass_the_store(self):
+        import src.model_store as store
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(store.resolve_model_path(Mock(), tmp), Path(tmp))
+
+    def test_offline_mode_refuses_to_download(self):
+        import src.model_store as store
+
+        auto_cls = Mock()
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch.object(store, "MODEL_STORE_DIR", Path(tmp)),
+            patch.dict(os.environ, {"MODEL_STORE_OFFLINE": "1"}),
+        ):
+            with self.assertRaises(FileNotFoundError):
+                store.resolve_model_path(auto_cls, "org/missing-model")
+        auto_cls.from_pretrained.assert_not_called()
+
+    def test_load_from_store_is_local_and_mmapped(self):
+        import src.model_store as store
+
+        auto_cls = Mock()
+        with tempfile.TemporaryDirectory() as tmp:
+            entry = Path(tmp) / "org--model"
+            entry.mkdir()
+            (entry / "config.json").write_text("{}")
+            (entry / "model.safetensors").write_bytes(b"")
+            with patch.object(store, "MODEL_STORE_DIR", Path(tmp)):
+                model, seconds = store.load_pretrained(auto_cls, "org/model")
+
+        kwargs = auto_cls.from_pretrained.call_args.kwargs
+        self.assertEqual(auto_cls.from_pretrained.call_args.args[0], entry)
+        self.assertTrue(kwargs["local_files_only"])
+        self.assertTrue(kwargs["low_cpu_mem_usage"])
+        # Same dtype as _populate stored, so nothing is upcast and copied.
+        self.assertEqual(kwargs["torch_dtype"], "auto")
+        self.assertEqual(model.name_or_path, "org/model")
+        self.assertGreaterEqual(seconds, 0.0)
+
+    def test_base_ref_resolves_by_content_hash(self):
+        import src.model_store as store
+
+        with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as out:
+            entry = Path(tmp) / "org--model"
+            entry.mkdir()
+            (entry / "config.json").write_text("{}")
+            (entry / "model.safetensors").write_bytes(b"weights")
+            with patch.object(store, "MODEL_STORE_DIR", Path(tmp)):
+                ref = store.write_base_ref(Path(out), "org/model")
+                found = store.find_base_ref(Path(out) / "checkpoint-10")
+                path = store.resolve_model_path(Mock(), "org/model", content_hash=ref["sha256"])
+
+            self.assertEqual(found, ref)
+            self.assertEqual(len(ref["sha256"]), 64)
+            self.assertEqual(path, entry.resolve())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class TestProfilerWindow(unittest.TestCase):
+    def test_window_exports_after_schedule(self):
+        import torch
+
+        from src.profiling import PROFILER_DIRNAME, ProfilerWindow, load_profile_summary
+
+        model = torch.nn.Linear(8, 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            window = ProfilerWindow(Path(tmp), active_steps=2)
+            window.start()
+            for _ in range(window.total_steps + 2):
+                model(torch.randn(16, 8)).sum().backward()
+                window.step()
+
+            summary = load_profile_summary(Path(tmp))
+            files = sorted(p.name for p in (Path(tmp) / PROFILER_DIRNAME).iterdir())
+
+        self.assertEqual(files, ["ops.json", "ops.txt", "stacks.txt", "trace.json"])
+        self.assertEqual(summary["sort_by"], "self_cpu_time_total")
+        self.assertTrue(any(op["name"] == "aten::addmm" for op in summary["ops"]))
+
+    def test_missing_capture(self):
+        from src.profiling import load_profile_summary
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(load_profile_summary(Path(tmp)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+
+class _FakePopen:
+    """Stands in for the runner subprocess: records its argv and exits 0 at once."""
+
+    calls: list = []
+
+    def __init__(self, args, cwd=None, env=None, **kwargs):
+        self.args = args
+        self.returncode = 0
+        _FakePopen.calls.append(self)
+        payload = json.loads(Path(args[-1]).read_text(encoding="utf-8"))
+        (Path(args[-1]).parent / "metrics.json").write_text(json.dumps({"resumed_from": payload["resume_from"]}))
+
+    def poll(self):
+        return self.returncode
+
+    def communicate(self, timeout=None):
+        return "resumed\n", ""
+
+
+def _sync_thread(target, args):
+    return SimpleNamespace(start=lambda: target(*args))
+
+
+class TestResumeExperiment(unittest.TestCase):
+    def setUp(self):
+        from src.storage import database
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self._patch = mock.patch.object(database, "DB_PATH", self.root / "t.db")
+        self._patch.start()
+        database.init_db()
+        _FakePopen.calls = []
+
+    def tearDown(self):
+        self._patch.stop()
+        self._tmp.cleanup()
+
+    def _experiment(self, status, exp_id="x", checkpoints=("checkpoint-2", "checkpoint-10"), payload=True):
+        from src.models import ExperimentResult, ExperimentStatus, ExperimentType
+        from src.storage import save_experiment
+
+        output_dir = self.root / exp_id
+        output_dir.mkdir()
+        for name in checkpoints:
+            (output_dir / name).mkdir()
+        if payload:
+            (output_dir / "runner_payload.json").write_text(json.dumps({"training": {}}), encoding="utf-8")
+        save_experiment(
+            ExperimentResult(
+                id=exp_id, experiment_type=ExperimentType.CAUSAL_LM, status=ExperimentStatus(status), dataset_id="d",
+                config_id="c", started_at=datetime.now(), output_dir=str(output_dir),
+            )
+        )
+        return output_dir
+
+    def _resume(self, exp_id="x"):
+        from src.api import experiment_routes
+
+        with mock.patch.object(experiment_routes.subprocess, "Popen", _FakePopen), mock.patch.object(
+            experiment_routes, "Thread", _sync_thread
+        ):
+            return experiment_routes.resume_experiment(exp_id)
+
+    def _status_code(self, exp_id="x"):
+        from fastapi import HTTPException
+
+        with self.assertRaises(HTTPException) as ctx:
+            self._resume(exp_id)
+        return ctx.exception.status_code
+
+    def test_resumes_from_the_latest_checkpoint(self):
+        from src.cpu_policy import runner_slots
+        from src.models import ExperimentStatus
+        from src.storage import get_experiment
+
+        output_dir = self._experiment("stopped")
+        response = self._resume()
+
+        self.assertEqual(response.status, ExperimentStatus.PENDING)
+        self.assertTrue(response.message.startswith("Resuming from checkpoint-10"))
+        self.assertIn("without optimizer state", response.message)
+        (popen,) = _FakePopen.calls
+        self.assertEqual(popen.args[1:3], ["-m", "src.causal_lm_runner"])
+        payload = json.loads((output_dir / "runner_payload.json").read_text(encoding="utf-8"))
+        self.assertEqual(payload["resume_from"], str(output_dir / "checkpoint-10"))
+        self.assertIn("cpu", payload)
+
+        exp = get_experiment("x")
+        self.assertEqual(exp.status, ExperimentStatus.COMPLETED)
+        self.assertEqual(exp.metrics, {"resumed_from": str(output_dir / "checkpoint-10")})
+        self.assertIn("resumed from", (output_dir / "runner_stdout.txt").read_text(encoding="utf-8"))
+        self.assertFalse(runner_slots.holds("x"))
+
+    def test_failed_launch_releases_the_slot(self):
+        from src.api import experiment_routes
+        from src.cpu_policy import runner_slots
+        from src.models import ExperimentStatus
+        from src.storage import get_experiment
+
+        self._experiment("stopped")
+        with mock.patch.object(experiment_routes.subprocess, "Popen", side_effect=OSError("no python")), mock.patch.object(
+            experiment_routes, "Thread", _sync_thread
+        ):
+            experiment_routes.resume_experiment("x")
+
+        exp = get_experiment("x")
+        self.assertEqual((exp.status, exp.error), (ExperimentStatus.FAILED, "no python"))
+        self.assertFalse(runner_slots.holds("x"))
+        self.assertEqual(runner_slots.active(), 0)
+
+    def test_queued_resume_stays_pending_and_can_be_stopped(self):
+        import os
+        import time
+
+        from src.api import experiment_routes
+        from src.cpu_policy import runner_slots
+        from src.models import ExperimentStatus
+        from src.storage import get_experiment
+
+        self._experiment("stopped")
+        with mock.patch.dict(os.environ, {"CPU_RUNNER_SLOTS": "1"}), mock.patch.object(
+            experiment_routes.subprocess, "Popen", _FakePopen
+        ):
+            runner_slots.acquire("other")
+            try:
+                experiment_routes.resume_experiment("x")
+                deadline = time.monotonic() + 5
+                while not runner_slots.holds("x") and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertEqual(get_experiment("x").status, ExperimentStatus.PENDING)
+
+                experiment_routes.stop_experiment("x")
+                while runner_slots.holds("x") and time.monotonic() < deadline:
+                    time.sleep(0.05)
+            finally:
+                runner_slots.release("other")
+            while get_experiment("x").status == ExperimentStatus.PENDING and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+        self.assertEqual(get_experiment("x").status, ExperimentStatus.STOPPED)
+        self.assertEqual(_FakePopen.calls, [])
+
+    def test_status_gate(self):
+        from src.cpu_policy import runner_slots
+
+        for status, expected in (("completed", 400), ("pending", 400), ("failed", None), ("running", None)):
+            with self.subTest(status=status):
+                _FakePopen.calls = []
+                self._experiment(status, exp_id=status)
+                if expected is None:
+                    self._resume(status)
+                    self.assertEqual(len(_FakePopen.calls), 1)
+                else:
+                    self.assertEqual(self._status_code(status), expected)
+                    self.assertEqual(_FakePopen.calls, [])
+
+        # A RUNNING row whose runner still holds a slot is live, not orphaned.
+        _FakePopen.calls = []
+        self._experiment("running")
+        runner_slots.acquire("x")
+        try:
+            self.assertEqual(self._status_code(), 409)
+        finally:
+            runner_slots.release("x")
+        self.assertEqual(_FakePopen.calls, [])
+
+    def test_rejects_missing_checkpoint_or_payload(self):
+        from fastapi import HTTPException
+
+        from src.api import experiment_routes
+
+        with self.assertRaises(HTTPException) as ctx:
+            experiment_routes.resume_experiment("x")
+        self.assertEqual(ctx.exception.status_code, 404)
+
+        output_dir = self._experiment("failed", checkpoints=())
+        self.assertEqual(self._status_code(), 400)
+        (output_dir / "runner_payload.json").unlink()
+        (output_dir / "checkpoint-3").mkdir()
+        self.assertEqual(self._status_code(), 400)
+        self.assertEqual(_FakePopen.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import random
+import unittest
+
+
+def _random_pairs(n: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(20)] + ["The", "dog,", "ran!", "x-y", "É"]
+    hyps = [" ".join(rng.choices(words, k=rng.randint(0, 30))) for _ in range(n)]
+    refs = [" ".join(rng.choices(words, k=rng.randint(0, 30))) for _ in range(n)]
+    return hyps, refs
+
+
+class TestLCS(unittest.TestCase):
+    def test_matches_dynamic_programming(self):
+        from src.scoring import lcs_length
+
+        def dp(a, b):
+            table = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+            for i, x in enumerate(a):
+                for j, y in enumerate(b):
+                    table[i + 1][j + 1] = table[i][j] + 1 if x == y else max(table[i][j + 1], table[i + 1][j])
+            return table[-1][-1]
+
+        rng = random.Random(0)
+        for _ in range(200):
+            a = rng.choices("abcd", k=rng.randint(0, 80))
+            b = rng.choices("abcd", k=rng.randint(0, 80))
+            self.assertEqual(lcs_length(a, b), dp(a, b))
+
+
+class TestScores(unittest.TestCase):
+    def test_rouge_l_matches_rouge_score(self):
+        from rouge_score import rouge_scorer
+
+        from src.scoring import rouge_l_scores
+
+        hyps, refs = _random_pairs(300)
+        scorer = rouge_scorer.RougeScorer(["rougeL"])
+        expected = [scorer.score(r, h)["rougeL"].fmeasure * 100 for h, r in zip(hyps, refs)]
+        for got, want in zip(rouge_l_scores(hyps, refs), expected):
+            self.assertAlmostEqual(got, want, places=9)
+
+    def test_bleu_matches_sacrebleu(self):
+        from sacrebleu.metrics import BLEU
+
+        from src.scoring import bleu_scores, corpus_bleu
+
+        hyps, refs = _random_pairs(300, seed=1)
+        sentence = BLEU(effective_order=True)
+        expected = [sentence.sentence_score(h, [r]).score for h, r in zip(hyps, refs)]
+        self.assertEqual(bleu_scores(hyps, refs), expected)
+        self.assertAlmostEqual(corpus_bleu(hyps, refs), BLEU().corpus_score(hyps, [refs]).score, places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()
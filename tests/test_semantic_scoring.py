@@ -0,0 +1,126 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+_WORDS = "the capital of france is paris city lyon a big river what".split()
+
+
+def _save_encoder(path: Path) -> None:
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import BertConfig, BertModel, PreTrainedTokenizerFast
+
+    vocab = {w: i for i, w in enumerate(["[PAD]", "[UNK]", "[CLS]", "[SEP]"] + _WORDS)}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend, unk_token="[UNK]", pad_token="[PAD]", cls_token="[CLS]", sep_token="[SEP]"
+    )
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=32, intermediate_size=64, num_hidden_layers=1, num_attention_heads=4
+    )
+    BertModel(config).save_pretrained(path)
+    tokenizer.save_pretrained(path)
+
+
+class TestSemanticScoring(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.root = Path(cls._tmp.name)
+        _save_encoder(cls.root / "encoder")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def _scorer(self, cache_name="cache.db"):
+        from src.semantic import SemanticScorer
+
+        return SemanticScorer(self.root / "encoder", self.root / cache_name, batch_size=2)
+
+    def test_scores_batch_and_reuse_the_disk_cache(self):
+        answers = ["paris", "the capital is lyon", "a big river", "paris"]
+        golds = ["paris"] * len(answers)
+
+        first = self._scorer()
+        scores = first.scores(answers, golds)
+        again = self._scorer().scores(answers, golds)
+        stats = first.stats()
+
+        self.assertAlmostEqual(scores[0], 100.0, places=3)
+        self.assertEqual(scores[0], scores[3])
+        self.assertLess(min(scores[1:3]), 99.0)
+        self.assertEqual(again, scores)
+        # Three distinct texts, embedded in two batches; the second scorer only reads the cache.
+        self.assertEqual((stats["texts"], stats["encoded"], stats["batches"]), (3, 3, 2))
+
+        second = self._scorer()
+        second.scores(answers, golds)
+        self.assertEqual((second.stats()["encoded"], second.stats()["cache_hits"]), (0, 3))
+
+    def test_semantic_primary_metric(self):
+        from fastapi import HTTPException
+
+        from src.api import benchmark_routes
+        from src.models import Benchmark, BenchmarkEvalResult, BenchmarkStatus, BenchmarkType
+        from src.semantic import SemanticScorer
+
+        benchmark = Benchmark(
+            id="b", name="qa", question="What is the capital of France?", gold_answer="paris",
+            spec={"primary_metric": "semantic"}, created_at=datetime.now(),
+        )
+        eval_result = BenchmarkEvalResult(
+            id="e", benchmark_id="b", benchmark_name="qa", experiment_id="x", question="", gold_answer="",
+            model_answer="", bleu_score=0.0, rouge_score=0.0, status=BenchmarkStatus.RUNNING,
+            started_at=datetime.now(),
+        )
+        with mock.patch.object(benchmark_routes, "semantic_scorer", SemanticScorer(None, self.root / "off.db")):
+            with self.assertRaises(HTTPException):
+                benchmark_routes._validate_primary_metric(benchmark.spec, BenchmarkType.CAUSAL_LM_QA)
+            with self.assertRaisesRegex(ValueError, "SEMANTIC_ENCODER_PATH"):
+                benchmark_routes._score_causal_lm_qa(eval_result, benchmark, ["paris"])
+
+        with mock.patch.object(benchmark_routes, "semantic_scorer", self._scorer("routes.db")):
+            benchmark_routes._validate_primary_metric(benchmark.spec, BenchmarkType.CAUSAL_LM_QA)
+            benchmark_routes._score_causal_lm_qa(eval_result, benchmark, ["paris city", "lyon"])
+
+        self.assertEqual(eval_result.primary_score, eval_result.metrics["semantic"])
+        self.assertAlmostEqual(eval_result.rouge_score, 100.0 / 3)
+        self.assertEqual(len({r.semantic_score for r in eval_result.run_scores}), 2)
+        with self.assertRaises(HTTPException):
+            benchmark_routes._validate_primary_metric({"primary_metric": "semantic"}, BenchmarkType.MASKED_LM_FILL_MASK)
+
+    def test_broken_encoder_only_fails_benchmarks_ranked_by_it(self):
+        from src.api import benchmark_routes
+        from src.models import Benchmark, BenchmarkEvalResult, BenchmarkStatus
+
+        broken = mock.Mock(enabled=True)
+        broken.scores.side_effect = OSError("encoder weights missing")
+
+        def eval_result():
+            return BenchmarkEvalResult(
+                id="e", benchmark_id="b", benchmark_name="qa", experiment_id="x", question="", gold_answer="",
+                model_answer="", bleu_score=0.0, rouge_score=0.0, status=BenchmarkStatus.RUNNING,
+                started_at=datetime.now(),
+            )
+
+        rouge_ranked = Benchmark(id="b", name="qa", question="q?", gold_answer="paris", created_at=datetime.now())
+        semantic_ranked = rouge_ranked.model_copy(update={"spec": {"primary_metric": "semantic"}})
+        scored = eval_result()
+        with mock.patch.object(benchmark_routes, "semantic_scorer", broken):
+            with self.assertLogs("src.api.benchmark_routes", level="WARNING"):
+                benchmark_routes._score_causal_lm_qa(scored, rouge_ranked, ["paris", "lyon"])
+            with self.assertRaisesRegex(OSError, "encoder weights missing"):
+                benchmark_routes._score_causal_lm_qa(eval_result(), semantic_ranked, ["paris"])
+
+        self.assertEqual(scored.status, BenchmarkStatus.COMPLETED)
+        self.assertEqual(scored.primary_score, 50.0)
+        self.assertEqual([r.semantic_score for r in scored.run_scores], [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
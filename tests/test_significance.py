@@ -0,0 +1,112 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+
+class TestPairwiseSignificance(unittest.TestCase):
+    def test_pairing_separates_a_small_shift_over_noisy_items(self):
+        from src.eval_stats import pairwise_significance
+
+        rng = np.random.default_rng(1)
+        base = rng.normal(50.0, 20.0, size=30)
+        jitter = rng.normal(0.0, 0.5, size=30)
+        a = dict(enumerate(base))
+        b = dict(enumerate(base - 2.0 + jitter))
+        # The same scores on other units: no pairing, so item variance swamps the shift.
+        c = {i + 100: v for i, v in b.items()}
+
+        result = pairwise_significance([a, b, c], resamples=1000)
+        ab, ac, bc = result["pairs"]
+
+        self.assertEqual([(p["a"], p["b"], p["paired"]) for p in (ab, ac, bc)], [(0, 1, True), (0, 2, False), (1, 2, False)])
+        self.assertTrue(ab["significant"])
+        self.assertEqual(ab["extra_samples"], 0)
+        self.assertGreater(ab["ci_low"], 0)
+        self.assertFalse(ac["significant"])
+        self.assertGreaterEqual(ac["extra_samples"], 30)
+        self.assertAlmostEqual(ab["diff"], ac["diff"])
+        self.assertEqual(result["estimates"][0]["n"], 30)
+        self.assertLess(result["estimates"][0]["ci_low"], base.mean())
+
+    def test_degenerate_pairs(self):
+        from src.eval_stats import pairwise_significance
+
+        pairs = pairwise_significance([{0: 1.0, 1: 2.0}, {0: 1.0, 1: 2.0}, {0: 5.0}], resamples=200)["pairs"]
+
+        self.assertEqual((pairs[0]["p_value"], pairs[0]["extra_samples"]), (1.0, None))
+        self.assertIsNone(pairs[1]["p_value"])
+        self.assertFalse(pairs[1]["significant"])
+
+
+class TestSignificanceEndpoint(unittest.TestCase):
+    def setUp(self):
+        from src.storage import database
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self._patch = mock.patch.object(database, "DB_PATH", Path(self._tmp.name) / "t.db")
+        self._patch.start()
+        database.init_db()
+
+    def tearDown(self):
+        self._patch.stop()
+        self._tmp.cleanup()
+
+    def _eval(self, eval_id, rouges):
+        from src.models import BenchmarkEvalResult, BenchmarkRunScore, BenchmarkStatus
+        from src.storage import save_benchmark_eval
+
+        save_benchmark_eval(
+            BenchmarkEvalResult(
+                id=eval_id, benchmark_id="b", benchmark_name="qa", experiment_id=f"x-{eval_id}", question="q?",
+                gold_answer="a", model_answer="a", bleu_score=0.0, rouge_score=float(np.mean(rouges)),
+                primary_score=float(np.mean(rouges)), num_runs=len(rouges), status=BenchmarkStatus.COMPLETED,
+                run_scores=[
+                    BenchmarkRunScore(run_number=i + 1, model_answer="a", bleu_score=0.0, rouge_score=r)
+                    for i, r in enumerate(rouges)
+                ],
+                started_at=datetime.now(),
+            )
+        )
+
+    def test_ranks_runs_and_names_the_winner(self):
+        from fastapi import HTTPException
+
+        from src.api.benchmark_routes import get_benchmark_significance
+        from src.models import Benchmark, BenchmarkType
+        from src.storage import save_benchmark
+
+        save_benchmark(Benchmark(id="b", name="qa", question="q?", gold_answer="a", created_at=datetime.now()))
+        self._eval("strong", [80.0, 82.0, 79.0, 81.0, 80.5])
+        self._eval("weak", [40.0, 45.0, 38.0, 42.0, 41.0])
+        self._eval("close", [78.0, 82.0, 77.0, 81.0])
+
+        result = get_benchmark_significance("b", resamples=500)
+
+        self.assertEqual((result.metric, result.unit), ("rouge_l", "run"))
+        self.assertEqual([e.eval_id for e in result.estimates], ["strong", "close", "weak"])
+        by_pair = {(p.eval_a, p.eval_b): p for p in result.pairs}
+        self.assertEqual(by_pair[("strong", "weak")].better_eval_id, "strong")
+        self.assertFalse(by_pair[("strong", "close")].paired)
+        self.assertIsNone(by_pair[("strong", "close")].better_eval_id)
+        self.assertGreater(by_pair[("strong", "close")].extra_samples, 0)
+        self.assertEqual(result.skipped_eval_ids, [])
+
+        # No run has a semantic_score, so nothing is left to compare.
+        with self.assertRaises(HTTPException):
+            get_benchmark_significance("b", metric="semantic")
+        save_benchmark(
+            Benchmark(
+                id="l", name="sin", benchmark_type=BenchmarkType.CUSTOM_LIGHTNING_SIN_REGRESSION,
+                created_at=datetime.now(),
+            )
+        )
+        with self.assertRaises(HTTPException):
+            get_benchmark_significance("l")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+_WORDS = "what is the capital of france paris a city river two plus four".split()
+
+
+def _tokenizer():
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import PreTrainedTokenizerFast
+
+    vocab = {w: i for i, w in enumerate(["[UNK]", "[PAD]"] + _WORDS)}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    return PreTrainedTokenizerFast(tokenizer_object=backend, unk_token="[UNK]", pad_token="[PAD]")
+
+
+class TestStaticFeatures(unittest.TestCase):
+    def setUp(self):
+        import pandas as pd
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.csv = self.root / "qa.csv"
+        rows = [
+            {"question": f"what is {' '.join(_WORDS[: i % 9])} item{i % 13}?", "answer": "paris " * (i % 5), "x": i}
+            for i in range(50)
+        ]
+        pd.DataFrame(rows).to_csv(self.csv, index=False)
+        self.tokenizer = _tokenizer()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _extract(self, **kwargs):
+        from src.meta_features import extract_static_dataset_features
+
+        return extract_static_dataset_features(self.csv, ("question", "answer"), "\n", self.tokenizer, 8, **kwargs)
+
+    def test_chunked_counts_match_one_pass(self):
+        import pandas as pd
+
+        features = self._extract(chunk_rows=7)
+        texts = pd.read_csv(self.csv, dtype=str, keep_default_na=False)[["question", "answer"]].agg("\n".join, axis=1)
+        tokens = [t for text in texts for t in text.split()]
+        lengths = [len(self.tokenizer(text)["input_ids"]) for text in texts]
+
+        self.assertEqual(features, self._extract(chunk_rows=1000))
+        self.assertEqual(features.n_samples, 50)
+        self.assertEqual(features.vocab_size, len(set(tokens)))
+        self.assertAlmostEqual(features.type_token_ratio, len(set(tokens)) / len(tokens))
+        self.assertAlmostEqual(features.avg_sequence_length, sum(lengths) / 50)
+        self.assertEqual(features.max_sequence_length, max(lengths))
+        self.assertAlmostEqual(features.truncation_rate, sum(n > 8 for n in lengths) / 50)
+
+    def test_cache_skips_the_csv_until_it_changes(self):
+        import pandas as pd
+
+        from src.meta_features import StaticFeatureCache, extract_static_dataset_features
+
+        cache = StaticFeatureCache(self.root / "static.db")
+        first = self._extract(cache=cache)
+        with mock.patch("src.meta_features.pd.read_csv", side_effect=AssertionError("CSV was re-read")):
+            self.assertEqual(self._extract(cache=cache), first)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        other_length = extract_static_dataset_features(
+            self.csv, ("question", "answer"), "\n", self.tokenizer, 4, cache=cache
+        )
+        self.assertGreater(other_length.truncation_rate, first.truncation_rate)
+
+        pd.read_csv(self.csv).head(10).to_csv(self.csv, index=False)
+        self.assertEqual(self._extract(cache=cache).n_samples, 10)
+        self.assertEqual(cache.stats(), {"path": str(self.root / "static.db"), "hits": 1, "misses": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class TestTelemetryRecorder(unittest.TestCase):
+    def test_series_and_summary(self):
+        from src.telemetry import TelemetryRecorder, load_telemetry
+
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = TelemetryRecorder(Path(tmp) / "telemetry.json", flush_every=2)
+            recorder.start()
+            for step in range(1, 4):
+                recorder.step_begin()
+                recorder.step_end(step, samples=4, tokens=100)
+            recorder.flush()
+
+            rows = load_telemetry(Path(tmp))
+            summary = recorder.summary()
+
+        self.assertEqual([r["step"] for r in rows], [1, 2, 3])
+        self.assertEqual(summary["steps"], 3)
+        self.assertGreater(summary["samples_per_sec"], 0)
+        self.assertGreater(summary["tokens_per_sec"], summary["samples_per_sec"])
+        self.assertLessEqual(summary["step_time_p50"], summary["step_time_p99"])
+        self.assertGreater(summary["peak_rss_mb"], 0)
+
+    def test_resume_keeps_rows_up_to_checkpoint(self):
+        from src.telemetry import TelemetryRecorder
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "telemetry.json"
+            path.write_text(json.dumps([{"step": s} for s in range(1, 6)]))
+            recorder = TelemetryRecorder(path)
+            recorder.start(resume_step=3)
+            self.assertEqual([r["step"] for r in recorder.rows], [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()